@@ -12,8 +12,9 @@ from pathlib import Path
 from datetime import datetime
 
 class CITestRunner:
-    def __init__(self, project_root=None):
+    def __init__(self, project_root=None, acceptance_workers=0):
         self.project_root = Path(project_root) if project_root else Path(__file__).parent.parent
+        self.acceptance_workers = acceptance_workers
         self.results = {
             "timestamp": datetime.now().isoformat(),
             "stages": {},
@@ -135,9 +136,17 @@ class CITestRunner:
             ("cd test/acceptance && python3 -m behave --dry-run --tags='not @hil' features/", "BDD Syntax Validation")
         ]
         
+        # Optionally execute the features against emulated firmware, sharded
+        # across workers (one PTY each); JUnit is merged into acceptance-junit/
+        if self.acceptance_workers:
+            commands.append((
+                f"python3 scripts/parallel_behave.py --emulator --workers {self.acceptance_workers} -- --tags=~@pending",
+                "Parallel Acceptance Execution (Emulator)"
+            ))
+        
         all_passed = True
         for command, name in commands:
-            if not self.run_command(command, name):
+            if not self.run_command(command, name, timeout=900):
                 all_passed = False
         
         return all_passed
@@ -228,10 +237,12 @@ def main():
     parser.add_argument("--stage", choices=["validation", "unit", "acceptance", "integration"],
                        help="Run specific stage only")
     parser.add_argument("--project-root", help="Project root directory")
+    parser.add_argument("--acceptance-workers", type=int, default=0,
+                       help="Run acceptance features on N parallel emulator workers (0 = syntax check only)")
     
     args = parser.parse_args()
     
-    runner = CITestRunner(args.project_root)
+    runner = CITestRunner(args.project_root, args.acceptance_workers)
     
     if args.stage:
         # Run specific stage
@@ -8,12 +8,18 @@ Utility for loading and validating modular YAML configuration files
 import yaml
 import os
 import sys
+import hashlib
+import pickle
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import argparse
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from datetime import datetime
 
+# Compiled bundle: parsed + validated modules, keyed by the SHA-256 of every source file
+BUNDLE_FORMAT = 1
+BUNDLE_FILE = "config-bundle.pickle"
+
 @dataclass
 class ConfigModule:
     """Configuration module metadata"""
@@ -48,6 +54,8 @@ class ModularConfigLoader:
         self.master_config: Optional[Dict[Any, Any]] = None
         self.modules: Dict[str, ConfigModule] = {}
         self.validation_errors: List[str] = []
+        self.bundle_hit = False
+        self._signal_index: Tuple[Optional[Dict[Any, Any]], Dict[str, str]] = (None, {})
         
     def load_master_config(self, master_file: str = "sonic-multiplexer.yaml") -> bool:
         """
@@ -104,7 +112,7 @@ class ModularConfigLoader:
             return False
             
         module = self.modules[module_name]
-        module_path = Path(module.file_path)
+        module_path = self._module_path(module)
         
         try:
             with open(module_path, 'r') as f:
@@ -139,6 +147,104 @@ class ModularConfigLoader:
                 
         return success
     
+    def _module_path(self, module: ConfigModule) -> Path:
+        """Module paths in the master file are relative to the repository root"""
+        path = Path(module.file_path)
+        if path.is_absolute():
+            return path
+        rooted = self.config_dir.parent / path
+        return rooted if rooted.exists() else path
+    
+    def default_bundle_path(self) -> Path:
+        """Bundle location: .hil_cache/ next to the configuration directory"""
+        return self.config_dir.resolve().parent / ".hil_cache" / BUNDLE_FILE
+    
+    def load_compiled(self, master_file: str = "sonic-multiplexer.yaml",
+                      bundle_file: Optional[str] = None) -> bool:
+        """
+        Load master config and all modules from the compiled bundle
+        
+        The bundle is used only while every source file still hashes to the
+        value recorded at compile time; otherwise it is recompiled first.
+        
+        Args:
+            master_file: Master configuration filename
+            bundle_file: Bundle path (default: .hil_cache/config-bundle.pickle)
+            
+        Returns:
+            True if loaded successfully, False otherwise
+        """
+        bundle_path = Path(bundle_file) if bundle_file else self.default_bundle_path()
+        bundle = self._read_bundle(bundle_path, self.config_dir / master_file)
+        if bundle is None:
+            return self.compile_bundle(master_file, str(bundle_path))
+        
+        self.master_config = bundle['master_config']
+        self.modules = {name: ConfigModule(**fields) for name, fields in bundle['modules'].items()}
+        self.validation_errors = list(bundle['validation_errors'])
+        self.bundle_hit = True
+        print(f"✅ Configuration bundle loaded: {bundle_path}")
+        return True
+    
+    def compile_bundle(self, master_file: str = "sonic-multiplexer.yaml",
+                       bundle_file: Optional[str] = None) -> bool:
+        """
+        Parse and validate all modules, then write the bundle
+        
+        Args:
+            master_file: Master configuration filename
+            bundle_file: Bundle path (default: .hil_cache/config-bundle.pickle)
+            
+        Returns:
+            True if all files loaded (validation errors are kept in the bundle), False otherwise
+        """
+        if not self.load_master_config(master_file) or not self.load_all_modules():
+            return False
+        self.validate_configuration()
+        
+        master_path = self.config_dir / master_file
+        sources = [master_path] + [self._module_path(module) for module in self.modules.values()]
+        bundle = {
+            'format': BUNDLE_FORMAT,
+            'master_path': str(master_path.resolve()),
+            'sources': {str(path.resolve()): _file_digest(path) for path in sources},
+            'compiled_at': datetime.now().isoformat(),
+            'master_config': self.master_config,
+            'modules': {name: asdict(module) for name, module in self.modules.items()},
+            'validation_errors': list(self.validation_errors),
+        }
+        bundle_path = Path(bundle_file) if bundle_file else self.default_bundle_path()
+        try:
+            bundle_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = bundle_path.with_name(f"{bundle_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, bundle_path)
+            print(f"✅ Configuration bundle compiled: {bundle_path}")
+        except OSError as e:
+            # Read-only checkout: still usable, just not cached
+            print(f"⚠️  Could not write configuration bundle {bundle_path}: {e}")
+        return True
+    
+    def _read_bundle(self, bundle_path: Path, master_path: Path) -> Optional[Dict[str, Any]]:
+        """Return the bundle if it matches the current sources, else None"""
+        try:
+            with open(bundle_path, 'rb') as f:
+                bundle = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+        if not isinstance(bundle, dict) or bundle.get('format') != BUNDLE_FORMAT:
+            return None
+        if bundle.get('master_path') != str(master_path.resolve()):
+            return None
+        for source, digest in bundle.get('sources', {}).items():
+            try:
+                if _file_digest(Path(source)) != digest:
+                    return None
+            except OSError:
+                return None
+        return bundle
+    
     def get_module_data(self, module_name: str) -> Optional[Dict[Any, Any]]:
         """
         Get data from a specific module
@@ -163,7 +269,7 @@ class ModularConfigLoader:
         Get configuration for a specific pin
         
         Args:
-            pin_name: Pin name (e.g., "PB0", "PC1")
+            pin_name: Pin name (e.g., "PB0", "PC1") or signal name (e.g., "START_4")
             
         Returns:
             Pin configuration dictionary or None if not found
@@ -173,7 +279,14 @@ class ModularConfigLoader:
             return None
             
         pins = pinout_data.get('dut', {}).get('pins', {})
-        return pins.get(pin_name)
+        if pin_name in pins:
+            return pins[pin_name]
+        # Signal -> pin index, rebuilt only when the pinout module is (re)loaded
+        indexed, index = self._signal_index
+        if indexed is not pins:
+            index = {cfg['signal']: name for name, cfg in pins.items() if cfg and cfg.get('signal')}
+            self._signal_index = (pins, index)
+        return pins.get(index.get(pin_name))
     
     def get_sonicator_config(self, sonicator_id: int) -> Optional[Dict[Any, Any]]:
         """
@@ -368,6 +481,10 @@ class ModularConfigLoader:
             print(f"❌ Export failed: {e}")
             return False
 
+def _file_digest(path: Path) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
 def main():
     """Main function for command-line usage"""
     parser = argparse.ArgumentParser(description='Multi-Sonicator-IO Modular Configuration Loader')
@@ -378,25 +495,37 @@ def main():
     parser.add_argument('--pin', help='Show configuration for specific pin')
     parser.add_argument('--sonicator', type=int, help='Show configuration for specific sonicator')
     parser.add_argument('--db9', help='Show configuration for specific DB9 connector')
+    parser.add_argument('--compile', action='store_true', help='Rebuild the compiled configuration bundle')
+    parser.add_argument('--no-bundle', action='store_true', help='Parse the YAML sources directly')
+    parser.add_argument('--bundle', help='Compiled bundle path (default: .hil_cache/config-bundle.pickle)')
     
     args = parser.parse_args()
     
     # Initialize loader
     loader = ModularConfigLoader(args.config_dir)
     
-    # Load master configuration
-    if not loader.load_master_config(args.master_file):
-        print("❌ Failed to load master configuration")
-        sys.exit(1)
-    
-    # Load all modules
-    if not loader.load_all_modules():
-        print("❌ Failed to load all modules")
-        sys.exit(1)
+    if args.no_bundle:
+        # Load master configuration
+        if not loader.load_master_config(args.master_file):
+            print("❌ Failed to load master configuration")
+            sys.exit(1)
+        
+        # Load all modules
+        if not loader.load_all_modules():
+            print("❌ Failed to load all modules")
+            sys.exit(1)
+    else:
+        # Compiled bundle (validated at compile time); rebuilt when a source changes
+        load = loader.compile_bundle if args.compile else loader.load_compiled
+        if not load(args.master_file, args.bundle):
+            print("❌ Failed to load configuration")
+            for error in loader.validation_errors:
+                print(f"  ❌ {error}")
+            sys.exit(1)
     
     # Validate if requested
     if args.validate:
-        if loader.validate_configuration():
+        if (not loader.validation_errors) if not args.no_bundle else loader.validate_configuration():
             print("✅ Configuration validation passed")
         else:
             print("❌ Configuration validation failed")
@@ -9,34 +9,17 @@ import sys
 import subprocess
 import platform
 import argparse
-import serial.tools.list_ports
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from test.acceptance.hil_framework.port_discovery import ROLE_ISP, PortDiscovery, isp_sign_on, list_candidates
 
 def detect_arduino_programmer():
     """
     Detect if Arduino programmer is available
     """
     try:
-        # Check for Arduino ISP programmer
-        ports = serial.tools.list_ports.comports()
-        arduino_ports = []
-        
-        for port in ports:
-            port_name = port.device.lower()
-            description = (port.description or "").lower()
-            manufacturer = (port.manufacturer or "").lower()
-            
-            # Check for Arduino-specific identifiers
-            arduino_indicators = [
-                'arduino', 'uno', 'nano', 'mega',
-                'usbmodem', 'usbserial',
-                'ch340', 'ftdi', 'cp210x'
-            ]
-            
-            if any(indicator in description for indicator in arduino_indicators) or \
-               any(indicator in manufacturer for indicator in arduino_indicators) or \
-               any(indicator in port_name for indicator in arduino_indicators):
-                arduino_ports.append(port)
-        
+        arduino_ports = [c for c in list_candidates() if c.arduino_like]
         if arduino_ports:
             print(f"Found Arduino programmer: {arduino_ports[0].device}")
             return True
@@ -49,57 +32,19 @@ def detect_arduino_programmer():
 def detect_arduino_isp():
     """
     Detect if Arduino as ISP is specifically available and responding
-    Uses probe_arduinoisp.py for accurate detection
+    Probes the STK500v1 sign-on, starting with the port that answered last time
     """
     try:
         # First detect any Arduino
         if not detect_arduino_programmer():
             return False
 
-        # Get Arduino port
-        ports = serial.tools.list_ports.comports()
-        arduino_port = None
-
-        # Look for usbmodem devices (common for Arduino on macOS)
-        import glob
-        if platform.system() == "Darwin":
-            usbmodem_ports = glob.glob("/dev/tty.usbmodem*")
-            if usbmodem_ports:
-                arduino_port = usbmodem_ports[0]
-
-        # Fallback to general Arduino detection
-        if not arduino_port:
-            arduino_ports = [
-                port for port in ports
-                if 'arduino' in (port.description or "").lower() or
-                   'uno' in (port.description or "").lower() or
-                   'usbmodem' in port.device.lower()
-            ]
-
-            if arduino_ports:
-                arduino_port = arduino_ports[0].device
-
-        if not arduino_port:
-            print("No Arduino port found")
-            return False
-
-        # Use probe script to verify ArduinoISP is loaded
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        probe_script = os.path.join(script_dir, "probe_arduinoisp.py")
-
-        if os.path.exists(probe_script):
-            result = subprocess.run([sys.executable, probe_script, arduino_port],
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
-                print(f"✅ Arduino as ISP detected and responding on: {arduino_port}")
-                return True
-            else:
-                print(f"Arduino found on {arduino_port} but ArduinoISP sketch not loaded")
-                return False
-        else:
-            # Fallback to basic port detection if probe script not found
-            print(f"Arduino as ISP ready: {arduino_port}")
+        found = PortDiscovery().find(ROLE_ISP, isp_sign_on)
+        if found:
+            print(f"✅ Arduino as ISP detected and responding on: {found.device}")
             return True
+        print("Arduino found but ArduinoISP sketch not loaded")
+        return False
 
     except Exception as e:
         print(f"Error detecting Arduino as ISP: {e}")
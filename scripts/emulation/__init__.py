@@ -0,0 +1,20 @@
+"""
+Firmware emulation for hardware-free acceptance runs
+
+Components:
+- register_map: Python mirror of include/modbus_registers.h
+- sonicator: Per-unit state machine ported from src/modules/control/sonicator.cpp
+- firmware: Register bank and 10 ms control loop of the ATmega32A firmware
+- rtu: MODBUS RTU slave (CRC, FC03/FC06, exception responses)
+- pty_server: Serves a firmware instance on a PTY symlinked to /tmp/tty-msio
+- cli: Command line entry point (python scripts/emulation/cli.py)
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+from .firmware import FirmwareEmulator
+from .pty_server import DEFAULT_LINK_PATH, PtyEmulatorServer
+from .rtu import RtuSlave, crc16
+
+__all__ = ["FirmwareEmulator", "PtyEmulatorServer", "RtuSlave", "crc16", "DEFAULT_LINK_PATH"]
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Firmware Emulator CLI
+
+Serves one or more emulated ATmega32A sonicator multiplexers as MODBUS RTU
+pseudo-terminals so the Behave acceptance suite can run without hardware.
+With --count N the links are <link>-0 .. <link>-(N-1), one per test worker.
+
+Usage:
+    python scripts/emulation/cli.py [--link /tmp/tty-msio] [--count N]
+                                    [--slave-id 2] [--time-scale 1.0]
+
+Once every PTY is ready a line "READY <link> <device>" is printed per
+instance; the process serves until interrupted.
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from firmware import FirmwareEmulator  # noqa: E402
+from pty_server import DEFAULT_LINK_PATH, PtyEmulatorServer  # noqa: E402
+import register_map as rm  # noqa: E402
+
+
+def link_paths(link: str, count: int) -> List[str]:
+    """Link path per instance; a single instance keeps the bare path"""
+    if count == 1:
+        return [link]
+    return [f"{link}-{i}" for i in range(count)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Emulated sonicator firmware on MODBUS RTU PTYs")
+    parser.add_argument("--link", default=DEFAULT_LINK_PATH,
+                        help=f"Symlink path for the PTY (default: {DEFAULT_LINK_PATH})")
+    parser.add_argument("--count", type=int, default=1,
+                        help="Number of independent instances to serve")
+    parser.add_argument("--slave-id", type=int, action="append", dest="slave_ids",
+                        help=f"MODBUS slave id to answer (repeatable, default: {rm.MODBUS_SLAVE_ID})")
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="Emulated ms per real ms; >1 shortens start/stop delays")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Enable debug logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    slave_ids = args.slave_ids or [rm.MODBUS_SLAVE_ID]
+
+    servers = []
+    try:
+        for path in link_paths(args.link, max(1, args.count)):
+            server = PtyEmulatorServer(path, FirmwareEmulator(time_scale=args.time_scale), slave_ids)
+            servers.append(server.start())
+            print(f"READY {server.link_path} {server.device_path}", flush=True)
+
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        try:
+            stop.wait()
+        except KeyboardInterrupt:
+            pass
+    finally:
+        for server in servers:
+            server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
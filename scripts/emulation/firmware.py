@@ -0,0 +1,181 @@
+"""
+Firmware Emulator - Register bank and control loop of the ATmega32A firmware
+
+Holds the MODBUS register map, applies the write side effects implemented in
+src/modules/communication/modbus.cpp (global enable, emergency stop snapshot)
+and runs the four sonicator state machines on the same 10 ms cadence as
+main.cpp's loop(). Time only advances when the emulator is touched, so an idle
+instance costs nothing and many can run side by side.
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+try:
+    from . import register_map as rm
+    from .sonicator import SonicatorModel, SonicatorState
+except ImportError:  # Direct execution
+    import register_map as rm  # type: ignore
+    from sonicator import SonicatorModel, SonicatorState  # type: ignore
+
+# include/constants.h
+MULTIPLEXER_UPDATE_INTERVAL_MS = 10
+
+# Bound on catch-up passes after an idle gap; the state machines settle well
+# within this many passes when no register changes in between
+MAX_CATCHUP_PASSES = 64
+
+
+class FirmwareEmulator:
+    """Register-level model of the sonicator multiplexer firmware"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, time_scale: float = 1.0) -> None:
+        """Create a freshly booted firmware instance
+
+        Args:
+            clock: Monotonic clock in seconds (injectable for tests)
+            time_scale: Emulated milliseconds per real millisecond; values above
+                1.0 make start/stop delays elapse faster
+        """
+        self.clock = clock
+        self.time_scale = time_scale
+        self.lock = threading.RLock()
+        self.registers: Dict[int, int] = {}
+        self.units: List[SonicatorModel] = [SonicatorModel(i + 1) for i in range(rm.MAX_SONICATORS)]
+        self._epoch = clock()
+        self._last_pass_ms = 0.0
+        self.reset()
+
+    # ----------------------------- Lifecycle ------------------------------ #
+
+    def reset(self) -> None:
+        """Power-on state (register_manager_init + setup())"""
+        with self.lock:
+            self.registers.clear()
+            self.registers[rm.REG_SYSTEM_STATUS] = rm.SYSTEM_STATUS_OK
+            self.registers[rm.REG_WATCHDOG_STATUS] = 1
+            self.registers[rm.REG_GLOBAL_ENABLE] = 1
+            self.units = [SonicatorModel(i + 1) for i in range(rm.MAX_SONICATORS)]
+            for unit in self.units:
+                self.registers[rm.sonicator_address(unit.sonicator_id, rm.SON_AMPLITUDE_SP)] = \
+                    rm.DEFAULT_SONICATOR_AMPLITUDE
+            self._epoch = self.clock()
+            self._last_pass_ms = 0.0
+            self._publish()
+
+    def now_ms(self) -> float:
+        return (self.clock() - self._epoch) * 1000.0 * self.time_scale
+
+    def tick(self) -> None:
+        """Run every control-loop pass that is due up to now"""
+        with self.lock:
+            now = self.now_ms()
+            due = int((now - self._last_pass_ms) // MULTIPLEXER_UPDATE_INTERVAL_MS)
+            if due > MAX_CATCHUP_PASSES:
+                self._last_pass_ms = now - MAX_CATCHUP_PASSES * MULTIPLEXER_UPDATE_INTERVAL_MS
+                due = MAX_CATCHUP_PASSES
+            for _ in range(due):
+                self._last_pass_ms += MULTIPLEXER_UPDATE_INTERVAL_MS
+                self._update_units(self._last_pass_ms)
+
+    # ----------------------------- Registers ------------------------------ #
+
+    def read_register(self, address: int) -> int:
+        with self.lock:
+            self.tick()
+            return self.registers.get(address, 0)
+
+    def read_registers(self, start: int, count: int) -> List[int]:
+        with self.lock:
+            self.tick()
+            return [self.registers.get(start + i, 0) for i in range(count)]
+
+    def write_register(self, address: int, value: int) -> bool:
+        """modbus_write_register_internal(); False maps to SLAVE_FAILURE"""
+        value &= 0xFFFF
+        with self.lock:
+            self.tick()
+            if 0x0010 <= address <= 0x001F:
+                self.registers[address] = value
+                self._apply_global_control(address, value)
+                return True
+            if rm.SONICATOR_BASE <= address <= 0x041F:
+                unit_id, offset = rm.split_sonicator_address(address)
+                if unit_id <= rm.MAX_SONICATORS and offset < 0x10:
+                    self.registers[address] = value
+                    return True
+            return False
+
+    def _apply_global_control(self, address: int, value: int) -> None:
+        regs = self.registers
+        if address == rm.REG_GLOBAL_ENABLE:
+            if value:
+                regs[rm.REG_SYSTEM_STATUS] = regs.get(rm.REG_SYSTEM_STATUS, 0) | rm.SYSTEM_STATUS_OK
+            else:
+                regs[rm.REG_SYSTEM_STATUS] = regs.get(rm.REG_SYSTEM_STATUS, 0) & ~rm.SYSTEM_STATUS_OK
+                regs[rm.REG_PREV_ACTIVE_MASK] = regs.get(rm.REG_ACTIVE_MASK, 0)
+                regs[rm.REG_LAST_SHUTDOWN_REASON] = rm.SHUTDOWN_REASON_NORMAL
+        elif address == rm.REG_EMERGENCY_STOP and value:
+            regs[rm.REG_SYSTEM_STATUS] = regs.get(rm.REG_SYSTEM_STATUS, 0) | rm.SYSTEM_STATUS_EMERGENCY_STOP
+            regs[rm.REG_PREV_ACTIVE_MASK] = regs.get(rm.REG_ACTIVE_MASK, 0)
+            regs[rm.REG_LAST_SHUTDOWN_REASON] = rm.SHUTDOWN_REASON_ESTOP
+            for unit in self.units:
+                flags = regs.get(rm.sonicator_address(unit.sonicator_id, rm.SON_STATUS_FLAGS), 0)
+                running = bool(flags & rm.SON_STATUS_RUNNING)
+                regs[rm.sonicator_address(unit.sonicator_id, rm.SON_PREV_STATE)] = \
+                    int(SonicatorState.RUNNING) if running else int(SonicatorState.IDLE)
+
+    # --------------------------- Fault injection -------------------------- #
+
+    def set_overload(self, sonicator_id: int, active: bool) -> None:
+        with self.lock:
+            self.tick()
+            self.units[sonicator_id - 1].inputs.overload = active
+
+    def set_frequency(self, sonicator_id: int, frequency_hz: Optional[int]) -> None:
+        """Force the measured frequency (None restores the simulated value)"""
+        with self.lock:
+            self.tick()
+            self.units[sonicator_id - 1].inputs.frequency_hz = frequency_hz
+
+    def set_power(self, sonicator_id: int, power_raw: Optional[int]) -> None:
+        """Force the raw power ADC reading (None restores the simulated value)"""
+        with self.lock:
+            self.tick()
+            self.units[sonicator_id - 1].inputs.power_raw = power_raw
+
+    # ----------------------------- Internals ------------------------------ #
+
+    def _update_units(self, now_ms: float) -> None:
+        for unit in self.units:
+            start_stop = self.registers.get(rm.sonicator_address(unit.sonicator_id, rm.SON_START_STOP), 0)
+            reset = self.registers.get(rm.sonicator_address(unit.sonicator_id, rm.SON_OVERLOAD_RESET), 0)
+            previous = unit.state
+            unit.update(now_ms, start_stop, bool(reset))
+            if unit.state != previous:
+                addr = rm.sonicator_address(unit.sonicator_id, rm.SON_LAST_STATE_TIMESTAMP_LO)
+                self.registers[addr] = int(now_ms) & 0xFFFF
+        self._publish()
+
+    def _publish(self) -> None:
+        """register_manager_update_sonicator_status() for every unit"""
+        active_mask = 0
+        for unit in self.units:
+            sid = unit.sonicator_id
+            amplitude = self.registers.get(rm.sonicator_address(sid, rm.SON_AMPLITUDE_SP), 0)
+            amplitude = max(rm.MIN_AMPLITUDE_PERCENT, min(rm.MAX_AMPLITUDE_PERCENT, amplitude))
+            flags = unit.status_flags()
+            self.registers[rm.sonicator_address(sid, rm.SON_POWER_WATTS)] = unit.power_raw(amplitude)
+            self.registers[rm.sonicator_address(sid, rm.SON_FREQUENCY_HZ)] = unit.frequency_hz() // 10
+            self.registers[rm.sonicator_address(sid, rm.SON_STATUS_FLAGS)] = flags
+            self.registers[rm.sonicator_address(sid, rm.SON_AMPLITUDE_ACT)] = amplitude
+            if unit.active_faults:
+                self.registers[rm.sonicator_address(sid, rm.SON_LAST_FAULT_CODE)] = unit.active_faults
+            if flags & rm.SON_STATUS_RUNNING:
+                active_mask |= 1 << (sid - 1)
+        self.registers[rm.REG_ACTIVE_MASK] = active_mask
+        self.registers[rm.REG_ACTIVE_COUNT] = bin(active_mask).count("1")
@@ -0,0 +1,128 @@
+"""
+PTY Server - Serves an emulated firmware instance on a pseudo-terminal
+
+Opens a PTY pair, points a stable symlink (default /tmp/tty-msio) at the slave
+side and answers MODBUS RTU requests written to it. Frames are delimited by
+their known length for FC03/FC06/FC16 and by inter-frame silence otherwise.
+Each server owns its own PTY and firmware model, so parallel test workers
+just use different link paths.
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+import logging
+import os
+import select
+import threading
+import time
+import tty
+from typing import Iterable, Optional
+
+try:
+    from . import register_map as rm
+    from .firmware import FirmwareEmulator
+    from .rtu import RtuSlave, expected_frame_length
+except ImportError:  # Direct execution
+    import register_map as rm  # type: ignore
+    from firmware import FirmwareEmulator  # type: ignore
+    from rtu import RtuSlave, expected_frame_length  # type: ignore
+
+DEFAULT_LINK_PATH = "/tmp/tty-msio"
+
+# Silence that terminates a frame of unknown length; a PTY delivers a client
+# write in one burst, so this only has to outlast scheduler jitter
+FRAME_GAP_S = 0.005
+
+
+class PtyEmulatorServer:
+    """Firmware emulator exposed as a serial device for pymodbus clients"""
+
+    def __init__(self, link_path: str = DEFAULT_LINK_PATH,
+                 firmware: Optional[FirmwareEmulator] = None,
+                 slave_ids: Iterable[int] = (rm.MODBUS_SLAVE_ID,)) -> None:
+        self.link_path = link_path
+        self.firmware = firmware or FirmwareEmulator()
+        self.slave = RtuSlave(self.firmware, slave_ids)
+        self.logger = logging.getLogger(__name__)
+        self.device_path: Optional[str] = None
+        self._master_fd: Optional[int] = None
+        self._slave_fd: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = threading.Event()
+
+    def start(self) -> "PtyEmulatorServer":
+        """Create the PTY and symlink, then serve requests on a daemon thread"""
+        if self._running.is_set():
+            return self
+        self._master_fd, self._slave_fd = os.openpty()
+        # Raw mode on both ends: no echo, no CR/LF translation of binary frames
+        tty.setraw(self._master_fd)
+        tty.setraw(self._slave_fd)
+        self.device_path = os.ttyname(self._slave_fd)
+        self._replace_link()
+        self._running.set()
+        self._thread = threading.Thread(target=self._serve, name=f"msio-emulator:{self.link_path}", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Firmware emulator serving {self.link_path} -> {self.device_path}")
+        return self
+
+    def stop(self) -> None:
+        self._running.clear()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        try:
+            if os.path.islink(self.link_path) and os.readlink(self.link_path) == self.device_path:
+                os.unlink(self.link_path)
+        except OSError:
+            pass
+        for fd in (self._master_fd, self._slave_fd):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._master_fd = self._slave_fd = None
+
+    def __enter__(self) -> "PtyEmulatorServer":
+        return self.start()
+
+    def __exit__(self, *_exc) -> None:
+        self.stop()
+
+    def _replace_link(self) -> None:
+        tmp = f"{self.link_path}.{os.getpid()}.tmp"
+        if os.path.lexists(tmp):
+            os.unlink(tmp)
+        os.symlink(self.device_path, tmp)
+        os.replace(tmp, self.link_path)
+
+    def _serve(self) -> None:
+        buffer = bytearray()
+        last_byte_at = 0.0
+        while self._running.is_set():
+            timeout = FRAME_GAP_S if buffer else 0.1
+            try:
+                readable, _, _ = select.select([self._master_fd], [], [], timeout)
+                if readable:
+                    buffer.extend(os.read(self._master_fd, 512))
+                    last_byte_at = time.monotonic()
+            except OSError as e:
+                if self._running.is_set():
+                    self.logger.debug(f"Emulator PTY read failed: {e}")
+                break
+            while buffer:
+                length = expected_frame_length(bytes(buffer))
+                if length is not None and len(buffer) >= length:
+                    frame = bytes(buffer[:length])
+                    del buffer[:length]
+                elif time.monotonic() - last_byte_at >= FRAME_GAP_S:
+                    # Silence: whatever is buffered is one (possibly malformed) frame
+                    frame = bytes(buffer)
+                    buffer.clear()
+                else:
+                    break
+                response = self.slave.handle_frame(frame)
+                if response:
+                    os.write(self._master_fd, response)
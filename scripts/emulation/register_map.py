@@ -0,0 +1,124 @@
+"""
+MODBUS Register Map - Python mirror of include/modbus_registers.h
+
+Addresses, status bits and validation rules used by the firmware emulator.
+Keep this module in lock-step with the header; it is the contract the
+acceptance suite reads and writes over MODBUS RTU.
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+from typing import Tuple
+
+# ----------------------------------------------------------------------------
+# Communication defaults (include/modbus.h)
+# ----------------------------------------------------------------------------
+
+MODBUS_SLAVE_ID = 2
+MODBUS_BAUD_RATE = 115200
+MODBUS_MAX_READ_COUNT = 125
+
+FC_READ_HOLDING = 0x03
+FC_WRITE_SINGLE = 0x06
+FC_WRITE_MULTIPLE = 0x10
+
+# Exception codes (modbus_error_t order == standard MODBUS exception codes)
+EXC_ILLEGAL_FUNCTION = 0x01
+EXC_ILLEGAL_ADDRESS = 0x02
+EXC_ILLEGAL_VALUE = 0x03
+EXC_SLAVE_FAILURE = 0x04
+
+# ----------------------------------------------------------------------------
+# System status (0x0000-0x000F, read-only)
+# ----------------------------------------------------------------------------
+
+REG_SYSTEM_STATUS = 0x0000
+REG_ACTIVE_COUNT = 0x0001
+REG_ACTIVE_MASK = 0x0002
+REG_WATCHDOG_STATUS = 0x0003
+REG_COMM_ERRORS = 0x0004
+REG_PREV_ACTIVE_MASK = 0x0005
+REG_LAST_SHUTDOWN_REASON = 0x0006
+
+# ----------------------------------------------------------------------------
+# Global control (0x0010-0x001F, read/write)
+# ----------------------------------------------------------------------------
+
+REG_GLOBAL_ENABLE = 0x0010
+REG_EMERGENCY_STOP = 0x0011
+REG_SYSTEM_RESET = 0x0012
+REG_TEST_START_INHIBIT = 0x0013
+
+# ----------------------------------------------------------------------------
+# Per-sonicator blocks (0x0100 + (id-1)*0x20)
+# ----------------------------------------------------------------------------
+
+SONICATOR_BASE = 0x0100
+SONICATOR_STRIDE = 0x0020
+MAX_SONICATORS = 4
+
+SON_START_STOP = 0x00
+SON_AMPLITUDE_SP = 0x01
+SON_OVERLOAD_RESET = 0x02
+SON_POWER_WATTS = 0x10
+SON_FREQUENCY_HZ = 0x11  # Hz / 10
+SON_STATUS_FLAGS = 0x12
+SON_AMPLITUDE_ACT = 0x13
+SON_PREV_STATE = 0x14
+SON_PERSISTED_AMPLITUDE = 0x15
+SON_LAST_FAULT_CODE = 0x16
+SON_LAST_STATE_TIMESTAMP_LO = 0x17
+
+LAST_ADDRESS = SONICATOR_BASE + MAX_SONICATORS * SONICATOR_STRIDE - 1  # 0x017F
+
+# ----------------------------------------------------------------------------
+# Status bits
+# ----------------------------------------------------------------------------
+
+SYSTEM_STATUS_OK = 0x0001
+SYSTEM_STATUS_FAULT = 0x0002
+SYSTEM_STATUS_EMERGENCY_STOP = 0x0004
+SYSTEM_STATUS_COMM_FAULT = 0x0008
+SYSTEM_STATUS_OVERTEMP = 0x0010
+
+SON_STATUS_RUNNING = 0x0001
+SON_STATUS_OVERLOAD = 0x0002
+SON_STATUS_FREQ_LOCK = 0x0004
+SON_STATUS_COMM_FAULT = 0x0008
+SON_STATUS_OVER_TEMP = 0x0010
+SON_STATUS_FAULT = 0x0020
+
+SHUTDOWN_REASON_NORMAL = 0
+SHUTDOWN_REASON_ESTOP = 3
+
+DEFAULT_SONICATOR_AMPLITUDE = 80  # include/constants.h
+MIN_AMPLITUDE_PERCENT = 20
+MAX_AMPLITUDE_PERCENT = 100
+
+
+def sonicator_address(sonicator_id: int, offset: int) -> int:
+    """Absolute register address for a 1-based sonicator id and block offset"""
+    if not 1 <= sonicator_id <= MAX_SONICATORS:
+        raise ValueError(f"sonicator_id must be 1..{MAX_SONICATORS}, got {sonicator_id}")
+    return SONICATOR_BASE + (sonicator_id - 1) * SONICATOR_STRIDE + offset
+
+
+def split_sonicator_address(address: int) -> Tuple[int, int]:
+    """Return (1-based sonicator id, block offset) for a per-sonicator address"""
+    index, offset = divmod(address - SONICATOR_BASE, SONICATOR_STRIDE)
+    return index + 1, offset
+
+
+def is_valid_address(address: int) -> bool:
+    """IS_VALID_REGISTER_ADDR"""
+    return address <= 0x001F or SONICATOR_BASE <= address <= 0x041F
+
+
+def is_readonly_address(address: int) -> bool:
+    """IS_READONLY_REGISTER"""
+    if address <= 0x000F:
+        return True
+    if address >= SONICATOR_BASE:
+        return (address - SONICATOR_BASE) % SONICATOR_STRIDE >= 0x10
+    return False
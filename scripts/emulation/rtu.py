@@ -0,0 +1,106 @@
+"""
+MODBUS RTU Slave - Frame handling of src/modules/communication/modbus.cpp
+
+CRC-16 (poly 0xA001, init 0xFFFF, low byte first), slave-id filtering, FC03
+read holding and FC06 write single, with the firmware's exception behaviour:
+frames for another slave or with a bad CRC get no reply at all, count > 125
+is ILLEGAL_VALUE, invalid or read-only addresses are ILLEGAL_ADDRESS, a
+rejected write is SLAVE_FAILURE and every other function code (including
+FC16, which the firmware declares but does not implement) is
+ILLEGAL_FUNCTION.
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+import struct
+from typing import Iterable, Optional
+
+try:
+    from . import register_map as rm
+    from .firmware import FirmwareEmulator
+except ImportError:  # Direct execution
+    import register_map as rm  # type: ignore
+    from firmware import FirmwareEmulator  # type: ignore
+
+
+def crc16(data: bytes) -> int:
+    """modbus_calculate_crc()"""
+    crc = 0xFFFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            if crc & 0x0001:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc >>= 1
+    return crc
+
+
+def with_crc(pdu: bytes) -> bytes:
+    """Append the CRC in wire order (low byte first)"""
+    return pdu + struct.pack("<H", crc16(pdu))
+
+
+def expected_frame_length(buffer: bytes) -> Optional[int]:
+    """Length of the request frame at the head of ``buffer``, if knowable yet
+
+    Returns None when more bytes are needed to tell (or the function code has
+    no fixed layout); callers then fall back to the inter-frame silence.
+    """
+    if len(buffer) < 2:
+        return None
+    function_code = buffer[1]
+    if function_code in (rm.FC_READ_HOLDING, rm.FC_WRITE_SINGLE):
+        return 8
+    if function_code == rm.FC_WRITE_MULTIPLE and len(buffer) >= 7:
+        return 9 + buffer[6]
+    return None
+
+
+class RtuSlave:
+    """Turns request frames into response frames against a FirmwareEmulator"""
+
+    def __init__(self, firmware: FirmwareEmulator, slave_ids: Iterable[int] = (rm.MODBUS_SLAVE_ID,)) -> None:
+        self.firmware = firmware
+        self.slave_ids = frozenset(slave_ids)
+        self.requests_received = 0
+        self.crc_errors = 0
+        self.exceptions_sent = 0
+
+    def handle_frame(self, frame: bytes) -> Optional[bytes]:
+        """Process one complete RTU frame; None means the slave stays silent"""
+        if len(frame) < 4 or frame[0] not in self.slave_ids:
+            return None
+        if struct.unpack("<H", frame[-2:])[0] != crc16(frame[:-2]):
+            self.crc_errors += 1
+            return None
+        self.requests_received += 1
+        slave_id, function_code = frame[0], frame[1]
+        if function_code == rm.FC_READ_HOLDING and len(frame) == 8:
+            return self._read_holding(slave_id, frame)
+        if function_code == rm.FC_WRITE_SINGLE and len(frame) == 8:
+            return self._write_single(slave_id, frame)
+        return self._exception(slave_id, function_code, rm.EXC_ILLEGAL_FUNCTION)
+
+    def _read_holding(self, slave_id: int, frame: bytes) -> bytes:
+        start, count = struct.unpack(">HH", frame[2:6])
+        if count > rm.MODBUS_MAX_READ_COUNT:
+            return self._exception(slave_id, rm.FC_READ_HOLDING, rm.EXC_ILLEGAL_VALUE)
+        if not all(rm.is_valid_address(start + i) for i in range(count)):
+            return self._exception(slave_id, rm.FC_READ_HOLDING, rm.EXC_ILLEGAL_ADDRESS)
+        values = self.firmware.read_registers(start, count)
+        payload = struct.pack(f">BBB{count}H", slave_id, rm.FC_READ_HOLDING, count * 2, *values)
+        return with_crc(payload)
+
+    def _write_single(self, slave_id: int, frame: bytes) -> bytes:
+        address, value = struct.unpack(">HH", frame[2:6])
+        if not rm.is_valid_address(address) or rm.is_readonly_address(address):
+            return self._exception(slave_id, rm.FC_WRITE_SINGLE, rm.EXC_ILLEGAL_ADDRESS)
+        if not self.firmware.write_register(address, value):
+            return self._exception(slave_id, rm.FC_WRITE_SINGLE, rm.EXC_SLAVE_FAILURE)
+        return with_crc(bytes([slave_id]) + frame[1:6])
+
+    def _exception(self, slave_id: int, function_code: int, code: int) -> bytes:
+        self.exceptions_sent += 1
+        return with_crc(bytes([slave_id, function_code | 0x80, code]))
@@ -0,0 +1,148 @@
+"""
+Sonicator Unit Model - Python port of the SonicatorInterface state machine
+
+Mirrors src/modules/control/sonicator.cpp closely enough for acceptance
+scenarios: IDLE -> STARTING -> RUNNING -> STOPPING -> IDLE with the firmware
+start/stop delays, overload debounce into FAULT, and FAULT -> IDLE once the
+fault has cleared and an overload reset is requested. Hardware inputs
+(overload line, frequency, power ADC) are simulated and can be overridden
+by tests to inject faults.
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Optional
+
+try:
+    from . import register_map as rm
+except ImportError:  # Direct execution
+    import register_map as rm  # type: ignore
+
+# include/sonicator/sonicator_constants.h (milliseconds)
+SONICATOR_START_DELAY_MS = 50
+SONICATOR_STOP_DELAY_MS = 100
+SONICATOR_RESET_PULSE_MS = 20
+SONICATOR_FAULT_DEBOUNCE_MS = 10
+
+NOMINAL_FREQUENCY_HZ = 20000
+FREQ_LOCK_MIN_HZ = 18000
+FREQ_LOCK_MAX_HZ = 22000
+
+
+class SonicatorState(IntEnum):
+    IDLE = 0
+    STARTING = 1
+    RUNNING = 2
+    STOPPING = 3
+    FAULT = 4
+    UNKNOWN = 5
+
+
+class SonicatorFault(IntEnum):
+    NONE = 0x00
+    OVERLOAD = 0x01
+    FREQ_UNLOCK = 0x02
+
+
+@dataclass
+class SimulatedInputs:
+    """Hardware inputs seen by one unit; None means 'derive from state'"""
+    overload: bool = False
+    frequency_hz: Optional[int] = None
+    power_raw: Optional[int] = None
+
+
+@dataclass
+class SonicatorModel:
+    """One CT2000 channel driven by its MODBUS control registers"""
+    sonicator_id: int
+    state: SonicatorState = SonicatorState.IDLE
+    previous_state: SonicatorState = SonicatorState.UNKNOWN
+    state_entry_ms: float = 0.0
+    active_faults: int = 0
+    fault_count: int = 0
+    start_count: int = 0
+    inputs: SimulatedInputs = field(default_factory=SimulatedInputs)
+    _overload_since_ms: Optional[float] = field(default=None, repr=False)
+
+    def _enter(self, state: SonicatorState, now_ms: float) -> None:
+        self.previous_state = self.state
+        self.state = state
+        self.state_entry_ms = now_ms
+
+    def frequency_hz(self) -> int:
+        if self.inputs.frequency_hz is not None:
+            return self.inputs.frequency_hz
+        return NOMINAL_FREQUENCY_HZ if self.state == SonicatorState.RUNNING else 0
+
+    def frequency_locked(self) -> bool:
+        freq = self.frequency_hz()
+        if freq == 0:
+            # No measurement: the lock pin follows the generator output
+            return self.state == SonicatorState.RUNNING
+        return FREQ_LOCK_MIN_HZ <= freq <= FREQ_LOCK_MAX_HZ
+
+    def update(self, now_ms: float, start_stop: int, reset_overload: bool) -> None:
+        """Run one SonicatorInterface::update() pass at ``now_ms``"""
+        # checkFaultConditions / handleFaultConditions
+        faults = 0
+        if self.inputs.overload:
+            if self._overload_since_ms is None:
+                self._overload_since_ms = now_ms
+            if now_ms - self._overload_since_ms >= SONICATOR_FAULT_DEBOUNCE_MS:
+                faults |= SonicatorFault.OVERLOAD
+        else:
+            self._overload_since_ms = None
+        if self.state == SonicatorState.RUNNING and not self.frequency_locked():
+            faults |= SonicatorFault.FREQ_UNLOCK
+        if faults:
+            if self.state != SonicatorState.FAULT:
+                self.fault_count += 1
+            self._enter(SonicatorState.FAULT, now_ms)
+        self.active_faults = faults
+
+        # processStateMachine
+        elapsed = now_ms - self.state_entry_ms
+        if self.state == SonicatorState.IDLE:
+            if start_stop == 1:
+                self._enter(SonicatorState.STARTING, now_ms)
+        elif self.state == SonicatorState.STARTING:
+            if elapsed >= SONICATOR_START_DELAY_MS:
+                self._enter(SonicatorState.RUNNING, now_ms)
+                self.start_count += 1
+            if start_stop == 0:
+                self._enter(SonicatorState.STOPPING, now_ms)
+        elif self.state == SonicatorState.RUNNING:
+            if start_stop == 0:
+                self._enter(SonicatorState.STOPPING, now_ms)
+        elif self.state == SonicatorState.STOPPING:
+            if elapsed >= SONICATOR_STOP_DELAY_MS:
+                self._enter(SonicatorState.IDLE, now_ms)
+        elif self.state == SonicatorState.FAULT:
+            if not self.active_faults and reset_overload:
+                self._enter(SonicatorState.IDLE, now_ms)
+        else:
+            self._enter(SonicatorState.IDLE, now_ms)
+
+    def status_flags(self) -> int:
+        flags = 0
+        if self.state == SonicatorState.RUNNING:
+            flags |= rm.SON_STATUS_RUNNING
+        if self.inputs.overload:
+            flags |= rm.SON_STATUS_OVERLOAD
+        if self.frequency_locked():
+            flags |= rm.SON_STATUS_FREQ_LOCK
+        if self.state == SonicatorState.FAULT or self.active_faults:
+            flags |= rm.SON_STATUS_FAULT
+        return flags
+
+    def power_raw(self, amplitude_percent: int) -> int:
+        """Raw 10-bit power ADC reading (cloud does the scaling)"""
+        if self.inputs.power_raw is not None:
+            return self.inputs.power_raw
+        if self.state != SonicatorState.RUNNING:
+            return 0
+        return min(1023, amplitude_percent * 8)
@@ -8,11 +8,13 @@ import os
 import sys
 import json
 import yaml
-import glob
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from test.acceptance.feature_index import default_index
+
 class TraceabilityReportGenerator:
     def __init__(self, project_root=None):
         self.project_root = Path(project_root) if project_root else Path(__file__).parent.parent
@@ -53,52 +55,31 @@ class TraceabilityReportGenerator:
     
     def analyze_acceptance_tests(self):
         """Analyze acceptance test structure and coverage"""
-        feature_files = list(self.features_dir.glob("*.feature"))
-        
         features = []
         total_scenarios = 0
         tagged_scenarios = {"hil": 0, "smoke": 0, "pending": 0}
         
-        for feature_file in feature_files:
-            try:
-                with open(feature_file, 'r') as f:
-                    content = f.read()
-                
-                # Simple parsing for scenarios and tags
-                lines = content.split('\n')
-                feature_name = None
-                scenarios = []
-                
-                for line in lines:
-                    line = line.strip()
-                    if line.startswith('Feature:'):
-                        feature_name = line.replace('Feature:', '').strip()
-                    elif line.startswith('Scenario:'):
-                        scenario_name = line.replace('Scenario:', '').strip()
-                        scenarios.append({
-                            "name": scenario_name,
-                            "tags": []
-                        })
-                        total_scenarios += 1
-                    elif line.startswith('@'):
-                        # Extract tags
-                        tags = [tag.strip('@') for tag in line.split()]
-                        if scenarios:
-                            scenarios[-1]["tags"] = tags
-                            for tag in tags:
-                                if tag in tagged_scenarios:
-                                    tagged_scenarios[tag] += 1
-                
-                if feature_name:
-                    features.append({
-                        "name": feature_name,
-                        "file": feature_file.name,
-                        "scenarios": scenarios,
-                        "scenario_count": len(scenarios)
-                    })
+        for feature in default_index().features(self.features_dir):
+            scenarios = []
+            for scenario in feature.scenarios:
+                if scenario.keyword != 'Scenario':
+                    continue
+                scenarios.append({
+                    "name": scenario.name,
+                    "tags": list(scenario.tags)
+                })
+                total_scenarios += 1
+                for tag in scenario.tags:
+                    if tag in tagged_scenarios:
+                        tagged_scenarios[tag] += 1
             
-            except Exception as e:
-                print(f"Warning: Could not parse {feature_file}: {e}")
+            if feature.name:
+                features.append({
+                    "name": feature.name,
+                    "file": Path(feature.path).name,
+                    "scenarios": scenarios,
+                    "scenario_count": len(scenarios)
+                })
         
         self.report_data["acceptance_testing"] = {
             "framework": "Behave BDD",
@@ -10,6 +10,7 @@ Usage:
 """
 
 import argparse
+import asyncio
 import os
 import subprocess
 import sys
@@ -19,7 +20,10 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any
 
-import serial.tools.list_ports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from test.acceptance.hil_framework.async_hardware_interface import AsyncHardwareInterface
+from test.acceptance.hil_framework.port_discovery import ROLE_HARNESS, PortDiscovery
+from test.acceptance.hil_framework.telemetry_stream import TelemetryStream
 
 # ANSI color codes
 class Colors:
@@ -107,29 +111,11 @@ def run_command(cmd: list[str], cwd: Optional[str] = None, check: bool = True, e
 
 
 def find_arduino_port() -> Optional[str]:
-    """Find Arduino port automatically."""
-    candidates = []
-    for port in serial.tools.list_ports.comports():
-        desc = (port.description or "").lower()
-        dev = port.device
-        score = 0
-        
-        if "arduino" in desc or "uno" in desc:
-            score += 10
-        if "ch340" in desc or "ftdi" in desc:
-            score += 5
-        if "usbmodem" in dev or "usbserial" in dev:
-            score += 3
-        if sys.platform == "darwin" and dev.startswith("/dev/cu."):
-            score += 1
-            
-        candidates.append((score, dev, desc))
-    
-    candidates.sort(reverse=True)
-    if candidates:
-        print_info(f"Auto-detected Arduino port: {candidates[0][1]} ({candidates[0][2]})")
-        return candidates[0][1]
-    return None
+    """Find Arduino port automatically (last verified harness port first, then best USB match)."""
+    port = PortDiscovery().best_guess(ROLE_HARNESS)
+    if port:
+        print_info(f"Auto-detected Arduino port: {port}")
+    return port
 
 
 def build_atmega_firmware(env: str = "development") -> bool:
@@ -507,12 +493,23 @@ def upload_hil_wrapper(arduino_port: str) -> bool:
 
 
 class HILMonitor:
-    """Live HIL monitoring interface."""
+    """Live HIL monitoring interface.
+
+    Polling, display and command handling share one asyncio event loop and one
+    AsyncHardwareInterface, so a command typed mid-poll is simply queued behind
+    the poll's requests instead of racing it for the serial port. When the
+    wrapper supports STREAM, S4 status and power arrive as telemetry frames
+    and the display reads the newest sample instead of polling.
+    """
+
+    STREAM_SIGNALS = ("POWER_SENSE_4", "PINS")
+    STREAM_RATE_HZ = 50
 
     def __init__(self, port: str):
         self.port = port
         self.running = False
-        self.serial_conn = None
+        self.hw: Optional[AsyncHardwareInterface] = None
+        self.stream: Optional[TelemetryStream] = None
         self.status_data = {
             'timestamp': '',
             'connection': 'Unknown',
@@ -535,25 +532,17 @@ class HILMonitor:
             'active_mask': 0
         }
 
-    def connect(self) -> bool:
+    async def connect(self) -> bool:
         """Connect to HIL wrapper."""
         try:
-            import serial
-            self.serial_conn = serial.Serial(self.port, 115200, timeout=0.5)
-            time.sleep(1)  # Wait for Arduino reset
+            self.hw = await AsyncHardwareInterface(self.port).open()
 
             # Test connection with PING
-            self.serial_conn.write(b"PING\n")
-            time.sleep(0.1)
-            response = self.serial_conn.readline().decode().strip()
-
-            if response.startswith("OK"):
+            if await self.hw.ping():
                 self.status_data['connection'] = 'Connected'
 
                 # Get version info
-                self.serial_conn.write(b"INFO\n")
-                time.sleep(0.1)
-                info_response = self.serial_conn.readline().decode().strip()
+                info_response = await self.hw.send_command("INFO")
                 if info_response.startswith("OK"):
                     parts = info_response.split()
                     if len(parts) >= 3:
@@ -562,6 +551,8 @@ class HILMonitor:
                         # Confirm our configuration matches the wrapper
                         print_info("Wrapper confirmed: S4-ONLY configuration")
 
+                # Older wrappers answer ERR UNKNOWN_COMMAND; update_status then polls
+                self.stream = await self.hw.start_stream(list(self.STREAM_SIGNALS), self.STREAM_RATE_HZ)
                 return True
             else:
                 self.status_data['connection'] = 'Failed'
@@ -571,47 +562,39 @@ class HILMonitor:
             self.status_data['connection'] = f'Error: {e}'
             return False
 
-    def update_status(self):
+    async def update_status(self):
         """Update status from HIL wrapper."""
-        if not self.serial_conn:
+        if not self.hw:
             return
 
         try:
             self.status_data['timestamp'] = datetime.now().strftime("%H:%M:%S")
 
-            # Query S4 status (only implemented unit)
-            self.serial_conn.write(b"READ STATUS 4\n")
-            time.sleep(0.05)
-
-            # Try to read response without blocking
-            if self.serial_conn.in_waiting > 0:
-                response = self.serial_conn.readline().decode().strip()
-                if response.startswith("OK"):
-                    # Parse response: "OK RUN=1 OVL=0 LOCK=1"
-                    parts = response.split()
-                    for part in parts[1:]:  # Skip "OK"
-                        if part.startswith("RUN="):
-                            self.status_data['units'][4]['running'] = part.split('=')[1] == '1'
-                        elif part.startswith("OVL="):
-                            self.status_data['units'][4]['overload'] = part.split('=')[1] == '1'
-                        elif part.startswith("LOCK="):
-                            self.status_data['units'][4]['locked'] = part.split('=')[1] == '1'
-
-            # Query power for S4
-            self.serial_conn.write(b"READ POWER 4\n")
-            time.sleep(0.05)
-
-            if self.serial_conn.in_waiting > 0:
-                response = self.serial_conn.readline().decode().strip()
-                if response.startswith("OK POWER="):
-                    try:
-                        power_adc = int(response.split('=')[1])
-                        # Convert ADC to approximate power (rough estimation)
-                        # ADC 0-1023 maps to 0-2000W approximately
-                        power_watts = int((power_adc / 1023.0) * 2000)
-                        self.status_data['units'][4]['power'] = power_watts
-                    except:
-                        pass
+            if self.stream is not None and self.stream.latest("PINS") is not None:
+                # Streamed: newest pin word and power sample, no round trip
+                unit = self.status_data['units'][4]
+                unit['running'] = self.stream.pin_state("START_4")
+                unit['overload'] = self.stream.pin_state("OVERLOAD_4")
+                unit['locked'] = self.stream.pin_state("FREQ_LOCK_4")
+                response, power_adc = None, self.stream.latest("POWER_SENSE_4")[1]
+            else:
+                # Query S4 status (only implemented unit) and power in one round trip
+                response, power_adc = await asyncio.gather(self.hw.read_status(4), self.hw.read_power(4))
+            if response:
+                # Parse response: "OK RUN=1 OVL=0 LOCK=1"
+                parts = response.split()
+                for part in parts[1:]:  # Skip "OK"
+                    if part.startswith("RUN="):
+                        self.status_data['units'][4]['running'] = part.split('=')[1] == '1'
+                    elif part.startswith("OVL="):
+                        self.status_data['units'][4]['overload'] = part.split('=')[1] == '1'
+                    elif part.startswith("LOCK="):
+                        self.status_data['units'][4]['locked'] = part.split('=')[1] == '1'
+
+            if power_adc is not None:
+                # Convert ADC to approximate power (rough estimation)
+                # ADC 0-1023 maps to 0-2000W approximately
+                self.status_data['units'][4]['power'] = int((power_adc / 1023.0) * 2000)
 
             # Update system summary
             running_units = sum(1 for unit in self.status_data['units'].values() if unit['running'])
@@ -659,6 +642,8 @@ class HILMonitor:
 
         print(f"{Colors.BOLD}Connection: {conn_color}{conn_status}{Colors.END}")
         print(f"{Colors.BOLD}Wrapper Version: {Colors.END}{self.status_data['wrapper_version']}")
+        if self.status_data.get('last_message'):
+            print(f"{Colors.BOLD}Last Message: {Colors.END}{self.status_data['last_message']}")
         print()
 
         # Configuration
@@ -719,71 +704,92 @@ class HILMonitor:
         print(f"{Colors.CYAN}  quit                    - Exit monitor{Colors.END}")
         print(f"{Colors.YELLOW}Note: Only S4 is physically implemented. S1-S3 are simulated by firmware.{Colors.END}")
 
-    def handle_command(self, command: str):
+    async def handle_command(self, command: str):
         """Handle user command."""
-        if not self.serial_conn:
+        if not self.hw:
             return
 
         try:
-            self.serial_conn.write((command + "\n").encode())
-            time.sleep(0.1)
-
-            # Read response
-            response = self.serial_conn.readline().decode().strip()
+            response = await self.hw.send_command(command)
             if response:
                 # Show response briefly
                 print(f"\n{Colors.MAGENTA}Response: {response}{Colors.END}")
-                time.sleep(1)
+                await asyncio.sleep(1)
 
         except Exception as e:
             print(f"\n{Colors.RED}Command error: {e}{Colors.END}")
-            time.sleep(1)
+            await asyncio.sleep(1)
 
     def run_monitor(self):
         """Run the live monitoring interface."""
         print_step(7, "Opening HIL monitoring interface")
+        try:
+            return asyncio.run(self._run_monitor())
+        except KeyboardInterrupt:
+            print(f"\n{Colors.GREEN}HIL monitor closed.{Colors.END}")
+            return True
 
-        if not self.connect():
+    async def _run_monitor(self):
+        if not await self.connect():
             print_error("Failed to connect to HIL wrapper")
+            if self.hw:
+                await self.hw.close()
             return False
 
         print_success("Connected to HIL wrapper")
-        time.sleep(1)
+        await asyncio.sleep(1)
 
         self.running = True
 
-        # Start status update thread
-        def status_updater():
+        async def status_updater():
             while self.running:
-                self.update_status()
-                time.sleep(1)
+                await self.update_status()
+                await asyncio.sleep(1)
 
-        status_thread = threading.Thread(target=status_updater, daemon=True)
-        status_thread.start()
-
-        # Start display update thread
-        def display_updater():
+        async def display_updater():
             while self.running:
                 self.display_status()
-                time.sleep(1)
-
-        display_thread = threading.Thread(target=display_updater, daemon=True)
-        display_thread.start()
+                await asyncio.sleep(1)
+
+        async def message_reader():
+            # Lines the wrapper pushes on its own (e.g. MONITOR_ON pin changes)
+            async for line in self.hw.messages():
+                self.status_data['last_message'] = line
+
+        # input() blocks, so stdin is read on a daemon thread that feeds the loop
+        loop = asyncio.get_running_loop()
+        commands: asyncio.Queue = asyncio.Queue()
+
+        def stdin_reader():
+            while True:
+                try:
+                    line = input()
+                except EOFError:
+                    line = 'quit'
+                loop.call_soon_threadsafe(commands.put_nowait, line)
+                if line.strip().lower() in ['quit', 'exit', 'q']:
+                    return
+
+        threading.Thread(target=stdin_reader, daemon=True).start()
+        tasks = [asyncio.create_task(coro) for coro in (status_updater(), display_updater(), message_reader())]
 
         # Command input loop
         try:
             while self.running:
-                command = input().strip()
+                command = (await commands.get()).strip()
                 if command.lower() in ['quit', 'exit', 'q']:
                     break
                 elif command:
-                    self.handle_command(command)
-        except KeyboardInterrupt:
-            pass
+                    await self.handle_command(command)
         finally:
             self.running = False
-            if self.serial_conn:
-                self.serial_conn.close()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self.stream is not None:
+                await self.hw.stop_stream()
+                self.stream = None
+            await self.hw.close()
 
         print(f"\n{Colors.GREEN}HIL monitor closed.{Colors.END}")
         return True
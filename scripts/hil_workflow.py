@@ -21,7 +21,8 @@ import time
 from pathlib import Path
 from typing import Optional
 
-import serial.tools.list_ports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from test.acceptance.hil_framework.port_discovery import ROLE_HARNESS, PortDiscovery
 
 
 def run_command(cmd: list[str], cwd: Optional[str] = None, check: bool = True) -> subprocess.CompletedProcess:
@@ -39,28 +40,8 @@ def run_command(cmd: list[str], cwd: Optional[str] = None, check: bool = True) -
 
 
 def find_arduino_port() -> Optional[str]:
-    """Find Arduino port automatically."""
-    candidates = []
-    for port in serial.tools.list_ports.comports():
-        desc = (port.description or "").lower()
-        dev = port.device
-        score = 0
-        
-        if "arduino" in desc or "uno" in desc:
-            score += 10
-        if "ch340" in desc or "ftdi" in desc:
-            score += 5
-        if "usbmodem" in dev or "usbserial" in dev:
-            score += 3
-        if sys.platform == "darwin" and dev.startswith("/dev/cu."):
-            score += 1
-            
-        candidates.append((score, dev, desc))
-    
-    candidates.sort(reverse=True)
-    if candidates:
-        return candidates[0][1]
-    return None
+    """Find Arduino port automatically (last verified harness port first, then best USB match)."""
+    return PortDiscovery().best_guess(ROLE_HARNESS)
 
 
 def check_arduino_isp_loaded(port: str) -> bool:
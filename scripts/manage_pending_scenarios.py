@@ -12,6 +12,9 @@ import yaml
 from pathlib import Path
 from typing import Dict, List, Set, Tuple
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from test.acceptance.feature_index import FeatureFile, default_index, parse_feature
+
 class PendingScenariosManager:
     def __init__(self, project_root=None):
         self.project_root = Path(project_root) if project_root else Path(__file__).parent.parent
@@ -69,13 +72,10 @@ class PendingScenariosManager:
         """Scan all feature files and extract scenario information"""
         feature_files = []
         
-        for feature_file in self.features_dir.glob("*.feature"):
+        for feature_file in sorted(self.features_dir.glob("*.feature")):
             try:
-                with open(feature_file, 'r') as f:
-                    content = f.read()
-                
-                feature_info = self.parse_feature_file(content, feature_file)
-                feature_files.append((feature_file, feature_info))
+                feature = default_index().feature(feature_file)
+                feature_files.append((feature_file, self._feature_info(feature, feature_file)))
                 
             except Exception as e:
                 print(f"Warning: Could not parse {feature_file}: {e}")
@@ -84,59 +84,36 @@ class PendingScenariosManager:
     
     def parse_feature_file(self, content: str, file_path: Path) -> Dict:
         """Parse a feature file and extract scenario information"""
-        lines = content.split('\n')
-        
+        return self._feature_info(parse_feature(content, str(file_path)), file_path)
+    
+    def _feature_info(self, feature: FeatureFile, file_path: Path) -> Dict:
+        """Scenario information for one indexed feature file"""
         feature_info = {
-            "name": None,
+            "name": feature.name or None,
             "scenarios": [],
-            "tags": set(),
+            "tags": set(feature.tags),
             "file_path": file_path
         }
         
-        current_scenario = None
-        in_scenario = False
-        
-        for line_num, line in enumerate(lines, 1):
-            line = line.strip()
-            
-            if line.startswith('Feature:'):
-                feature_info["name"] = line.replace('Feature:', '').strip()
-            
-            elif line.startswith('@'):
-                # Extract tags
-                tags = [tag.strip('@') for tag in line.split()]
-                if in_scenario and current_scenario:
-                    current_scenario["tags"].update(tags)
-                else:
-                    feature_info["tags"].update(tags)
+        for scenario in feature.scenarios:
+            if scenario.keyword != 'Scenario':
+                continue
+            current_scenario = {
+                "name": scenario.name,
+                "line_number": scenario.line,
+                "tags": set(scenario.tags),
+                "steps": [step.text for step in scenario.steps],
+                "should_skip": False,
+                "skip_reason": None
+            }
             
-            elif line.startswith('Scenario:'):
-                if current_scenario:
-                    feature_info["scenarios"].append(current_scenario)
-                
-                current_scenario = {
-                    "name": line.replace('Scenario:', '').strip(),
-                    "line_number": line_num,
-                    "tags": set(),
-                    "steps": [],
-                    "should_skip": False,
-                    "skip_reason": None
-                }
-                in_scenario = True
+            # Check for auto-skip patterns
+            for step in current_scenario["steps"]:
+                pattern = next((p for p in self.config["auto_skip_patterns"] if p.lower() in step.lower()), None)
+                if pattern:
+                    current_scenario["should_skip"] = True
+                    current_scenario["skip_reason"] = f"Contains pattern: {pattern}"
             
-            elif in_scenario and current_scenario:
-                if line.startswith(('Given', 'When', 'Then', 'And', 'But')):
-                    current_scenario["steps"].append(line)
-                    
-                    # Check for auto-skip patterns
-                    for pattern in self.config["auto_skip_patterns"]:
-                        if pattern.lower() in line.lower():
-                            current_scenario["should_skip"] = True
-                            current_scenario["skip_reason"] = f"Contains pattern: {pattern}"
-                            break
-        
-        # Add the last scenario
-        if current_scenario:
             feature_info["scenarios"].append(current_scenario)
         
         return feature_info
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Parallel Behave Runner
+
+Splits test/acceptance/features across worker processes, each bound to its own
+serial endpoint: an emulated firmware PTY (scripts/emulation), one physical
+harness from a list, or a rig leased from the HIL rig pool (one shard per
+available rig; each shard leases its own rig when Behave starts). Shards are
+balanced with historical per-scenario durations read from previous JUnit
+output, so the wall time approaches that of the longest single feature. The
+per-shard JUnit files replace the previous run's files in acceptance-junit/,
+next to one log per shard.
+
+Usage:
+    python scripts/parallel_behave.py --workers 4 --emulator
+    python scripts/parallel_behave.py --harness /dev/ttyACM0 --harness /dev/ttyACM1
+    python scripts/parallel_behave.py --rig-pool
+    python scripts/parallel_behave.py --workers 4 --emulator --dry-run -- --tags=~@pending
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+FEATURES_DIR = PROJECT_ROOT / "test" / "acceptance" / "features"
+JUNIT_DIR = PROJECT_ROOT / "acceptance-junit"
+
+# Weight for features with no usable history (never run, or all skipped)
+DEFAULT_FEATURE_SECONDS = 1.0
+# Slave ids answered by emulated PTYs: common_steps uses 1, modbus_rtu uses 2
+EMULATOR_SLAVE_IDS = (1, 2)
+# Endpoint label for shards that lease their rig from hil_framework/rig_pool.py
+RIG_POOL_ENDPOINT = "rig-pool"
+# Per-shard Behave output, written next to the merged JUnit files
+SHARD_LOG_PATTERN = "parallel-shard-{index}.log"
+
+
+@dataclass
+class Shard:
+    """Features assigned to one worker"""
+    index: int
+    features: List[Path] = field(default_factory=list)
+    estimated_seconds: float = 0.0
+
+
+@dataclass
+class ShardResult:
+    shard: Shard
+    endpoint: str
+    return_code: int
+    elapsed_seconds: float
+    junit_dir: Path
+    log_path: Path
+
+
+def feature_key(name: str) -> str:
+    """Feature stem from a JUnit file name or a feature path
+
+    Behave names files TESTS-features.<stem>.xml when run from the project root.
+    """
+    base = os.path.basename(name)
+    for suffix in (".xml", ".feature"):
+        if base.endswith(suffix):
+            base = base[: -len(suffix)]
+    return base.rsplit(".", 1)[-1]
+
+
+def load_scenario_durations(junit_dir: Path) -> Dict[str, Dict[str, float]]:
+    """Historical per-scenario durations: {feature stem: {scenario name: seconds}}"""
+    history: Dict[str, Dict[str, float]] = {}
+    for path in sorted(Path(junit_dir).glob("TESTS-*.xml")):
+        try:
+            root = ET.parse(path).getroot()
+        except ET.ParseError:
+            continue
+        scenarios = history.setdefault(feature_key(path.name), {})
+        for case in root.iter("testcase"):
+            if case.find("skipped") is not None or case.get("status") == "skipped":
+                continue
+            try:
+                scenarios[case.get("name", "")] = float(case.get("time", 0.0))
+            except ValueError:
+                pass
+    return history
+
+
+def estimate_feature_seconds(features: List[Path], history: Dict[str, Dict[str, float]]) -> Dict[Path, float]:
+    """Sum scenario history per feature; unknown features get the mean of known ones"""
+    known = {f: sum(history[feature_key(f.name)].values())
+             for f in features if history.get(feature_key(f.name))}
+    known = {f: s for f, s in known.items() if s > 0}
+    fallback = (sum(known.values()) / len(known)) if known else DEFAULT_FEATURE_SECONDS
+    return {f: known.get(f, fallback) for f in features}
+
+
+def plan_shards(weights: Dict[Path, float], workers: int) -> List[Shard]:
+    """Longest-processing-time-first assignment onto the least loaded shard"""
+    shards = [Shard(index=i) for i in range(max(1, workers))]
+    for feature in sorted(weights, key=lambda f: (-weights[f], str(f))):
+        target = min(shards, key=lambda s: (s.estimated_seconds, s.index))
+        target.features.append(feature)
+        target.estimated_seconds += weights[feature]
+    return [s for s in shards if s.features]
+
+
+def merge_junit(shard_dirs: List[Path], junit_dir: Path) -> int:
+    """Replace the JUnit files in junit_dir with the shard files; returns the number merged
+
+    Files left by an earlier run are removed first, so features that did not run
+    this time (filtered out, renamed or deleted) cannot reappear in the report.
+    """
+    junit_dir.mkdir(parents=True, exist_ok=True)
+    for stale in junit_dir.glob("*.xml"):
+        stale.unlink()
+    merged = 0
+    for shard_dir in shard_dirs:
+        for path in sorted(Path(shard_dir).glob("*.xml")):
+            shutil.copy2(path, junit_dir / path.name)
+            merged += 1
+    return merged
+
+
+class ParallelBehaveRunner:
+    """Runs Behave shards concurrently, one serial endpoint per worker"""
+
+    def __init__(self, workers: int = 2, use_emulator: bool = True,
+                 harness_pool: Optional[List[str]] = None,
+                 features_dir: Path = FEATURES_DIR, junit_dir: Path = JUNIT_DIR,
+                 behave_args: Optional[List[str]] = None, rig_pool: bool = False) -> None:
+        self.harness_pool = list(harness_pool or [])
+        self.rig_pool = rig_pool and not self.harness_pool
+        self.use_emulator = use_emulator and not self.harness_pool and not self.rig_pool
+        self.workers = len(self.harness_pool) if self.harness_pool else max(1, workers)
+        self.features_dir = Path(features_dir)
+        self.junit_dir = Path(junit_dir)
+        self.behave_args = list(behave_args or [])
+        self._emulators = []
+
+    def plan(self) -> List[Shard]:
+        features = sorted(self.features_dir.glob("*.feature"))
+        weights = estimate_feature_seconds(features, load_scenario_durations(self.junit_dir))
+        return plan_shards(weights, self.workers)
+
+    def _start_endpoints(self, count: int, workdir: Path) -> List[str]:
+        if self.rig_pool:
+            return [RIG_POOL_ENDPOINT] * count
+        if not self.use_emulator:
+            return self.harness_pool[:count]
+        sys.path.insert(0, str(PROJECT_ROOT))
+        from scripts.emulation import FirmwareEmulator, PtyEmulatorServer
+        endpoints = []
+        for i in range(count):
+            server = PtyEmulatorServer(str(workdir / f"tty-msio-{i}"), FirmwareEmulator(), EMULATOR_SLAVE_IDS)
+            self._emulators.append(server.start())
+            endpoints.append(server.link_path)
+        return endpoints
+
+    def _stop_endpoints(self) -> None:
+        for server in self._emulators:
+            server.stop()
+        self._emulators = []
+
+    def _behave_command(self, shard: Shard, endpoint: str, junit_dir: Path) -> List[str]:
+        if self.rig_pool:
+            endpoint_arg = "rig_pool=true"
+        elif self.use_emulator:
+            endpoint_arg = f"emulator_port={endpoint}"
+        else:
+            endpoint_arg = f"harness_port={endpoint}"
+        return [sys.executable, "-m", "behave",
+                *[str(f.relative_to(PROJECT_ROOT)) for f in shard.features],
+                "--junit", f"--junit-directory={junit_dir}",
+                "-D", "profile=hil", "-D", endpoint_arg,
+                *self.behave_args]
+
+    def run(self) -> List[ShardResult]:
+        shards = self.plan()
+        python_path = filter(None, [str(PROJECT_ROOT), os.environ.get("PYTHONPATH")])
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(python_path))
+        results: List[ShardResult] = []
+        self.junit_dir.mkdir(parents=True, exist_ok=True)
+        for stale in self.junit_dir.glob(SHARD_LOG_PATTERN.format(index="*")):
+            stale.unlink()
+        # Emulator PTY links and per-shard JUnit output; removed once merged
+        with tempfile.TemporaryDirectory(prefix="parallel-behave-") as tmp:
+            workdir = Path(tmp)
+            try:
+                endpoints = self._start_endpoints(len(shards), workdir)
+                running = []
+                for shard, endpoint in zip(shards, endpoints):
+                    shard_junit = workdir / f"shard-{shard.index}"
+                    log_path = self.junit_dir / SHARD_LOG_PATTERN.format(index=shard.index)
+                    log = open(log_path, "w")
+                    proc = subprocess.Popen(self._behave_command(shard, endpoint, shard_junit),
+                                            cwd=PROJECT_ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+                    running.append((shard, endpoint, proc, log, time.monotonic(), shard_junit, log_path))
+                    print(f"🔄 Shard {shard.index}: {len(shard.features)} features on {endpoint} "
+                          f"(~{shard.estimated_seconds:.1f}s)")
+                for shard, endpoint, proc, log, started, shard_junit, log_path in running:
+                    return_code = proc.wait()
+                    log.close()
+                    results.append(ShardResult(shard, endpoint, return_code,
+                                               time.monotonic() - started, shard_junit, log_path))
+                merged = merge_junit([r.junit_dir for r in results], self.junit_dir)
+                print(f"📄 Merged {merged} JUnit files into {self.junit_dir}")
+            finally:
+                self._stop_endpoints()
+        for r in results:
+            icon = "✅" if r.return_code == 0 else "❌"
+            print(f"   {icon} Shard {r.shard.index}: {r.elapsed_seconds:.1f}s "
+                  f"(estimated {r.shard.estimated_seconds:.1f}s) log={r.log_path}")
+        return results
+
+
+def available_rig_count() -> int:
+    """Registered rigs that are plugged in, not quarantined and not leased right now"""
+    sys.path.insert(0, str(PROJECT_ROOT))
+    from test.acceptance.hil_framework.config_service import hil_config
+    from test.acceptance.hil_framework.rig_pool import STATE_AVAILABLE, RigScheduler
+    scheduler = RigScheduler.from_config(hil_config().as_dict(), health_check=None)
+    return sum(1 for rig in scheduler.status() if rig["state"] == STATE_AVAILABLE)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run Behave acceptance features in parallel shards")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2,
+                        help="Number of worker processes (emulator mode)")
+    parser.add_argument("--emulator", action="store_true",
+                        help="Give each worker its own emulated firmware PTY")
+    parser.add_argument("--harness", action="append", default=[],
+                        help="Physical harness port for one worker (repeatable; overrides --workers)")
+    parser.add_argument("--rig-pool", action="store_true",
+                        help="One shard per available rig in hil_config.yaml rig_pool (--workers caps it)")
+    parser.add_argument("--junit-directory", default=str(JUNIT_DIR), help="Merged JUnit output directory")
+    parser.add_argument("--dry-run", action="store_true", help="Print the shard plan and exit")
+    parser.add_argument("behave_args", nargs="*", help="Extra Behave arguments (after --)")
+    args = parser.parse_args()
+
+    if not args.emulator and not args.harness and not args.rig_pool:
+        parser.error("choose --emulator, --rig-pool or at least one --harness port")
+
+    workers = args.workers
+    if args.rig_pool:
+        available = available_rig_count()
+        if not available:
+            parser.error("no rig in the pool is available (python -m test.acceptance.hil_framework.rig_pool status)")
+        workers = min(workers, available)
+
+    runner = ParallelBehaveRunner(workers=workers, use_emulator=args.emulator,
+                                  harness_pool=args.harness, junit_dir=Path(args.junit_directory),
+                                  behave_args=args.behave_args, rig_pool=args.rig_pool)
+    if args.dry_run:
+        for shard in runner.plan():
+            names = ", ".join(f.stem for f in shard.features)
+            print(f"Shard {shard.index} (~{shard.estimated_seconds:.1f}s): {names}")
+        return 0
+
+    results = runner.run()
+    return 0 if results and all(r.return_code == 0 for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
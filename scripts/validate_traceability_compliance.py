@@ -16,6 +16,9 @@ from typing import Dict, List, Set, Tuple
 from datetime import datetime
 import subprocess
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from test.acceptance.feature_index import default_index
+
 class TraceabilityValidator:
     def __init__(self, project_root: Path):
         self.project_root = project_root
@@ -82,22 +85,20 @@ class TraceabilityValidator:
         critical_pending = []
         
         # Scan all feature files for @pending tags
-        for feature_file in self.test_path.glob("*.feature"):
-            with open(feature_file, 'r') as f:
-                content = f.read()
-                
-            # Find scenarios with @pending tag
-            pending_matches = re.findall(r'@pending.*?\n.*?Scenario.*?:(.*)', content, re.MULTILINE)
-            for scenario_name in pending_matches:
+        for feature in default_index().features(self.test_path):
+            feature_file = Path(feature.path)
+            for scenario in feature.scenarios:
+                if "pending" not in scenario.tags:
+                    continue
                 scenario_info = {
                     "file": feature_file.name,
-                    "scenario": scenario_name.strip(),
-                    "age_days": self._get_scenario_age(feature_file, scenario_name.strip())
+                    "scenario": scenario.name,
+                    "age_days": self._get_scenario_age(feature_file, scenario.name)
                 }
                 pending_scenarios.append(scenario_info)
                 
                 # Check if it's a critical scenario (has @req- or SC-xxx tags)
-                if re.search(r'@req-|SC-\d+', content):
+                if any(tag.startswith("req-") for tag in scenario.tags) or re.search(r'SC-\d+', scenario.name):
                     critical_pending.append(scenario_info)
         
         self.validation_results["test_coverage"] = {
@@ -244,18 +245,16 @@ class TraceabilityValidator:
         """Extract test scenarios with their tags"""
         scenarios = {}
         
-        for feature_file in self.test_path.glob("*.feature"):
-            with open(feature_file, 'r') as f:
-                content = f.read()
-            
-            # Extract scenarios with tags
-            scenario_blocks = re.findall(r'(@[\w\s@-]+)\s*Scenario.*?:(.*)', content, re.MULTILINE)
-            for tags, scenario_name in scenario_blocks:
-                scenario_id = f"{feature_file.stem}::{scenario_name.strip()}"
+        for feature in default_index().features(self.test_path):
+            feature_file = Path(feature.path)
+            for scenario in feature.scenarios:
+                if not scenario.tags:
+                    continue
+                scenario_id = f"{feature_file.stem}::{scenario.name}"
                 scenarios[scenario_id] = {
-                    "tags": [tag.strip() for tag in tags.split('@') if tag.strip()],
+                    "tags": list(scenario.tags),
                     "file": feature_file.name,
-                    "name": scenario_name.strip()
+                    "name": scenario.name
                 }
         
         return scenarios
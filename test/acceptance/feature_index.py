@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Feature Index - Shared, incrementally cached index of Gherkin feature files
+
+Parses each .feature file once into features, scenarios, tags, steps and line
+numbers, and keeps the result in an on-disk cache keyed by absolute path.
+Entries are validated by mtime and size, falling back to a content hash, so
+only files that actually changed are reparsed. The web UI
+TestAutomationService, requirement_mapping and the pending-scenario and
+traceability scripts all read features through this index.
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_FILE = Path(__file__).resolve().parents[2] / ".hil_cache" / "feature_index.json"
+
+STEP_KEYWORDS = ("Given", "When", "Then", "And", "But", "*")
+SCENARIO_KEYWORDS = ("Scenario Outline", "Scenario Template", "Scenario", "Example")
+
+PathLike = Union[str, Path]
+
+
+@dataclass
+class FeatureStep:
+    keyword: str
+    text: str  # full step line, keyword included
+    line: int
+
+
+@dataclass
+class FeatureScenario:
+    name: str
+    keyword: str  # "Scenario", "Scenario Outline", ...
+    line: int
+    tags: List[str] = field(default_factory=list)  # scenario's own tags, without '@'
+    steps: List[FeatureStep] = field(default_factory=list)
+
+
+@dataclass
+class FeatureFile:
+    path: str
+    name: str = ""
+    line: int = 0
+    tags: List[str] = field(default_factory=list)
+    background: List[FeatureStep] = field(default_factory=list)
+    scenarios: List[FeatureScenario] = field(default_factory=list)
+
+    def effective_tags(self, scenario: FeatureScenario) -> List[str]:
+        """Feature tags followed by the scenario's own tags (Behave's effective_tags)"""
+        return self.tags + [t for t in scenario.tags if t not in self.tags]
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "FeatureFile":
+        return cls(
+            path=data["path"],
+            name=data.get("name", ""),
+            line=data.get("line", 0),
+            tags=list(data.get("tags", [])),
+            background=[FeatureStep(**s) for s in data.get("background", [])],
+            scenarios=[
+                FeatureScenario(
+                    name=s["name"], keyword=s["keyword"], line=s["line"], tags=list(s.get("tags", [])),
+                    steps=[FeatureStep(**st) for st in s.get("steps", [])],
+                )
+                for s in data.get("scenarios", [])
+            ],
+        )
+
+
+def parse_feature(text: str, path: str = "") -> FeatureFile:
+    """Parse Gherkin text into a FeatureFile (tags and steps, not full Gherkin semantics)"""
+    feature = FeatureFile(path=path)
+    pending_tags: List[str] = []
+    current: Optional[FeatureScenario] = None
+    in_background = False
+    in_docstring = False
+
+    for number, raw in enumerate(text.splitlines(), start=1):
+        line = raw.strip()
+        if line.startswith('"""') or line.startswith("```"):
+            in_docstring = not in_docstring
+            continue
+        if in_docstring or not line or line.startswith("#") or line.startswith("|"):
+            continue
+        if line.startswith("@"):
+            # Trailing comments are allowed after tags
+            for token in line.split("#", 1)[0].split():
+                if token.startswith("@") and token[1:] not in pending_tags:
+                    pending_tags.append(token[1:])
+            continue
+        if line.startswith("Feature:"):
+            feature.name = line[len("Feature:"):].strip()
+            feature.line = number
+            feature.tags = pending_tags
+            pending_tags = []
+            continue
+        if line.startswith("Background:"):
+            in_background, current, pending_tags = True, None, []
+            continue
+        if line.startswith(("Examples:", "Scenarios:")):
+            # Tags on an Examples block belong to it, not to the next scenario
+            pending_tags = []
+            continue
+        keyword = next((k for k in SCENARIO_KEYWORDS if line.startswith(k + ":")), None)
+        if keyword:
+            current = FeatureScenario(
+                name=line[len(keyword) + 1:].strip(), keyword=keyword, line=number, tags=pending_tags,
+            )
+            feature.scenarios.append(current)
+            in_background, pending_tags = False, []
+            continue
+        first = line.split(None, 1)[0]
+        if first in STEP_KEYWORDS:
+            step = FeatureStep(keyword=first, text=line, line=number)
+            if in_background:
+                feature.background.append(step)
+            elif current is not None:
+                current.steps.append(step)
+    return feature
+
+
+class FeatureIndex:
+    """Process-wide, disk-backed cache of parsed feature files"""
+
+    def __init__(self, cache_file: Optional[PathLike] = None) -> None:
+        self.cache_file = Path(cache_file) if cache_file else DEFAULT_CACHE_FILE
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._parsed: Dict[str, FeatureFile] = {}
+        self._dirty = False
+
+    def feature(self, path: PathLike) -> FeatureFile:
+        """Parsed contents of one feature file; raises OSError if it cannot be read"""
+        with self._lock:
+            result = self._get(Path(path))
+            self._flush()
+            return result
+
+    def features(self, directory: PathLike, recursive: bool = False) -> List[FeatureFile]:
+        """All feature files in ``directory`` (sorted by path); unreadable files are skipped"""
+        root = Path(directory)
+        paths = sorted(root.rglob("*.feature") if recursive else root.glob("*.feature"))
+        results = []
+        with self._lock:
+            self._load()
+            for path in paths:
+                try:
+                    results.append(self._get(path))
+                except OSError:
+                    continue
+            self._flush()
+        return results
+
+    # --------------------------------------------------------------------- #
+
+    def _get(self, path: Path) -> FeatureFile:
+        key = str(path.resolve())
+        stat = os.stat(key)
+        entries = self._load()
+        entry = entries.get(key)
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return self._materialise(key, entry)
+
+        with open(key, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha1(data).hexdigest()
+        if entry and entry["sha1"] == digest:
+            # Touched but unchanged: refresh the stat key only
+            entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            self._dirty = True
+            return self._materialise(key, entry)
+
+        parsed = parse_feature(data.decode("utf-8", errors="replace"), key)
+        entries[key] = {
+            "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha1": digest, "feature": asdict(parsed),
+        }
+        self._parsed[key] = parsed
+        self._dirty = True
+        return parsed
+
+    def _materialise(self, key: str, entry: Dict) -> FeatureFile:
+        parsed = self._parsed.get(key)
+        if parsed is None:
+            parsed = FeatureFile.from_dict(entry["feature"])
+            self._parsed[key] = parsed
+        return parsed
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            try:
+                with open(self.cache_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                valid = isinstance(data, dict) and data.get("version") == CACHE_VERSION
+                entries = data.get("files", {}) if valid else {}
+                # Forget files that were deleted or lived in temporary directories
+                self._entries = {k: v for k, v in entries.items() if os.path.exists(k)}
+                self._dirty = len(self._entries) != len(entries)
+            except Exception:
+                self._entries = {}
+        return self._entries
+
+    def _flush(self) -> None:
+        if not self._dirty:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "files": self._entries}, f)
+            os.replace(tmp, self.cache_file)
+            self._dirty = False
+        except OSError:
+            # Read-only checkout: the in-memory index still works
+            pass
+
+
+_default_index: Optional[FeatureIndex] = None
+
+
+def default_index() -> FeatureIndex:
+    """The shared index (cache file overridable with FEATURE_INDEX_CACHE)"""
+    global _default_index
+    if _default_index is None:
+        _default_index = FeatureIndex(os.environ.get("FEATURE_INDEX_CACHE") or None)
+    return _default_index
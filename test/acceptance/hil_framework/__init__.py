@@ -6,8 +6,20 @@ multi-sonicator firmware using real ATmega32A hardware with Arduino test harness
 
 Components:
 - hil_controller: Main HIL controller for Behave integration
+- config_service: hil_config.yaml parsed once per process, frozen typed views, hot reload
 - hardware_interface: Arduino Test Wrapper interface
+- port_discovery: Cached USB-fingerprint port lookup with parallel probing
+- pin_registry: Immutable signal/pin lookup tables merged from config/pinout-cfg.yaml and connections-cfg.yaml
+- serial_transport: Pipelined reader-thread transport used by hardware_interface
+- telemetry_stream: Ring-buffered decoder for the harness STREAM telemetry frames
+- measurement_series: NumPy-backed timestamped samples, stability statistics and .npy evidence
+- async_hardware_interface: asyncio harness client with non-blocking serial reads
+- hil_daemon: Long-lived harness session shared with local clients over a Unix socket
 - programmer: Arduino as ISP programming interface  
+- intel_hex: Intel HEX parsing and page diffing for delta programming
+- stk500v1: Native STK500v1 session with the ArduinoISP sketch (avrdude fallback)
+- timing: wait_until polling/notification waits with latency measurement
+- programming_cache: SHA-256 record of flashed images to skip redundant programming
 - sandbox_cli: Interactive CLI for manual testing
 - logger: Test logging and reporting
 """
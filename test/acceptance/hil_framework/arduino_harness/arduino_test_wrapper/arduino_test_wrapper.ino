@@ -11,13 +11,32 @@
  *
  * Protocol (draft):
  *  - Commands are ASCII lines ending with \n. Responses are lines prefixed with "OK " or "ERR ".
+ *  - A command may start with a correlation tag "#<n> "; the tag is echoed in front of every
+ *    reply line for it (including each BATCH line), e.g. "#17 PING" -> "#17 OK PONG".
+ *    Untagged commands get untagged replies; banners and telemetry are never tagged.
  *  - Examples:
  *      SET FREQ <unit> <hz>         // simulate frequency output ÷10
  *      SET OVERLOAD <unit> <0|1>    // set/clear overload input
  *      SET FREQ_LOCK <unit> <0|1>   // set/clear frequency lock input
  *      READ STATUS <unit>           // read back status pins
  *      READ POWER <unit>            // read analog power proxy (if configured)
+ *      READ_PIN <pin>               // digital level of a harness pin (signal name, Dn or An):
+ *                                   // replies "OK PIN <pin> HIGH|LOW"
  *      PULSE RESET <unit> <ms>      // generate reset pulse and report timing
+ *      BATCH <cmd>;<cmd>;...        // run several commands from one line: replies
+ *                                   // "OK BATCH <n>" then one line per command
+ *      STREAM ON <sig>,<sig> <hz>   // push binary telemetry frames (see below) at <hz>;
+ *                                   // replies "OK STREAM ON <mask> <hz>"
+ *      STREAM OFF                   // stop streaming; replies "OK STREAM OFF"
+ *  - Telemetry frames are written between response lines, never inside one:
+ *      A5 5A <len> <payload> <xor of len and payload bytes>
+ *      payload = seq:u16 t_us:u32 mask:u8, then one u16 per selected signal in mask bit order
+ *      (little endian). Signals: POWER_SENSE_4, A0, A2, A3 (ADC counts), PINS (bit0 START_4,
+ *      bit1 RESET_4, bit2 OVERLOAD_4, bit3 FREQ_LOCK_4, bit4 AMPLITUDE_ALL level),
+ *      PWM (AMPLITUDE_ALL duty in 0.1 %), PWM_HZ (AMPLITUDE_ALL frequency in Hz).
+ *    PWM/PWM_HZ time the edges on D9: a pin-change interrupt on AVR boards (D9 is not an
+ *    external-interrupt pin on the Uno), attachInterrupt elsewhere. Boards with neither
+ *    answer "ERR STREAM_PWM_UNSUPPORTED" and the host polls READ PWM instead.
  *  - TODO: finalize mapping to DUT headers per include/system_config.h and harness doc.
  *
  * Safety:
@@ -69,13 +88,32 @@ static const uint8_t PIN_STATUS_LED = 12; // drives LED terminal if needed for t
 float simulated_power_voltage = 0.0;
 bool use_simulated_power = false;
 
-// PWM measurement variables
+// PWM measurement variables (edge interrupt on AMPLITUDE_ALL while streaming PWM, see pwmEdgeCaptureStart)
 volatile unsigned long pwm_high_time = 0;
 volatile unsigned long pwm_period = 0;
-volatile unsigned long pwm_last_change = 0;
+volatile unsigned long pwm_last_change = 0;  // micros() of the last rising edge
 volatile bool pwm_measuring = false;
 float last_measured_duty_cycle = 0.0;
 
+// Telemetry streaming (STREAM ON/OFF)
+enum StreamSignal { SIG_POWER_SENSE_4, SIG_A0, SIG_A2, SIG_A3, SIG_PINS, SIG_PWM, SIG_PWM_HZ, SIG_COUNT };
+static const char* STREAM_SIGNAL_NAMES[SIG_COUNT] = {
+  "POWER_SENSE_4", "A0", "A2", "A3", "PINS", "PWM", "PWM_HZ"
+};
+static const uint8_t STREAM_SYNC0 = 0xA5;
+static const uint8_t STREAM_SYNC1 = 0x5A;
+static const uint8_t STREAM_HEADER_BYTES = 7;        // seq u16, t_us u32, mask u8
+static const uint8_t STREAM_FRAME_OVERHEAD = 4;      // sync x2, len, checksum
+static const unsigned int STREAM_MAX_RATE_HZ = 1000;
+static const unsigned long STREAM_MAX_BYTES_PER_SEC = 10000UL; // 115200 baud leaves room for replies
+static const unsigned long PWM_IDLE_US = 50000UL;     // no edge for 50 ms = constant level
+
+static bool stream_on = false;
+static uint8_t stream_mask = 0;
+static uint16_t stream_seq = 0;
+static unsigned long stream_period_us = 0;
+static unsigned long stream_next_us = 0;
+
 static void setSafeDefaults() {
   // Configure S4 pins (only physically implemented unit)
   pinMode(S4_PINS.OVERLOAD_IN, OUTPUT);   digitalWrite(S4_PINS.OVERLOAD_IN, LOW);
@@ -133,9 +171,296 @@ float measurePWMDutyCycle() {
   return duty_cycle;
 }
 
+static void onAmplitudeEdge() {
+  unsigned long now = micros();
+  if (digitalRead(PIN_AMPLITUDE_ALL) == HIGH) {
+    pwm_period = now - pwm_last_change;
+    pwm_last_change = now;
+  } else {
+    pwm_high_time = now - pwm_last_change;
+  }
+  pwm_measuring = true;
+}
+
+// D9 is PB1 on the ATmega328P: PCINT1, served by the port B pin-change vector
+#if defined(__AVR__)
+static bool pwmEdgeCaptureAvailable() {
+  return digitalPinToPCICR(PIN_AMPLITUDE_ALL) != 0 && digitalPinToPCICRbit(PIN_AMPLITUDE_ALL) == 0;
+}
+
+static void pwmEdgeCaptureStart() {
+  *digitalPinToPCMSK(PIN_AMPLITUDE_ALL) |= _BV(digitalPinToPCMSKbit(PIN_AMPLITUDE_ALL));
+  PCIFR = _BV(digitalPinToPCICRbit(PIN_AMPLITUDE_ALL));  // drop an edge latched before now
+  *digitalPinToPCICR(PIN_AMPLITUDE_ALL) |= _BV(digitalPinToPCICRbit(PIN_AMPLITUDE_ALL));
+}
+
+static void pwmEdgeCaptureStop() {
+  *digitalPinToPCMSK(PIN_AMPLITUDE_ALL) &= ~_BV(digitalPinToPCMSKbit(PIN_AMPLITUDE_ALL));
+}
+
+ISR(PCINT0_vect) {
+  onAmplitudeEdge();
+}
+#else
+static bool pwmEdgeCaptureAvailable() {
+  return digitalPinToInterrupt(PIN_AMPLITUDE_ALL) != NOT_AN_INTERRUPT;
+}
+
+static void pwmEdgeCaptureStart() {
+  attachInterrupt(digitalPinToInterrupt(PIN_AMPLITUDE_ALL), onAmplitudeEdge, CHANGE);
+}
+
+static void pwmEdgeCaptureStop() {
+  detachInterrupt(digitalPinToInterrupt(PIN_AMPLITUDE_ALL));
+}
+#endif
+
+// Duty (0.1 %) or frequency (Hz) from the edge timings captured by onAmplitudeEdge
+static uint16_t streamPwmValue(bool frequency) {
+  noInterrupts();
+  unsigned long high_time = pwm_high_time;
+  unsigned long period = pwm_period;
+  unsigned long last = pwm_last_change;
+  bool measuring = pwm_measuring;
+  interrupts();
+
+  if (!measuring || period == 0 || micros() - last > PWM_IDLE_US) {
+    if (frequency) return 0;
+    return digitalRead(PIN_AMPLITUDE_ALL) == HIGH ? 1000 : 0;
+  }
+  if (frequency) {
+    unsigned long hz = 1000000UL / period;
+    return hz > 65535UL ? 65535 : (uint16_t)hz;
+  }
+  unsigned long tenths = (high_time * 1000UL) / period;
+  return tenths > 1000UL ? 1000 : (uint16_t)tenths;
+}
+
+static uint16_t streamSample(uint8_t signal) {
+  switch (signal) {
+    case SIG_POWER_SENSE_4:
+      if (use_simulated_power) return (uint16_t)((simulated_power_voltage / 5.0) * 1023.0);
+      return analogRead(S4_PINS.POWER_ADC);
+    case SIG_A0: return analogRead(A0);
+    case SIG_A2: return analogRead(A2);
+    case SIG_A3: return analogRead(A3);
+    case SIG_PINS: {
+      uint16_t bits = 0;
+      if (!digitalRead(S4_PINS.START_OUT)) bits |= 0x01;   // Active low with pullup
+      if (!digitalRead(S4_PINS.RESET_OUT)) bits |= 0x02;   // Active low with pullup
+      if (digitalRead(S4_PINS.OVERLOAD_IN)) bits |= 0x04;
+      if (digitalRead(S4_PINS.FREQ_LOCK_IN)) bits |= 0x08;
+      if (digitalRead(PIN_AMPLITUDE_ALL)) bits |= 0x10;
+      return bits;
+    }
+    case SIG_PWM: return streamPwmValue(false);
+    case SIG_PWM_HZ: return streamPwmValue(true);
+  }
+  return 0;
+}
+
+static void streamPut16(uint8_t* buf, uint8_t& n, uint16_t value) {
+  buf[n++] = value & 0xFF;
+  buf[n++] = value >> 8;
+}
+
+static void streamEmitFrame() {
+  uint8_t payload[STREAM_HEADER_BYTES + 2 * SIG_COUNT];
+  uint8_t n = 0;
+  unsigned long t_us = micros();
+  streamPut16(payload, n, stream_seq++);
+  streamPut16(payload, n, t_us & 0xFFFF);
+  streamPut16(payload, n, t_us >> 16);
+  payload[n++] = stream_mask;
+  for (uint8_t i = 0; i < SIG_COUNT; i++) {
+    if (stream_mask & (1 << i)) streamPut16(payload, n, streamSample(i));
+  }
+
+  uint8_t check = n;
+  for (uint8_t i = 0; i < n; i++) check ^= payload[i];
+  Serial.write(STREAM_SYNC0);
+  Serial.write(STREAM_SYNC1);
+  Serial.write(n);
+  Serial.write(payload, n);
+  Serial.write(check);
+}
+
+static void streamTick() {
+  unsigned long now = micros();
+  if ((long)(now - stream_next_us) < 0) return;
+  streamEmitFrame();
+  stream_next_us += stream_period_us;
+  // Fell more than a period behind (e.g. a slow command): resynchronise instead of bursting
+  if ((long)(now - stream_next_us) > (long)stream_period_us) stream_next_us = now + stream_period_us;
+}
+
+static void streamStop() {
+  if (stream_on && (stream_mask & ((1 << SIG_PWM) | (1 << SIG_PWM_HZ)))) {
+    pwmEdgeCaptureStop();
+  }
+  stream_on = false;
+  stream_mask = 0;
+}
+
+// STREAM ON <sig>,<sig>,... <hz> | STREAM OFF
+static void handleStream(String args) {
+  args.trim();
+  if (args.equalsIgnoreCase("OFF")) {
+    streamStop();
+    Serial.println("OK STREAM OFF");
+    return;
+  }
+  if (!args.startsWith("ON ")) {
+    Serial.println("ERR INVALID_FORMAT");
+    return;
+  }
+  String rest = args.substring(3);
+  rest.trim();
+  int space = rest.lastIndexOf(' ');
+  if (space < 0) {
+    Serial.println("ERR INVALID_FORMAT");
+    return;
+  }
+  String names = rest.substring(0, space);
+  long rate = rest.substring(space + 1).toInt();
+
+  uint8_t mask = 0;
+  int start = 0;
+  while (start <= (int)names.length()) {
+    int sep = names.indexOf(',', start);
+    if (sep < 0) sep = names.length();
+    String name = names.substring(start, sep);
+    name.trim();
+    if (name.length() > 0) {
+      int found = -1;
+      for (uint8_t i = 0; i < SIG_COUNT; i++) {
+        if (name.equalsIgnoreCase(STREAM_SIGNAL_NAMES[i])) found = i;
+      }
+      if (found < 0) {
+        Serial.println("ERR STREAM_SIGNAL");
+        return;
+      }
+      mask |= (1 << found);
+    }
+    start = sep + 1;
+  }
+
+  uint8_t values = 0;
+  for (uint8_t i = 0; i < SIG_COUNT; i++) {
+    if (mask & (1 << i)) values++;
+  }
+  unsigned long frame_bytes = STREAM_FRAME_OVERHEAD + STREAM_HEADER_BYTES + 2 * values;
+  if (mask == 0 || rate < 1 || rate > (long)STREAM_MAX_RATE_HZ ||
+      frame_bytes * (unsigned long)rate > STREAM_MAX_BYTES_PER_SEC) {
+    Serial.println("ERR STREAM_RATE");
+    return;
+  }
+
+  bool wants_pwm = mask & ((1 << SIG_PWM) | (1 << SIG_PWM_HZ));
+  if (wants_pwm && !pwmEdgeCaptureAvailable()) {
+    Serial.println("ERR STREAM_PWM_UNSUPPORTED");
+    return;
+  }
+
+  streamStop();
+  if (wants_pwm) {
+    pwm_measuring = false;
+    pwmEdgeCaptureStart();
+  }
+  stream_mask = mask;
+  stream_seq = 0;
+  stream_period_us = 1000000UL / (unsigned long)rate;
+  stream_next_us = micros();
+  stream_on = true;
+
+  Serial.print("OK STREAM ON ");
+  Serial.print(mask);
+  Serial.print(" ");
+  Serial.println(rate);
+}
+
+// Harness pin number for a signal name or Dn/An pin name, -1 if unknown
+static int harnessPin(String name) {
+  name.toUpperCase();
+  if (name == "OVERLOAD_4") return S4_PINS.OVERLOAD_IN;
+  if (name == "FREQ_DIV10_4") return S4_PINS.FREQ_DIV10_IN;
+  if (name == "FREQ_LOCK_4") return S4_PINS.FREQ_LOCK_IN;
+  if (name == "START_4") return S4_PINS.START_OUT;
+  if (name == "RESET_4") return S4_PINS.RESET_OUT;
+  if (name == "POWER_SENSE_4") return S4_PINS.POWER_ADC;
+  if (name == "AMPLITUDE_ALL") return PIN_AMPLITUDE_ALL;
+  if (name == "UART_RXD") return PIN_UART_RXD_TO_DUT;
+  if (name == "UART_TXD") return PIN_UART_TXD_FROM_DUT;
+  if (name == "STATUS_LED") return PIN_STATUS_LED;
+  if (name.length() < 2 || !isDigit(name[1])) return -1;
+  int number = name.substring(1).toInt();
+  if (name[0] == 'D' && number >= 0 && number <= 13) return number;
+  if (name[0] == 'A' && number >= 0 && number <= 5) return A0 + number;
+  return -1;
+}
+
+static void handleLine(String line);
+
+// Correlation tag of the command being handled ("" when untagged)
+static String reply_tag;
+
+static void printReplyTag() {
+  if (reply_tag.length() > 0) {
+    Serial.print(reply_tag);
+    Serial.print(' ');
+  }
+}
+
+// Maximum sub-commands per BATCH frame (host sends at most 16)
+static const int BATCH_MAX_COMMANDS = 16;
+
+// BATCH <cmd>;<cmd>;... - one USB turnaround for several single-line commands.
+// The header carries the count so the host knows how many lines follow.
+static void handleBatch(String body) {
+  String items[BATCH_MAX_COMMANDS];
+  int count = 0;
+  int start = 0;
+  while (start <= (int)body.length()) {
+    int sep = body.indexOf(';', start);
+    if (sep < 0) sep = body.length();
+    String item = body.substring(start, sep);
+    item.trim();
+    if (item.length() > 0) {
+      if (count >= BATCH_MAX_COMMANDS) {
+        Serial.println("ERR BATCH_TOO_LARGE");
+        return;
+      }
+      items[count++] = item;
+    }
+    start = sep + 1;
+  }
+
+  Serial.print("OK BATCH ");
+  Serial.println(count);
+  for (int i = 0; i < count; i++) {
+    if (items[i].startsWith("BATCH")) {
+      printReplyTag();
+      Serial.println("ERR NESTED_BATCH");
+    } else {
+      handleLine(items[i]);
+    }
+  }
+}
+
 static void handleLine(String line) {
   line.trim();
   if (line.length() == 0) return;
+  printReplyTag();
+
+  if (line.startsWith("BATCH ")) {
+    handleBatch(line.substring(6));
+    return;
+  }
+
+  if (line.startsWith("STREAM ")) {
+    handleStream(line.substring(7));
+    return;
+  }
 
   // Parse command
   if (line.equalsIgnoreCase("PING")) {
@@ -207,6 +532,21 @@ static void handleLine(String line) {
     return;
   }
 
+  // Digital level of one harness pin (used by batched pin snapshots)
+  if (line.startsWith("READ_PIN ")) {
+    String name = line.substring(9);
+    name.trim();
+    int pin = harnessPin(name);
+    if (pin < 0) {
+      Serial.println("ERR INVALID_PIN");
+      return;
+    }
+    Serial.print("OK PIN ");
+    Serial.print(name);
+    Serial.println(digitalRead(pin) ? " HIGH" : " LOW");
+    return;
+  }
+
   // Enhanced ADC commands for HIL testing
   if (line.startsWith("READ ADC ")) {
     String channel = line.substring(9);
@@ -289,6 +629,20 @@ static void handleLine(String line) {
   Serial.println("ERR UNKNOWN_COMMAND");
 }
 
+// Strip an optional "#<n> " tag so every reply line can echo it
+static void handleTaggedLine(String line) {
+  line.trim();
+  if (line.startsWith("#")) {
+    int space = line.indexOf(' ');
+    if (space > 1) {
+      reply_tag = line.substring(0, space);
+      line = line.substring(space + 1);
+    }
+  }
+  handleLine(line);
+  reply_tag = "";
+}
+
 void setup() {
   Serial.begin(115200);
   while (!Serial) { ; }
@@ -300,7 +654,8 @@ void loop() {
   static String buf;
   while (Serial.available() > 0) {
     char c = (char)Serial.read();
-    if (c == '\n') { handleLine(buf); buf = ""; }
+    if (c == '\n') { handleTaggedLine(buf); buf = ""; }
     else if (c != '\r') { buf += c; }
   }
+  if (stream_on) streamTick();
 }
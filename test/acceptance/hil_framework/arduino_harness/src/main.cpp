@@ -16,6 +16,7 @@ ATmegaInterface atmega;
 
 // Function declarations
 void processCommand(String command);
+void printReplyTag();
 void printHelp();
 void printStatus();
 void checkPower();
@@ -36,9 +37,15 @@ void exitSandboxMode();
 void enableMonitoring();
 void disableMonitoring();
 void handleModbusRead(String args);
+void handleModbusReadBlock(String args);
 void handleModbusWrite(String args);
 void handleModbusSetSlaveId(String args);
 void handleModbusSetBaud(String args);
+void handleBatch(String args);
+
+// Correlation tag of the command being handled ("" when untagged). The host
+// prefixes commands with "#<n> "; the tag is echoed in front of the reply.
+String reply_tag = "";
 
 // Global state
 bool sandbox_mode = false;
@@ -69,7 +76,15 @@ void loop() {
     if (Serial.available()) {
         String command = Serial.readStringUntil('\n');
         command.trim();
+        if (command.startsWith("#")) {
+            int space = command.indexOf(' ');
+            if (space > 1) {
+                reply_tag = command.substring(0, space);
+                command = command.substring(space + 1);
+            }
+        }
         processCommand(command);
+        reply_tag = "";
     }
     
     // Handle sandbox mode monitoring
@@ -89,7 +104,16 @@ void loop() {
     delay(10);
 }
 
+void printReplyTag() {
+    if (reply_tag.length() > 0) {
+        Serial.print(reply_tag);
+        Serial.print(' ');
+    }
+}
+
 void processCommand(String command) {
+    // Tags the first reply line; multi-line replies (HELP, STATUS) continue untagged
+    printReplyTag();
     command.toUpperCase();
     
     // Parse command and arguments
@@ -176,6 +200,12 @@ void processCommand(String command) {
     else if (cmd == "MODBUS_READ") {
         handleModbusRead(args);
     }
+    else if (cmd == "MODBUS_READ_BLOCK") {
+        handleModbusReadBlock(args);
+    }
+    else if (cmd == "BATCH") {
+        handleBatch(args);
+    }
     else if (cmd == "MODBUS_WRITE") {
         handleModbusWrite(args);
     }
@@ -197,6 +227,8 @@ void processCommand(String command) {
         atmega.setStartInhibit((uint8_t)unit, val != 0);
         Serial.println(F("OK"));
     }
+    // No STREAM here: telemetry streaming exists only in arduino_test_wrapper.ino. The host
+    // reads the unknown-command reply as "cannot stream" and polls READ commands instead.
     else {
         Serial.println("ERROR: Unknown command '" + cmd + "'. Type HELP for available commands.");
     }
@@ -224,8 +256,10 @@ void printHelp() {
     Serial.println("  MONITOR_OFF             - Disable pin monitoring");
     Serial.println("  STATUS_ALL              - Get all pin status");
     Serial.println("  MODBUS_READ <addr>      - Read MODBUS register");
+    Serial.println("  MODBUS_READ_BLOCK <addr> <count> - Read consecutive registers 0000..00FF (hex-packed)");
     Serial.println("  MODBUS_WRITE <addr> <val> - Write MODBUS register");
     Serial.println("  SET START_INHIBIT <unit> <0|1> - Test-control: inhibit start for unit (1..4)");
+    Serial.println("  BATCH <cmd>;<cmd>;...   - Run single-line commands in one frame");
     Serial.println("  HELP                    - Show this help");
 }
 
@@ -468,6 +502,43 @@ void handleModbusRead(String args) {
     Serial.println("MODBUS " + args + " " + String(value, HEX));
 }
 
+// FC03 allows at most 125 registers per read
+#define MODBUS_BLOCK_MAX 125
+// The harness answers from ATmegaInterface's simulated register table; it has no
+// RS-485 master, so registers outside that table cannot be read at all
+#define MODBUS_BRIDGE_REGISTERS 256
+
+void handleModbusReadBlock(String args) {
+    // Format: MODBUS_READ_BLOCK <addr> <count> (hex) -> "MODBUS_BLOCK <addr> <count> <hhhh...>"
+    int spaceIndex = args.indexOf(' ');
+    if (spaceIndex == -1) {
+        Serial.println("ERROR: MODBUS_READ_BLOCK requires address and count");
+        return;
+    }
+    String addrStr = args.substring(0, spaceIndex);
+    String countStr = args.substring(spaceIndex + 1);
+    uint16_t address = strtol(addrStr.c_str(), NULL, 16);
+    int count = strtol(countStr.c_str(), NULL, 16);
+    if (count < 1 || count > MODBUS_BLOCK_MAX) {
+        Serial.println("ERROR: MODBUS_READ_BLOCK count must be 1..7D");
+        return;
+    }
+    if ((long)address + count > MODBUS_BRIDGE_REGISTERS) {
+        // Refuse rather than pad with zeros that look like real register values
+        Serial.println("ERROR: MODBUS_READ_BLOCK address not supported (0000..00FF only)");
+        return;
+    }
+
+    // Streamed register by register to avoid building a 500-character String
+    Serial.print("MODBUS_BLOCK " + addrStr + " " + countStr + " ");
+    char word[5];
+    for (int i = 0; i < count; i++) {
+        snprintf(word, sizeof(word), "%04X", atmega.modbusRead(address + i));
+        Serial.print(word);
+    }
+    Serial.println();
+}
+
 void handleModbusWrite(String args) {
     int spaceIndex = args.indexOf(' ');
     if (spaceIndex == -1) {
@@ -499,3 +570,43 @@ void handleModbusSetBaud(String args) {
     atmega.setModbusBaudRate(baudRate);
     Serial.println("OK");
 }
+
+// Maximum sub-commands per BATCH frame (host sends at most 16)
+#define BATCH_MAX_COMMANDS 16
+
+// Commands that print more than one line would desynchronise the host's line count
+static bool isBatchable(const String& command) {
+    return !(command.startsWith("BATCH") || command.startsWith("HELP") ||
+             command.startsWith("STATUS") || command.startsWith("SANDBOX_ENTER"));
+}
+
+void handleBatch(String args) {
+    // Format: BATCH <cmd>;<cmd>;... -> "OK BATCH <n>" followed by one line per command
+    String items[BATCH_MAX_COMMANDS];
+    int count = 0;
+    int start = 0;
+    while (start <= (int)args.length()) {
+        int sep = args.indexOf(';', start);
+        if (sep < 0) sep = args.length();
+        String item = args.substring(start, sep);
+        item.trim();
+        if (item.length() > 0) {
+            if (count >= BATCH_MAX_COMMANDS) {
+                Serial.println(F("ERROR: BATCH too large"));
+                return;
+            }
+            items[count++] = item;
+        }
+        start = sep + 1;
+    }
+
+    Serial.println("OK BATCH " + String(count));
+    for (int i = 0; i < count; i++) {
+        if (isBatchable(items[i])) {
+            processCommand(items[i]);
+        } else {
+            printReplyTag();
+            Serial.println("ERROR: " + items[i] + " not allowed in BATCH");
+        }
+    }
+}
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Async Hardware Interface - asyncio client for the Arduino Test Harness
+
+Counterpart of ``HardwareInterface`` for code that already runs an event loop
+(web backend, live monitor, safety loop). Commands are awaitables; replies
+are matched to commands by their echoed ``#<n>`` tag exactly like
+``SerialTransport``, and untagged lines the harness pushes on its own
+(MONITOR_ON pin changes, boot banners) are delivered through the
+``messages()`` async iterator. Telemetry frames from ``start_stream`` are
+decoded on the loop into a TelemetryStream.
+
+Reads are non-blocking: on POSIX the serial file descriptor is registered with
+the event loop (``loop.add_reader``) and drained on readiness. Ports without a
+usable descriptor (Windows, test doubles) fall back to a single reader running
+in the default executor, so callers still never block the loop.
+
+    async with AsyncHardwareInterface("/dev/ttyUSB0") as hw:
+        if await hw.ping():
+            registers = await hw.modbus_read_block(0x0100, 16)
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+import asyncio
+import collections
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional
+
+try:
+    from .config_service import HarnessTimeouts, hil_config
+    from .hardware_interface import HardwareInterface, MODBUS_BLOCK_MAX
+    from .serial_transport import next_tag, split_records, split_tag, tag_command
+    from .telemetry_stream import STREAM_OFF, TelemetryStream
+except ImportError:
+    from config_service import HarnessTimeouts, hil_config
+    from hardware_interface import HardwareInterface, MODBUS_BLOCK_MAX
+    from serial_transport import next_tag, split_records, split_tag, tag_command
+    from telemetry_stream import STREAM_OFF, TelemetryStream
+
+
+def load_timeouts() -> Dict[str, float]:
+    """timeouts.hardware_interface from the shared HIL config, by key"""
+    try:
+        timeouts = hil_config().harness_timeouts
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Failed to load timeout configuration: {e}. Using defaults.")
+        timeouts = HarnessTimeouts()
+    return asdict(timeouts)
+
+
+@dataclass
+class _PendingReply:
+    command: str
+    future: asyncio.Future
+    sent_at: float
+    tag: int
+    is_complete: Callable[[List[str]], bool] = field(default=lambda lines: True, repr=False)
+    lines: List[str] = field(default_factory=list)
+
+
+class AsyncHardwareInterface:
+    """Non-blocking harness client; one instance per serial port and event loop"""
+
+    def __init__(self, serial_port: Optional[str] = None, baud_rate: int = 115200,
+                 serial_connection: Any = None, unsolicited_limit: int = 256) -> None:
+        """Create a client for ``serial_port`` or an already open connection
+
+        Args:
+            serial_port: Device path opened by ``open()`` when no connection is given
+            baud_rate: Harness baud rate
+            serial_connection: Open pyserial-compatible connection to use instead
+            unsolicited_limit: Unsolicited lines retained before the oldest are dropped
+        """
+        self.serial_port = serial_port
+        self.baud_rate = baud_rate
+        self.serial_connection = serial_connection
+        self.timeouts = load_timeouts()
+        self.logger = logging.getLogger(__name__)
+        self.connected = False
+
+        self.late_replies = 0  # replies to commands that had already timed out
+        self._pending: Dict[int, _PendingReply] = {}
+        self._last_tag = 0
+        self._unsolicited: Deque[str] = collections.deque(maxlen=unsolicited_limit)
+        self._unsolicited_ready: Optional[asyncio.Event] = None
+        self._buffer = bytearray()
+        self._line = bytearray()  # start of a line interrupted by a telemetry frame
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._fd: Optional[int] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._block_read_supported: Optional[bool] = None
+        self.telemetry: Optional[TelemetryStream] = None
+        self.frame_handler: Optional[Callable[[bytes], None]] = None
+
+    # ----------------------------- Lifecycle ------------------------------ #
+
+    async def open(self) -> "AsyncHardwareInterface":
+        """Open the port (if needed) and start reading"""
+        if self.connected:
+            return self
+        self._loop = asyncio.get_running_loop()
+        self._unsolicited_ready = asyncio.Event()
+        if self.serial_connection is None:
+            import serial
+            self.serial_connection = await self._loop.run_in_executor(None, lambda: serial.Serial(
+                port=self.serial_port, baudrate=self.baud_rate, timeout=0,
+                write_timeout=self.timeouts['serial_connect']))
+            # Let the Arduino finish its reset before talking to it
+            await asyncio.sleep(1.0)
+        try:
+            self.serial_connection.reset_input_buffer()
+        except Exception:
+            pass
+        self._start_reader()
+        self.connected = True
+        return self
+
+    async def close(self) -> None:
+        """Stop reading, fail outstanding commands and close the port"""
+        self.connected = False
+        if self._fd is not None:
+            self._loop.remove_reader(self._fd)
+            self._fd = None
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._reader_task = None
+        self._fail_pending()
+        try:
+            if self.serial_connection is not None and getattr(self.serial_connection, 'is_open', False):
+                self.serial_connection.close()
+        except Exception:
+            pass
+
+    async def __aenter__(self) -> "AsyncHardwareInterface":
+        return await self.open()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    # ----------------------------- Commands ------------------------------- #
+
+    async def send_command(self, command: str, timeout: Optional[float] = None,
+                           is_complete: Optional[Callable[[List[str]], bool]] = None) -> str:
+        """Send one command line and await its response; returns '' on timeout or error"""
+        if timeout is None:
+            timeout = self.timeouts['command_response']
+        try:
+            lines = await self._request(command, timeout, is_complete)
+        except Exception as e:
+            self.logger.debug(f"send_command error: {e}")
+            return ""
+        return lines[0] if lines else ""
+
+    async def ping(self) -> bool:
+        """Test basic connectivity with the harness"""
+        response = await self.send_command("PING", timeout=self.timeouts['ping'])
+        return "PONG" in response.upper()
+
+    async def read_status(self, sonicator: int) -> Optional[str]:
+        """Sonicator status line, e.g. 'OK RUN=1 OVL=0 LOCK=1'"""
+        response = await self.send_command(f"READ STATUS {sonicator}", timeout=self.timeouts['status'])
+        return response if "OK" in response else None
+
+    async def read_power(self, sonicator: int) -> Optional[float]:
+        """Power measurement for a sonicator"""
+        response = await self.send_command(f"READ POWER {sonicator}", timeout=self.timeouts['power_read'])
+        if "POWER=" not in response:
+            return None
+        try:
+            return float(response.split("POWER=")[1].split()[0])
+        except (IndexError, ValueError):
+            return None
+
+    async def read_adc(self, channel: str) -> Optional[int]:
+        response = await self.send_command(f"READ ADC {channel}", timeout=self.timeouts['adc_read'])
+        if "ADC=" not in response:
+            return None
+        try:
+            return int(response.split("ADC=")[1].split()[0])
+        except (IndexError, ValueError):
+            return None
+
+    async def modbus_read_block(self, start: int, count: int) -> List[Optional[int]]:
+        """Read ``count`` consecutive registers from ``start`` (FC03)
+
+        Harness builds without MODBUS_READ_BLOCK are detected on the first call;
+        after that registers are read with single-register reads, one at a time so the
+        Arduino's 64-byte RX buffer is never handed a burst of commands. A block the
+        harness refuses as unsupported reads as None.
+        """
+        if not 1 <= count <= MODBUS_BLOCK_MAX:
+            raise ValueError(f"Block read count must be 1..{MODBUS_BLOCK_MAX}, got {count}")
+        if self._block_read_supported is not False:
+            response = await self.send_command(f"MODBUS_READ_BLOCK {int(start) & 0xFFFF:04X} {int(count):02X}")
+            values = HardwareInterface._parse_modbus_block(response, start, count)
+            if values is not None:
+                self._block_read_supported = True
+                return values
+            if HardwareInterface._block_address_unsupported(response):
+                self._block_read_supported = True
+                return [None] * count
+            if self._block_read_supported is None and "UNKNOWN" in response.upper():
+                self.logger.info("Harness has no MODBUS_READ_BLOCK; using single-register reads")
+                self._block_read_supported = False
+        responses = [await self.send_command(f"MODBUS_READ {(start + i) & 0xFFFF:04X}") for i in range(count)]
+        return [HardwareInterface._parse_modbus_read(r) for r in responses]
+
+    async def start_stream(self, signals: List[str], rate_hz: int = 200,
+                           capacity: int = 4096) -> Optional[TelemetryStream]:
+        """Start harness telemetry streaming; None if the harness rejects or lacks STREAM"""
+        stream = TelemetryStream(signals, rate_hz=rate_hz, capacity=capacity)
+        if self.telemetry is not None:
+            await self.stop_stream()
+        self.frame_handler = stream.feed
+        response = await self.send_command(stream.command)
+        if not stream.accepts(response):
+            self.frame_handler = None
+            self.logger.info(f"Harness did not start telemetry stream ({response or 'no response'})")
+            return None
+        self.telemetry = stream
+        return stream
+
+    async def stop_stream(self) -> None:
+        """Stop the telemetry stream started by start_stream"""
+        self.telemetry = None
+        await self.send_command(STREAM_OFF)
+        self.frame_handler = None
+
+    async def messages(self) -> AsyncIterator[str]:
+        """Yield unsolicited harness lines as they arrive until the interface closes"""
+        while True:
+            while self._unsolicited:
+                yield self._unsolicited.popleft()
+            if not self.connected:
+                return
+            self._unsolicited_ready.clear()
+            await self._unsolicited_ready.wait()
+
+    def drain_messages(self) -> List[str]:
+        """Return and clear unsolicited lines received so far"""
+        lines = list(self._unsolicited)
+        self._unsolicited.clear()
+        return lines
+
+    # ----------------------------- Internals ------------------------------ #
+
+    async def _request(self, command: str, timeout: float,
+                       is_complete: Optional[Callable[[List[str]], bool]]) -> Optional[List[str]]:
+        if not self.connected:
+            raise RuntimeError("Harness connection is not open")
+        self._last_tag = next_tag(self._last_tag, self._pending)
+        pending = _PendingReply(command=command.strip(), future=self._loop.create_future(),
+                                sent_at=time.monotonic(), tag=self._last_tag)
+        if is_complete is not None:
+            pending.is_complete = is_complete
+        # Registered before writing so a fast reply can never overtake its command
+        self._pending[pending.tag] = pending
+        try:
+            self.serial_connection.write((tag_command(pending.tag, pending.command) + "\n")
+                                         .encode("ascii", errors="ignore"))
+            return await asyncio.wait_for(asyncio.shield(pending.future), timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            # A late reply carries a tag nobody waits for and is discarded
+            self._pending.pop(pending.tag, None)
+
+    def _start_reader(self) -> None:
+        try:
+            fd = self.serial_connection.fileno()
+            self._loop.add_reader(fd, self._on_readable)
+            self._fd = fd
+        except (AttributeError, NotImplementedError, OSError, ValueError):
+            self._reader_task = self._loop.create_task(self._executor_reader())
+
+    def _on_readable(self) -> None:
+        try:
+            # Port opened with timeout=0: returns whatever is buffered right now
+            chunk = self.serial_connection.read(4096)
+        except Exception as e:
+            self.logger.debug(f"Serial reader stopped: {e}")
+            self._loop.remove_reader(self._fd)
+            self._fd = None
+            self.connected = False
+            self._fail_pending()
+            return
+        self._feed(chunk)
+
+    async def _executor_reader(self) -> None:
+        try:
+            self.serial_connection.timeout = 0.05
+        except Exception:
+            pass
+        while self.connected:
+            try:
+                chunk = await self._loop.run_in_executor(None, self._blocking_read)
+            except Exception as e:
+                self.logger.debug(f"Serial reader stopped: {e}")
+                self.connected = False
+                self._fail_pending()
+                return
+            self._feed(chunk)
+
+    def _blocking_read(self) -> bytes:
+        chunk = self.serial_connection.read(1)
+        if chunk:
+            waiting = getattr(self.serial_connection, 'in_waiting', 0)
+            if waiting:
+                chunk += self.serial_connection.read(waiting)
+        return chunk
+
+    def _feed(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+        self._buffer.extend(chunk)
+        for is_frame, body in split_records(self._buffer, self._line):
+            if is_frame:
+                if body is not None and self.frame_handler is not None:
+                    self.frame_handler(body)
+                continue
+            line = body.decode("ascii", errors="ignore").strip()
+            if line:
+                self._dispatch_line(line)
+
+    def _dispatch_line(self, line: str) -> None:
+        tag, body = split_tag(line)
+        if tag is None:
+            self._unsolicited.append(line)
+            self._unsolicited_ready.set()
+            return
+        pending = self._pending.get(tag)
+        if pending is None:
+            self.late_replies += 1
+            self.logger.debug(f"Discarding reply to timed-out command #{tag}: {body}")
+            return
+        pending.lines.append(body)
+        if pending.is_complete(pending.lines):
+            del self._pending[tag]
+            if not pending.future.done():
+                pending.future.set_result(pending.lines)
+
+    def _fail_pending(self) -> None:
+        pending, self._pending = list(self._pending.values()), {}
+        for reply in pending:
+            if not reply.future.done():
+                reply.future.set_result(None)
+        if self._unsolicited_ready is not None:
+            self._unsolicited_ready.set()
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+HIL Config Service - hil_config.yaml parsed and validated once per process
+
+Every framework object used to open and YAML-parse hil_config.yaml in its
+constructor. The service loads it once. It validates the sections the
+framework reads and publishes an immutable HILConfig snapshot: the raw tree
+as read-only mappings, plus typed frozen views of the timeout and testing
+sections. The modular hardware description in config/*.yaml
+(ModularConfigLoader, scripts/config-loader.py) is attached to the same
+snapshot and only loaded, from its compiled bundle, when first asked for.
+
+    from .config_service import hil_config
+    timeouts = hil_config().harness_timeouts   # HarnessTimeouts(serial_connect=2.0, ...)
+
+Long-lived processes can call ``get_config_service().watch()`` to reload
+when a watched file's mtime changes; subscribers get the new snapshot.
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+import contextlib
+import copy
+import functools
+import importlib.util
+import io
+import logging
+import threading
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+import yaml
+
+DEFAULT_CONFIG_FILE = Path(__file__).resolve().parent / 'hil_config.yaml'
+REPO_ROOT = Path(__file__).resolve().parents[3]
+MODULAR_CONFIG_DIR = REPO_ROOT / 'config'
+MODULAR_CONFIG_LOADER = REPO_ROOT / 'scripts' / 'config-loader.py'
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigError(ValueError):
+    """hil_config.yaml is unreadable or a section has the wrong shape"""
+
+
+def freeze(value: Any) -> Any:
+    """Deep read-only copy: dicts become MappingProxyType, lists become tuples"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Deep mutable copy of a frozen tree"""
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return copy.copy(value)
+
+
+class _View:
+    """Frozen dataclass built from one config section, falling back to field defaults"""
+
+    @classmethod
+    def from_mapping(cls, section: Mapping[str, Any], where: str):
+        values = {}
+        for f in fields(cls):
+            raw = section.get(f.name, f.default)
+            try:
+                value = type(f.default)(raw)
+            except (TypeError, ValueError):
+                raise ConfigError(f"{where}.{f.name} must be a number, got {raw!r}") from None
+            if value < 0:
+                raise ConfigError(f"{where}.{f.name} must not be negative, got {raw!r}")
+            values[f.name] = value
+        return cls(**values)
+
+
+@dataclass(frozen=True)
+class HarnessTimeouts(_View):
+    """timeouts.hardware_interface (seconds)"""
+    serial_connect: float = 2.0
+    serial_write: float = 2.0
+    command_response: float = 1.0
+    ping: float = 1.0
+    info: float = 1.0
+    status: float = 1.0
+    power_read: float = 1.0
+    overload_set: float = 1.0
+    frequency_lock: float = 1.0
+    adc_read: float = 1.0
+    pwm_read: float = 1.0
+    send_command_min: float = 0.05
+
+
+@dataclass(frozen=True)
+class ProgrammerTimeouts(_View):
+    """timeouts.programmer (seconds)"""
+    avrdude_check: int = 10
+    connection_test: int = 30
+    firmware_programming: int = 120
+    fuse_read: int = 30
+    firmware_verification: int = 60
+    chip_erase: int = 30
+    pid_detection: int = 5
+    arduino_check: int = 10
+    platformio_upload: int = 300
+
+
+@dataclass(frozen=True)
+class SafetyTimeouts(_View):
+    """timeouts.safety_system (seconds)"""
+    emergency_stop: float = 0.1
+    communication_timeout: float = 5.0
+    monitoring_interval: float = 0.1
+    safe_state_timeout: float = 30.0
+
+
+@dataclass(frozen=True)
+class TestingSettings(_View):
+    """testing section values shared by the runners, validators and signal generators"""
+    voltage_tolerance: float = 0.2
+    timing_tolerance: float = 0.1
+    adc_reference_voltage: float = 5.0
+    max_frequency_hz: int = 50000
+    min_frequency_hz: int = 1
+    pwm_resolution: int = 8
+    analog_resolution: int = 10
+    max_voltage: float = 5.0
+    update_interval_ms: int = 10
+
+
+@dataclass(frozen=True)
+class HILConfig:
+    """Immutable snapshot of hil_config.yaml with typed views of the sections the framework reads"""
+    path: Path
+    data: Mapping[str, Any]
+    harness_timeouts: HarnessTimeouts
+    programmer_timeouts: ProgrammerTimeouts
+    safety_timeouts: SafetyTimeouts
+    testing: TestingSettings
+    generation: int = 0
+    config_dir: Path = field(default=MODULAR_CONFIG_DIR, compare=False)
+
+    @classmethod
+    def from_dict(cls, raw: Optional[Mapping[str, Any]], path: Path = DEFAULT_CONFIG_FILE,
+                  generation: int = 0, config_dir: Path = MODULAR_CONFIG_DIR) -> "HILConfig":
+        raw = raw or {}
+        if not isinstance(raw, Mapping):
+            raise ConfigError(f"{path}: top level must be a mapping, got {type(raw).__name__}")
+        for name, value in raw.items():
+            if name in ('timeouts', 'testing', 'hardware', 'timing', 'programming', 'rig_pool') and \
+                    value is not None and not isinstance(value, Mapping):
+                raise ConfigError(f"{path}: section '{name}' must be a mapping")
+        timeouts = raw.get('timeouts') or {}
+        return cls(
+            path=path,
+            data=freeze(raw),
+            harness_timeouts=HarnessTimeouts.from_mapping(timeouts.get('hardware_interface') or {},
+                                                          'timeouts.hardware_interface'),
+            programmer_timeouts=ProgrammerTimeouts.from_mapping(timeouts.get('programmer') or {},
+                                                                'timeouts.programmer'),
+            safety_timeouts=SafetyTimeouts.from_mapping(timeouts.get('safety_system') or {},
+                                                        'timeouts.safety_system'),
+            testing=TestingSettings.from_mapping(raw.get('testing') or {}, 'testing'),
+            generation=generation,
+            config_dir=config_dir,
+        )
+
+    def section(self, name: str) -> Mapping[str, Any]:
+        """A top-level hil_config.yaml section, else a config/*.yaml module of that name"""
+        value = self.data.get(name)
+        if value is None:
+            value = self.modules.get(name)
+        return value if value is not None else MappingProxyType({})
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.data.get(name, default)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Mutable deep copy for callers that adjust settings at runtime"""
+        return thaw(self.data)
+
+    @functools.cached_property
+    def modules(self) -> Mapping[str, Mapping[str, Any]]:
+        """config/*.yaml modules (pinout, connections, communication, sonicators), parsed on first use"""
+        return freeze(_load_modules(self.config_dir))
+
+
+def _load_modules(config_dir: Path) -> Dict[str, Any]:
+    if not MODULAR_CONFIG_LOADER.exists() or not (config_dir / 'sonic-multiplexer.yaml').exists():
+        return {}
+    spec = importlib.util.spec_from_file_location('hil_modular_config_loader', MODULAR_CONFIG_LOADER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    loader = module.ModularConfigLoader(str(config_dir))
+    # The loader narrates every file it reads; keep that out of test output
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Content-hashed bundle in .hil_cache/, recompiled only when a source file changes
+        loaded = loader.load_compiled()
+    for error in loader.validation_errors:
+        (logger.debug if loaded else logger.warning)(f"Modular configuration: {error}")
+    return {name: entry.data for name, entry in loader.modules.items() if entry.loaded and entry.data}
+
+
+class ConfigService:
+    """Owns the current HILConfig for one hil_config.yaml; reloads on demand or on file change"""
+
+    def __init__(self, path: Path = DEFAULT_CONFIG_FILE, config_dir: Path = MODULAR_CONFIG_DIR) -> None:
+        self.path = Path(path)
+        self.config_dir = Path(config_dir)
+        self._lock = threading.RLock()
+        self._config: Optional[HILConfig] = None
+        self._stamps: Dict[Path, Optional[int]] = {}
+        self._subscribers: List[Callable[[HILConfig], None]] = []
+        self._watch_stop: Optional[threading.Event] = None
+
+    def get(self) -> HILConfig:
+        config = self._config
+        if config is None:
+            with self._lock:
+                if self._config is None:
+                    self._config = self._read(generation=0)
+                config = self._config
+        return config
+
+    def reload(self) -> HILConfig:
+        """Re-read now and notify subscribers; the previous snapshot stays valid for its holders"""
+        with self._lock:
+            generation = self._config.generation + 1 if self._config else 0
+            self._config = self._read(generation)
+            config = self._config
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(config)
+            except Exception as e:
+                logger.warning(f"Config subscriber {callback!r} failed: {e}")
+        return config
+
+    def subscribe(self, callback: Callable[[HILConfig], None]) -> Callable[[], None]:
+        """Call ``callback(config)`` after every reload; returns an unsubscribe function"""
+        with self._lock:
+            self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback) if callback in self._subscribers else None
+
+    def changed(self) -> bool:
+        """True when hil_config.yaml or a config/*.yaml file changed since the last read"""
+        return self._snapshot_stamps() != self._stamps
+
+    def watch(self, interval: float = 1.0) -> None:
+        """Poll file mtimes on a daemon thread and reload when they change"""
+        with self._lock:
+            if self._watch_stop is not None:
+                return
+            self.get()
+            self._watch_stop = stop = threading.Event()
+
+        def loop() -> None:
+            while not stop.wait(interval):
+                if self.changed():
+                    try:
+                        config = self.reload()
+                        logger.info(f"Reloaded {self.path} (generation {config.generation})")
+                    except ConfigError as e:
+                        # Keep serving the last good snapshot until the file is fixed
+                        logger.error(f"Ignoring invalid configuration change: {e}")
+                        self._stamps = self._snapshot_stamps()
+
+        threading.Thread(target=loop, name="hil-config-watch", daemon=True).start()
+
+    def stop_watching(self) -> None:
+        with self._lock:
+            if self._watch_stop is not None:
+                self._watch_stop.set()
+                self._watch_stop = None
+
+    def _read(self, generation: int) -> HILConfig:
+        stamps = self._snapshot_stamps()
+        raw: Any = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    raw = yaml.safe_load(f) or {}
+            except (OSError, yaml.YAMLError) as e:
+                raise ConfigError(f"Failed to read {self.path}: {e}") from e
+        config = HILConfig.from_dict(raw, self.path, generation, self.config_dir)
+        self._stamps = stamps
+        return config
+
+    def _snapshot_stamps(self) -> Dict[Path, Optional[int]]:
+        stamps = {}
+        for path in [self.path, *sorted(self.config_dir.glob('*.yaml'))]:
+            try:
+                stamps[path] = path.stat().st_mtime_ns
+            except OSError:
+                stamps[path] = None
+        return stamps
+
+
+_services: Dict[Path, ConfigService] = {}
+_services_lock = threading.Lock()
+
+
+def resolve_config_path(config_file: Optional[str] = None) -> Path:
+    """hil_config.yaml by default; relative names resolve against this package like HILController did"""
+    if not config_file:
+        return DEFAULT_CONFIG_FILE
+    return (Path(__file__).parent / config_file).resolve()
+
+
+def get_config_service(config_file: Optional[str] = None) -> ConfigService:
+    """The process-wide service for ``config_file`` (default hil_config.yaml)"""
+    path = resolve_config_path(config_file)
+    with _services_lock:
+        service = _services.get(path)
+        if service is None:
+            service = _services[path] = ConfigService(path)
+        return service
+
+
+def hil_config(config_file: Optional[str] = None) -> HILConfig:
+    """Current configuration snapshot, parsed on first call"""
+    return get_config_service(config_file).get()
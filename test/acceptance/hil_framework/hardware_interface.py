@@ -6,12 +6,23 @@ from dataclasses import dataclass
 import logging
 from typing import Optional, Dict, Any, List, Union
 
-import glob
-
 import serial
 import serial.tools.list_ports
 import time
-import platform
+
+try:
+    from .config_service import HarnessTimeouts, HILConfig, hil_config
+    from .pin_registry import PinRegistry, pin_registry
+    from .port_discovery import ROLE_HARNESS, PortDiscovery, open_harness
+    from .serial_transport import PendingCommand, SerialTransport
+    from .telemetry_stream import STREAM_OFF, TelemetryStream
+except ImportError:
+    # Direct execution (e.g. sandbox_cli.py run from this directory)
+    from config_service import HarnessTimeouts, HILConfig, hil_config
+    from pin_registry import PinRegistry, pin_registry
+    from port_discovery import ROLE_HARNESS, PortDiscovery, open_harness
+    from serial_transport import PendingCommand, SerialTransport
+    from telemetry_stream import STREAM_OFF, TelemetryStream
 
 @dataclass
 class WRAPPER_PINS:
@@ -26,7 +37,50 @@ class WRAPPER_PINS:
         RESET_4: str = "A4"
         POWER_SENSE_4: str = "A1"
         AMPLITUDE_ALL: str = "D9"
-    
+
+
+DEFAULT_PIN_MAPPING: Dict[str, str] = {
+    'FREQ_DIV10_4': WRAPPER_PINS.SONICATOR_4.FREQ_DIV10_4,
+    'FREQ_LOCK_4': WRAPPER_PINS.SONICATOR_4.FREQ_LOCK_4,
+    'OVERLOAD_4': WRAPPER_PINS.SONICATOR_4.OVERLOAD_4,
+    'START_4': WRAPPER_PINS.SONICATOR_4.START_4,
+    'RESET_4': WRAPPER_PINS.SONICATOR_4.RESET_4,
+    'POWER_SENSE_4': WRAPPER_PINS.SONICATOR_4.POWER_SENSE_4,
+    'AMPLITUDE_ALL': WRAPPER_PINS.SONICATOR_4.AMPLITUDE_ALL,  # PWM
+    'UART_RXD': WRAPPER_PINS.UART_RXD,        # MODBUS RTU RX
+    'UART_TXD': WRAPPER_PINS.UART_TXD,        # MODBUS RTU TX
+    'STATUS_LED': WRAPPER_PINS.STATUS_LED       # Status LED
+}
+
+
+# BATCH frames: "BATCH <cmd>;<cmd>;..." answered by "OK BATCH <n>" then n response lines
+BATCH_SEPARATOR = ";"
+BATCH_MAX_COMMANDS = 16  # keeps each frame well inside the harness line buffer
+MODBUS_BLOCK_MAX = 125  # FC03 limit on registers per read
+# Status/control registers. The sonicator blocks (0x0100-0x0174) are left out: the
+# harness bridge only serves 0x0000-0x00FF and refuses block reads beyond it
+MODBUS_SNAPSHOT_BLOCKS = ((0x0000, 0x20),)
+
+
+@dataclass
+class BatchResult:
+    """Responses for a send_batch call, in command order ('' for a missing response)"""
+    responses: List[str]
+    latency_ms: float
+    frames: int
+    batched: bool  # False when the harness lacks BATCH and commands were sent one at a time
+
+
+def _batch_frame_complete(lines: List[str]) -> bool:
+    """Completion predicate for a BATCH frame response."""
+    header = lines[0].split()
+    if len(header) < 3 or header[0] != "OK" or header[1] != "BATCH":
+        # Harness without BATCH support answers with a single error line
+        return True
+    try:
+        return len(lines) >= 1 + int(header[2])
+    except ValueError:
+        return True
 
 
 class HardwareInterface:
@@ -36,91 +90,53 @@ class HardwareInterface:
         self.logger: logging.Logger = logging.getLogger(__name__)
         self.connected: bool = False
         self.serial_port: Optional[str] = serial_port
-        # Pin mapping verified against docs/planning/pin-matrix.md (SOLE SOURCE OF TRUTH)
-        self.pin_mapping: Dict[str, str] = {
-            'FREQ_DIV10_4': WRAPPER_PINS.SONICATOR_4.FREQ_DIV10_4,
-            'FREQ_LOCK_4': WRAPPER_PINS.SONICATOR_4.FREQ_LOCK_4,
-            'OVERLOAD_4': WRAPPER_PINS.SONICATOR_4.OVERLOAD_4,
-            'START_4': WRAPPER_PINS.SONICATOR_4.START_4,
-            'RESET_4': WRAPPER_PINS.SONICATOR_4.RESET_4,
-            'POWER_SENSE_4': WRAPPER_PINS.SONICATOR_4.POWER_SENSE_4,
-            'AMPLITUDE_ALL': WRAPPER_PINS.SONICATOR_4.AMPLITUDE_ALL,  # PWM
-            'UART_RXD': WRAPPER_PINS.UART_RXD,        # MODBUS RTU RX
-            'UART_TXD': WRAPPER_PINS.UART_TXD,        # MODBUS RTU TX
-            'STATUS_LED': WRAPPER_PINS.STATUS_LED       # Status LED
-        }
+        self._transport: Optional[SerialTransport] = None
+        self._batch_supported: Optional[bool] = None  # learned on first send_batch
+        self._block_read_supported: Optional[bool] = None  # learned on first modbus_read_block
+        self.telemetry: Optional[TelemetryStream] = None  # active STREAM ON session
+        self.port_discovery: PortDiscovery = PortDiscovery()
+        # Signal -> harness pin from config/connections-cfg.yaml via the shared pin registry;
+        # WRAPPER_PINS (verified against docs/planning/pin-matrix.md) is the fallback
+        self.pin_registry: Optional[PinRegistry] = None
+        self.pin_mapping: Dict[str, str] = dict(DEFAULT_PIN_MAPPING)
+        try:
+            self.pin_registry = pin_registry()
+            self.pin_mapping.update(self.pin_registry.harness_pins)
+        except Exception as e:
+            self.logger.warning(f"Pin registry unavailable, using built-in pin mapping: {e}")
         
         # Load timeout configuration
         self._load_timeout_config()
     
-    def _load_timeout_config(self) -> None:
-        """Load timeout configuration from HIL config file"""
+    def _load_timeout_config(self, config: Optional[HILConfig] = None) -> None:
+        """Apply timeouts.hardware_interface from the shared HIL config (defaults if unavailable)"""
         try:
-            import yaml
-            from pathlib import Path
-            config_path = Path(__file__).parent / 'hil_config.yaml'
-            if config_path.exists():
-                with open(config_path, 'r') as f:
-                    config = yaml.safe_load(f)
-                    timeouts = config.get('timeouts', {}).get('hardware_interface', {})
-                    self.serial_connect_timeout: float = timeouts.get('serial_connect', 2.0)
-                    self.serial_write_timeout: float = timeouts.get('serial_write', 2.0)
-                    self.command_response_timeout: float = timeouts.get('command_response', 1.0)
-                    self.ping_timeout: float = timeouts.get('ping', 1.0)
-                    self.info_timeout: float = timeouts.get('info', 1.0)
-                    self.status_timeout: float = timeouts.get('status', 1.0)
-                    self.power_read_timeout: float = timeouts.get('power_read', 1.0)
-                    self.overload_set_timeout: float = timeouts.get('overload_set', 1.0)
-                    self.frequency_lock_timeout: float = timeouts.get('frequency_lock', 1.0)
-                    self.adc_read_timeout: float = timeouts.get('adc_read', 1.0)
-                    self.pwm_read_timeout: float = timeouts.get('pwm_read', 1.0)
-                    self.send_command_min_timeout: float = timeouts.get('send_command_min', 0.05)
-            else:
-                # Default values if config file not found
-                self.serial_connect_timeout: float = 2.0
-                self.serial_write_timeout: float = 2.0
-                self.command_response_timeout: float = 1.0
-                self.ping_timeout: float = 1.0
-                self.info_timeout: float = 1.0
-                self.status_timeout: float = 1.0
-                self.power_read_timeout: float = 1.0
-                self.overload_set_timeout: float = 1.0
-                self.frequency_lock_timeout: float = 1.0
-                self.adc_read_timeout: float = 1.0
-                self.pwm_read_timeout: float = 1.0
-                self.send_command_min_timeout: float = 0.05
+            timeouts = (config or hil_config()).harness_timeouts
         except Exception as e:
             self.logger.warning(f"Failed to load timeout configuration: {e}. Using defaults.")
-            # Default values if config loading fails
-            self.serial_connect_timeout: float = 2.0
-            self.serial_write_timeout: float = 2.0
-            self.command_response_timeout: float = 1.0
-            self.ping_timeout: float = 1.0
-            self.info_timeout: float = 1.0
-            self.status_timeout: float = 1.0
-            self.power_read_timeout: float = 1.0
-            self.overload_set_timeout: float = 1.0
-            self.frequency_lock_timeout: float = 1.0
-            self.adc_read_timeout: float = 1.0
-            self.pwm_read_timeout: float = 1.0
-            self.send_command_min_timeout: float = 0.05
-
-    def _find_macos_usb_serial_ports(self) -> List[str]:
-        patterns = [
-            "/dev/tty.usbserial-*",
-            "/dev/tty.usbmodem*",
-            "/dev/tty.wchusbserial*",
-            "/dev/cu.usbserial-*",
-            "/dev/cu.usbmodem*",
-            "/dev/cu.wchusbserial*",
-        ]
-        ports = []
-        for pattern in patterns:
-            ports.extend(glob.glob(pattern))
-        return sorted(ports)
-    
-    def verify_connection(self) -> bool:
-
+            timeouts = HarnessTimeouts()
+        self.serial_connect_timeout: float = timeouts.serial_connect
+        self.serial_write_timeout: float = timeouts.serial_write
+        self.command_response_timeout: float = timeouts.command_response
+        self.ping_timeout: float = timeouts.ping
+        self.info_timeout: float = timeouts.info
+        self.status_timeout: float = timeouts.status
+        self.power_read_timeout: float = timeouts.power_read
+        self.overload_set_timeout: float = timeouts.overload_set
+        self.frequency_lock_timeout: float = timeouts.frequency_lock
+        self.adc_read_timeout: float = timeouts.adc_read
+        self.pwm_read_timeout: float = timeouts.pwm_read
+        self.send_command_min_timeout: float = timeouts.send_command_min
+
+    def verify_connection(self, scan: bool = True) -> bool:
+        """Connect to the harness on ``serial_port``, then (if ``scan``) on any other port
+
+        The port that answered last time is remembered by USB fingerprint
+        (port_discovery) and validated first; other candidates are only probed,
+        in parallel, when it is gone. Pass ``scan=False`` when the port is owned
+        by a leased rig so a failing rig never falls through to another bench's
+        harness.
+        """
         if self.serial_connection and getattr(self.serial_connection, 'is_open', False):
             try:
                 self.send_command("PING")
@@ -128,110 +144,25 @@ class HardwareInterface:
                 return True
             except Exception:
                 self.connected = False
-        ports_to_try = []
-        if self.serial_port:
-            ports_to_try.append(self.serial_port)
-        if platform.system() == "Darwin" and self.serial_port and "*" in self.serial_port:
-            macos_ports = self._find_macos_usb_serial_ports()
-            cu_first = sorted([p for p in macos_ports if "/dev/cu." in p]) + sorted([p for p in macos_ports if "/dev/tty." in p])
-            ports_to_try.extend(cu_first)
-        try:
-            all_ports = serial.tools.list_ports.comports()
-            for port in all_ports:
-                if port.device not in ports_to_try:
-                    ports_to_try.append(port.device)
-        except Exception:
-            pass
-        if platform.system() == "Darwin" and self.serial_port and "*" not in self.serial_port:
-            if self.serial_port.startswith("/dev/tty."):
-                twin = self.serial_port.replace("/dev/tty.", "/dev/cu.")
-                if twin not in ports_to_try:
-                    ports_to_try.append(twin)
-            elif self.serial_port.startswith("/dev/cu."):
-                twin = self.serial_port.replace("/dev/cu.", "/dev/tty.")
-                if twin not in ports_to_try:
-                    ports_to_try.append(twin)
-        self.logger.info(f"Candidate Arduino ports to try: {ports_to_try}")
-        for port in ports_to_try:
-            try:
-                self.logger.info(f"Attempting connection to {port}")
-                if self.serial_connection and getattr(self.serial_connection, 'is_open', False):
-                    self.serial_connection.close()
-                self.serial_connection = serial.Serial(
-                    port=port,
-                    baudrate=self.baud_rate,
-                    timeout=self.serial_connect_timeout,
-                    write_timeout=self.serial_write_timeout
-                )
-
-                # TIMING FIX: Extended wait for Arduino initialization
-                self.logger.debug(f"Waiting for Arduino initialization on {port}...")
-                time.sleep(3.0)  # This is a fixed delay for Arduino boot, not configurable
-
-                # BUFFER CLEARING FIX: More thorough startup message clearing
-                start = time.time()
-                startup_messages = []
-                while time.time() - start < 2.0:  # Extended clearing time (fixed)
-                    try:
-                        if self.serial_connection.in_waiting:
-                            data = self.serial_connection.read(self.serial_connection.in_waiting)
-                            if data:
-                                startup_messages.append(data.decode('ascii', errors='ignore'))
-                        else:
-                            break
-                    except Exception:
-                        break
-                    time.sleep(0.05)  # Slightly longer sleep for stability (fixed)
-
-                if startup_messages:
-                    self.logger.debug(f"Cleared startup messages: {startup_messages}")
-
-                # Reset buffers to ensure clean state
-                self.serial_connection.reset_input_buffer()
-                self.serial_connection.reset_output_buffer()
-                self.serial_connection.write(("PING\n").encode("utf-8"))
-                self.serial_connection.flush()
-                line = None
-                start = time.time()
-                while time.time() - start < self.ping_timeout * 0.6:
-                    try:
-                        if self.serial_connection.in_waiting:
-                            line = self.serial_connection.readline()
-                            break
-                    except Exception:
-                        break
-                    time.sleep(0.01)
-                response = line or b""
-                if b"PONG" in response or b"OK" in response or b"READY" in response.upper():
-                    self.connected = True
-                    self.serial_port = port
-                    self.logger.info(f"✅ Arduino Test Harness connection verified on {port}")
-                    return True
-                else:
-                    self.serial_connection.write(("PING\n").encode("utf-8"))
-                    self.serial_connection.flush()
-                    start = time.time()
-                    line = None
-                    while time.time() - start < self.ping_timeout * 0.6:
-                        try:
-                            if self.serial_connection.in_waiting:
-                                line = self.serial_connection.readline()
-                                break
-                        except Exception:
-                            break
-                        time.sleep(0.01)
-                    response = line or b""
-                    if b"PONG" in response or b"OK" in response or b"READY" in response.upper():
-                        self.connected = True
-                        self.serial_port = port
-                        self.logger.info(f"✅ Arduino Test Harness connection verified on {port}")
-                        return True
-            except serial.SerialException as e:
-                self.logger.debug(f"Serial connection failed on {port}: {e}")
-                continue
-            except Exception as e:
-                self.logger.debug(f"Connection error on {port}: {e}")
-                continue
+        self._stop_transport()
+        if self.serial_connection and getattr(self.serial_connection, 'is_open', False):
+            self.serial_connection.close()
+        self.serial_connection = None
+
+        def probe(port: str) -> Optional[serial.Serial]:
+            self.logger.info(f"Attempting connection to {port}")
+            return open_harness(port, baud_rate=self.baud_rate, write_timeout=self.serial_write_timeout,
+                                boot_timeout=max(4.0, self.serial_connect_timeout + self.ping_timeout))
+
+        found = self.port_discovery.find(ROLE_HARNESS, probe, preferred=self.serial_port, scan=scan)
+        if found:
+            self.serial_connection = found.handle
+            self.serial_connection.timeout = self.serial_connect_timeout
+            self.connected = True
+            self.serial_port = found.device
+            source = "cached port" if found.cached else "probe"
+            self.logger.info(f"✅ Arduino Test Harness connection verified on {found.device} ({source})")
+            return True
         self.logger.error("Failed to connect to any Arduino port")
         self.logger.error("Available ports:")
         try:
@@ -242,10 +173,14 @@ class HardwareInterface:
         return False
     # --- HIL Harness command helpers and device operations ---
     def _resolve_pin(self, pin: str) -> str:
-        """Map logical pin name to harness pin name if available."""
+        """Map logical pin name (signal or ATmega port/pin such as 'PB0') to harness pin name if available."""
         if not isinstance(pin, str):
             pin = str(pin)
-        return self.pin_mapping.get(pin, pin)
+        mapped = self.pin_mapping.get(pin)
+        if mapped is None and self.pin_registry is not None:
+            entry = self.pin_registry.resolve(pin)
+            mapped = entry.harness_pin if entry else None
+        return mapped or pin
 
     def _ensure_serial(self) -> serial.Serial:
         """Ensure the serial port is open and ready with proper Arduino initialization."""
@@ -280,8 +215,42 @@ class HardwareInterface:
                 self.logger.error(f"Failed to reopen serial on {self.serial_port}: {e}")
         raise RuntimeError("Serial connection is not open")
 
+    def wait_for_notification(self, timeout: float) -> Optional[str]:
+        """Block up to ``timeout`` for a line pushed by the harness (e.g. MONITOR_ON pin changes).
+
+        Suitable as the ``wake`` source for timing.wait_until; without a running
+        transport it simply sleeps for ``timeout``.
+        """
+        transport = self._transport
+        if transport is None or not transport.is_running:
+            time.sleep(timeout)
+            return None
+        return transport.wait_unsolicited(timeout)
+
+    def _ensure_transport(self, ser: serial.Serial) -> SerialTransport:
+        """Return a running transport bound to the given serial connection."""
+        if self._transport and self._transport.serial is ser and self._transport.is_running:
+            return self._transport
+        self._stop_transport()
+        # Residual bytes predate the reader and must not be taken as a reply
+        try:
+            ser.reset_input_buffer()
+        except Exception:
+            pass
+        self._transport = SerialTransport(ser).start()
+        return self._transport
+
+    def _stop_transport(self) -> None:
+        """Stop the reader thread before the port is closed or reopened."""
+        if self._transport:
+            self._transport.stop()
+            self._transport = None
+
     def cleanup(self) -> None:
         """Close the serial connection cleanly."""
+        if self.telemetry is not None:
+            self.stop_stream()
+        self._stop_transport()
         try:
             if self.serial_connection and getattr(self.serial_connection, 'is_open', False):
                 self.serial_connection.close()
@@ -377,43 +346,144 @@ class HardwareInterface:
     def send_command(self, command: str, read_timeout: float = None) -> str:
         """Send a single-line ASCII command to the Arduino Test Harness and return one line of response.
         Returns empty string on timeout.
+
+        Responses are delivered by the transport reader thread, so the call returns as
+        soon as the newline arrives rather than on the next poll tick.
         """
         # Use configured default timeout if none provided
         if read_timeout is None:
             read_timeout = self.command_response_timeout
-            
+
         try:
-            import time
-            ser = self._ensure_serial()
-            # Drain any residual input quickly
-            try:
-                if ser.in_waiting:
-                    _ = ser.read(ser.in_waiting)
-            except Exception:
-                pass
-            # Send command
-            line = (command.strip() + "\n").encode("ascii", errors="ignore")
-            ser.write(line)
-            ser.flush()
-            # Read one line with a short timeout loop
-            start = time.time()
-            response = b""
-            while time.time() - start < max(self.send_command_min_timeout, read_timeout):
-                try:
-                    if ser.in_waiting:
-                        response = ser.readline()
-                        break
-                except Exception:
-                    break
-                time.sleep(0.01)
-            try:
-                return response.decode("ascii", errors="ignore").strip()
-            except Exception:
-                return ""
+            transport = self._ensure_transport(self._ensure_serial())
+            return transport.request(command, timeout=max(self.send_command_min_timeout, read_timeout))
         except Exception as e:
             self.logger.debug(f"send_command error: {e}")
             return ""
 
+    def send_command_async(self, command: str) -> Optional[PendingCommand]:
+        """Write a command without waiting so several can be outstanding at once.
+
+        Call ``wait(timeout)`` on the returned handle to collect the response line.
+        Returns None if the harness is not reachable.
+        """
+        try:
+            transport = self._ensure_transport(self._ensure_serial())
+            return transport.submit(command)
+        except Exception as e:
+            self.logger.debug(f"send_command_async error: {e}")
+            return None
+
+    def send_batch(self, commands: List[str], read_timeout: float = None) -> BatchResult:
+        """Send several commands in one USB write and collect one response per command.
+
+        Commands are packed into BATCH frames of up to BATCH_MAX_COMMANDS. A harness
+        that does not understand BATCH is detected on the first frame; after that each
+        command is sent on its own once the previous reply is in, so a slow command
+        never leaves a burst of lines to overrun the Arduino's 64-byte RX buffer.
+        """
+        if read_timeout is None:
+            read_timeout = self.command_response_timeout
+        read_timeout = max(self.send_command_min_timeout, read_timeout)
+        commands = [c.strip() for c in commands]
+        for command in commands:
+            if BATCH_SEPARATOR in command:
+                raise ValueError(f"Command cannot be batched (contains '{BATCH_SEPARATOR}'): {command}")
+
+        start = time.monotonic()
+        responses: List[str] = []
+        frames = 0
+        try:
+            transport = self._ensure_transport(self._ensure_serial())
+            for i in range(0, len(commands), BATCH_MAX_COMMANDS):
+                chunk = commands[i:i + BATCH_MAX_COMMANDS]
+                frames += 1
+                chunk_responses = None
+                if self._batch_supported is not False:
+                    chunk_responses = self._send_batch_frame(transport, chunk, read_timeout)
+                if chunk_responses is None:
+                    chunk_responses = [transport.request(command, read_timeout) for command in chunk]
+                responses.extend(chunk_responses)
+        except Exception as e:
+            self.logger.debug(f"send_batch error: {e}")
+        responses.extend([""] * (len(commands) - len(responses)))
+
+        latency_ms = (time.monotonic() - start) * 1000.0
+        result = BatchResult(responses=responses, latency_ms=latency_ms, frames=frames,
+                             batched=bool(self._batch_supported))
+        self.logger.info(f"Batch of {len(commands)} command(s) completed in {latency_ms:.1f} ms "
+                         f"({frames} frame(s), {'BATCH' if result.batched else 'one at a time'})")
+        return result
+
+    def _send_batch_frame(self, transport: SerialTransport, chunk: List[str],
+                          read_timeout: float) -> Optional[List[str]]:
+        """Send one BATCH frame; returns None if the harness does not support BATCH."""
+        frame = "BATCH " + BATCH_SEPARATOR.join(chunk)
+        pending = transport.submit(frame, is_complete=_batch_frame_complete)
+        # Each sub-command may take as long as a standalone command on the harness
+        if pending.wait(read_timeout * len(chunk)) is None:
+            self.logger.debug(f"BATCH frame timed out after {len(pending.lines)} line(s)")
+            transport.abandon(pending)
+            return (pending.lines[1:] + [""] * len(chunk))[:len(chunk)]
+        header = pending.lines[0].split()
+        if header[:2] != ["OK", "BATCH"]:
+            if self._batch_supported is None:
+                self.logger.info(f"Harness does not support BATCH ({pending.lines[0]}); "
+                                 "sending commands one at a time")
+            self._batch_supported = False
+            return None
+        self._batch_supported = True
+        return (pending.lines[1:] + [""] * len(chunk))[:len(chunk)]
+
+    def start_stream(self, signals: List[str], rate_hz: int = 200,
+                     capacity: int = 4096) -> Optional[TelemetryStream]:
+        """Ask the harness to push ``signals`` at ``rate_hz`` and buffer them in a TelemetryStream.
+
+        Replaces any stream already running. Returns None when the harness does not
+        support STREAM or rejects the signal set/rate, so callers can fall back to polling.
+        """
+        stream = TelemetryStream(signals, rate_hz=rate_hz, capacity=capacity)
+        if self.telemetry is not None:
+            self.stop_stream()
+        try:
+            transport = self._ensure_transport(self._ensure_serial())
+        except Exception as e:
+            self.logger.debug(f"start_stream error: {e}")
+            return None
+        # Install the handler first: the first frame can follow the acknowledgement immediately
+        transport.frame_handler = stream.feed
+        response = transport.request(stream.command, timeout=self.command_response_timeout)
+        if not stream.accepts(response):
+            transport.frame_handler = None
+            self.logger.info(f"Harness did not start telemetry stream ({response or 'no response'})")
+            return None
+        self.telemetry = stream
+        self.logger.info(f"Telemetry stream started: {', '.join(stream.signals)} at {stream.rate_hz} Hz")
+        return stream
+
+    def stop_stream(self) -> None:
+        """Stop the harness telemetry stream started by start_stream"""
+        stream, self.telemetry = self.telemetry, None
+        self.send_command(STREAM_OFF)
+        if self._transport is not None:
+            self._transport.frame_handler = None
+        if stream is not None:
+            self.logger.info(f"Telemetry stream stopped: {stream.frames} frame(s), {stream.dropped} dropped")
+
+    def read_pin_snapshot(self, pins: Optional[List[str]] = None) -> Dict[str, Optional[bool]]:
+        """Read several digital pins in a single batched round trip.
+
+        Returns a mapping of logical pin name to True (HIGH), False (LOW) or None when
+        the harness did not report a level for that pin.
+        """
+        names = list(pins) if pins is not None else list(self.pin_mapping.keys())
+        result = self.send_batch([f"READ_PIN {self._resolve_pin(name)}" for name in names])
+        snapshot: Dict[str, Optional[bool]] = {}
+        for name, resp in zip(names, result.responses):
+            up = resp.upper()
+            snapshot[name] = True if "HIGH" in up else False if "LOW" in up else None
+        return snapshot
+
     # --- GPIO helpers ---
     def write_gpio_pin(self, pin: str, state: bool) -> bool:
         pin_name = self._resolve_pin(pin)
@@ -515,23 +585,91 @@ class HardwareInterface:
     def modbus_read_register(self, address: int) -> Optional[int]:
         try:
             addr_hex = f"{int(address) & 0xFFFF:04X}"
-            resp = self.send_command(f"MODBUS_READ {addr_hex}")
-            # Harness prints: "MODBUS <addr> <value>" with hex value
-            if not resp:
-                return None
-            parts = resp.strip().split()
-            if len(parts) >= 3 and parts[0].upper() == "MODBUS":
-                try:
-                    return int(parts[2], 16)
-                except Exception:
-                    return None
-            # Some harnesses may just echo the value
+            return self._parse_modbus_read(self.send_command(f"MODBUS_READ {addr_hex}"))
+        except Exception as e:
+            self.logger.debug(f"modbus_read_register error: {e}")
+            return None
+
+    def modbus_read_block(self, start: int, count: int) -> List[Optional[int]]:
+        """Read ``count`` consecutive registers from ``start`` in one round trip (FC03).
+
+        Harness builds without MODBUS_READ_BLOCK are detected on the first call; after
+        that the registers are read with batched single-register reads instead.
+        Unreadable registers, including a block the harness refuses as unsupported,
+        are reported as None.
+        """
+        if not 1 <= count <= MODBUS_BLOCK_MAX:
+            raise ValueError(f"Block read count must be 1..{MODBUS_BLOCK_MAX}, got {count}")
+        return self.modbus_read_snapshot(((start, count),))[0]
+
+    def modbus_read_snapshot(self, blocks=MODBUS_SNAPSHOT_BLOCKS) -> List[List[Optional[int]]]:
+        """Read several register blocks, all in a single batched frame where supported.
+
+        Returns one list of values per ``(start, count)`` block, in order. The default
+        blocks cover the system status/control registers, the part of the register
+        map the harness can serve; blocks it refuses read as None.
+        """
+        try:
+            if self._block_read_supported is not False:
+                commands = [f"MODBUS_READ_BLOCK {int(start) & 0xFFFF:04X} {int(count):02X}" for start, count in blocks]
+                responses = (self.send_batch(commands).responses if len(commands) > 1
+                             else [self.send_command(commands[0])])
+                values = [self._parse_modbus_block(resp, start, count)
+                          for resp, (start, count) in zip(responses, blocks)]
+                refused = [self._block_address_unsupported(resp) for resp in responses]
+                if all(v is not None or r for v, r in zip(values, refused)):
+                    self._block_read_supported = True
+                    # Single reads of a refused range would only return the harness's zero padding
+                    return [v if v is not None else [None] * count for v, (_start, count) in zip(values, blocks)]
+                if self._block_read_supported is None and any("UNKNOWN" in r.upper() for r in responses):
+                    self.logger.info("Harness has no MODBUS_READ_BLOCK; using single-register reads")
+                    self._block_read_supported = False
+            # Per-register fallback, still batched into as few frames as possible
+            addresses = [start + i for start, count in blocks for i in range(count)]
+            responses = self.send_batch([f"MODBUS_READ {a & 0xFFFF:04X}" for a in addresses]).responses
+            flat = [self._parse_modbus_read(r) for r in responses]
+            result, offset = [], 0
+            for _start, count in blocks:
+                result.append(flat[offset:offset + count])
+                offset += count
+            return result
+        except Exception as e:
+            self.logger.debug(f"modbus_read_snapshot error: {e}")
+            return [[None] * count for _start, count in blocks]
+
+    @staticmethod
+    def _parse_modbus_read(resp: str) -> Optional[int]:
+        # Harness prints: "MODBUS <addr> <value>" with hex value
+        if not resp:
+            return None
+        parts = resp.strip().split()
+        if len(parts) >= 3 and parts[0].upper() == "MODBUS":
             try:
-                return int(resp.strip(), 16)
+                return int(parts[2], 16)
             except Exception:
                 return None
-        except Exception as e:
-            self.logger.debug(f"modbus_read_register error: {e}")
+        # Some harnesses may just echo the value
+        try:
+            return int(resp.strip(), 16)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _block_address_unsupported(resp: str) -> bool:
+        # Harness prints: "ERROR: MODBUS_READ_BLOCK address not supported ..." for registers it cannot read
+        return "ADDRESS NOT SUPPORTED" in (resp or "").upper()
+
+    @staticmethod
+    def _parse_modbus_block(resp: str, start: int, count: int) -> Optional[List[int]]:
+        # Harness prints: "MODBUS_BLOCK <start> <count> <4 hex digits per register>"
+        parts = (resp or "").strip().split()
+        if len(parts) != 4 or parts[0].upper() != "MODBUS_BLOCK":
+            return None
+        try:
+            if int(parts[1], 16) != start or int(parts[2], 16) != count or len(parts[3]) != 4 * count:
+                return None
+            return [int(parts[3][i:i + 4], 16) for i in range(0, 4 * count, 4)]
+        except ValueError:
             return None
 
     def modbus_write_register(self, address: int, value: int) -> bool:
@@ -11,15 +11,18 @@ License: Proprietary
 
 import os
 import sys
-import yaml
 import time
 import logging
 import platform
 from pathlib import Path
 from typing import Dict, Optional, Any
 
+from .config_service import hil_config
 from .hardware_interface import HardwareInterface
+from .hil_daemon import HILDaemonClient, RemoteHardwareInterface
 from .programmer import ArduinoISPProgrammer
+from .programming_cache import MODE_CACHE, ProgrammingCache
+from .rig_pool import NoRigAvailableError, RigLease, RigScheduler
 from .logger import HILLogger
 
 
@@ -34,13 +37,31 @@ class HILController:
         self.hardware_interface = None
         self.programmer = None
         self.hardware_ready = False
+        programming = self.config.get('programming', {}) or {}
+        self.programming_cache = ProgrammingCache(mode=programming.get('mode', MODE_CACHE))
+        self.verify_cached_firmware = programming.get('verify_cached', True)
+        self.delta_programming = programming.get('delta', False)
+        self.native_isp = programming.get('native_isp', False)
+        # Multi-rig lab: lease a bench from the pool instead of globbing for ports
+        self.rig_scheduler: Optional[RigScheduler] = None
+        self.rig_lease: Optional[RigLease] = None
+        self.rig_serial: Optional[str] = None
+        if RigScheduler.enabled(self.config):
+            self.use_rig_pool()
 
         self.logger.info("HIL Controller initialized")
 
+    def use_rig_pool(self, serial: Optional[str] = None) -> None:
+        """Lease a rig from ``rig_pool`` in setup_hardware (optionally a specific one)"""
+        self.rig_scheduler = RigScheduler.from_config(self.config)
+        self.rig_serial = serial
+
     def _load_config(self) -> Dict[str, Any]:
-        """Load HIL configuration from YAML file"""
-        config_path = Path(__file__).parent / self.config_file
+        """HIL configuration from the shared config service, over built-in defaults
 
+        The service parses the file once per process; this controller gets its
+        own mutable copy because setup writes resolved ports back into it.
+        """
         # Default configuration if file doesn't exist
         config = {
             'hardware': {
@@ -71,16 +92,13 @@ class HILController:
             }
         }
 
-        if config_path.exists():
-            try:
-                with open(config_path, 'r') as f:
-                    loaded_config = yaml.safe_load(f)
-                    # Merge with defaults
-                    config.update(loaded_config)
-            except Exception as e:
-                self.logger.warning(f"Failed to load config file {config_path}: {e}")
+        try:
+            # Merge with defaults
+            config.update(hil_config(self.config_file).as_dict())
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Failed to load config file {self.config_file}: {e}")
 
-            return config
+        return config
 
     def _auto_detect_programmer_port(self, configured_port: Optional[str]) -> str:
         """Resolve the ArduinoISP programmer serial port with platform-aware auto-detect.
@@ -141,108 +159,217 @@ class HILController:
 
     def setup_hardware(self) -> bool:
         """Initialize hardware connections and verify basic connectivity with improved timing"""
-        import time
-
         try:
             self.logger.info("Setting up HIL hardware connections...")
 
-            # Initialize hardware interface
-            serial_port = self.config['hardware']['target_serial_port']
-            baud_rate = self.config['timing']['serial_baud_rate']
-
-            self.hardware_interface = HardwareInterface(serial_port, baud_rate)
-
-            # Initialize programmer with auto-detected port when needed
-            programmer_port = self._auto_detect_programmer_port(self.config['hardware'].get('programmer_port'))
-            # Persist the resolved port back into config for visibility
-            self.config['hardware']['programmer_port'] = programmer_port
-            self.programmer = ArduinoISPProgrammer(programmer_port)
+            if self.rig_scheduler is not None:
+                return self._setup_leased_rig()
 
-            # TIMING FIX: Allow Arduino to fully initialize before attempting connection
-            self.logger.info("Waiting for Arduino initialization (3 seconds)...")
-            time.sleep(3.0)
+            # A running HIL daemon already holds a warm harness session
+            if self._attach_daemon():
+                return True
 
-            # BUFFER CLEARING FIX: Verify connectivity with retry mechanism
-            connection_attempts = 3
-            for attempt in range(connection_attempts):
-                self.logger.info(f"Connection attempt {attempt + 1}/{connection_attempts}")
+            return self._connect_hardware()
 
-                if self.hardware_interface.verify_connection():
-                    self.logger.info("✅ Hardware interface connection established")
-                    break
+        except Exception as e:
+            self.logger.error(f"Hardware setup failed: {e}")
+            return False
 
-                if attempt < connection_attempts - 1:
-                    self.logger.info("Connection failed, retrying in 2 seconds...")
-                    time.sleep(2.0)
-            else:
-                self.logger.error("Failed to establish hardware interface connection after all attempts")
+    def _setup_leased_rig(self) -> bool:
+        """Lease a healthy rig and connect to it, moving on to another rig if it fails"""
+        pool = self.config.get('rig_pool', {}) or {}
+        tried = set()
+        while True:
+            try:
+                lease = self.rig_scheduler.lease(f"pid {os.getpid()}", timeout=pool.get('lease_timeout', 600),
+                                                 serial=self.rig_serial, exclude=tried)
+            except NoRigAvailableError as e:
+                self.logger.error(str(e))
                 return False
-
-            # STARTUP MESSAGE FIX: Send dummy command to clear any startup messages
+            rig = lease.rig
+            tried.add(rig.serial)
+            self.rig_lease = lease
+            self.config['hardware']['target_serial_port'] = rig.harness_port
+            self.config['hardware']['programmer_port'] = rig.programmer_port
+            self.logger.info(f"Using rig {rig.name} ({rig.serial}): harness {rig.harness_port}")
             try:
-                self.logger.info("Clearing Arduino startup messages...")
-                dummy_response = self.hardware_interface.send_command("PING", read_timeout=1.0)
-                self.logger.debug(f"Dummy command response: {dummy_response}")
-
-                # Verify connection is stable with a second PING
-                verify_response = self.hardware_interface.send_command("PING", read_timeout=2.0)
-                if verify_response and "PONG" in verify_response:
-                    self.logger.info("✅ Arduino communication verified and stable")
-                else:
-                    self.logger.warning(f"Arduino communication may be unstable: {verify_response}")
-
+                connected = self._connect_hardware()
             except Exception as e:
-                self.logger.warning(f"Startup message clearing failed: {e}")
+                self.logger.error(f"Hardware setup on rig {rig.name} failed: {e}")
+                connected = False
+            if connected:
+                return True
+            self._release_rig(healthy=False, error="hardware setup failed")
+            if self.rig_serial:
+                return False
 
-            # Mark hardware ready once harness connection is up; programmer may be optional for some tests
-            self.hardware_ready = True
+    def _release_rig(self, healthy: Optional[bool] = None, error: str = "") -> None:
+        if self.rig_lease is not None:
+            if self.hardware_interface:
+                self.hardware_interface.cleanup()
+                self.hardware_interface = None
+            self.rig_lease.release(healthy, error)
+            self.rig_lease = None
+            self.hardware_ready = False
 
-            # Try to verify programmer; if it fails, warn but do not fail overall HIL setup
-            if not self.programmer.verify_connection():
-                self.logger.error("Failed to establish programmer connection")
-                self.logger.warning("Proceeding without programmer; scenarios that require programming will be skipped or fail later")
+    def _connect_hardware(self) -> bool:
+        """Open the configured harness and programmer ports and verify the harness answers"""
+        # Initialize hardware interface
+        serial_port = self.config['hardware']['target_serial_port']
+        baud_rate = self.config['timing']['serial_baud_rate']
+
+        self.hardware_interface = HardwareInterface(serial_port, baud_rate)
+
+        # Initialize programmer with auto-detected port when needed
+        programmer_port = self._auto_detect_programmer_port(self.config['hardware'].get('programmer_port'))
+        # Persist the resolved port back into config for visibility
+        self.config['hardware']['programmer_port'] = programmer_port
+        self.programmer = ArduinoISPProgrammer(programmer_port, native_isp=self.native_isp)
+
+        # TIMING FIX: Allow Arduino to fully initialize before attempting connection
+        self.logger.info("Waiting for Arduino initialization (3 seconds)...")
+        time.sleep(3.0)
+
+        # BUFFER CLEARING FIX: Verify connectivity with retry mechanism
+        connection_attempts = 3
+        for attempt in range(connection_attempts):
+            self.logger.info(f"Connection attempt {attempt + 1}/{connection_attempts}")
+
+            # A leased rig's harness must answer on its own port
+            if self.hardware_interface.verify_connection(scan=self.rig_lease is None):
+                self.logger.info("✅ Hardware interface connection established")
+                break
+
+            if attempt < connection_attempts - 1:
+                self.logger.info("Connection failed, retrying in 2 seconds...")
+                time.sleep(2.0)
+        else:
+            self.logger.error("Failed to establish hardware interface connection after all attempts")
+            return False
 
-            self.logger.info("HIL hardware setup completed successfully (hardware interface ready)")
-            return True
+        # STARTUP MESSAGE FIX: Send dummy command to clear any startup messages
+        try:
+            self.logger.info("Clearing Arduino startup messages...")
+            dummy_response = self.hardware_interface.send_command("PING", read_timeout=1.0)
+            self.logger.debug(f"Dummy command response: {dummy_response}")
+
+            # Verify connection is stable with a second PING
+            verify_response = self.hardware_interface.send_command("PING", read_timeout=2.0)
+            if verify_response and "PONG" in verify_response:
+                self.logger.info("✅ Arduino communication verified and stable")
+            else:
+                self.logger.warning(f"Arduino communication may be unstable: {verify_response}")
 
         except Exception as e:
-            self.logger.error(f"Hardware setup failed: {e}")
-            return False
+            self.logger.warning(f"Startup message clearing failed: {e}")
+
+        # Mark hardware ready once harness connection is up; programmer may be optional for some tests
+        self.hardware_ready = True
+
+        # Try to verify programmer; if it fails, warn but do not fail overall HIL setup
+        if not self.programmer.verify_connection():
+            self.logger.error("Failed to establish programmer connection")
+            self.logger.warning("Proceeding without programmer; scenarios that require programming will be skipped or fail later")
+        self.programmer.close_session()
 
-    def program_firmware(self, firmware_path: str) -> bool:
-        """Upload firmware to ATmega32A via Arduino as ISP"""
+        self.logger.info("HIL hardware setup completed successfully (hardware interface ready)")
+        return True
+
+    def _attach_daemon(self) -> bool:
+        """Attach to a running HIL daemon instead of opening (and resetting) the port"""
+        socket_path = self.config['hardware'].get('daemon_socket')
+        client = HILDaemonClient.attach(socket_path)
+        if client is None:
+            return False
+        self.hardware_interface = RemoteHardwareInterface(client)
+        if not self.hardware_interface.verify_connection():
+            self.logger.warning(f"HIL daemon at {client.socket_path} is up but the harness did not answer")
+            self.hardware_interface.cleanup()
+            self.hardware_interface = None
+            return False
+        programmer_port = self._auto_detect_programmer_port(self.config['hardware'].get('programmer_port'))
+        self.config['hardware']['programmer_port'] = programmer_port
+        # Verified lazily: avrdude needs the port, which the daemon releases only for programming
+        self.programmer = ArduinoISPProgrammer(programmer_port, native_isp=self.native_isp)
+        self.hardware_ready = True
+        self.logger.info(f"✅ Attached to HIL daemon at {client.socket_path} ({self.hardware_interface.serial_port})")
+        return True
+
+    def program_firmware(self, firmware_path: str, force: bool = False) -> bool:
+        """Upload firmware to ATmega32A via Arduino as ISP
+
+        Skipped when the programming cache shows the target already holds this
+        image; ``force`` always flashes.
+        """
         try:
             if not self.hardware_ready:
                 self.logger.error("Hardware not ready for firmware programming")
                 return False
 
-            self.logger.info(f"Programming firmware: {firmware_path}")
-
             if not Path(firmware_path).exists():
                 self.logger.error(f"Firmware file not found: {firmware_path}")
                 return False
 
+            # Rig serial numbers survive port renumbering; bare ports are all a single bench has
+            target = f"rig:{self.rig_lease.rig.serial}" if self.rig_lease else self.programmer.programmer_port
+            device_key = ProgrammingCache.device_key(target,
+                                                     self.config['hardware'].get('target_mcu', 'ATmega32A'))
+            verify = self._verify_flashed_firmware if self.verify_cached_firmware else None
+            if not self.programming_cache.needs_programming(device_key, firmware_path, force=force, verify=verify):
+                self.logger.info(f"Firmware already programmed, skipping: {firmware_path}")
+                return True
+
+            self.logger.info(f"Programming firmware: {firmware_path}")
+
             # Program using Arduino as ISP
-            success = self.programmer.program_firmware(firmware_path)
+            remote = isinstance(self.hardware_interface, RemoteHardwareInterface)
+            if remote:
+                self.hardware_interface.release_port()
+            if self.delta_programming and not force:
+                success = self.programmer.program_firmware_delta(
+                    firmware_path, self.programming_cache.previous_image(device_key))
+            else:
+                success = self.programmer.program_firmware(firmware_path)
+            # Leaving programming mode releases the target from reset
+            self.programmer.close_session()
 
             if success:
                 self.logger.info("Firmware programming completed successfully")
+                self.programming_cache.record(device_key, firmware_path)
                 # Wait for target to boot
                 time.sleep(2)
                 # Restore Arduino to Test Harness firmware so PING/INFO are available
+                restored = False
                 try:
-                    self.upload_test_harness()
+                    restored = self.upload_test_harness()
                 except Exception as _e:
                     self.logger.warning(f"Failed to restore Test Harness after programming: {_e}")
+                if remote and not restored:
+                    self.hardware_interface.acquire_port()
                 return True
             else:
                 self.logger.error("Firmware programming failed")
+                # A partial write leaves the flash contents unknown
+                self.programming_cache.invalidate(device_key)
+                if remote:
+                    self.hardware_interface.acquire_port()
                 return False
 
         except Exception as e:
             self.logger.error(f"Firmware programming error: {e}")
             return False
 
+    def _verify_flashed_firmware(self, firmware_path: str) -> bool:
+        """Read back the target flash and compare it with ``firmware_path``"""
+        remote = isinstance(self.hardware_interface, RemoteHardwareInterface)
+        if remote:
+            self.hardware_interface.release_port()
+        try:
+            return self.programmer.verify_firmware(firmware_path)
+        finally:
+            self.programmer.close_session()
+            if remote:
+                self.hardware_interface.acquire_port()
 
     def upload_test_harness(self) -> bool:
         """Upload the Arduino Test Harness firmware so PING/INFO work after programming.
@@ -263,8 +390,10 @@ class HILController:
                 return False
             # Give Arduino time to reboot into harness
             time.sleep(2.0)
-            # Re-verify serial connection for harness
-            if self.hardware_interface:
+            # Re-verify serial connection for harness (the daemon reopens its own port)
+            if isinstance(self.hardware_interface, RemoteHardwareInterface):
+                self.hardware_interface.acquire_port()
+            elif self.hardware_interface:
                 _ = self.hardware_interface.verify_connection()
             self.logger.info("Arduino Test Harness upload completed")
             return True
@@ -318,6 +447,7 @@ class HILController:
             if self.programmer:
                 self.programmer.cleanup()
 
+            self._release_rig()
             self.hardware_ready = False
             self.logger.info("HIL hardware cleanup completed")
 
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+HIL Daemon - Long-lived owner of the Arduino Test Harness serial port
+
+Opening the harness port resets the Arduino and costs several seconds of boot
+wait and buffer draining. The daemon pays that once, keeps the port and its
+reader-thread transport warm, and serves any number of local clients (Behave,
+sandbox_cli, the web-UI backend) over a Unix socket with a JSON-lines protocol:
+
+    -> {"id": 1, "op": "command", "command": "PING", "timeout": 1.0}
+    <- {"id": 1, "ok": true, "response": "OK PONG"}
+
+Operations: ping, command, batch, status, reset_dut, release, acquire, shutdown.
+``release``/``acquire`` hand the port to avrdude for ISP programming and take it
+back afterwards; the DUT is only reset when a client asks for ``reset_dut``.
+
+Usage:
+    python -m test.acceptance.hil_framework.hil_daemon --port /dev/ttyACM0
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    from .config_service import get_config_service
+    from .hardware_interface import BatchResult, HardwareInterface
+except ImportError:
+    # Direct execution (e.g. run from this directory)
+    from config_service import get_config_service
+    from hardware_interface import BatchResult, HardwareInterface
+
+DEFAULT_SOCKET_PATH = "/tmp/hil-daemon.sock"
+SOCKET_ENV_VAR = "HIL_DAEMON_SOCKET"
+
+
+def default_socket_path() -> str:
+    return os.environ.get(SOCKET_ENV_VAR, DEFAULT_SOCKET_PATH)
+
+
+class HILDaemonError(RuntimeError):
+    """Raised by the client when the daemon is unreachable or rejects a request."""
+
+
+class _ClientHandler(socketserver.StreamRequestHandler):
+    """One connected client; requests are answered in order, one line each."""
+
+    def handle(self) -> None:
+        daemon: "HILDaemon" = self.server.hil_daemon  # type: ignore[attr-defined]
+        daemon.clients += 1
+        try:
+            for raw in self.rfile:
+                try:
+                    request = json.loads(raw)
+                except ValueError:
+                    request = {}
+                    reply = {"ok": False, "error": "invalid JSON"}
+                else:
+                    reply = daemon.dispatch(request)
+                    reply["id"] = request.get("id")
+                self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+                self.wfile.flush()
+                if request.get("op") == "shutdown":
+                    break
+        finally:
+            daemon.clients -= 1
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class HILDaemon:
+    """Serves one warm HardwareInterface session to local clients"""
+
+    def __init__(self, hardware_interface: HardwareInterface, socket_path: Optional[str] = None) -> None:
+        self.hardware_interface = hardware_interface
+        self.socket_path = socket_path or default_socket_path()
+        self.logger = logging.getLogger(__name__)
+        self.started_at = time.time()
+        self.commands_served = 0
+        self.clients = 0
+        self.released = False
+        self._server: Optional[_UnixServer] = None
+        self._thread: Optional[threading.Thread] = None
+        # Serialises release/acquire against in-flight commands
+        self._port_lock = threading.RLock()
+
+    # ----------------------------- Lifecycle ------------------------------ #
+
+    def start(self, connect: bool = True) -> "HILDaemon":
+        """Open the harness session (once) and start serving on the socket"""
+        if connect and not self.hardware_interface.verify_connection():
+            raise HILDaemonError("Arduino Test Harness not reachable")
+        if os.path.exists(self.socket_path):
+            if _socket_alive(self.socket_path):
+                raise HILDaemonError(f"Another HIL daemon is serving {self.socket_path}")
+            os.unlink(self.socket_path)
+        self._server = _UnixServer(self.socket_path, _ClientHandler)
+        self._server.hil_daemon = self  # type: ignore[attr-defined]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="hil-daemon", daemon=True)
+        self._thread.start()
+        self.logger.info(f"HIL daemon serving {self.hardware_interface.serial_port} on {self.socket_path}")
+        return self
+
+    def serve_forever(self) -> None:
+        while self._thread and self._thread.is_alive():
+            self._thread.join(timeout=0.5)
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+        self.hardware_interface.cleanup()
+
+    # ----------------------------- Requests ------------------------------- #
+
+    def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        op = request.get("op")
+        handler = getattr(self, f"_op_{op}", None)
+        if handler is None:
+            return {"ok": False, "error": f"unknown op: {op}"}
+        try:
+            return handler(request)
+        except Exception as e:
+            self.logger.debug(f"HIL daemon op {op} failed: {e}")
+            return {"ok": False, "error": str(e)}
+
+    def _op_ping(self, _request: Dict[str, Any]) -> Dict[str, Any]:
+        return {"ok": True, "response": "PONG"}
+
+    def _op_status(self, _request: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "ok": True,
+            "serial_port": self.hardware_interface.serial_port,
+            "connected": self.hardware_interface.connected,
+            "released": self.released,
+            "uptime_s": round(time.time() - self.started_at, 3),
+            "clients": self.clients,
+            "commands_served": self.commands_served,
+        }
+
+    def _op_command(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        with self._port_lock:
+            if self.released:
+                return {"ok": False, "error": "serial port released for programming"}
+            response = self.hardware_interface.send_command(request["command"], read_timeout=request.get("timeout"))
+            self.commands_served += 1
+        return {"ok": True, "response": response}
+
+    def _op_batch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        with self._port_lock:
+            if self.released:
+                return {"ok": False, "error": "serial port released for programming"}
+            result = self.hardware_interface.send_batch(request["commands"], read_timeout=request.get("timeout"))
+            self.commands_served += len(request["commands"])
+        return {"ok": True, "responses": result.responses, "latency_ms": result.latency_ms,
+                "frames": result.frames, "batched": result.batched}
+
+    def _op_reset_dut(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return self._op_command({"command": "RESET_TARGET", "timeout": request.get("timeout", 2.0)})
+
+    def _op_release(self, _request: Dict[str, Any]) -> Dict[str, Any]:
+        with self._port_lock:
+            self.hardware_interface.cleanup()
+            self.released = True
+        self.logger.info("Serial port released")
+        return {"ok": True}
+
+    def _op_acquire(self, _request: Dict[str, Any]) -> Dict[str, Any]:
+        with self._port_lock:
+            ok = self.hardware_interface.verify_connection()
+            self.released = not ok
+        return {"ok": ok, "serial_port": self.hardware_interface.serial_port}
+
+    def _op_shutdown(self, _request: Dict[str, Any]) -> Dict[str, Any]:
+        threading.Thread(target=self.stop, daemon=True).start()
+        return {"ok": True}
+
+
+def _socket_alive(socket_path: str) -> bool:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            probe.settimeout(0.5)
+            probe.connect(socket_path)
+        return True
+    except OSError:
+        return False
+
+
+class HILDaemonClient:
+    """Thread-safe JSON-lines client for a running HIL daemon"""
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = 10.0) -> None:
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    @classmethod
+    def attach(cls, socket_path: Optional[str] = None) -> Optional["HILDaemonClient"]:
+        """Connect to a running daemon; None if none is listening"""
+        client = cls(socket_path)
+        try:
+            client.connect()
+            client.request("ping")
+            return client
+        except HILDaemonError:
+            client.close()
+            return None
+
+    def connect(self) -> None:
+        try:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+        except OSError as e:
+            raise HILDaemonError(f"HIL daemon not reachable at {self.socket_path}: {e}") from e
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+
+    def close(self) -> None:
+        with self._lock:
+            for closable in (self._reader, self._sock):
+                try:
+                    if closable:
+                        closable.close()
+                except OSError:
+                    pass
+            self._sock = self._reader = None
+
+    def request(self, op: str, **params: Any) -> Dict[str, Any]:
+        with self._lock:
+            if self._sock is None:
+                raise HILDaemonError("HIL daemon client is not connected")
+            self._next_id += 1
+            payload = dict(params, op=op, id=self._next_id)
+            try:
+                self._sock.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+                line = self._reader.readline()
+            except OSError as e:
+                raise HILDaemonError(f"HIL daemon request failed: {e}") from e
+        if not line:
+            raise HILDaemonError("HIL daemon closed the connection")
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            raise HILDaemonError(reply.get("error", f"{op} failed"))
+        return reply
+
+
+class RemoteHardwareInterface(HardwareInterface):
+    """HardwareInterface whose harness I/O goes through a HIL daemon session
+
+    Every helper on HardwareInterface funnels into send_command/send_batch, so
+    overriding those is enough for steps to run unchanged against the daemon.
+    The daemon owns the harness port: anything that would open it here (telemetry
+    streaming, a direct transport) is refused, since two readers on one UART
+    corrupt each other's replies and frames.
+    """
+
+    def __init__(self, client: HILDaemonClient) -> None:
+        super().__init__(serial_port=None)
+        self.client = client
+        try:
+            status = client.request("status")
+            self.serial_port = status.get("serial_port")
+            self.connected = bool(status.get("connected"))
+        except HILDaemonError:
+            self.connected = False
+
+    def verify_connection(self) -> bool:
+        self.connected = "PONG" in self.send_command("PING", read_timeout=self.ping_timeout)
+        return self.connected
+
+    def send_command(self, command: str, read_timeout: float = None) -> str:
+        try:
+            return self.client.request("command", command=command, timeout=read_timeout).get("response", "")
+        except HILDaemonError as e:
+            self.logger.debug(f"send_command via daemon failed: {e}")
+            return ""
+
+    def send_command_async(self, command: str):
+        # The daemon answers one request per line; there is nothing to pipeline
+        return None
+
+    def _ensure_serial(self):
+        raise HILDaemonError(f"Harness port {self.serial_port} is owned by the HIL daemon")
+
+    def start_stream(self, signals: List[str], rate_hz: int = 200, capacity: int = 4096):
+        # The daemon does not forward telemetry frames; callers poll instead
+        return None
+
+    def stop_stream(self) -> None:
+        self.telemetry = None
+
+    def send_batch(self, commands: List[str], read_timeout: float = None) -> BatchResult:
+        try:
+            reply = self.client.request("batch", commands=list(commands), timeout=read_timeout)
+            return BatchResult(responses=reply["responses"], latency_ms=reply["latency_ms"],
+                               frames=reply["frames"], batched=reply["batched"])
+        except HILDaemonError as e:
+            self.logger.debug(f"send_batch via daemon failed: {e}")
+            return BatchResult(responses=[""] * len(commands), latency_ms=0.0, frames=0, batched=False)
+
+    def release_port(self) -> bool:
+        """Let avrdude open the harness port (ISP programming)"""
+        try:
+            self.client.request("release")
+            return True
+        except HILDaemonError as e:
+            self.logger.warning(f"HIL daemon release failed: {e}")
+            return False
+
+    def acquire_port(self) -> bool:
+        """Take the harness port back after programming"""
+        try:
+            self.client.request("acquire")
+            return True
+        except HILDaemonError as e:
+            self.logger.warning(f"HIL daemon acquire failed: {e}")
+            return False
+
+    def reset_dut(self) -> bool:
+        try:
+            return "OK" in self.client.request("reset_dut").get("response", "")
+        except HILDaemonError:
+            return False
+
+    def cleanup(self) -> None:
+        """Detach from the daemon; the session itself stays warm"""
+        self.client.close()
+        self.connected = False
+
+
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Long-lived HIL harness session daemon")
+    parser.add_argument("--port", help="Arduino Test Harness serial port (auto-detect if omitted)")
+    parser.add_argument("--baud", type=int, default=115200, help="Baud rate")
+    parser.add_argument("--socket", default=default_socket_path(), help="Unix socket path")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Enable debug logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+    daemon = HILDaemon(HardwareInterface(args.port, args.baud), args.socket)
+    # Timeout edits in hil_config.yaml apply to the warm session without a restart
+    config_service = get_config_service()
+    config_service.subscribe(daemon.hardware_interface._load_timeout_config)
+    config_service.watch()
+    try:
+        daemon.start()
+        print(f"HIL daemon ready on {daemon.socket_path} ({daemon.hardware_interface.serial_port})", flush=True)
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except HILDaemonError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        daemon.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
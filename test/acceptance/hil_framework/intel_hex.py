@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Intel HEX Images - Page-level view of AVR flash images
+
+Parses Intel HEX files produced by avr-gcc/PlatformIO into a sparse flash
+image, splits it into programming pages and diffs two images so only the
+pages that actually changed need to be written to the target.
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+ATMEGA32_PAGE_SIZE = 128      # bytes (64 words)
+ATMEGA32_FLASH_SIZE = 32768   # bytes
+
+_RECORD_DATA = 0x00
+_RECORD_EOF = 0x01
+_RECORD_EXT_SEGMENT = 0x02
+_RECORD_EXT_LINEAR = 0x04
+
+
+class FlashImage:
+    """Sparse flash contents keyed by byte address"""
+
+    def __init__(self, data: Optional[Dict[int, int]] = None, page_size: int = ATMEGA32_PAGE_SIZE) -> None:
+        self.data: Dict[int, int] = dict(data or {})
+        self.page_size = page_size
+
+    @classmethod
+    def from_hex(cls, path: str, page_size: int = ATMEGA32_PAGE_SIZE) -> "FlashImage":
+        """Parse an Intel HEX file; raises ValueError on malformed records"""
+        data: Dict[int, int] = {}
+        base = 0
+        for lineno, raw in enumerate(Path(path).read_text().splitlines(), start=1):
+            line = raw.strip()
+            if not line:
+                continue
+            if not line.startswith(':'):
+                raise ValueError(f"{path}:{lineno}: record does not start with ':'")
+            try:
+                record = bytes.fromhex(line[1:])
+            except ValueError:
+                raise ValueError(f"{path}:{lineno}: invalid hex digits") from None
+            if len(record) < 5 or len(record) != record[0] + 5:
+                raise ValueError(f"{path}:{lineno}: bad record length")
+            if sum(record) & 0xFF:
+                raise ValueError(f"{path}:{lineno}: checksum mismatch")
+            count, rtype = record[0], record[3]
+            offset = (record[1] << 8) | record[2]
+            payload = record[4:4 + count]
+            if rtype == _RECORD_DATA:
+                for i, byte in enumerate(payload):
+                    data[base + offset + i] = byte
+            elif rtype == _RECORD_EOF:
+                break
+            elif rtype == _RECORD_EXT_SEGMENT:
+                base = int.from_bytes(payload, 'big') << 4
+            elif rtype == _RECORD_EXT_LINEAR:
+                base = int.from_bytes(payload, 'big') << 16
+            # Start address records (03/05) carry no flash contents
+        return cls(data, page_size)
+
+    def pages(self) -> Dict[int, bytes]:
+        """Page start address -> full page contents (unset bytes read as erased 0xFF)"""
+        used = sorted({addr - addr % self.page_size for addr in self.data})
+        return {start: bytes(self.data.get(start + i, 0xFF) for i in range(self.page_size))
+                for start in used}
+
+    def page(self, start: int) -> bytes:
+        return bytes(self.data.get(start + i, 0xFF) for i in range(self.page_size))
+
+    def write_hex(self, path: str, pages: Optional[Iterable[int]] = None) -> None:
+        """Write the image (or only the given page start addresses) as Intel HEX"""
+        selected = sorted(pages) if pages is not None else sorted(self.pages())
+        lines: List[str] = []
+        upper = 0
+        for start in selected:
+            contents = self.page(start)
+            for chunk_start in range(0, self.page_size, 16):
+                address = start + chunk_start
+                if address >> 16 != upper:
+                    upper = address >> 16
+                    lines.append(_record(0, _RECORD_EXT_LINEAR, upper.to_bytes(2, 'big')))
+                lines.append(_record(address & 0xFFFF, _RECORD_DATA, contents[chunk_start:chunk_start + 16]))
+        lines.append(_record(0, _RECORD_EOF, b''))
+        Path(path).write_text('\n'.join(lines) + '\n')
+
+
+def changed_pages(previous: FlashImage, current: FlashImage) -> List[int]:
+    """Page start addresses whose contents differ between two images"""
+    starts = set(previous.pages()) | set(current.pages())
+    return sorted(start for start in starts if previous.page(start) != current.page(start))
+
+
+def needs_erase(previous: FlashImage, current: FlashImage, pages: Iterable[int]) -> bool:
+    """True if writing ``pages`` would have to set a programmed bit back to 1
+
+    ISP page writes on the ATmega32 can only clear bits; restoring a 1 takes a
+    chip erase, so such deltas have to fall back to a full erase and write.
+    """
+    for start in pages:
+        old, new = previous.page(start), current.page(start)
+        if any(o & n != n for o, n in zip(old, new)):
+            return True
+    return False
+
+
+def _record(address: int, rtype: int, payload: bytes) -> str:
+    body = bytes([len(payload), address >> 8, address & 0xFF, rtype]) + payload
+    return ':' + (body + bytes([(-sum(body)) & 0xFF])).hex().upper()
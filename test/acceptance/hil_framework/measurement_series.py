@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Measurement Series - Timestamped sample arrays for stability assertions
+
+A MeasurementSeries holds one measured quantity (ADC counts on a channel, PWM
+duty, PWM frequency) as a pair of preallocated NumPy arrays: sample time in
+seconds and value. Appending doubles the capacity only when it is full. The
+statistics the HIL steps assert on (mean, standard deviation, percentiles,
+linear drift, outliers, tolerance bands) are computed over the whole array
+at once, so a streamed capture of thousands of samples costs the same code
+path as a handful of polled readings.
+
+    series = MeasurementSeries.from_samples("adc_A1", readings, timestamps, unit="counts")
+    stats = series.stats()              # SeriesStats(count=500, mean=511.8, std=0.9, ...)
+    assert not len(series.outliers(tolerance=5))
+    save_evidence(series, scenario="ADC stability")   # acceptance-junit/evidence/*.npy
+
+Evidence files are NumPy structured arrays (fields ``t`` and ``value``) and
+load back with ``MeasurementSeries.load``.
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+import os
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+EVIDENCE_DIR = Path(os.environ.get('HIL_EVIDENCE_DIR', REPO_ROOT / 'acceptance-junit' / 'evidence'))
+SAMPLE_DTYPE = np.dtype([('t', '<f8'), ('value', '<f8')])
+
+
+@dataclass(frozen=True)
+class SeriesStats:
+    """Summary statistics of a MeasurementSeries"""
+    count: int
+    mean: float
+    std: float          # sample standard deviation (ddof=1); 0.0 below two samples
+    minimum: float
+    maximum: float
+    p05: float
+    median: float
+    p95: float
+    drift_per_s: float  # least-squares slope; 0.0 without a time span
+
+    @property
+    def span(self) -> float:
+        return self.maximum - self.minimum
+
+
+class MeasurementSeries:
+    """Growable, timestamped samples of one quantity backed by NumPy arrays"""
+
+    def __init__(self, name: str, unit: str = "", capacity: int = 1024) -> None:
+        self.name = name
+        self.unit = unit
+        self._t = np.empty(max(1, capacity), dtype=np.float64)
+        self._v = np.empty(max(1, capacity), dtype=np.float64)
+        self._n = 0
+        self._t0 = time.monotonic()
+
+    @classmethod
+    def from_samples(cls, name: str, values: Iterable[float], timestamps: Optional[Iterable[float]] = None,
+                     unit: str = "") -> "MeasurementSeries":
+        values = np.asarray(list(values), dtype=np.float64)
+        series = cls(name, unit, capacity=len(values))
+        series.extend(values, timestamps)
+        return series
+
+    # ----------------------------- Samples -------------------------------- #
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def times(self) -> np.ndarray:
+        """Sample times in seconds (read-only view)"""
+        view = self._t[:self._n]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def values(self) -> np.ndarray:
+        """Sample values (read-only view)"""
+        view = self._v[:self._n]
+        view.flags.writeable = False
+        return view
+
+    def append(self, value: float, t: Optional[float] = None) -> None:
+        """Add one sample; ``t`` defaults to seconds since the series was created"""
+        self._reserve(self._n + 1)
+        self._t[self._n] = time.monotonic() - self._t0 if t is None else t
+        self._v[self._n] = value
+        self._n += 1
+
+    def extend(self, values: Iterable[float], timestamps: Optional[Iterable[float]] = None) -> None:
+        """Add many samples at once; without timestamps they are numbered 0, 1, 2, ... seconds"""
+        values = np.asarray(values if isinstance(values, np.ndarray) else list(values), dtype=np.float64)
+        if timestamps is None:
+            times = np.arange(self._n, self._n + len(values), dtype=np.float64)
+        else:
+            times = np.asarray(list(timestamps), dtype=np.float64)
+            if times.shape != values.shape:
+                raise ValueError(f"{self.name}: {len(times)} timestamps for {len(values)} values")
+        end = self._n + len(values)
+        self._reserve(end)
+        self._t[self._n:end] = times
+        self._v[self._n:end] = values
+        self._n = end
+
+    def _reserve(self, size: int) -> None:
+        if size <= len(self._v):
+            return
+        capacity = max(size, 2 * len(self._v))
+        for attr in ('_t', '_v'):
+            grown = np.empty(capacity, dtype=np.float64)
+            grown[:self._n] = getattr(self, attr)[:self._n]
+            setattr(self, attr, grown)
+
+    # ----------------------------- Analysis ------------------------------- #
+
+    def stats(self) -> SeriesStats:
+        if not self._n:
+            raise ValueError(f"{self.name}: no samples")
+        v = self.values
+        p05, median, p95 = np.percentile(v, [5, 50, 95])
+        return SeriesStats(
+            count=self._n,
+            mean=float(v.mean()),
+            std=float(v.std(ddof=1)) if self._n > 1 else 0.0,
+            minimum=float(v.min()),
+            maximum=float(v.max()),
+            p05=float(p05),
+            median=float(median),
+            p95=float(p95),
+            drift_per_s=self.drift(),
+        )
+
+    def percentile(self, q: Union[float, Iterable[float]]) -> Union[float, np.ndarray]:
+        result = np.percentile(self.values, q)
+        return float(result) if np.ndim(result) == 0 else result
+
+    def drift(self) -> float:
+        """Least-squares slope of value over time (units per second)"""
+        if self._n < 2:
+            return 0.0
+        t = self.times - self.times.mean()
+        denominator = float(np.dot(t, t))
+        if denominator == 0.0:
+            return 0.0
+        return float(np.dot(t, self.values - self.values.mean()) / denominator)
+
+    def outliers(self, tolerance: Optional[float] = None, sigma: Optional[float] = None,
+                 center: Optional[float] = None) -> np.ndarray:
+        """Indices of samples further than ``tolerance`` (or ``sigma`` standard deviations) from ``center``
+
+        ``center`` defaults to the mean. Exactly one of ``tolerance`` and ``sigma`` is required.
+        """
+        if (tolerance is None) == (sigma is None):
+            raise ValueError("Give exactly one of tolerance or sigma")
+        if not self._n:
+            return np.empty(0, dtype=np.intp)
+        v = self.values
+        center = float(v.mean()) if center is None else center
+        if sigma is not None:
+            tolerance = sigma * (float(v.std(ddof=1)) if self._n > 1 else 0.0)
+        return np.flatnonzero(np.abs(v - center) > tolerance)
+
+    def band_violations(self, low: float, high: float) -> np.ndarray:
+        """Indices of samples outside the closed band [low, high]"""
+        v = self.values
+        return np.flatnonzero((v < low) | (v > high))
+
+    def within_band(self, low: float, high: float) -> bool:
+        return not len(self.band_violations(low, high))
+
+    # ----------------------------- Evidence ------------------------------- #
+
+    def to_records(self) -> np.ndarray:
+        records = np.empty(self._n, dtype=SAMPLE_DTYPE)
+        records['t'] = self.times
+        records['value'] = self.values
+        return records
+
+    def save(self, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(path, self.to_records(), allow_pickle=False)
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path], name: Optional[str] = None, unit: str = "") -> "MeasurementSeries":
+        records = np.load(path, allow_pickle=False)
+        return cls.from_samples(name or Path(path).stem, records['value'], records['t'], unit)
+
+
+def _slug(text: str) -> str:
+    return re.sub(r'[^A-Za-z0-9]+', '_', text).strip('_').lower() or 'series'
+
+
+def save_evidence(series: MeasurementSeries, scenario: Optional[str] = None,
+                  directory: Optional[Union[str, Path]] = None) -> Path:
+    """Write ``series`` as ``<scenario>__<series>_<timestamp>.npy`` under the evidence directory"""
+    stamp = time.strftime('%Y%m%d_%H%M%S')
+    name = f"{_slug(series.name)}_{stamp}.npy"
+    if scenario:
+        name = f"{_slug(scenario)}__{name}"
+    return series.save(Path(directory or EVIDENCE_DIR) / name)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Pin Registry - Immutable signal/pin lookup tables built from the pin matrix
+
+config/pinout-cfg.yaml (ATmega32A pins) and config/connections-cfg.yaml (DB9
+connectors, Arduino test harness wiring) are merged into one PinEntry per
+signal. The registry indexes the entries by signal name, Arduino harness pin,
+ATmega port/pin, DB9 connector pin and sonicator unit. Each lookup is a
+single dict access, so nothing scans lists per call. A precompiled regex
+finds every known signal name in free text, such as Behave step
+descriptions, in one pass.
+
+    registry = pin_registry()
+    registry.signal("START_4").harness_pin      # 'A3'
+    registry.by_harness_pin["D7"].dut_pin       # 'PB0'
+    registry.extract_signals('set "START_4" and RESET_4')  # ['START_4', 'RESET_4']
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+import re
+import threading
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Pattern, Tuple
+
+try:
+    from .config_service import HILConfig, hil_config
+except ImportError:
+    from config_service import HILConfig, hil_config
+
+
+@dataclass(frozen=True)
+class PinEntry:
+    """Everything the pin matrix says about one signal"""
+    signal: str
+    dut_pin: Optional[str] = None              # ATmega32A port/pin, e.g. 'PB0'
+    physical_pin: Optional[int] = None         # DIP-40 pin number
+    direction: Optional[str] = None            # DUT perspective: IN / OUT / ANALOG
+    sonicator: Optional[int] = None
+    harness_pin: Optional[str] = None          # Arduino test harness pin, e.g. 'D7'
+    harness_direction: Optional[str] = None    # harness_to_dut / dut_to_harness
+    db9: Tuple[Tuple[str, int], ...] = ()      # (connector, pin) pairs
+    function: str = ""
+    modbus_register: Optional[str] = None
+    modbus_address: Optional[int] = None
+
+
+def compile_signal_matcher(signals) -> Pattern[str]:
+    """One regex matching any of ``signals`` as a whole word (longest name wins)"""
+    names = sorted(set(signals), key=lambda s: (-len(s), s))
+    if not names:
+        return re.compile(r"(?!x)x")
+    return re.compile(r"(?<![A-Za-z0-9_])(" + "|".join(map(re.escape, names)) + r")(?![A-Za-z0-9_])")
+
+
+def _address(value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(str(value), 0)
+    except ValueError:
+        return None
+
+
+class PinRegistry:
+    """Read-only indexes over the merged pin matrix"""
+
+    def __init__(self, entries: List[PinEntry]) -> None:
+        self.entries: Tuple[PinEntry, ...] = tuple(entries)
+        by_signal: Dict[str, PinEntry] = {}
+        by_harness: Dict[str, PinEntry] = {}
+        by_dut: Dict[str, PinEntry] = {}
+        by_db9: Dict[Tuple[str, int], PinEntry] = {}
+        by_sonicator: Dict[int, List[PinEntry]] = {}
+        for entry in self.entries:
+            by_signal[entry.signal] = entry
+            if entry.harness_pin:
+                by_harness[entry.harness_pin] = entry
+            if entry.dut_pin:
+                by_dut[entry.dut_pin] = entry
+            for connector_pin in entry.db9:
+                by_db9[connector_pin] = entry
+            if entry.sonicator is not None:
+                by_sonicator.setdefault(entry.sonicator, []).append(entry)
+        self.by_signal: Mapping[str, PinEntry] = MappingProxyType(by_signal)
+        self.by_harness_pin: Mapping[str, PinEntry] = MappingProxyType(by_harness)
+        self.by_dut_pin: Mapping[str, PinEntry] = MappingProxyType(by_dut)
+        self.by_db9: Mapping[Tuple[str, int], PinEntry] = MappingProxyType(by_db9)
+        self.by_sonicator: Mapping[int, Tuple[PinEntry, ...]] = MappingProxyType(
+            {unit: tuple(group) for unit, group in by_sonicator.items()})
+        # Signal -> harness pin, in wiring order (what HardwareInterface sends to the harness)
+        self.harness_pins: Mapping[str, str] = MappingProxyType(
+            {e.signal: e.harness_pin for e in self.entries if e.harness_pin})
+        aliases: Dict[str, PinEntry] = {}
+        for index in (by_dut, by_harness, by_signal):
+            aliases.update({name.upper(): entry for name, entry in index.items()})
+        self._aliases: Mapping[str, PinEntry] = MappingProxyType(aliases)
+        self.signal_matcher: Pattern[str] = compile_signal_matcher(by_signal)
+
+    @classmethod
+    def from_modules(cls, pinout: Optional[Mapping[str, Any]],
+                     connections: Optional[Mapping[str, Any]]) -> "PinRegistry":
+        """Merge the pinout and connections modules (as parsed from YAML) by signal name"""
+        entries: Dict[str, PinEntry] = {}
+
+        def merge(signal: str, **values: Any) -> None:
+            current = entries.get(signal) or PinEntry(signal=signal)
+            # First source to provide a field wins; pinout-cfg.yaml is read first
+            updates = {k: v for k, v in values.items() if v not in (None, "") and getattr(current, k) in (None, "")}
+            entries[signal] = replace(current, **updates)
+
+        for dut_pin, pin in ((pinout or {}).get('dut', {}) or {}).get('pins', {}).items():
+            if not pin or not pin.get('signal'):
+                continue
+            merge(pin['signal'], dut_pin=dut_pin, physical_pin=pin.get('pin'), direction=pin.get('direction'),
+                  sonicator=pin.get('sonicator'), function=pin.get('function'),
+                  modbus_register=pin.get('modbus_register'), modbus_address=_address(pin.get('modbus_address')))
+
+        harness = ((connections or {}).get('test_harness', {}) or {}).get('connections', {}) or {}
+        for harness_pin, link in harness.items():
+            if not link or not link.get('signal'):
+                continue
+            merge(link['signal'], harness_pin=str(harness_pin), harness_direction=link.get('direction'),
+                  dut_pin=link.get('dut_pin'), sonicator=link.get('sonicator'), function=link.get('function'))
+
+        for connector, spec in ((connections or {}).get('db9_connectors', {}) or {}).items():
+            spec = spec or {}
+            for number, link in (spec.get('pins', {}) or {}).items():
+                if not link or not link.get('signal'):
+                    continue
+                signal = link['signal']
+                merge(signal, dut_pin=link.get('dut_pin'), direction=link.get('direction'),
+                      sonicator=spec.get('sonicator_id'), function=link.get('function'))
+                entries[signal] = replace(entries[signal], db9=entries[signal].db9 + ((connector, int(number)),))
+
+        # Harness-wired signals first (wiring order), then the rest of the matrix
+        ordered = [entries[link['signal']] for link in harness.values() if link and link.get('signal')]
+        ordered += [entry for entry in entries.values() if not entry.harness_pin]
+        return cls(list(dict.fromkeys(ordered)))
+
+    @classmethod
+    def from_config(cls, config: HILConfig) -> "PinRegistry":
+        return cls.from_modules(config.modules.get('pinout'), config.modules.get('connections'))
+
+    # ----------------------------- Lookups -------------------------------- #
+
+    def signal(self, name: str) -> Optional[PinEntry]:
+        return self.by_signal.get(name)
+
+    def resolve(self, name: str) -> Optional[PinEntry]:
+        """Entry for a signal name, harness pin ('D7') or ATmega pin ('PB0'), case-insensitive"""
+        return self._aliases.get(str(name).strip().upper())
+
+    def sonicator(self, unit: int) -> Tuple[PinEntry, ...]:
+        return self.by_sonicator.get(unit, ())
+
+    def extract_signals(self, text: str) -> List[str]:
+        """Known signal names mentioned in ``text``, in order of first appearance"""
+        return list(dict.fromkeys(m.group(1) for m in self.signal_matcher.finditer(text or "")))
+
+
+_cache_lock = threading.Lock()
+_cached: Tuple[Optional[HILConfig], Optional[PinRegistry]] = (None, None)
+
+
+def pin_registry(config: Optional[HILConfig] = None) -> PinRegistry:
+    """Registry for the current HIL config snapshot; rebuilt only after a config reload"""
+    global _cached
+    config = config or hil_config()
+    with _cache_lock:
+        if _cached[0] is not config:
+            _cached = (config, PinRegistry.from_config(config))
+        return _cached[1]
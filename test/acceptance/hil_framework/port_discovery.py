@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Port Discovery - Find the harness / ArduinoISP serial port once and remember it
+
+Every USB serial device is fingerprinted by VID:PID:serial-number. When a
+probe (harness PING, ArduinoISP sign-on) succeeds on a device, the fingerprint
+is cached per role in ``.hil_cache/ports.json``. Later lookups go straight to
+the device carrying the cached fingerprint, even if it was renumbered, and
+validate only that one port. Only when it is gone or fails the probe are the
+remaining candidates probed, all in parallel, instead of opening each port in
+turn and sitting through its Arduino auto-reset.
+
+    discovery = PortDiscovery()
+    found = discovery.find(ROLE_HARNESS, open_harness, preferred="/dev/ttyACM0")
+    if found:
+        connection = found.handle   # whatever the probe returned (open port)
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+import fnmatch
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_CACHE_FILE = Path(__file__).resolve().parents[3] / ".hil_cache" / "ports.json"
+
+ROLE_HARNESS = "harness"
+ROLE_ISP = "isp"
+
+# USB vendor IDs of Arduino boards and the USB-serial bridges used on clones
+ARDUINO_VIDS = {0x2341, 0x2A03}
+BRIDGE_VIDS = {0x1A86, 0x0403, 0x10C4}  # CH340, FTDI, CP210x
+_DESCRIPTION_HINTS = ('arduino', 'uno', 'nano', 'mega')
+_BRIDGE_HINTS = ('ch340', 'ftdi', 'cp210x')
+_DEVICE_HINTS = ('usbmodem', 'usbserial', 'ttyacm', 'ttyusb', 'wchusbserial')
+
+
+@dataclass
+class PortCandidate:
+    """One serial device as reported by pyserial, with its fingerprint and score"""
+    device: str
+    vid: Optional[int] = None
+    pid: Optional[int] = None
+    serial_number: Optional[str] = None
+    description: str = ""
+    manufacturer: str = ""
+    score: int = 0
+
+    @property
+    def fingerprint(self) -> str:
+        vid = f"{self.vid:04X}" if self.vid is not None else "----"
+        pid = f"{self.pid:04X}" if self.pid is not None else "----"
+        return f"{vid}:{pid}:{self.serial_number or ''}"
+
+    @property
+    def arduino_like(self) -> bool:
+        return self.score > 0
+
+
+@dataclass
+class DiscoveryResult:
+    device: str
+    fingerprint: str
+    handle: Any
+    cached: bool  # True when the cached mapping was valid and nothing else was probed
+
+
+def _score(port: Any) -> int:
+    description = (port.description or "").lower()
+    manufacturer = (getattr(port, 'manufacturer', None) or "").lower()
+    device = port.device.lower()
+    score = 0
+    if port.vid in ARDUINO_VIDS or any(h in description or h in manufacturer for h in _DESCRIPTION_HINTS):
+        score += 10
+    if port.vid in BRIDGE_VIDS or any(h in description or h in manufacturer for h in _BRIDGE_HINTS):
+        score += 5
+    if any(h in device for h in _DEVICE_HINTS):
+        score += 3
+    # macOS: call-out devices (cu.*) do not block waiting for carrier detect
+    if score and sys.platform == "darwin" and port.device.startswith("/dev/cu."):
+        score += 1
+    return score
+
+
+def list_candidates(ports: Optional[List[Any]] = None) -> List[PortCandidate]:
+    """Serial devices, most Arduino-like first"""
+    if ports is None:
+        try:
+            import serial.tools.list_ports
+            ports = serial.tools.list_ports.comports()
+        except Exception:
+            ports = []
+    candidates = [PortCandidate(device=p.device, vid=p.vid, pid=p.pid, serial_number=p.serial_number,
+                                description=p.description or "", manufacturer=getattr(p, 'manufacturer', None) or "",
+                                score=_score(p))
+                  for p in ports]
+    candidates.sort(key=lambda c: (-c.score, c.device))
+    return candidates
+
+
+class PortDiscovery:
+    """Per-role cache of which USB device answered, with parallel probing as the fallback"""
+
+    def __init__(self, cache_file: Optional[Path] = None,
+                 port_lister: Callable[[], List[PortCandidate]] = list_candidates,
+                 max_workers: int = 8) -> None:
+        env_file = os.environ.get("HIL_PORT_CACHE")
+        self.cache_file = Path(cache_file or env_file or DEFAULT_CACHE_FILE)
+        self.port_lister = port_lister
+        self.max_workers = max_workers
+        self.logger = logging.getLogger(__name__)
+
+    # ----------------------------- Lookups -------------------------------- #
+
+    def find(self, role: str, probe: Callable[[str], Any], preferred: Optional[str] = None,
+             scan: bool = True) -> Optional[DiscoveryResult]:
+        """Return the first device whose probe succeeds, trying the cached device first
+
+        Args:
+            role: Cache slot (ROLE_HARNESS, ROLE_ISP)
+            probe: Called with a device path; returns a truthy handle (e.g. the open
+                port) on success. Handles from losing parallel probes are closed.
+            preferred: Configured port or glob pattern, tried right after the cache
+            scan: Probe every other Arduino-like port if the cached/preferred ones fail
+        """
+        candidates = self.port_lister()
+        by_device = {c.device: c for c in candidates}
+        pattern = preferred if preferred and any(ch in preferred for ch in "*?[") else None
+
+        ordered: List[PortCandidate] = []
+        cached = self._cached_candidate(role, candidates)
+        if cached is not None:
+            ordered.append(cached)
+        if preferred and not pattern and preferred not in [c.device for c in ordered]:
+            ordered.append(by_device.get(preferred) or PortCandidate(device=preferred))
+
+        # Fast path: validate the remembered / configured ports one at a time
+        for candidate in ordered:
+            handle = self._probe(probe, candidate.device)
+            if handle:
+                self._remember(role, candidate)
+                return DiscoveryResult(candidate.device, candidate.fingerprint, handle,
+                                       cached=candidate is cached)
+        if not scan:
+            return None
+
+        tried = {c.device for c in ordered}
+        remaining = [c for c in candidates if c.device not in tried and
+                     (c.arduino_like or (pattern and fnmatch.fnmatch(c.device, pattern)))]
+        if pattern:
+            # Ports matching the configured pattern win ties
+            remaining.sort(key=lambda c: not fnmatch.fnmatch(c.device, pattern))
+        found = self._probe_parallel(probe, remaining)
+        if found is None:
+            self.logger.warning(f"No {role} found on any of: {[c.device for c in remaining] or 'no ports'}")
+            return None
+        candidate, handle = found
+        self._remember(role, candidate)
+        return DiscoveryResult(candidate.device, candidate.fingerprint, handle, cached=False)
+
+    def best_guess(self, role: str) -> Optional[str]:
+        """Device for ``role`` without probing: the cached device if attached, else the best scored"""
+        candidates = self.port_lister()
+        cached = self._cached_candidate(role, candidates)
+        if cached is not None:
+            return cached.device
+        ranked = [c for c in candidates if c.arduino_like] or candidates
+        return ranked[0].device if ranked else None
+
+    def forget(self, role: str) -> None:
+        cache = self._load()
+        if cache.pop(role, None) is not None:
+            self._save(cache)
+
+    # ----------------------------- Internals ------------------------------ #
+
+    def _cached_candidate(self, role: str, candidates: List[PortCandidate]) -> Optional[PortCandidate]:
+        entry = self._load().get(role)
+        if not entry:
+            return None
+        matches = [c for c in candidates if c.fingerprint == entry.get('fingerprint')]
+        if not matches:
+            return None
+        if len(matches) > 1 or not matches[0].serial_number:
+            # Boards without a USB serial number (CH340 clones) only match on the same path
+            return next((c for c in matches if c.device == entry.get('device')), None)
+        return matches[0]
+
+    def _probe(self, probe: Callable[[str], Any], device: str) -> Any:
+        started = time.monotonic()
+        try:
+            handle = probe(device)
+        except Exception as e:
+            self.logger.debug(f"Probe of {device} failed: {e}")
+            handle = None
+        self.logger.debug(f"Probed {device} in {time.monotonic() - started:.2f}s: {'ok' if handle else 'no answer'}")
+        return handle
+
+    def _probe_parallel(self, probe: Callable[[str], Any], candidates: List[PortCandidate]):
+        if not candidates:
+            return None
+        winner = None
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(candidates)),
+                                thread_name_prefix="port-probe") as pool:
+            futures = {pool.submit(self._probe, probe, c.device): c for c in candidates}
+            for future in as_completed(futures):
+                handle = future.result()
+                if not handle:
+                    continue
+                if winner is None:
+                    winner = (futures[future], handle)
+                else:
+                    _close(handle)
+        return winner
+
+    def _remember(self, role: str, candidate: PortCandidate) -> None:
+        cache = self._load()
+        entry = {'fingerprint': candidate.fingerprint, 'device': candidate.device}
+        if {k: cache.get(role, {}).get(k) for k in entry} == entry:
+            return
+        cache[role] = dict(entry, updated=time.time())
+        self._save(cache)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, cache: Dict[str, Dict[str, Any]]) -> None:
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+            with open(tmp, 'w') as f:
+                json.dump(cache, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.cache_file)
+        except OSError as e:
+            self.logger.debug(f"Could not write port cache {self.cache_file}: {e}")
+
+
+def _close(handle: Any) -> None:
+    close = getattr(handle, 'close', None)
+    if close:
+        try:
+            close()
+        except Exception:
+            pass
+
+
+def open_harness(device: str, baud_rate: int = 115200, boot_timeout: float = 4.0,
+                 write_timeout: float = 2.0) -> Optional[Any]:
+    """Open ``device`` and return the port once the Test Harness answers PING, else None
+
+    Opening resets the Arduino, so PING is repeated until the sketch is up
+    instead of sleeping for a fixed boot time.
+    """
+    import serial
+    connection = serial.Serial(port=device, baudrate=baud_rate, timeout=0.1, write_timeout=write_timeout)
+    try:
+        deadline = time.monotonic() + boot_timeout
+        buffer = b""
+        next_ping = 0.0
+        while time.monotonic() < deadline:
+            now = time.monotonic()
+            if now >= next_ping:
+                connection.write(b"PING\n")
+                connection.flush()
+                next_ping = now + 0.25
+            buffer += connection.read(connection.in_waiting or 1)
+            lines = buffer.split(b"\n")
+            buffer = lines.pop()
+            if any(b"PONG" in line or b"OK" in line or b"READY" in line.upper() for line in lines):
+                # Drop replies to the extra PINGs still in flight
+                time.sleep(0.05)
+                connection.reset_input_buffer()
+                return connection
+    except Exception:
+        connection.close()
+        raise
+    connection.close()
+    return None
+
+
+def isp_sign_on(device: str) -> bool:
+    """True when ``device`` runs the ArduinoISP sketch (STK500v1 sign-on 'AVR ISP')"""
+    try:
+        from .stk500v1 import ARDUINO_ISP_SIGN_ON, STK500v1Programmer
+    except ImportError:
+        from stk500v1 import ARDUINO_ISP_SIGN_ON, STK500v1Programmer
+    with STK500v1Programmer(device) as programmer:
+        return programmer.sign_on.startswith(ARDUINO_ISP_SIGN_ON)
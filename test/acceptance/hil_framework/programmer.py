@@ -3,7 +3,8 @@
 Arduino ISP Programmer - Interface for programming ATmega32A via Arduino as ISP
 
 This module provides the programming interface for uploading firmware to the 
-ATmega32A target using Arduino as ISP.
+ATmega32A target using Arduino as ISP. Operations run over a persistent native
+STK500v1 session when enabled, with avrdude as the fallback.
 
 Author: Cannasol Technologies  
 License: Proprietary
@@ -16,16 +17,34 @@ import os
 import glob
 import signal
 import shutil
+import tempfile
 from pathlib import Path
 from typing import Optional, List, Iterable
 import sys
 
+import serial
+
+try:
+    from .config_service import ProgrammerTimeouts, hil_config
+    from .intel_hex import FlashImage, changed_pages, needs_erase
+    from .stk500v1 import ATMEGA32_SIGNATURE, STK500Error, STK500v1Programmer
+except ImportError:
+    from config_service import ProgrammerTimeouts, hil_config
+    from intel_hex import FlashImage, changed_pages, needs_erase
+    from stk500v1 import ATMEGA32_SIGNATURE, STK500Error, STK500v1Programmer
+
 
 class ArduinoISPProgrammer:
     """Arduino as ISP programmer interface for ATmega32A"""
 
-    def __init__(self, programmer_port: str = '/dev/ttyUSB0', avrdude_conf: Optional[str] = None, bitclock: str = '125kHz'):
-        """Initialize Arduino ISP programmer"""
+    def __init__(self, programmer_port: str = '/dev/ttyUSB0', avrdude_conf: Optional[str] = None, bitclock: str = '125kHz',
+                 native_isp: bool = False):
+        """Initialize Arduino ISP programmer
+
+        Args:
+            native_isp: Talk STK500v1 directly over one kept-open session; avrdude
+                is used if the session cannot be established or fails
+        """
         self.programmer_port = programmer_port
         self.logger = logging.getLogger(__name__)
         self.avrdude_cmd = self._resolve_avrdude()
@@ -36,55 +55,41 @@ class ArduinoISPProgrammer:
         # Use stk500v1 to match PlatformIO upload settings for Arduino as ISP
         self.programmer_type = 'stk500v1'
         self.baud_rate = 19200
+        self.native_isp = native_isp
+        self._session: Optional[STK500v1Programmer] = None
         
         # Load timeout configuration
         self._load_timeout_config()
     
     def _load_timeout_config(self):
-        """Load timeout configuration from HIL config file"""
+        """Load timeout configuration from the shared HIL config"""
         try:
-            import yaml
-            from pathlib import Path
-            config_path = Path(__file__).parent / 'hil_config.yaml'
-            if config_path.exists():
-                with open(config_path, 'r') as f:
-                    config = yaml.safe_load(f)
-                    timeouts = config.get('timeouts', {}).get('programmer', {})
-                    self.avrdude_check_timeout = timeouts.get('avrdude_check', 10)
-                    self.connection_test_timeout = timeouts.get('connection_test', 30)
-                    self.firmware_programming_timeout = timeouts.get('firmware_programming', 120)
-                    self.fuse_read_timeout = timeouts.get('fuse_read', 30)
-                    self.firmware_verification_timeout = timeouts.get('firmware_verification', 60)
-                    self.chip_erase_timeout = timeouts.get('chip_erase', 30)
-                    self.pid_detection_timeout = timeouts.get('pid_detection', 5)
-                    self.arduino_check_timeout = timeouts.get('arduino_check', 10)
-                    self.platformio_upload_timeout = timeouts.get('platformio_upload', 300)
-            else:
-                # Default values if config file not found
-                self.avrdude_check_timeout = 10
-                self.connection_test_timeout = 30
-                self.firmware_programming_timeout = 120
-                self.fuse_read_timeout = 30
-                self.firmware_verification_timeout = 60
-                self.chip_erase_timeout = 30
-                self.pid_detection_timeout = 5
-                self.arduino_check_timeout = 10
-                self.platformio_upload_timeout = 300
+            timeouts = hil_config().programmer_timeouts
         except Exception as e:
             self.logger.warning(f"Failed to load timeout configuration: {e}. Using defaults.")
-            # Default values if config loading fails
-            self.avrdude_check_timeout = 10
-            self.connection_test_timeout = 30
-            self.firmware_programming_timeout = 120
-            self.fuse_read_timeout = 30
-            self.firmware_verification_timeout = 60
-            self.chip_erase_timeout = 30
-            self.pid_detection_timeout = 5
-            self.arduino_check_timeout = 10
-            self.platformio_upload_timeout = 300
+            timeouts = ProgrammerTimeouts()
+        self.avrdude_check_timeout = timeouts.avrdude_check
+        self.connection_test_timeout = timeouts.connection_test
+        self.firmware_programming_timeout = timeouts.firmware_programming
+        self.fuse_read_timeout = timeouts.fuse_read
+        self.firmware_verification_timeout = timeouts.firmware_verification
+        self.chip_erase_timeout = timeouts.chip_erase
+        self.pid_detection_timeout = timeouts.pid_detection
+        self.arduino_check_timeout = timeouts.arduino_check
+        self.platformio_upload_timeout = timeouts.platformio_upload
         
     def verify_connection(self) -> bool:
         """Verify Arduino ISP programmer connection"""
+        if self.native_isp:
+            try:
+                signature = self._native_session().read_signature()
+                if signature == ATMEGA32_SIGNATURE:
+                    self.logger.info("Arduino ISP programmer connection verified")
+                    return True
+                self.logger.error(f"Unexpected device signature: {signature.hex()}")
+                return False
+            except (STK500Error, serial.SerialException, OSError) as e:
+                self._native_failed(e)
         try:
             # Test avrdude availability
             result = subprocess.run(
@@ -148,6 +153,17 @@ class ArduinoISPProgrammer:
                 self.logger.error(f"Firmware file not found: {firmware_path}")
                 return False
 
+            if self.native_isp:
+                try:
+                    session = self._native_session()
+                    image = FlashImage.from_hex(firmware_path)
+                    session.chip_erase()
+                    pages = session.write_image(image)
+                    self.logger.info(f"Firmware programming completed successfully ({pages} pages)")
+                    return True
+                except (STK500Error, serial.SerialException, OSError) as e:
+                    self._native_failed(e)
+
             # Quick check: is an Arduino (programmer) present?
             if not self._arduino_present():
                 self.logger.error("Arduino ISP programmer not detected; skipping programming")
@@ -207,8 +223,143 @@ class ArduinoISPProgrammer:
             self._free_port_users()
             return False
             
+    def program_firmware_delta(self, firmware_path: str, previous_image: Optional[str] = None) -> bool:
+        """Program only the flash pages that differ from the image already on the target
+
+        Args:
+            firmware_path: Intel HEX image to program
+            previous_image: Intel HEX of what the target last held (programming cache);
+                it is read back against the target before any delta is based on it.
+                When missing, the flash is read back once to find out.
+
+        Whenever the base cannot be confirmed, the whole image is erased, written
+        and verified instead.
+        """
+        try:
+            current = FlashImage.from_hex(firmware_path)
+            with tempfile.TemporaryDirectory(prefix='hil-delta-') as workdir:
+                if previous_image and Path(previous_image).exists():
+                    previous = FlashImage.from_hex(previous_image)
+                    # The board may have been reflashed by hand or by another tool since the
+                    # record was made; a delta against the wrong base mixes two images
+                    if not self._flash_matches(previous, set(previous.pages()) | set(current.pages()), workdir):
+                        self.logger.warning("Target flash does not match the cached image; programming full image")
+                        return self._program_full_verified(firmware_path)
+                else:
+                    previous_image = os.path.join(workdir, 'flash.hex')
+                    if not self.read_flash(previous_image):
+                        self.logger.warning("Flash read-back failed; programming full image")
+                        return self._program_full_verified(firmware_path)
+                    previous = FlashImage.from_hex(previous_image)
+
+                pages = changed_pages(previous, current)
+                if not pages:
+                    self.logger.info("Flash already matches firmware image; nothing to program")
+                    return True
+                if needs_erase(previous, current, pages):
+                    # ISP cannot erase single pages on the ATmega32
+                    self.logger.info(f"{len(pages)} changed page(s) need erasing; programming full image")
+                    return self._program_full_verified(firmware_path)
+
+                self.logger.info(f"Programming {len(pages)} changed page(s) of {len(current.pages())}")
+                if self.native_isp:
+                    try:
+                        session = self._native_session()
+                        session.write_image(current, pages)
+                        mismatched = session.verify_image(current, pages)
+                        if not mismatched:
+                            self.logger.info("Delta programming completed successfully")
+                            return True
+                        self.logger.error(f"Delta verify failed at pages {[hex(p) for p in mismatched]}")
+                        return self._program_full_verified(firmware_path)
+                    except (STK500Error, serial.SerialException, OSError) as e:
+                        self._native_failed(e)
+
+                delta_path = os.path.join(workdir, 'delta.hex')
+                current.write_hex(delta_path, pages)
+                # avrdude verifies what it wrote, i.e. only the changed pages
+                result = subprocess.run(
+                    self._avrdude_base_cmd() + ['-U', f'flash:w:{delta_path}:i', '-D'],
+                    capture_output=True,
+                    text=True,
+                    timeout=self.firmware_programming_timeout
+                )
+                if result.returncode == 0:
+                    self.logger.info("Delta programming completed successfully")
+                    return True
+                self.logger.error(f"Delta programming failed: {result.stderr}")
+                self._free_port_users()
+                return self._program_full_verified(firmware_path)
+
+        except ValueError as e:
+            self.logger.error(f"Invalid firmware image: {e}")
+            return False
+        except subprocess.TimeoutExpired:
+            self.logger.error("Delta programming timed out")
+            self._free_port_users()
+            return False
+        except Exception as e:
+            self.logger.error(f"Delta programming error: {e}")
+            self._free_port_users()
+            return False
+
+    def _flash_matches(self, image: FlashImage, pages, workdir: str) -> bool:
+        """True when the target holds ``image`` on every page in ``pages`` (read-back)"""
+        if self.native_isp:
+            try:
+                return not self._native_session().verify_image(image, pages)
+            except (STK500Error, serial.SerialException, OSError) as e:
+                self._native_failed(e)
+        expected = os.path.join(workdir, 'base.hex')
+        image.write_hex(expected, pages)
+        try:
+            result = subprocess.run(
+                self._avrdude_base_cmd() + ['-U', f'flash:v:{expected}:i'],
+                capture_output=True,
+                text=True,
+                timeout=self.firmware_verification_timeout
+            )
+            return result.returncode == 0
+        except Exception as e:
+            self.logger.error(f"Flash base verification error: {e}")
+            return False
+
+    def _program_full_verified(self, firmware_path: str) -> bool:
+        """Erase, write the whole image and read it back"""
+        if not (self.erase_chip() and self.program_firmware(firmware_path)):
+            return False
+        return self.verify_firmware(firmware_path)
+
+    def read_flash(self, output_path: str) -> bool:
+        """Read the whole target flash into an Intel HEX file"""
+        if self.native_isp:
+            try:
+                self._native_session().read_flash().write_hex(output_path)
+                return True
+            except (STK500Error, serial.SerialException, OSError) as e:
+                self._native_failed(e)
+        try:
+            result = subprocess.run(
+                self._avrdude_base_cmd() + ['-U', f'flash:r:{output_path}:i'],
+                capture_output=True,
+                text=True,
+                timeout=self.firmware_verification_timeout
+            )
+            if result.returncode == 0:
+                return True
+            self.logger.error(f"Flash read failed: {result.stderr}")
+            return False
+        except Exception as e:
+            self.logger.error(f"Flash read error: {e}")
+            return False
+
     def read_fuses(self) -> Optional[dict]:
         """Read ATmega32A fuse settings"""
+        if self.native_isp:
+            try:
+                return {name: f"{value:02x}" for name, value in self._native_session().read_fuses().items()}
+            except (STK500Error, serial.SerialException, OSError) as e:
+                self._native_failed(e)
         try:
             fuses = {}
             
@@ -243,6 +394,17 @@ class ArduinoISPProgrammer:
         try:
             if not Path(firmware_path).exists():
                 return False
+
+            if self.native_isp:
+                try:
+                    mismatched = self._native_session().verify_image(FlashImage.from_hex(firmware_path))
+                    if not mismatched:
+                        self.logger.info("Firmware verification successful")
+                        return True
+                    self.logger.error(f"Firmware verification failed at pages {[hex(p) for p in mismatched]}")
+                    return False
+                except (STK500Error, serial.SerialException, OSError) as e:
+                    self._native_failed(e)
                 
             cmd = [self.avrdude_cmd]
             if self.avrdude_conf:
@@ -276,6 +438,13 @@ class ArduinoISPProgrammer:
             
     def erase_chip(self) -> bool:
         """Erase ATmega32A chip"""
+        if self.native_isp:
+            try:
+                self._native_session().chip_erase()
+                self.logger.info("Chip erase completed")
+                return True
+            except (STK500Error, serial.SerialException, OSError) as e:
+                self._native_failed(e)
         try:
             cmd = [self.avrdude_cmd]
             if self.avrdude_conf:
@@ -307,13 +476,44 @@ class ArduinoISPProgrammer:
             self.logger.error(f"Erase error: {e}")
             return False
             
+    def close_session(self) -> None:
+        """Close the native session so the port (and target reset) is released"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
     def cleanup(self) -> None:
         """Clean up programmer interface"""
-        # No persistent connections to clean up for avrdude
+        self.close_session()
         self.logger.info("Programmer interface cleanup completed")
 
     # -------------------------- Internal helpers --------------------------- #
 
+    def _native_session(self) -> STK500v1Programmer:
+        """Open the STK500v1 session on first use and keep it for later operations"""
+        if self._session is None:
+            self._session = STK500v1Programmer(self.programmer_port, self.baud_rate).open()
+        return self._session
+
+    def _native_failed(self, error: Exception) -> None:
+        """Drop a broken native session and use avrdude for the rest of this programmer's life"""
+        self.logger.warning(f"Native STK500v1 session failed ({error}); falling back to avrdude")
+        self.close_session()
+        self.native_isp = False
+
+    def _avrdude_base_cmd(self) -> List[str]:
+        """avrdude invocation for the Arduino as ISP programmer, without operations"""
+        cmd = [self.avrdude_cmd]
+        if self.avrdude_conf:
+            cmd += ['-C', self.avrdude_conf]
+        return cmd + [
+            '-c', self.programmer_type,
+            '-p', self.target_mcu,
+            '-P', self.programmer_port,
+            '-b', str(self.baud_rate),
+            '-B', self.bitclock,
+        ]
+
     def _resolve_avrdude(self, force_fallback: bool = False) -> str:
         """Resolve path to avrdude, checking system, local .pio, then ~/.platformio."""
         if not force_fallback:
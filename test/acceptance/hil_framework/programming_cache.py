@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Programming Cache - Skip redundant ISP flashes of unchanged firmware
+
+Records the SHA-256 of the last hex image flashed to each target (keyed by
+programmer port and MCU) in a small JSON file. Before trusting a record for
+the first time in a process the flash contents are checked with a read-back
+verify, so a board reflashed by hand or by another bench is never mistaken
+for current. A copy of each recorded image is kept next to the record so
+delta programming can diff against what the target actually holds.
+Three policies are supported:
+
+- cache:  flash only when the image differs from the verified record (default)
+- once:   flash unconditionally on the first request of the run, then never again
+- always: flash on every request (previous behaviour; also the forced override)
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set
+
+MODE_CACHE = "cache"
+MODE_ONCE = "once"
+MODE_ALWAYS = "always"
+MODES = (MODE_CACHE, MODE_ONCE, MODE_ALWAYS)
+
+DEFAULT_CACHE_FILE = Path(__file__).resolve().parents[3] / ".hil_cache" / "programming.json"
+
+
+def firmware_sha256(firmware_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(firmware_path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ProgrammingCache:
+    """Decides whether a firmware image actually needs to be flashed"""
+
+    def __init__(self, cache_file: Optional[Path] = None, mode: str = MODE_CACHE) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown programming mode '{mode}' (expected one of {', '.join(MODES)})")
+        self.cache_file = Path(cache_file) if cache_file else DEFAULT_CACHE_FILE
+        self.mode = mode
+        self.logger = logging.getLogger(__name__)
+        self._records: Dict[str, Dict[str, str]] = self._load()
+        # Device keys whose record was read back (or flashed) during this process
+        self._verified: Set[str] = set()
+        self._programmed_this_run: Set[str] = set()
+
+    def needs_programming(self, device_key: str, firmware_path: str, force: bool = False,
+                          verify: Optional[Callable[[str], bool]] = None) -> bool:
+        """True when ``firmware_path`` must be flashed to ``device_key``
+
+        Args:
+            device_key: Identifies the target (see ``device_key()``)
+            firmware_path: Intel HEX image about to be flashed
+            force: Flash regardless of mode or cache contents
+            verify: Read-back check ``verify(firmware_path) -> bool`` used the first
+                time a cached record is trusted in this process
+        """
+        if force or self.mode == MODE_ALWAYS:
+            return True
+        if self.mode == MODE_ONCE:
+            return device_key not in self._programmed_this_run
+
+        record = self._records.get(device_key)
+        if not record or record.get("sha256") != firmware_sha256(firmware_path):
+            return True
+        if device_key in self._verified:
+            return False
+        if verify is None:
+            return True
+        if verify(firmware_path):
+            self._verified.add(device_key)
+            self.logger.info(f"Flash on {device_key} matches {Path(firmware_path).name}; skipping programming")
+            return False
+        self.logger.info(f"Flash on {device_key} differs from cache record; reprogramming")
+        return True
+
+    def record(self, device_key: str, firmware_path: str) -> None:
+        """Remember a successful flash"""
+        sha = firmware_sha256(firmware_path)
+        self._records[device_key] = {
+            "sha256": sha,
+            "firmware": str(firmware_path),
+            "programmed_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        try:
+            self._image_dir().mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(firmware_path, self._image_dir() / f"{sha}.hex")
+        except OSError as e:
+            self.logger.debug(f"Failed to keep copy of programmed image: {e}")
+        self._verified.add(device_key)
+        self._programmed_this_run.add(device_key)
+        self._save()
+
+    def invalidate(self, device_key: str) -> None:
+        """Forget a target's flash contents (failed or foreign programming)"""
+        self._records.pop(device_key, None)
+        self._verified.discard(device_key)
+        self._save()
+
+    def previous_image(self, device_key: str) -> Optional[str]:
+        """Copy of the image last recorded for ``device_key``, if still available"""
+        record = self._records.get(device_key)
+        if not record:
+            return None
+        path = self._image_dir() / f"{record.get('sha256')}.hex"
+        return str(path) if path.exists() else None
+
+    @staticmethod
+    def device_key(programmer_port: str, target_mcu: str) -> str:
+        return f"{target_mcu}@{programmer_port}"
+
+    def _image_dir(self) -> Path:
+        return self.cache_file.parent / "images"
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        try:
+            with open(self.cache_file, "r") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self) -> None:
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                json.dump(self._records, f, indent=2)
+            os.replace(tmp, self.cache_file)
+            # Drop image copies no target refers to any more
+            referenced = {f"{r.get('sha256')}.hex" for r in self._records.values()}
+            if self._image_dir().is_dir():
+                for image in self._image_dir().glob("*.hex"):
+                    if image.name not in referenced:
+                        image.unlink()
+        except OSError as e:
+            self.logger.debug(f"Failed to persist programming cache: {e}")
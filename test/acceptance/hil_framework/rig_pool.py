@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Rig Pool - Registry and leasing scheduler for several identical HIL benches
+
+Rigs are registered in hil_config.yaml under ``rig_pool.rigs`` by the USB
+serial number of their harness Arduino (and optionally of a separate ISP
+programmer), so a rig keeps its identity when /dev/ttyACM* numbering changes.
+Any process that needs hardware (a Behave shard, a continuous-testing cycle,
+a web-UI execution) leases one rig at a time:
+
+    scheduler = RigScheduler.from_config(config)
+    with scheduler.lease("behave shard 2") as lease:
+        run_tests(lease.rig.harness_port, lease.rig.programmer_port)
+
+A lease is an exclusive ``flock`` on ``.hil_cache/rigs/<serial>.lock``, so it
+is shared correctly between unrelated processes and released by the kernel if
+the holder dies. ``flock`` is POSIX only; on Windows the pool reports itself
+disabled and the controller falls back to single-bench port discovery. Before a rig is handed out it is health-checked (harness
+PING by default); rigs that fail ``failure_threshold`` times in a row are
+quarantined for ``quarantine_seconds`` so one flaky bench cannot eat a run.
+
+    python -m test.acceptance.hil_framework.rig_pool status
+    python -m test.acceptance.hil_framework.rig_pool clear <serial>
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+import json
+import logging
+import os
+import socket
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+DEFAULT_STATE_DIR = Path(__file__).resolve().parents[3] / ".hil_cache" / "rigs"
+POOL_ENV_VAR = "HIL_RIG_POOL"
+
+STATE_AVAILABLE = "available"
+STATE_LEASED = "leased"
+STATE_QUARANTINED = "quarantined"
+STATE_OFFLINE = "offline"
+
+
+class NoRigAvailableError(RuntimeError):
+    """Raised when no healthy rig could be leased before the timeout"""
+
+
+@dataclass
+class Rig:
+    """One bench: harness Arduino plus (optionally separate) ISP programmer"""
+    serial: str
+    name: str
+    programmer_serial: Optional[str] = None
+    labels: List[str] = field(default_factory=list)
+    harness_port: Optional[str] = None
+    programmer_port: Optional[str] = None
+
+    @property
+    def present(self) -> bool:
+        return self.harness_port is not None
+
+
+def _usb_serial_ports() -> Dict[str, str]:
+    """USB serial number -> device path for every attached USB serial device"""
+    try:
+        import serial.tools.list_ports
+        return {p.serial_number: p.device for p in serial.tools.list_ports.comports() if p.serial_number}
+    except Exception:
+        return {}
+
+
+def harness_ping(rig: Rig) -> bool:
+    """Default health check: the harness answers PING"""
+    try:
+        from .hardware_interface import HardwareInterface
+    except ImportError:
+        from hardware_interface import HardwareInterface
+    hw = HardwareInterface(rig.harness_port)
+    try:
+        return bool(hw.ping())
+    finally:
+        hw.cleanup()
+
+
+class RigRegistry:
+    """Registered rigs, with device paths resolved from their USB serial numbers"""
+
+    def __init__(self, rigs: List[Rig], port_lookup: Callable[[], Dict[str, str]] = _usb_serial_ports):
+        self.rigs = {rig.serial: rig for rig in rigs}
+        self._port_lookup = port_lookup
+
+    @classmethod
+    def from_config(cls, entries: List[Dict[str, Any]], **kwargs) -> "RigRegistry":
+        rigs = []
+        for i, entry in enumerate(entries or []):
+            serial = str(entry['serial'])
+            rigs.append(Rig(serial=serial, name=entry.get('name') or f"rig-{i + 1}",
+                            programmer_serial=entry.get('programmer_serial'),
+                            labels=list(entry.get('labels') or [])))
+        return cls(rigs, **kwargs)
+
+    def refresh(self) -> List[Rig]:
+        """Re-resolve every rig's ports; rigs whose harness is unplugged get None"""
+        ports = self._port_lookup()
+        for rig in self.rigs.values():
+            rig.harness_port = ports.get(rig.serial)
+            # Without a separate programmer the harness Arduino is also the ISP
+            rig.programmer_port = ports.get(rig.programmer_serial) if rig.programmer_serial else rig.harness_port
+        return list(self.rigs.values())
+
+    def get(self, serial: str) -> Optional[Rig]:
+        return self.rigs.get(serial)
+
+
+class RigLease:
+    """Exclusive use of one rig until released"""
+
+    def __init__(self, scheduler: "RigScheduler", rig: Rig, owner: str, lock_fd: int):
+        self.scheduler = scheduler
+        self.rig = rig
+        self.owner = owner
+        self._lock_fd: Optional[int] = lock_fd
+
+    @property
+    def active(self) -> bool:
+        return self._lock_fd is not None
+
+    def release(self, healthy: Optional[bool] = None, error: str = "") -> None:
+        """Give the rig back; ``healthy`` feeds the quarantine bookkeeping when known"""
+        if self._lock_fd is None:
+            return
+        if healthy is not None:
+            self.scheduler.record_result(self.rig.serial, healthy, error)
+        self.scheduler._unlock(self._lock_fd)
+        self._lock_fd = None
+
+    def __enter__(self) -> "RigLease":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+
+class RigScheduler:
+    """Hands out healthy rigs to concurrent processes, quarantining flaky ones"""
+
+    def __init__(self, registry: RigRegistry, state_dir: Optional[Path] = None,
+                 health_check: Optional[Callable[[Rig], bool]] = harness_ping,
+                 failure_threshold: int = 3, quarantine_seconds: float = 1800.0,
+                 poll_interval: float = 2.0) -> None:
+        self.registry = registry
+        self.state_dir = Path(state_dir) if state_dir else DEFAULT_STATE_DIR
+        self.health_check = health_check
+        self.failure_threshold = max(1, failure_threshold)
+        self.quarantine_seconds = quarantine_seconds
+        self.poll_interval = poll_interval
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], **kwargs) -> "RigScheduler":
+        """Build from the ``rig_pool`` section of hil_config.yaml"""
+        pool = config.get('rig_pool', {}) or {}
+        options = {
+            'health_check': harness_ping if pool.get('health_check', True) else None,
+            'failure_threshold': pool.get('failure_threshold', 3),
+            'quarantine_seconds': pool.get('quarantine_seconds', 1800.0),
+            'poll_interval': pool.get('poll_interval', 2.0),
+        }
+        options.update(kwargs)
+        return cls(RigRegistry.from_config(pool.get('rigs', [])), **options)
+
+    @staticmethod
+    def enabled(config: Dict[str, Any]) -> bool:
+        """Pool mode is on via rig_pool.enabled or HIL_RIG_POOL=1 (POSIX hosts only)"""
+        override = os.environ.get(POOL_ENV_VAR)
+        if override is not None:
+            wanted = override.lower() in ('1', 'true', 'yes')
+        else:
+            wanted = bool((config.get('rig_pool', {}) or {}).get('enabled', False))
+        if wanted and fcntl is None:
+            logging.getLogger(__name__).warning("Rig pool needs flock (POSIX); using single-bench setup")
+            return False
+        return wanted
+
+    # ----------------------------- Leasing -------------------------------- #
+
+    def lease(self, owner: str = "", timeout: float = 0.0, labels: Optional[List[str]] = None,
+              serial: Optional[str] = None, exclude: Iterable[str] = ()) -> RigLease:
+        """Lease a healthy rig, waiting up to ``timeout`` seconds for one to free up
+
+        Args:
+            owner: Free-form description shown by ``status()``
+            timeout: Seconds to keep retrying while every rig is busy
+            labels: Only consider rigs carrying all of these labels
+            serial: Only consider this rig
+            exclude: Serial numbers to skip (e.g. rigs this caller already gave up on)
+
+        Raises NoRigAvailableError at once when no registered rig is left to wait
+        for, e.g. every matching rig is in ``exclude``.
+        """
+        owner = f"{socket.gethostname()}:{os.getpid()} {owner}".strip()
+        exclude = set(exclude)
+        if not any(self._matches(rig, labels, serial) and rig.serial not in exclude
+                   for rig in self.registry.rigs.values()):
+            reason = self._unavailable_reason(labels, serial)
+            raise NoRigAvailableError(f"{reason}; every matching rig already tried" if exclude else reason)
+        deadline = time.monotonic() + timeout
+        while True:
+            lease = self._try_lease(owner, labels, serial, exclude)
+            if lease is not None:
+                return lease
+            if time.monotonic() >= deadline:
+                raise NoRigAvailableError(self._unavailable_reason(labels, serial))
+            time.sleep(self.poll_interval)
+
+    def _try_lease(self, owner: str, labels: Optional[List[str]], serial: Optional[str],
+                   exclude: Set[str]) -> Optional[RigLease]:
+        state = self._read_state()
+        now = time.time()
+        for rig in self.registry.refresh():
+            if not self._matches(rig, labels, serial) or rig.serial in exclude:
+                continue
+            if not rig.present or state.get(rig.serial, {}).get('quarantined_until', 0) > now:
+                continue
+            fd = self._lock(rig.serial, owner)
+            if fd is None:
+                continue
+            if self.health_check is not None:
+                try:
+                    healthy, error = bool(self.health_check(rig)), "health check failed"
+                except Exception as e:
+                    healthy, error = False, f"health check error: {e}"
+                self.record_result(rig.serial, healthy, "" if healthy else error)
+                if not healthy:
+                    self.logger.warning(f"Rig {rig.name} ({rig.serial}) failed its health check")
+                    self._unlock(fd)
+                    continue
+            self.logger.info(f"Leased rig {rig.name} ({rig.serial}) on {rig.harness_port} to {owner}")
+            return RigLease(self, rig, owner, fd)
+        return None
+
+    @staticmethod
+    def _matches(rig: Rig, labels: Optional[List[str]], serial: Optional[str]) -> bool:
+        if serial and rig.serial != serial:
+            return False
+        return not labels or set(labels) <= set(rig.labels)
+
+    def _unavailable_reason(self, labels, serial) -> str:
+        rigs = self.registry.rigs.values()
+        if not rigs:
+            return "No rigs registered in rig_pool.rigs"
+        counts: Dict[str, int] = {}
+        for entry in self.status():
+            counts[entry['state']] = counts.get(entry['state'], 0) + 1
+        summary = ", ".join(f"{n} {state}" for state, n in sorted(counts.items()))
+        wanted = f" matching serial={serial}" if serial else f" with labels {labels}" if labels else ""
+        return f"No healthy rig available{wanted} ({summary})"
+
+    # --------------------------- Health state ----------------------------- #
+
+    def record_result(self, serial: str, healthy: bool, error: str = "") -> None:
+        """Count consecutive failures; quarantine once the threshold is reached"""
+        with self._state_update() as state:
+            entry = state.setdefault(serial, {})
+            entry['last_checked'] = time.time()
+            if healthy:
+                entry['failures'] = 0
+                entry.pop('last_error', None)
+                return
+            entry['failures'] = entry.get('failures', 0) + 1
+            entry['last_error'] = error
+            if entry['failures'] >= self.failure_threshold:
+                entry['quarantined_until'] = time.time() + self.quarantine_seconds
+                entry['failures'] = 0
+                self.logger.warning(f"Rig {serial} quarantined for {self.quarantine_seconds:.0f}s: {error}")
+
+    def clear_quarantine(self, serial: str) -> None:
+        with self._state_update() as state:
+            state.pop(serial, None)
+
+    def status(self) -> List[Dict[str, Any]]:
+        """One entry per registered rig with its current state and lease holder"""
+        state = self._read_state()
+        now = time.time()
+        result = []
+        for rig in self.registry.refresh():
+            entry = state.get(rig.serial, {})
+            holder = self._holder(rig.serial)
+            if entry.get('quarantined_until', 0) > now:
+                rig_state = STATE_QUARANTINED
+            elif not rig.present:
+                rig_state = STATE_OFFLINE
+            elif holder is not None:
+                rig_state = STATE_LEASED
+            else:
+                rig_state = STATE_AVAILABLE
+            result.append({
+                'serial': rig.serial,
+                'name': rig.name,
+                'state': rig_state,
+                'harness_port': rig.harness_port,
+                'programmer_port': rig.programmer_port,
+                'leased_by': holder,
+                'last_error': entry.get('last_error'),
+                'quarantined_until': entry.get('quarantined_until'),
+            })
+        return result
+
+    # ----------------------------- Internals ------------------------------ #
+
+    def _lock_path(self, serial: str) -> Path:
+        return self.state_dir / f"{serial}.lock"
+
+    def _lock(self, serial: str, owner: str) -> Optional[int]:
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self._lock_path(serial), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return None
+        os.ftruncate(fd, 0)
+        os.write(fd, owner.encode())
+        return fd
+
+    @staticmethod
+    def _unlock(fd: int) -> None:
+        try:
+            os.ftruncate(fd, 0)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def _holder(self, serial: str) -> Optional[str]:
+        path = self._lock_path(serial)
+        if not path.exists():
+            return None
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+            except OSError:
+                return path.read_text() or "unknown"
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            return None
+        finally:
+            os.close(fd)
+
+    def _read_state(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.state_dir / "state.json", "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @contextmanager
+    def _state_update(self) -> Iterator[Dict[str, Dict[str, Any]]]:
+        """Read-modify-write of state.json under an exclusive lock"""
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.state_dir / "state.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            state = self._read_state()
+            yield state
+            tmp = self.state_dir / f"state.json.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(state, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.state_dir / "state.json")
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+
+def main() -> int:
+    import argparse
+    import yaml
+
+    parser = argparse.ArgumentParser(description="HIL rig pool status and maintenance")
+    parser.add_argument('command', choices=['status', 'clear'])
+    parser.add_argument('serial', nargs='?', help="Rig serial number (clear)")
+    parser.add_argument('--config', default=str(Path(__file__).parent / 'hil_config.yaml'))
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        scheduler = RigScheduler.from_config(yaml.safe_load(f) or {}, health_check=None)
+    if args.command == 'clear':
+        if not args.serial:
+            parser.error("clear needs a rig serial number")
+        scheduler.clear_quarantine(args.serial)
+        return 0
+    for entry in scheduler.status():
+        holder = f" leased by {entry['leased_by']}" if entry['leased_by'] else ""
+        error = f" last error: {entry['last_error']}" if entry['last_error'] else ""
+        print(f"{entry['name']:<12} {entry['serial']:<24} {entry['state']:<12} "
+              f"{entry['harness_port'] or '-'}{holder}{error}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
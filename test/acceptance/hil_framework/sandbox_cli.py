@@ -19,11 +19,13 @@ from typing import Optional, List, Dict, Any
 # Handle both direct execution and module imports
 try:
     from .hardware_interface import HardwareInterface
+    from .hil_daemon import HILDaemonClient, RemoteHardwareInterface
     from .logger import HILLogger
 except ImportError:
     # Direct execution - add parent directory to path
     sys.path.insert(0, '.')
     from hardware_interface import HardwareInterface
+    from hil_daemon import HILDaemonClient, RemoteHardwareInterface
     from logger import HILLogger
 
 
@@ -547,11 +549,18 @@ def main():
     parser = argparse.ArgumentParser(description="HIL Sandbox CLI")
     parser.add_argument('--port', default='/dev/ttyUSB0', help='Serial port for Arduino Test Harness')
     parser.add_argument('--baud', type=int, default=115200, help='Baud rate')
+    parser.add_argument('--no-daemon', action='store_true',
+                        help='Open the serial port directly even if a HIL daemon is running')
     
     args = parser.parse_args()
     
-    # Initialize hardware interface
-    arduino = HardwareInterface(args.port, args.baud)
+    # Prefer the warm session of a running HIL daemon over reopening the port
+    client = None if args.no_daemon else HILDaemonClient.attach()
+    if client:
+        print(f"Attached to HIL daemon at {client.socket_path}")
+        arduino = RemoteHardwareInterface(client)
+    else:
+        arduino = HardwareInterface(args.port, args.baud)
     
     # Start sandbox CLI
     sandbox = SandboxCLI(arduino)
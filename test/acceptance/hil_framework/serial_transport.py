@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Serial Transport - Pipelined, event-driven line transport for the Arduino Test Harness
+
+The harness protocol is request/response. This module owns the serial port
+with a dedicated reader thread that splits incoming bytes into lines and hands
+each reply to the command it answers, waking the caller the moment the newline
+arrives instead of polling ``in_waiting``.
+
+Every command is written with a sequence tag (``#17 READ ADC A1``) and the
+harness echoes the tag in front of its reply (``#17 OK ADC=512``), so several
+commands may be in flight at once and replies are matched by tag, never by
+position. A command that times out is forgotten immediately; if its reply
+turns up later the unknown tag identifies it and it is discarded. A command
+may claim more than one tagged line (e.g. a ``BATCH`` frame) by supplying a
+completion predicate over the lines collected so far. Untagged lines (boot
+banners, debug prints, monitor output) are kept in a bounded unsolicited
+buffer and never taken as replies.
+
+While the harness streams telemetry (``STREAM ON``) binary frames arrive
+between response lines. ``split_records`` separates them from the lines and
+hands their payloads to ``frame_handler`` (see telemetry_stream.py).
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+import collections
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Collection, Deque, Dict, Iterator, List, Optional, Tuple
+
+# Telemetry frame envelope: A5 5A <len> <payload> <xor of len and payload bytes>
+FRAME_SYNC = b"\xa5\x5a"
+FRAME_OVERHEAD = len(FRAME_SYNC) + 2
+
+# Command/reply correlation tags: "#<n> " in front of a command and its reply lines
+TAG_PREFIX = "#"
+TAG_LIMIT = 0xFFFF
+
+
+class TransportClosedError(RuntimeError):
+    """Raised when a command is submitted to a transport that is not running."""
+
+
+def frame_checksum(payload: bytes) -> int:
+    """XOR of the length byte and every payload byte"""
+    check = len(payload)
+    for byte in payload:
+        check ^= byte
+    return check
+
+
+def tag_command(tag: int, command: str) -> str:
+    """Command line with its correlation tag, e.g. ``#17 PING``"""
+    return f"{TAG_PREFIX}{tag} {command}"
+
+
+def split_tag(line: str) -> Tuple[Optional[int], str]:
+    """Split a reply line into (tag, body); the tag is None for untagged lines"""
+    if line.startswith(TAG_PREFIX):
+        tag, _, body = line[len(TAG_PREFIX):].partition(" ")
+        if tag.isdigit():
+            return int(tag), body.strip()
+    return None, line
+
+
+def next_tag(last: int, in_use: Collection[int]) -> int:
+    """Next free tag after ``last``, wrapping at TAG_LIMIT"""
+    tag = last
+    for _ in range(TAG_LIMIT):
+        tag = tag % TAG_LIMIT + 1
+        if tag not in in_use:
+            return tag
+    raise RuntimeError("Every command tag is outstanding")
+
+
+def split_records(buffer: bytearray, line: bytearray) -> Iterator[Tuple[bool, Optional[bytes]]]:
+    """Consume complete lines and telemetry frames from the front of ``buffer``
+
+    Yields ``(is_frame, body)``: raw line bytes without the newline, or a frame
+    payload (None when its checksum is wrong). Incomplete data is left in
+    ``buffer`` for the next call. Response lines are ASCII, so a line can never
+    start with the 0xA5 sync byte. The start of a line that a frame cuts into
+    is held in ``line`` (owned by the caller, kept between calls) until the
+    rest of the line arrives after the frame.
+    """
+    while buffer:
+        if buffer[0] == FRAME_SYNC[0]:
+            if len(buffer) < 3:
+                return
+            if buffer[1] != FRAME_SYNC[1]:
+                del buffer[:1]
+                continue
+            end = FRAME_OVERHEAD + buffer[2]
+            if len(buffer) < end:
+                return
+            payload = bytes(buffer[3:end - 1])
+            valid = frame_checksum(payload) == buffer[end - 1]
+            del buffer[:end]
+            yield True, payload if valid else None
+            continue
+        newline = buffer.find(b"\n")
+        sync = buffer.find(FRAME_SYNC)
+        if 0 <= sync and (newline < 0 or sync < newline):
+            # Partial line cut off by a frame: set it aside so the frame is not read as text
+            line.extend(buffer[:sync])
+            del buffer[:sync]
+            continue
+        if newline < 0:
+            return
+        raw = bytes(line + buffer[:newline])
+        line.clear()
+        del buffer[:newline + 1]
+        yield False, raw
+
+
+@dataclass
+class PendingCommand:
+    """A command written to the harness whose response line(s) may still be outstanding"""
+    command: str
+    sent_at: float
+    tag: int = 0
+    is_complete: Callable[[List[str]], bool] = field(default=lambda lines: True, repr=False)
+    lines: List[str] = field(default_factory=list)
+    response: Optional[str] = None
+    received_at: Optional[float] = None
+    abandoned: bool = False
+    _event: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[str]:
+        """Block until the response is complete and return its first line; None on timeout"""
+        if self._event.wait(timeout):
+            return self.response
+        return None
+
+    @property
+    def done(self) -> bool:
+        return self._event.is_set()
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Seconds between write and response, or None while outstanding"""
+        if self.received_at is None:
+            return None
+        return self.received_at - self.sent_at
+
+    def _append(self, line: str) -> bool:
+        """Collect one line; resolves and returns True once the response is complete"""
+        self.lines.append(line)
+        if self.is_complete(self.lines):
+            self._resolve(self.lines[0])
+            return True
+        return False
+
+    def _resolve(self, response: Optional[str]) -> None:
+        self.response = response
+        self.received_at = time.monotonic()
+        self._event.set()
+
+
+class SerialTransport:
+    """Reader-thread backed transport that correlates response lines to commands"""
+
+    def __init__(self, serial_connection: Any, encoding: str = "ascii",
+                 read_timeout: float = 0.05, unsolicited_limit: int = 256,
+                 frame_handler: Optional[Callable[[bytes], None]] = None) -> None:
+        """Wrap an already open pyserial-compatible connection
+
+        Args:
+            serial_connection: Open serial port (pyserial ``Serial`` or compatible)
+            encoding: Line encoding used by the harness protocol
+            read_timeout: Blocking read timeout for the reader thread; only bounds
+                how quickly ``stop()`` returns, never response latency
+            unsolicited_limit: Maximum number of unsolicited lines retained
+            frame_handler: Called on the reader thread with each telemetry frame
+                payload; frames are discarded while it is None
+        """
+        self.serial = serial_connection
+        self.encoding = encoding
+        self.read_timeout = read_timeout
+        self.logger = logging.getLogger(__name__)
+        self.frame_handler = frame_handler
+        self.corrupt_frames = 0
+        self.late_replies = 0  # replies to commands that had already timed out
+
+        self._pending: Dict[int, PendingCommand] = {}
+        self._last_tag = 0
+        self._tags_seen = False  # set by the first tagged reply
+        self._warned_untagged = False
+        self._unsolicited: Deque[str] = collections.deque(maxlen=unsolicited_limit)
+        self._lock = threading.Lock()
+        self._unsolicited_ready = threading.Condition(self._lock)
+        self._running = threading.Event()
+        self._reader: Optional[threading.Thread] = None
+        self._buffer = bytearray()
+        self._line = bytearray()  # start of a line interrupted by a telemetry frame
+
+    # ----------------------------- Lifecycle ------------------------------ #
+
+    def start(self) -> "SerialTransport":
+        """Start the reader thread (idempotent)"""
+        if self.is_running:
+            return self
+        try:
+            self.serial.timeout = self.read_timeout
+        except Exception:
+            pass
+        self._running.set()
+        self._reader = threading.Thread(target=self._reader_loop, name="hil-serial-reader", daemon=True)
+        self._reader.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the reader thread and fail every outstanding command"""
+        self._running.clear()
+        reader = self._reader
+        if reader and reader is not threading.current_thread():
+            reader.join(timeout=max(1.0, self.read_timeout * 4))
+        self._reader = None
+        self._fail_pending()
+
+    @property
+    def is_running(self) -> bool:
+        return self._running.is_set() and self._reader is not None and self._reader.is_alive()
+
+    @property
+    def outstanding(self) -> int:
+        """Number of commands still waiting for a response line"""
+        with self._lock:
+            return len(self._pending)
+
+    # ----------------------------- Commands ------------------------------- #
+
+    def submit(self, command: str,
+               is_complete: Optional[Callable[[List[str]], bool]] = None) -> PendingCommand:
+        """Write a command without waiting; returns a handle for its response
+
+        Args:
+            command: Single protocol line (without newline)
+            is_complete: Predicate over the lines received so far that returns True
+                once the response is complete; defaults to exactly one line
+        """
+        return self._write_command(command, is_complete)
+
+    def request(self, command: str, timeout: float) -> str:
+        """Send one command and wait for its response line; returns '' on timeout"""
+        pending = self.submit(command)
+        response = pending.wait(timeout)
+        if response is None:
+            self.abandon(pending)
+            return pending.response or ""  # the reply may have landed just after the timeout
+        return response
+
+    def abandon(self, pending: PendingCommand) -> None:
+        """Forget a timed-out command; a late reply carries its tag and is discarded"""
+        with self._lock:
+            if not pending.done:
+                pending.abandoned = True
+                self._pending.pop(pending.tag, None)
+
+    def drain_unsolicited(self) -> List[str]:
+        """Return and clear lines received while no command was outstanding"""
+        with self._lock:
+            lines = list(self._unsolicited)
+            self._unsolicited.clear()
+        return lines
+
+    def wait_unsolicited(self, timeout: Optional[float] = None) -> Optional[str]:
+        """Pop the oldest unsolicited line, waiting up to ``timeout`` for one"""
+        with self._unsolicited_ready:
+            if not self._unsolicited:
+                self._unsolicited_ready.wait(timeout)
+            return self._unsolicited.popleft() if self._unsolicited else None
+
+    # ----------------------------- Internals ------------------------------ #
+
+    def _write_command(self, command: str,
+                       is_complete: Optional[Callable[[List[str]], bool]]) -> PendingCommand:
+        if not self.is_running:
+            raise TransportClosedError("Serial transport is not running")
+        with self._lock:
+            self._last_tag = next_tag(self._last_tag, self._pending)
+            pending = PendingCommand(command=command.strip(), sent_at=time.monotonic(), tag=self._last_tag)
+            if is_complete is not None:
+                pending.is_complete = is_complete
+            # Registered before writing so a fast reply can never overtake its command
+            self._pending[pending.tag] = pending
+            try:
+                self.serial.write((tag_command(pending.tag, pending.command) + "\n")
+                                  .encode(self.encoding, errors="ignore"))
+                self.serial.flush()
+            except Exception:
+                del self._pending[pending.tag]
+                raise
+        return pending
+
+    def _dispatch_line(self, raw: bytes) -> None:
+        line = raw.decode(self.encoding, errors="ignore").strip()
+        if not line:
+            return
+        tag, body = split_tag(line)
+        with self._lock:
+            if tag is None:
+                if self._pending and not (self._tags_seen or self._warned_untagged) \
+                        and line.upper().startswith("ERR"):
+                    self._warned_untagged = True
+                    self.logger.warning("Harness answered without a command tag; "
+                                        "reflash the harness firmware (arduino_test_wrapper)")
+                self._unsolicited.append(line)
+                self._unsolicited_ready.notify_all()
+                return
+            self._tags_seen = True
+            pending = self._pending.get(tag)
+            if pending is None:
+                self.late_replies += 1
+                self.logger.debug(f"Discarding reply to timed-out command #{tag}: {body}")
+                return
+            if pending._append(body):
+                del self._pending[tag]
+
+    def _dispatch_frame(self, payload: Optional[bytes]) -> None:
+        if payload is None:
+            self.corrupt_frames += 1
+            return
+        handler = self.frame_handler
+        if handler is None:
+            return
+        try:
+            handler(payload)
+        except Exception as e:
+            self.logger.debug(f"Telemetry frame handler failed: {e}")
+
+    def _fail_pending(self) -> None:
+        with self._lock:
+            pending, self._pending = list(self._pending.values()), {}
+            for command in pending:
+                command._resolve(None)
+            self._unsolicited_ready.notify_all()
+
+    def _reader_loop(self) -> None:
+        while self._running.is_set():
+            try:
+                # Blocks until at least one byte arrives (or read_timeout), then
+                # takes everything already buffered in a single call
+                chunk = self.serial.read(1)
+                if chunk:
+                    waiting = getattr(self.serial, "in_waiting", 0)
+                    if waiting:
+                        chunk += self.serial.read(waiting)
+            except Exception as e:
+                if self._running.is_set():
+                    self.logger.debug(f"Serial reader stopped: {e}")
+                break
+            if not chunk:
+                continue
+            self._buffer.extend(chunk)
+            for is_frame, body in split_records(self._buffer, self._line):
+                if is_frame:
+                    self._dispatch_frame(body)
+                else:
+                    self._dispatch_line(body)
+        self._running.clear()
+        self._fail_pending()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+STK500v1 Client - Native Arduino as ISP programming session over pyserial
+
+Speaks the STK500v1 subset implemented by the ArduinoISP sketch
+(test/acceptance/sketches/ArduinoISP.ino) directly, so a programming session
+(sync, device parameters, programming mode) is set up once and reused for
+signature, fuse, erase, page write and read-back operations instead of
+spawning avrdude for each of them.
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import serial
+
+try:
+    from .intel_hex import ATMEGA32_FLASH_SIZE, ATMEGA32_PAGE_SIZE, FlashImage
+except ImportError:
+    from intel_hex import ATMEGA32_FLASH_SIZE, ATMEGA32_PAGE_SIZE, FlashImage
+
+# Protocol bytes (AVR061)
+STK_OK = 0x10
+STK_FAILED = 0x11
+STK_UNKNOWN = 0x12
+STK_INSYNC = 0x14
+STK_NOSYNC = 0x15
+CRC_EOP = 0x20
+
+CMND_GET_SYNC = 0x30           # '0'
+CMND_GET_SIGN_ON = 0x31        # '1'
+CMND_GET_PARAMETER = 0x41      # 'A'
+CMND_SET_PARAMETER = 0x40      # '@'
+CMND_SET_DEVICE = 0x42         # 'B'
+CMND_SET_DEVICE_EXT = 0x45     # 'E'
+CMND_ENTER_PROGMODE = 0x50     # 'P'
+CMND_LEAVE_PROGMODE = 0x51     # 'Q'
+CMND_LOAD_ADDRESS = 0x55       # 'U'
+CMND_UNIVERSAL = 0x56          # 'V'
+CMND_PROG_PAGE = 0x64
+CMND_READ_PAGE = 0x74
+CMND_READ_SIGN = 0x75
+
+PARM_SW_MAJOR = 0x81
+PARM_SW_MINOR = 0x82
+PARM_SCK_DURATION = 0x89
+
+ATMEGA32_SIGNATURE = bytes([0x1E, 0x95, 0x02])
+ARDUINO_ISP_SIGN_ON = "AVR ISP"
+
+# Cmnd_STK_SET_DEVICE block for the ATmega32 (values from avrdude.conf)
+ATMEGA32_DEVICE_PARAMETERS = bytes([
+    0x72,        # device code
+    0x00,        # revision
+    0x00,        # progtype: parallel and serial
+    0x01,        # parmode: full parallel interface
+    0x01,        # polling supported
+    0x01,        # self timed
+    0x01,        # lock bytes
+    0x02,        # fuse bytes
+    0xFF, 0xFF,  # flash poll values
+    0xFF, 0xFF,  # EEPROM poll values
+]) + ATMEGA32_PAGE_SIZE.to_bytes(2, 'big') + (1024).to_bytes(2, 'big') + ATMEGA32_FLASH_SIZE.to_bytes(4, 'big')
+ATMEGA32_DEVICE_EXT_PARAMETERS = bytes([0x05, 0x04, 0xD7, 0xA0, 0x00])
+
+CHIP_ERASE_DELAY = 0.02   # tWD_ERASE is 9 ms on the ATmega32
+
+
+class STK500Error(RuntimeError):
+    """Raised when the programmer is out of sync or rejects a command"""
+
+
+class STK500v1Programmer:
+    """Persistent STK500v1 session with an Arduino running the ArduinoISP sketch"""
+
+    def __init__(self, port: str, baud_rate: int = 19200, timeout: float = 1.0,
+                 page_size: int = ATMEGA32_PAGE_SIZE, flash_size: int = ATMEGA32_FLASH_SIZE,
+                 serial_factory: Optional[Callable[..., Any]] = None) -> None:
+        self.port = port
+        self.baud_rate = baud_rate
+        self.timeout = timeout
+        self.page_size = page_size
+        self.flash_size = flash_size
+        self.serial_factory = serial_factory or serial.Serial
+        self.logger = logging.getLogger(__name__)
+        self.connection = None
+        self.sign_on = ""
+        self.in_progmode = False
+
+    # ----------------------------- Session ----------------------------- #
+
+    def open(self, sync_window: float = 3.0) -> "STK500v1Programmer":
+        """Open the port and synchronise; the Arduino auto-resets on open, so retry until it answers"""
+        if self.connection is not None:
+            return self
+        self.connection = self.serial_factory(self.port, self.baud_rate, timeout=self.timeout)
+        try:
+            deadline = time.monotonic() + sync_window
+            while True:
+                try:
+                    self.sync()
+                    break
+                except STK500Error:
+                    if time.monotonic() >= deadline:
+                        raise
+                    time.sleep(0.2)
+            self.sign_on = self._command(bytes([CMND_GET_SIGN_ON]), len(ARDUINO_ISP_SIGN_ON)).decode('ascii', 'replace')
+            self._command(bytes([CMND_SET_DEVICE]) + ATMEGA32_DEVICE_PARAMETERS)
+            self._command(bytes([CMND_SET_DEVICE_EXT]) + ATMEGA32_DEVICE_EXT_PARAMETERS)
+        except Exception:
+            self.close()
+            raise
+        self.logger.debug(f"STK500v1 session open on {self.port} ({self.sign_on})")
+        return self
+
+    def close(self) -> None:
+        """Leave programming mode (releasing target reset) and close the port"""
+        if self.connection is None:
+            return
+        try:
+            if self.in_progmode:
+                self.leave_progmode()
+        except (STK500Error, serial.SerialException) as e:
+            self.logger.debug(f"Failed to leave programming mode cleanly: {e}")
+        finally:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+            self.connection = None
+            self.in_progmode = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.connection is not None
+
+    def __enter__(self) -> "STK500v1Programmer":
+        return self.open()
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+    def sync(self) -> None:
+        self.connection.reset_input_buffer()
+        self._command(bytes([CMND_GET_SYNC]))
+
+    def enter_progmode(self) -> None:
+        if not self.in_progmode:
+            self._command(bytes([CMND_ENTER_PROGMODE]))
+            self.in_progmode = True
+
+    def leave_progmode(self) -> None:
+        self._command(bytes([CMND_LEAVE_PROGMODE]))
+        self.in_progmode = False
+
+    def get_parameter(self, parameter: int) -> int:
+        return self._command(bytes([CMND_GET_PARAMETER, parameter]), 1)[0]
+
+    def set_sck_duration(self, duration: int) -> bool:
+        """Request a faster/slower ISP clock; False where the programmer fixes it
+
+        The ArduinoISP sketch compiles its SPI clock in and answers an unknown
+        command with a desynchronising NOSYNC, so the request is not sent to it.
+        """
+        if self.sign_on == ARDUINO_ISP_SIGN_ON:
+            self.logger.debug("ArduinoISP uses a fixed SPI clock; SCK duration not negotiated")
+            return False
+        try:
+            self._command(bytes([CMND_SET_PARAMETER, PARM_SCK_DURATION, duration & 0xFF]))
+            return True
+        except STK500Error as e:
+            self.logger.debug(f"SCK duration rejected: {e}")
+            self.sync()
+            return False
+
+    # ----------------------------- Target ------------------------------ #
+
+    def read_signature(self) -> bytes:
+        self.enter_progmode()
+        return self._command(bytes([CMND_READ_SIGN]), 3)
+
+    def universal(self, a: int, b: int, c: int, d: int) -> int:
+        """Raw 4-byte ISP instruction; returns the byte shifted out with the last one"""
+        self.enter_progmode()
+        return self._command(bytes([CMND_UNIVERSAL, a, b, c, d]), 1)[0]
+
+    def read_fuses(self) -> Dict[str, int]:
+        return {
+            'lfuse': self.universal(0x50, 0x00, 0x00, 0x00),
+            'hfuse': self.universal(0x58, 0x08, 0x00, 0x00),
+            'lock': self.universal(0x58, 0x00, 0x00, 0x00),
+        }
+
+    def chip_erase(self) -> None:
+        self.universal(0xAC, 0x80, 0x00, 0x00)
+        time.sleep(CHIP_ERASE_DELAY)
+        # Programming mode has to be re-entered after an erase
+        self.leave_progmode()
+        self.enter_progmode()
+
+    def write_page(self, address: int, data: bytes) -> None:
+        """Write one flash page at byte ``address`` (page-aligned, at most one page long)"""
+        if address % self.page_size or len(data) > self.page_size or len(data) % 2:
+            raise ValueError(f"Unaligned flash page write at 0x{address:04X} ({len(data)} bytes)")
+        self.enter_progmode()
+        self._load_address(address)
+        self._command(bytes([CMND_PROG_PAGE, len(data) >> 8, len(data) & 0xFF, ord('F')]) + bytes(data))
+
+    def read_page(self, address: int, length: Optional[int] = None) -> bytes:
+        length = length or self.page_size
+        self.enter_progmode()
+        self._load_address(address)
+        return self._command(bytes([CMND_READ_PAGE, length >> 8, length & 0xFF, ord('F')]), length)
+
+    def write_image(self, image: FlashImage, pages: Optional[Iterable[int]] = None) -> int:
+        """Write the image's pages (or only ``pages``); returns the number written"""
+        starts = sorted(pages) if pages is not None else sorted(image.pages())
+        for start in starts:
+            self.write_page(start, image.page(start))
+        return len(starts)
+
+    def verify_image(self, image: FlashImage, pages: Optional[Iterable[int]] = None) -> List[int]:
+        """Read back the image's pages (or only ``pages``); returns those that differ"""
+        starts = sorted(pages) if pages is not None else sorted(image.pages())
+        return [start for start in starts if self.read_page(start) != image.page(start)]
+
+    def read_flash(self) -> FlashImage:
+        """Read the whole flash; erased (0xFF) pages are left out of the image"""
+        data: Dict[int, int] = {}
+        for start in range(0, self.flash_size, self.page_size):
+            page = self.read_page(start)
+            if any(byte != 0xFF for byte in page):
+                data.update({start + i: byte for i, byte in enumerate(page)})
+        return FlashImage(data, self.page_size)
+
+    # ---------------------------- Protocol ----------------------------- #
+
+    def _load_address(self, address: int) -> None:
+        word = address >> 1
+        self._command(bytes([CMND_LOAD_ADDRESS, word & 0xFF, (word >> 8) & 0xFF]))
+
+    def _command(self, payload: bytes, response_length: int = 0) -> bytes:
+        """Send ``payload`` + CRC_EOP and return the data between INSYNC and OK"""
+        if self.connection is None:
+            raise STK500Error("STK500v1 session is not open")
+        self.connection.write(bytes(payload) + bytes([CRC_EOP]))
+        status = self.connection.read(1)
+        if not status:
+            raise STK500Error(f"No response to command 0x{payload[0]:02X}")
+        if status[0] != STK_INSYNC:
+            raise STK500Error(f"Lost sync on command 0x{payload[0]:02X} (got 0x{status[0]:02X})")
+        body = self.connection.read(response_length) if response_length else b''
+        trailer = self.connection.read(1)
+        if len(body) != response_length or not trailer:
+            raise STK500Error(f"Short response to command 0x{payload[0]:02X}")
+        if trailer[0] != STK_OK:
+            raise STK500Error(f"Command 0x{payload[0]:02X} failed (status 0x{trailer[0]:02X})")
+        return body
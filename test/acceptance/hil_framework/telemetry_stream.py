@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Telemetry Stream - Ring-buffered consumer for the harness STREAM mode
+
+``STREAM ON <signals> <hz>`` makes the Arduino Test Harness push timestamped
+binary frames (ADC counts, S4 pin states, AMPLITUDE_ALL PWM duty/frequency)
+at a fixed rate instead of answering one READ command per sample. The serial
+transports split the frames from the response lines (serial_transport.py) and
+pass each payload to ``TelemetryStream.feed``. The stream decodes the payload
+and appends one (time, value) sample per signal to a bounded ring buffer.
+
+    stream = hw.start_stream(["POWER_SENSE_4", "PINS"], rate_hz=500)
+    if stream and stream.wait_for("POWER_SENSE_4", 250, timeout=1.0):
+        times, counts = stream.samples("POWER_SENSE_4")
+    hw.stop_stream()
+
+Sample times are seconds since the first frame, measured on the harness clock
+(``micros()``), so USB scheduling jitter does not show up as sampling jitter.
+
+Only arduino_test_wrapper.ino implements STREAM; the PlatformIO harness
+(arduino_harness/src/main.cpp) rejects it as an unknown command. PWM/PWM_HZ
+need edge timing on D9, which the wrapper takes from a pin-change interrupt on
+AVR boards; a board that cannot do either answers ERR STREAM_PWM_UNSUPPORTED.
+In all these cases ``start_stream`` returns None and callers poll instead.
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+import collections
+import struct
+import threading
+import time
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+# Mask bit order of the harness STREAM signals (arduino_test_wrapper.ino StreamSignal)
+STREAM_SIGNALS = ("POWER_SENSE_4", "A0", "A2", "A3", "PINS", "PWM", "PWM_HZ")
+# Other names the framework uses for streamable signals
+STREAM_ALIASES = {"A1": "POWER_SENSE_4", "POWER_4": "POWER_SENSE_4", "AMPLITUDE_ALL": "PWM", "D9": "PWM"}
+# Bits of the PINS word
+PIN_BITS = {"START_4": 0x01, "RESET_4": 0x02, "OVERLOAD_4": 0x04, "FREQ_LOCK_4": 0x08, "AMPLITUDE_ALL": 0x10}
+# Raw u16 -> engineering value (PWM duty is sent in 0.1 %)
+SIGNAL_SCALE = {"PWM": 0.1}
+
+STREAM_OFF = "STREAM OFF"
+MAX_RATE_HZ = 1000
+MAX_BYTES_PER_SECOND = 10000  # harness limit; keeps 115200 baud free for command replies
+FRAME_HEADER = struct.Struct("<HIB")  # seq, t_us, mask
+FRAME_ENVELOPE = 4  # sync x2, length, checksum
+
+
+def stream_signal(name: str) -> Optional[str]:
+    """Harness STREAM name for a signal/pin name, or None if it cannot be streamed"""
+    name = str(name).strip().upper()
+    name = STREAM_ALIASES.get(name, name)
+    return name if name in STREAM_SIGNALS else None
+
+
+class TelemetryStream:
+    """Decodes STREAM frames for one signal set into per-signal ring buffers
+
+    ``feed`` runs on the transport's reader thread (or event loop); readers on
+    other threads see a consistent view through the internal lock.
+    """
+
+    def __init__(self, signals: Iterable[str], rate_hz: int = 200, capacity: int = 4096) -> None:
+        names = []
+        for signal in signals:
+            name = stream_signal(signal)
+            if name is None:
+                raise ValueError(f"Signal {signal!r} cannot be streamed; choose from {', '.join(STREAM_SIGNALS)}")
+            if name not in names:
+                names.append(name)
+        if not names:
+            raise ValueError("At least one signal is required")
+        # Values arrive in mask bit order, not request order
+        self.signals: Tuple[str, ...] = tuple(s for s in STREAM_SIGNALS if s in names)
+        self.mask = sum(1 << STREAM_SIGNALS.index(s) for s in self.signals)
+        self.rate_hz = int(rate_hz)
+        frame_bytes = FRAME_ENVELOPE + FRAME_HEADER.size + 2 * len(self.signals)
+        if not 1 <= self.rate_hz <= MAX_RATE_HZ or frame_bytes * self.rate_hz > MAX_BYTES_PER_SECOND:
+            raise ValueError(f"{self.rate_hz} Hz x {frame_bytes} byte frames exceeds the harness stream budget "
+                             f"({MAX_BYTES_PER_SECOND} B/s, {MAX_RATE_HZ} Hz)")
+        self.capacity = capacity
+        self._values = struct.Struct(f"<{len(self.signals)}H")
+        self._buffers: Dict[str, Deque[Tuple[float, float]]] = {
+            s: collections.deque(maxlen=capacity) for s in self.signals}
+
+        self.frames = 0
+        self.dropped = 0   # frames lost in transit, from sequence number gaps
+        self.rejected = 0  # payloads that do not match this signal set
+        self.started_at: Optional[float] = None
+        self._last_seq: Optional[int] = None
+        self._last_us: Optional[int] = None
+        self._elapsed_us = 0
+        self._lock = threading.Lock()
+        self._arrived = threading.Condition(self._lock)
+
+    @classmethod
+    def max_rate(cls, signal_count: int) -> int:
+        """Highest rate the harness accepts for ``signal_count`` signals"""
+        frame_bytes = FRAME_ENVELOPE + FRAME_HEADER.size + 2 * signal_count
+        return min(MAX_RATE_HZ, MAX_BYTES_PER_SECOND // frame_bytes)
+
+    @property
+    def command(self) -> str:
+        return f"STREAM ON {','.join(self.signals)} {self.rate_hz}"
+
+    def accepts(self, response: Optional[str]) -> bool:
+        """True when ``response`` is the harness acknowledging this stream's command"""
+        parts = (response or "").split()
+        return parts[:3] == ["OK", "STREAM", "ON"] and parts[3:4] == [str(self.mask)]
+
+    # ----------------------------- Producer ------------------------------- #
+
+    def feed(self, payload: bytes) -> None:
+        """Decode one frame payload (transport frame handler)"""
+        if len(payload) != FRAME_HEADER.size + self._values.size:
+            self.rejected += 1
+            return
+        seq, t_us, mask = FRAME_HEADER.unpack_from(payload)
+        if mask != self.mask:
+            self.rejected += 1
+            return
+        raw = self._values.unpack_from(payload, FRAME_HEADER.size)
+        with self._arrived:
+            if self._last_seq is None:
+                self.started_at = time.monotonic()
+            else:
+                self.dropped += (seq - self._last_seq - 1) & 0xFFFF
+                # micros() wraps every ~71 minutes
+                self._elapsed_us += (t_us - self._last_us) & 0xFFFFFFFF
+            self._last_seq, self._last_us = seq, t_us
+            t = self._elapsed_us / 1e6
+            for signal, value in zip(self.signals, raw):
+                self._buffers[signal].append((t, value * SIGNAL_SCALE.get(signal, 1)))
+            self.frames += 1
+            self._arrived.notify_all()
+
+    # ----------------------------- Consumers ------------------------------ #
+
+    def samples(self, signal: str, last: Optional[int] = None) -> Tuple[List[float], List[float]]:
+        """(times, values) currently buffered for ``signal``, oldest first; ``last`` keeps the newest N"""
+        buffer = self._buffer(signal)
+        with self._lock:
+            data = list(buffer)
+        if last is not None:
+            data = data[-last:] if last > 0 else []
+        return [t for t, _ in data], [v for _, v in data]
+
+    def values(self, signal: str, last: Optional[int] = None) -> List[float]:
+        return self.samples(signal, last)[1]
+
+    def latest(self, signal: str) -> Optional[Tuple[float, float]]:
+        """Newest (time, value) for ``signal``, or None before the first frame"""
+        buffer = self._buffer(signal)
+        with self._lock:
+            return buffer[-1] if buffer else None
+
+    def pin_state(self, pin: str) -> Optional[bool]:
+        """Level of an S4 pin from the newest PINS word (requires PINS in the stream)"""
+        latest = self.latest("PINS")
+        if latest is None:
+            return None
+        return bool(int(latest[1]) & PIN_BITS[pin])
+
+    def count(self, signal: str) -> int:
+        buffer = self._buffer(signal)
+        with self._lock:
+            return len(buffer)
+
+    def wait_for(self, signal: str, count: int, timeout: float) -> bool:
+        """Block until ``count`` samples of ``signal`` are buffered; False on timeout"""
+        buffer = self._buffer(signal)
+        deadline = time.monotonic() + timeout
+        with self._arrived:
+            while len(buffer) < min(count, self.capacity):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._arrived.wait(remaining)
+        return True
+
+    def collect(self, signal: str, count: int, timeout: float) -> Tuple[List[float], List[float]]:
+        """Discard buffered samples, then gather the next ``count`` (fewer on timeout)"""
+        self.clear()
+        self.wait_for(signal, count, timeout)
+        return self.samples(signal, last=count)
+
+    def clear(self) -> None:
+        with self._lock:
+            for buffer in self._buffers.values():
+                buffer.clear()
+
+    def _buffer(self, signal: str) -> Deque[Tuple[float, float]]:
+        name = stream_signal(signal)
+        if name not in self._buffers:
+            raise KeyError(f"{signal!r} is not part of this stream ({', '.join(self.signals)})")
+        return self._buffers[name]
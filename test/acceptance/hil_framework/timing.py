@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Timing - Event-driven waits and latency measurement for timing assertions
+
+``wait_until`` re-evaluates a predicate until it holds or a deadline passes,
+returning as soon as the condition is met together with the measured latency.
+Between evaluations it either sleeps a short poll interval (register polling)
+or blocks on a wake-up source such as harness push notifications, so a
+"within N ms" step costs only as long as the hardware actually takes.
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+DEFAULT_POLL_INTERVAL = 0.005  # seconds; a single-register FC03 round trip is ~2-3 ms
+
+
+@dataclass
+class WaitResult:
+    """Outcome of a wait_until call"""
+    satisfied: bool
+    latency_ms: float
+    attempts: int
+    value: Any = None  # last value returned by the predicate
+
+    def __bool__(self) -> bool:
+        return self.satisfied
+
+
+def wait_until(predicate: Callable[[], Any], deadline: float,
+               poll_interval: float = DEFAULT_POLL_INTERVAL,
+               wake: Optional[Callable[[float], Any]] = None) -> WaitResult:
+    """Evaluate ``predicate`` until it returns a truthy value or ``deadline`` seconds pass
+
+    The predicate is always evaluated at least once, and once more at the
+    deadline, so a condition that becomes true late is still observed.
+
+    Args:
+        predicate: Returns a truthy value when the condition holds
+        deadline: Seconds from now to keep trying
+        poll_interval: Longest pause between evaluations
+        wake: Optional ``wake(timeout)`` that blocks until new data may be
+            available (e.g. ``HardwareInterface.wait_for_notification``);
+            used instead of sleeping so pushed changes are seen immediately
+    """
+    start = time.monotonic()
+    end = start + max(0.0, deadline)
+    attempts = 0
+    while True:
+        attempts += 1
+        value = predicate()
+        now = time.monotonic()
+        if value:
+            return WaitResult(True, (now - start) * 1000.0, attempts, value)
+        remaining = end - now
+        if remaining <= 0:
+            return WaitResult(False, (now - start) * 1000.0, attempts, value)
+        pause = min(poll_interval, remaining)
+        if wake is not None:
+            wake(pause)
+        else:
+            time.sleep(pause)
+
+
+def record_latency(context: Any, name: str, result: WaitResult, spec_ms: float) -> None:
+    """Log a wait's measured latency against its spec and keep it on the Behave context"""
+    measurements = getattr(context, 'timing_measurements', None)
+    if measurements is None:
+        measurements = []
+        context.timing_measurements = measurements
+    measurements.append({
+        'name': name,
+        'latency_ms': round(result.latency_ms, 2),
+        'spec_ms': spec_ms,
+        'satisfied': result.satisfied,
+    })
+    logger = getattr(context, 'hil_logger', None)
+    if logger is not None:
+        logger.measurement(name, round(result.latency_ms, 2), "ms", f"<= {spec_ms} ms")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Progress Formatter - Behave formatter that streams step events as JSON lines
+
+Used by the web UI TestAutomationService, which runs all selected scenarios
+in one Behave invocation and turns these events into live progress updates:
+
+    behave test/acceptance/features/smoke.feature:9 \
+        --format test.acceptance.progress_formatter:ProgressFormatter
+
+Each line is one JSON object with an ``event`` of scenario_started,
+step_started, step_finished or scenario_finished, identified by the feature
+file name and scenario line. Step indexes count the scenario's own steps;
+Background steps are reported with ``background: true``.
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+import json
+import os
+
+from behave.formatter.base import Formatter
+
+
+def _status_name(status) -> str:
+    # Behave >= 1.2.6 uses a Status enum, older releases plain strings
+    return getattr(status, 'name', status) or 'untested'
+
+
+class ProgressFormatter(Formatter):
+    """Emit scenario and step lifecycle events as JSON lines"""
+
+    name = 'progress-json'
+    description = 'JSON-lines step events for live progress reporting'
+
+    def __init__(self, stream_opener, config):
+        super().__init__(stream_opener, config)
+        self.stream = self.open()
+        self._scenario = None
+        self._steps = []
+        self._position = 0
+
+    def scenario(self, scenario):
+        self._finish_scenario()
+        self._scenario = scenario
+        self._steps = list(scenario.all_steps)
+        self._background = len(scenario.background_steps or [])
+        self._position = 0
+        self._emit('scenario_started', name=scenario.name)
+
+    def match(self, match):
+        if self._scenario is not None and self._position < len(self._steps):
+            self._emit('step_started', **self._step_fields(self._position))
+
+    def result(self, step):
+        if self._scenario is None or self._position >= len(self._steps):
+            return
+        self._emit('step_finished', status=_status_name(step.status),
+                   duration_ms=int((step.duration or 0) * 1000),
+                   error_message=step.error_message, **self._step_fields(self._position))
+        self._position += 1
+
+    def eof(self):
+        self._finish_scenario()
+
+    def close(self):
+        self._finish_scenario()
+        self.close_stream()
+
+    # ------------------------------------------------------------------ #
+
+    def _step_fields(self, position):
+        step = self._steps[position]
+        background = position < self._background
+        return {
+            'index': position if background else position - self._background,
+            'background': background,
+            'text': f"{step.keyword} {step.name}",
+        }
+
+    def _finish_scenario(self):
+        scenario, self._scenario = self._scenario, None
+        if scenario is None:
+            return
+        failed = next((s for s in scenario.all_steps if _status_name(s.status) in ('failed', 'undefined')), None)
+        self._emit('scenario_finished', name=scenario.name, status=_status_name(scenario.status),
+                   duration_ms=int((scenario.duration or 0) * 1000),
+                   error_message=failed.error_message if failed else None,
+                   _scenario=scenario)
+
+    def _emit(self, event, _scenario=None, **fields):
+        scenario = _scenario or self._scenario
+        payload = {
+            'event': event,
+            'feature_file': os.path.basename(scenario.filename),
+            'line': scenario.line,
+        }
+        payload.update(fields)
+        self.stream.write(json.dumps(payload) + '\n')
+        self.stream.flush()
@@ -12,6 +12,11 @@ import re
 from dataclasses import dataclass, field
 from typing import Dict, List, Set, Tuple
 
+try:
+    from .feature_index import default_index
+except ImportError:
+    from feature_index import default_index
+
 
 PRD_FUNCTIONAL_REQUIREMENTS: Dict[str, str] = {
     "FR1": "Control up to four CT2000 sonicator units concurrently via a single interface.",
@@ -59,59 +64,41 @@ class Coverage:
             self.ac_pending.add(ac)
 
 
+def _tag_ids(regex: re.Pattern, prefix: str, tags: List[str]) -> Set[str]:
+    return {f"{prefix}{m.group(1)}" for tag in tags for m in regex.finditer(f"@{tag}")}
+
+
 def scan_feature_tags(features_dir: str) -> Coverage:
+    """FR/AC coverage of every feature file under ``features_dir``
+
+    Scenarios inherit their feature's tags as in Behave, so a feature-level FR tag
+    counts as live coverage when any scenario of that feature is not pending, whether
+    or not the scenario repeats the FR tag. (The former line scanner only counted
+    scenarios with FR tags of their own, but it also attached the feature's tag lines
+    to the first scenario, so reports for this repository are unchanged.)
+    """
     cov = Coverage()
-    for root, _dirs, files in os.walk(features_dir):
-        for name in files:
-            if not name.endswith(".feature"):
-                continue
-            path = os.path.join(root, name)
-            rel = os.path.relpath(path)
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    lines = f.readlines()
-            except Exception:
-                continue
-
-            feature_fr_tags: Set[str] = set()
-            any_scenario_nonpending = False
-
-            # First pass: collect feature-level FR tags (before first Scenario)
-            for line in lines:
-                s = line.strip()
-                if s.lower().startswith("feature:"):
-                    break
-                for m in RE_TAG.finditer(s):
-                    feature_fr_tags.add(f"FR{m.group(1)}")
-
-            # Second pass: scenarios with their own tags and pending flags
-            current_tags: Set[str] = set()
-            next_pending = False
-            for line in lines:
-                s = line.strip()
-                if s.startswith("@"):
-                    # Collect tags for the upcoming scenario
-                    if "@pending" in s:
-                        next_pending = True
-                    for m in RE_TAG.finditer(s):
-                        current_tags.add(f"FR{m.group(1)}")
-                    for m in RE_AC.finditer(s):
-                        ac = f"AC{m.group(1)}"
-                        cov.add_ac(ac, rel, next_pending)
-                elif s.lower().startswith("scenario"):
-                    # Assign collected tags to this scenario
-                    if current_tags:
-                        for fr in current_tags:
-                            cov.add(fr, rel, next_pending)
-                            if not next_pending:
-                                any_scenario_nonpending = True
-                    # reset for next scenario
-                    current_tags = set()
-                    next_pending = False
-
-            # Apply feature-level tags: mark as non-pending if any scenario is non-pending
-            for fr in feature_fr_tags:
-                cov.add(fr, rel, not any_scenario_nonpending)
+    for feature in default_index().features(features_dir, recursive=True):
+        rel = os.path.relpath(feature.path)
+        feature_pending = "pending" in feature.tags
+        any_scenario_nonpending = False
+
+        for ac in _tag_ids(RE_AC, "AC", feature.tags):
+            cov.add_ac(ac, rel, feature_pending)
+
+        # Scenarios with their own tags and pending flags
+        for scenario in feature.scenarios:
+            pending = feature_pending or "pending" in scenario.tags
+            if not pending:
+                any_scenario_nonpending = True
+            for fr in _tag_ids(RE_TAG, "FR", scenario.tags):
+                cov.add(fr, rel, pending)
+            for ac in _tag_ids(RE_AC, "AC", scenario.tags):
+                cov.add_ac(ac, rel, pending)
+
+        # Apply feature-level tags: mark as non-pending if any scenario (inheriting them) is non-pending
+        for fr in _tag_ids(RE_TAG, "FR", feature.tags):
+            cov.add(fr, rel, not any_scenario_nonpending)
 
     return cov
 
@@ -878,11 +878,10 @@ def step_sonicator_unit_connected_ready(context, unit):
 def step_exercise_advanced_communication_feature(context):
     """Exercise advanced communication features"""
     if hasattr(context, 'hardware_interface') and context.hardware_interface:
-        # Test advanced Arduino wrapper commands
-        status_response = context.hardware_interface.send_command("READ STATUS 4")
+        # Test advanced Arduino wrapper commands (one batched round trip)
+        batch = context.hardware_interface.send_batch(["READ STATUS 4", "READ POWER 4"])
+        status_response, power_response = batch.responses
         assert status_response and "OK" in status_response, "Advanced communication STATUS failed"
-
-        power_response = context.hardware_interface.send_command("READ POWER 4")
         assert power_response and "OK" in power_response, "Advanced communication POWER failed"
 
         print("✅ Advanced communication feature exercised successfully (HIL)")
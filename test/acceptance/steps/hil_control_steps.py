@@ -9,10 +9,79 @@ Author: Cannasol Technologies
 License: Proprietary
 """
 
+import math
 import time
 import statistics
 from behave import given, when, then
 
+from test.acceptance.hil_framework.telemetry_stream import TelemetryStream, stream_signal
+
+# Harness sample rate for continuous PWM measurement over STREAM
+PWM_STREAM_RATE_HZ = 100
+
+
+def _stream_samples(context, signals, count, duration):
+    """Collect ``count`` frames of ``signals`` from the harness STREAM mode.
+
+    Returns the stopped TelemetryStream, or None when the interface/harness cannot
+    stream these signals and the caller should poll instead.
+    """
+    hw = context.hardware_interface
+    if not hasattr(hw, 'start_stream') or any(stream_signal(s) is None for s in signals):
+        return None
+    max_rate = TelemetryStream.max_rate(len(signals))
+    rate = min(max_rate, max(1, math.ceil(count / duration))) if duration > 0 else max_rate
+    stream = hw.start_stream(list(signals), rate_hz=rate, capacity=max(count, 1))
+    if stream is None:
+        return None
+    try:
+        stream.collect(signals[0], count, timeout=count / rate + 2.0)
+    finally:
+        hw.stop_stream()
+    if stream.dropped:
+        context.hil_logger.hardware_event("Telemetry stream dropped frames", f"{stream.dropped} frame(s)")
+    return stream
+
+
+def _measurement_series(name, values, timestamps, unit):
+    """MeasurementSeries over step-collected values; timestamps are kept only if they line up"""
+    # NumPy is only needed by the stability steps; importing it here keeps the step modules loadable without it
+    from test.acceptance.hil_framework.measurement_series import MeasurementSeries
+    if timestamps is not None and len(timestamps) != len(values):
+        timestamps = None
+    return MeasurementSeries.from_samples(name, values, timestamps, unit)
+
+
+def _adc_series(context):
+    """Series for context.adc_readings, reusing the one built when the readings were taken"""
+    assert hasattr(context, 'adc_readings'), "No ADC readings available"
+    series = getattr(context, 'adc_series', None)
+    if series is None or series.values.tolist() != list(context.adc_readings):
+        series = _measurement_series(f"adc_{getattr(context, 'adc_channel', 'channel')}", context.adc_readings,
+                                     getattr(context, 'adc_timestamps', None), "counts")
+        context.adc_series = series
+    return series
+
+
+def _pwm_series(context, key, unit):
+    """Series of one field (duty_cycle/frequency) of context.pwm_measurements"""
+    assert hasattr(context, 'pwm_measurements'), "No PWM measurements available"
+    measurements = context.pwm_measurements
+    timestamps = [m['timestamp'] for m in measurements] if all('timestamp' in m for m in measurements) else None
+    return _measurement_series(f"pwm_{key}", [m[key] for m in measurements], timestamps, unit)
+
+
+def _record_evidence(context, series):
+    """Save the raw series next to the JUnit results; never fails the step"""
+    from test.acceptance.hil_framework.measurement_series import save_evidence
+    scenario = getattr(getattr(context, 'scenario', None), 'name', None)
+    try:
+        path = save_evidence(series, scenario)
+    except OSError as e:
+        context.hil_logger.hardware_event(f"Could not save {series.name} evidence", str(e))
+        return
+    context.hil_logger.hardware_event(f"Saved {len(series)} {series.name} samples", str(path))
+
 
 @given('the ADC subsystem is initialized')
 def step_adc_subsystem_initialized(context):
@@ -123,17 +192,31 @@ def step_apply_stable_voltage_to_adc(context, voltage, channel):
 
 @when('I take {count:d} ADC readings over {duration:d} seconds')
 def step_take_multiple_adc_readings(context, count, duration):
-    """Take multiple ADC readings for stability analysis"""
-    readings = []
-    interval = duration / count
-    
-    for i in range(count):
-        adc_value = context.hardware_interface.read_adc_channel(context.adc_channel)
-        if adc_value is not None:
-            readings.append(adc_value)
-        time.sleep(interval)
+    """Take multiple ADC readings for stability analysis
+
+    Streams the channel at count/duration Hz when the harness supports STREAM, so the
+    readings are evenly spaced on the harness clock; otherwise reads one at a time.
+    """
+    stream = _stream_samples(context, [context.adc_channel], count, duration)
+    if stream is not None:
+        timestamps, values = stream.samples(context.adc_channel, last=count)
+        readings = [int(v) for v in values]
+    else:
+        readings = []
+        timestamps = []
+        interval = duration / count
+        start = time.monotonic()
+
+        for i in range(count):
+            adc_value = context.hardware_interface.read_adc_channel(context.adc_channel)
+            if adc_value is not None:
+                readings.append(adc_value)
+                timestamps.append(time.monotonic() - start)
+            time.sleep(interval)
     
     context.adc_readings = readings
+    context.adc_timestamps = timestamps
+    context.adc_series = _measurement_series(f"adc_{context.adc_channel}", readings, timestamps, "counts")
     context.hil_logger.measurement(f"ADC readings count", len(readings), "", f"{count} expected")
 
 
@@ -213,13 +296,22 @@ def step_set_pwm_duty_freq_simple(context, duty, frequency, pin):
 def step_measure_pwm_continuously(context, duration):
     """Measure PWM continuously for stability testing"""
     measurements = []
-    start_time = time.time()
-    
-    while time.time() - start_time < duration:
-        pwm_data = context.hardware_interface.measure_pwm_output(context.pwm_pin)
-        if pwm_data:
-            measurements.append(pwm_data)
-        time.sleep(0.5)  # Measure every 500ms
+    stream = None
+    if stream_signal(context.pwm_pin) == "PWM":
+        stream = _stream_samples(context, ["PWM", "PWM_HZ"], duration * PWM_STREAM_RATE_HZ, duration)
+    if stream is not None:
+        times, duty_cycles = stream.samples("PWM")
+        frequencies = stream.values("PWM_HZ")
+        measurements = [{'timestamp': t, 'duty_cycle': d, 'frequency': f}
+                        for t, d, f in zip(times, duty_cycles, frequencies)]
+    else:
+        start_time = time.time()
+
+        while time.time() - start_time < duration:
+            pwm_data = context.hardware_interface.measure_pwm_output(context.pwm_pin)
+            if pwm_data:
+                measurements.append(pwm_data)
+            time.sleep(0.5)  # Measure every 500ms
     
     context.pwm_measurements = measurements
     context.hil_logger.measurement(f"PWM measurements count", len(measurements))
@@ -355,30 +447,32 @@ def step_verify_calculated_power(context, expected, tolerance):
 @then('the standard deviation should be less than {max_stddev:d} ADC counts')
 def step_verify_adc_stability(context, max_stddev):
     """Verify ADC stability via standard deviation"""
-    assert hasattr(context, 'adc_readings'), "No ADC readings available"
-    assert len(context.adc_readings) > 1, "Need multiple readings for stability test"
+    series = _adc_series(context)
+    assert len(series) > 1, "Need multiple readings for stability test"
     
-    stddev = statistics.stdev(context.adc_readings)
-    assert stddev < max_stddev, \
-           f"ADC standard deviation {stddev:.2f} exceeds {max_stddev} counts"
-    context.hil_logger.measurement("ADC standard deviation", stddev, "counts", f"< {max_stddev}")
+    stats = series.stats()
+    _record_evidence(context, series)
+    assert stats.std < max_stddev, \
+           f"ADC standard deviation {stats.std:.2f} exceeds {max_stddev} counts " \
+           f"({stats.count} samples, mean {stats.mean:.1f}, p05-p95 {stats.p05:.0f}-{stats.p95:.0f}, " \
+           f"drift {stats.drift_per_s:+.2f} counts/s)"
+    context.hil_logger.measurement("ADC standard deviation", stats.std, "counts", f"< {max_stddev}")
+    context.hil_logger.measurement("ADC drift", stats.drift_per_s, "counts/s")
 
 
 @then('all readings should be within ±{tolerance:d} ADC counts of the mean')
 def step_verify_adc_readings_within_tolerance(context, tolerance):
     """Verify all ADC readings are within tolerance of mean"""
-    assert hasattr(context, 'adc_readings'), "No ADC readings available"
-    
-    mean_value = statistics.mean(context.adc_readings)
-    outliers = []
+    series = _adc_series(context)
+    assert len(series), "No ADC readings available"
     
-    for i, reading in enumerate(context.adc_readings):
-        if abs(reading - mean_value) > tolerance:
-            outliers.append((i, reading))
+    mean_value = float(series.values.mean())
+    outliers = series.outliers(tolerance=tolerance, center=mean_value)
     
     assert len(outliers) == 0, \
-           f"{len(outliers)} readings outside ±{tolerance} counts of mean {mean_value:.1f}"
-    context.hil_logger.test_pass(f"All {len(context.adc_readings)} readings within ±{tolerance} counts")
+           f"{len(outliers)} readings outside ±{tolerance} counts of mean {mean_value:.1f} " \
+           f"(first at sample {outliers[0]}: {series.values[outliers[0]]:.0f})"
+    context.hil_logger.test_pass(f"All {len(series)} readings within ±{tolerance} counts")
 
 
 @then('"{channel1}" should read approximately {voltage1:f}V')
@@ -489,36 +583,34 @@ def step_verify_pwm_average_voltage(context, expected):
 @then('the duty cycle should remain stable within ±{tolerance:d}%')
 def step_verify_pwm_duty_stability(context, tolerance):
     """Verify PWM duty cycle stability"""
-    assert hasattr(context, 'pwm_measurements'), "No PWM measurements available"
-    
-    duty_cycles = [m['duty_cycle'] for m in context.pwm_measurements]
-    mean_duty = statistics.mean(duty_cycles)
+    series = _pwm_series(context, 'duty_cycle', '%')
+    assert len(series), "No PWM measurements available"
     
-    outliers = []
-    for i, duty in enumerate(duty_cycles):
-        if abs(duty - mean_duty) > tolerance:
-            outliers.append((i, duty))
+    stats = series.stats()
+    outliers = series.outliers(tolerance=tolerance, center=stats.mean)
+    _record_evidence(context, series)
     
     assert len(outliers) == 0, \
-           f"{len(outliers)} duty cycle measurements outside ±{tolerance}% of mean {mean_duty:.1f}%"
+           f"{len(outliers)} duty cycle measurements outside ±{tolerance}% of mean {stats.mean:.1f}% " \
+           f"(range {stats.minimum:.1f}-{stats.maximum:.1f}%, drift {stats.drift_per_s:+.3f}%/s)"
+    context.hil_logger.measurement("PWM duty cycle std", stats.std, "%", f"±{tolerance}%")
     context.hil_logger.test_pass(f"PWM duty cycle stable within ±{tolerance}%")
 
 
 @then('the frequency should remain stable within ±{tolerance:d}Hz')
 def step_verify_pwm_frequency_stability(context, tolerance):
     """Verify PWM frequency stability"""
-    assert hasattr(context, 'pwm_measurements'), "No PWM measurements available"
-    
-    frequencies = [m['frequency'] for m in context.pwm_measurements]
-    mean_freq = statistics.mean(frequencies)
+    series = _pwm_series(context, 'frequency', 'Hz')
+    assert len(series), "No PWM measurements available"
     
-    outliers = []
-    for i, freq in enumerate(frequencies):
-        if abs(freq - mean_freq) > tolerance:
-            outliers.append((i, freq))
+    stats = series.stats()
+    outliers = series.outliers(tolerance=tolerance, center=stats.mean)
+    _record_evidence(context, series)
     
     assert len(outliers) == 0, \
-           f"{len(outliers)} frequency measurements outside ±{tolerance}Hz of mean {mean_freq:.1f}Hz"
+           f"{len(outliers)} frequency measurements outside ±{tolerance}Hz of mean {stats.mean:.1f}Hz " \
+           f"(range {stats.minimum:.1f}-{stats.maximum:.1f}Hz, drift {stats.drift_per_s:+.3f}Hz/s)"
+    context.hil_logger.measurement("PWM frequency std", stats.std, "Hz", f"±{tolerance}Hz")
     context.hil_logger.test_pass(f"PWM frequency stable within ±{tolerance}Hz")
 
 
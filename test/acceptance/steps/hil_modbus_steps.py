@@ -12,6 +12,8 @@ License: Proprietary
 import time
 from behave import given, when, then
 
+from test.acceptance.hil_framework.hardware_interface import MODBUS_BLOCK_MAX
+
 
 @given('the ATmega32A is programmed with MODBUS firmware')
 def step_atmega_programmed_with_modbus(context):
@@ -133,17 +135,21 @@ def step_read_modbus_registers_sequence(context, start_addr, end_addr):
     
     context.sequence_reads = []
     
-    for addr in range(start, end + 1):
+    # One FC03 block read per MODBUS_BLOCK_MAX registers instead of one round trip each
+    for block_start in range(start, end + 1, MODBUS_BLOCK_MAX):
+        count = min(MODBUS_BLOCK_MAX, end + 1 - block_start)
         start_time = time.time()
-        value = context.hardware_interface.modbus_read_register(addr)
+        values = context.hardware_interface.modbus_read_block(block_start, count)
         end_time = time.time()
         
-        context.sequence_reads.append({
-            'address': addr,
-            'value': value,
-            'response_time': end_time - start_time
-        })
-        context.hil_logger.measurement(f"MODBUS sequence read 0x{addr:04X}", value if value is not None else "FAIL")
+        for offset, value in enumerate(values):
+            addr = block_start + offset
+            context.sequence_reads.append({
+                'address': addr,
+                'value': value,
+                'response_time': end_time - start_time
+            })
+            context.hil_logger.measurement(f"MODBUS sequence read 0x{addr:04X}", value if value is not None else "FAIL")
 
 
 @when('I attempt to read MODBUS register {address} (invalid address)')
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tag Index - Inverted tag-to-scenario bitset index with a boolean query engine
+
+Each scenario gets a dense integer ID and each tag maps to an integer bitset
+of the scenarios carrying it. Tag expressions are compiled once into bitset
+operations, so filtering and per-tag counts cost a handful of big-integer
+AND/OR/popcount operations regardless of how many scenarios exist.
+
+Query syntax (case-insensitive tag names, optional leading '@'):
+    smoke and hil          both tags (adjacent terms are also ANDed)
+    smoke or modbus        either tag ('|' and Behave's ',' also mean OR)
+    hil and not pending    '-', '~' and '!' also mean NOT
+    req-*                  every tag starting with "req-"
+    (smoke or hil) and not pending
+
+Author: Cannasol Technologies
+License: Proprietary
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Sequence
+
+_TOKEN = re.compile(r"\s*(\(|\)|&&|\|\||[&|,!~]|-(?=\S)|[^\s()&|,!~]+)")
+_OR = {"or", "|", "||", ","}
+_AND = {"and", "&", "&&"}
+_NOT = {"not", "!", "~", "-"}
+
+
+class TagQueryError(ValueError):
+    """Raised for malformed tag expressions"""
+
+
+def _normalize(tag: str) -> str:
+    return tag.lstrip("@").lower()
+
+
+class TagIndex:
+    """Inverted index from tag to a bitset of scenario IDs (bit i = scenario i)"""
+
+    def __init__(self, scenario_tags: Iterable[Iterable[str]] = ()):
+        self._bits: Dict[str, int] = {}
+        self._size = 0
+        for tags in scenario_tags:
+            self.add(tags)
+
+    def add(self, tags: Iterable[str]) -> int:
+        """Index one scenario's tags and return its scenario ID"""
+        sid = self._size
+        self._size += 1
+        bit = 1 << sid
+        for tag in tags:
+            key = _normalize(tag)
+            self._bits[key] = self._bits.get(key, 0) | bit
+        return sid
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def all_bits(self) -> int:
+        return (1 << self._size) - 1
+
+    def tags(self) -> List[str]:
+        return sorted(self._bits)
+
+    def bits(self, tag: str) -> int:
+        """Bitset for a tag, or for every tag sharing a prefix when it ends in '*'"""
+        key = _normalize(tag)
+        if key.endswith("*"):
+            prefix = key[:-1]
+            result = 0
+            for name, bits in self._bits.items():
+                if name.startswith(prefix):
+                    result |= bits
+            return result
+        return self._bits.get(key, 0)
+
+    def query(self, expression: str) -> int:
+        """Evaluate a tag expression to a scenario bitset (empty expression = all)"""
+        tokens = [m.group(1) for m in _TOKEN.finditer(expression or "")]
+        if not tokens:
+            return self.all_bits
+        parser = _QueryParser(self, tokens)
+        result = parser.parse_or()
+        if parser.pos != len(tokens):
+            raise TagQueryError(f"Unexpected '{tokens[parser.pos]}' in tag expression: {expression}")
+        return result
+
+    def match_all(self, tags: Sequence[str]) -> int:
+        """Scenarios carrying every tag (the web UI's AND mode)"""
+        result = self.all_bits
+        for tag in tags:
+            result &= self.bits(tag)
+        return result
+
+    def match_any(self, tags: Sequence[str]) -> int:
+        """Scenarios carrying at least one tag (the web UI's OR mode)"""
+        result = 0
+        for tag in tags:
+            result |= self.bits(tag)
+        return result
+
+    def counts(self, within: Optional[int] = None) -> Dict[str, int]:
+        """Scenario count per tag, optionally restricted to a result bitset"""
+        mask = self.all_bits if within is None else within
+        return {tag: bin(bits & mask).count("1") for tag, bits in sorted(self._bits.items())}
+
+    @staticmethod
+    def ids(bits: int) -> List[int]:
+        """Scenario IDs set in a bitset, in ascending order"""
+        result = []
+        while bits:
+            low = bits & -bits
+            result.append(low.bit_length() - 1)
+            bits ^= low
+        return result
+
+
+class _QueryParser:
+    """Recursive-descent evaluator: NOT binds tighter than AND, AND tighter than OR"""
+
+    def __init__(self, index: TagIndex, tokens: List[str]):
+        self.index = index
+        self.tokens = tokens
+        self.pos = 0
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos].lower() if self.pos < len(self.tokens) else None
+
+    def parse_or(self) -> int:
+        result = self.parse_and()
+        while self._peek() in _OR:
+            self.pos += 1
+            result |= self.parse_and()
+        return result
+
+    def parse_and(self) -> int:
+        result = self.parse_not()
+        while True:
+            token = self._peek()
+            if token in _AND:
+                self.pos += 1
+            elif token is None or token in _OR or token == ")":
+                return result
+            result &= self.parse_not()
+
+    def parse_not(self) -> int:
+        if self._peek() in _NOT:
+            self.pos += 1
+            return self.index.all_bits & ~self.parse_not()
+        return self.parse_term()
+
+    def parse_term(self) -> int:
+        token = self._peek()
+        if token is None:
+            raise TagQueryError("Tag expression ended unexpectedly")
+        self.pos += 1
+        if token == "(":
+            result = self.parse_or()
+            if self._peek() != ")":
+                raise TagQueryError("Missing ')' in tag expression")
+            self.pos += 1
+            return result
+        if token == ")" or token in _OR or token in _AND:
+            raise TagQueryError(f"Unexpected '{self.tokens[self.pos - 1]}' in tag expression")
+        return self.index.bits(token)
@@ -20,6 +20,7 @@ from typing import Dict, List, Optional, Any, Tuple
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from test.acceptance.hil_framework.config_service import TestingSettings, hil_config
 from test.acceptance.hil_framework.hardware_interface import HardwareInterface
 from test.acceptance.hil_framework.logger import HILLogger
 
@@ -43,23 +44,13 @@ class HardwareValidator:
     def _load_hil_config(self):
         """Load HIL configuration from config file"""
         try:
-            import yaml
-            from pathlib import Path
-            config_path = Path(__file__).parent.parent / 'acceptance' / 'hil_framework' / 'hil_config.yaml'
-            if config_path.exists():
-                with open(config_path, 'r') as f:
-                    config = yaml.safe_load(f)
-                    testing_config = config.get('testing', {})
-                    # Load any relevant configuration values
-                    self.voltage_tolerance = testing_config.get('voltage_tolerance', 0.2)
-                    self.timing_tolerance = testing_config.get('timing_tolerance', 0.1)
-                    self.adc_reference_voltage = testing_config.get('adc_reference_voltage', 5.0)
+            testing = hil_config().testing
         except Exception as e:
             self.logger.warning(f"Failed to load HIL configuration: {e}. Using defaults.")
-            # Default values if config loading fails
-            self.voltage_tolerance = 0.2
-            self.timing_tolerance = 0.1
-            self.adc_reference_voltage = 5.0
+            testing = TestingSettings()
+        self.voltage_tolerance = testing.voltage_tolerance
+        self.timing_tolerance = testing.timing_tolerance
+        self.adc_reference_voltage = testing.adc_reference_voltage
         
         self.logger.info("Hardware Validator initialized")
     
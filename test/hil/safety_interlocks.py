@@ -23,6 +23,7 @@ from enum import Enum
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from test.acceptance.hil_framework.config_service import hil_config
 from test.acceptance.hil_framework.hardware_interface import HardwareInterface
 from test.acceptance.hil_framework.logger import HILLogger
 
@@ -75,17 +76,11 @@ class SafetyInterlocks:
     def _load_timeout_config(self):
         """Load timeout configuration from HIL config file"""
         try:
-            import yaml
-            from pathlib import Path
-            config_path = Path(__file__).parent.parent / 'acceptance' / 'hil_framework' / 'hil_config.yaml'
-            if config_path.exists():
-                with open(config_path, 'r') as f:
-                    config = yaml.safe_load(f)
-                    timeouts = config.get('timeouts', {}).get('safety_system', {})
-                    self.config['emergency_stop_timeout_ms'] = int(timeouts.get('emergency_stop', 0.1) * 1000)
-                    self.config['communication_timeout_s'] = timeouts.get('communication_timeout', 5.0)
-                    self.config['monitoring_interval_s'] = timeouts.get('monitoring_interval', 0.1)
-                    self.config['safe_state_timeout_s'] = timeouts.get('safe_state_timeout', 30.0)
+            timeouts = hil_config().safety_timeouts
+            self.config['emergency_stop_timeout_ms'] = int(timeouts.emergency_stop * 1000)
+            self.config['communication_timeout_s'] = timeouts.communication_timeout
+            self.config['monitoring_interval_s'] = timeouts.monitoring_interval
+            self.config['safe_state_timeout_s'] = timeouts.safe_state_timeout
         except Exception as e:
             self.logger.warning(f"Failed to load timeout configuration: {e}. Using defaults.")
         
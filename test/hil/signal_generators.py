@@ -24,6 +24,7 @@ from enum import Enum
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from test.acceptance.hil_framework.config_service import hil_config
 from test.acceptance.hil_framework.hardware_interface import HardwareInterface
 from test.acceptance.hil_framework.logger import HILLogger
 
@@ -71,19 +72,13 @@ class SignalGenerators:
     def _load_config(self):
         """Load configuration from HIL config file"""
         try:
-            import yaml
-            from pathlib import Path
-            config_path = Path(__file__).parent.parent / 'acceptance' / 'hil_framework' / 'hil_config.yaml'
-            if config_path.exists():
-                with open(config_path, 'r') as f:
-                    config = yaml.safe_load(f)
-                    testing_config = config.get('testing', {})
-                    self.config['max_frequency_hz'] = testing_config.get('max_frequency_hz', 50000)
-                    self.config['min_frequency_hz'] = testing_config.get('min_frequency_hz', 1)
-                    self.config['pwm_resolution'] = testing_config.get('pwm_resolution', 8)
-                    self.config['analog_resolution'] = testing_config.get('analog_resolution', 10)
-                    self.config['max_voltage'] = testing_config.get('max_voltage', 5.0)
-                    self.config['update_interval_ms'] = int(testing_config.get('update_interval_ms', 10))
+            testing = hil_config().testing
+            self.config['max_frequency_hz'] = testing.max_frequency_hz
+            self.config['min_frequency_hz'] = testing.min_frequency_hz
+            self.config['pwm_resolution'] = testing.pwm_resolution
+            self.config['analog_resolution'] = testing.analog_resolution
+            self.config['max_voltage'] = testing.max_voltage
+            self.config['update_interval_ms'] = testing.update_interval_ms
         except Exception as e:
             self.logger.warning(f"Failed to load configuration: {e}. Using defaults.")
         
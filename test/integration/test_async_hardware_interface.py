@@ -0,0 +1,138 @@
+"""
+Integration Test — asyncio harness client
+
+Purpose:
+- Verify awaitable commands are correlated by tag with several in flight.
+- Verify unsolicited lines arrive through the async message iterator, not as replies.
+- Verify MODBUS block reads and the single-register fallback.
+- Verify the non-blocking file-descriptor reader used for real serial ports.
+"""
+
+import asyncio
+import socket
+import threading
+import unittest
+
+from test.acceptance.hil_framework.async_hardware_interface import AsyncHardwareInterface
+from test.mocks.fake_harness_serial import FakeHarnessSerial
+
+
+def _harness(cmd):
+    name, _, args = cmd.partition(" ")
+    if cmd == "PING":
+        return "OK PONG"
+    if cmd == "READ STATUS 4":
+        return "OK RUN=1 OVL=0 LOCK=1"
+    if cmd == "READ POWER 4":
+        return "OK POWER=428"
+    if name == "MODBUS_READ":
+        return f"MODBUS {args} {int(args, 16) * 3:x}"
+    return f"ERROR: Unknown command '{name}'. Type HELP for available commands."
+
+
+class SocketSerial:
+    """Serial stand-in backed by a socket pair, so it has a pollable file descriptor"""
+
+    def __init__(self, responder):
+        self.host, self.device = socket.socketpair()
+        self.host.setblocking(False)
+        self.is_open = True
+        self._thread = threading.Thread(target=self._serve, args=(responder,), daemon=True)
+        self._thread.start()
+
+    def _serve(self, responder):
+        buffer = b""
+        while True:
+            data = self.device.recv(4096)
+            if not data:
+                return
+            buffer += data
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                tag, command = line.decode().split(" ", 1)
+                self.device.sendall(f"{tag} {responder(command)}\r\n".encode())
+
+    def fileno(self):
+        return self.host.fileno()
+
+    def read(self, size=1):
+        try:
+            return self.host.recv(size)
+        except BlockingIOError:
+            return b""
+
+    def write(self, data):
+        self.host.sendall(data)
+        return len(data)
+
+    def reset_input_buffer(self):
+        pass
+
+    def close(self):
+        self.is_open = False
+        self.host.close()
+        self.device.close()
+
+
+class TestAsyncHardwareInterface(unittest.IsolatedAsyncioTestCase):
+    async def _interface(self, port):
+        hw = await AsyncHardwareInterface(serial_connection=port).open()
+        self.addAsyncCleanup(hw.close)
+        return hw
+
+    async def test_awaitable_commands(self):
+        hw = await self._interface(FakeHarnessSerial(responder=_harness))
+        self.assertTrue(await hw.ping())
+        self.assertEqual(await hw.read_status(4), "OK RUN=1 OVL=0 LOCK=1")
+        self.assertEqual(await hw.read_power(4), 428.0)
+
+    async def test_concurrent_commands_are_correlated_in_order(self):
+        port = FakeHarnessSerial(responder=lambda cmd: f"OK {cmd}", delay=0.05)
+        hw = await self._interface(port)
+        responses = await asyncio.gather(*(hw.send_command(f"READ ADC A{i}") for i in range(5)))
+        self.assertEqual(responses, [f"OK READ ADC A{i}" for i in range(5)])
+
+    async def test_unsolicited_messages_are_iterated(self):
+        port = FakeHarnessSerial(responder=_harness)
+        hw = await self._interface(port)
+        messages = hw.messages()
+        port.inject("PIN D8 HIGH\n")
+        self.assertEqual(await asyncio.wait_for(messages.__anext__(), 1.0), "PIN D8 HIGH")
+        self.assertTrue(await hw.ping())
+        port.inject("PIN D8 LOW\n")
+        self.assertEqual(await asyncio.wait_for(messages.__anext__(), 1.0), "PIN D8 LOW")
+
+    async def test_timeout_does_not_shift_later_replies(self):
+        port = FakeHarnessSerial(responder=lambda cmd: f"OK {cmd}", delay=0.2)
+        hw = await self._interface(port)
+        self.assertEqual(await hw.send_command("SLOW", timeout=0.05), "")
+        self.assertEqual(hw._pending, {})
+        self.assertEqual(await hw.send_command("NEXT", timeout=1.0), "OK NEXT")
+        self.assertEqual(hw.late_replies, 1)
+
+    async def test_modbus_block_falls_back_to_single_reads(self):
+        port = FakeHarnessSerial(responder=_harness)
+        hw = await self._interface(port)
+        self.assertEqual(await hw.modbus_read_block(0x0010, 3), [0x30, 0x33, 0x36])
+        self.assertFalse(hw._block_read_supported)
+        written = len(port.written)
+        await hw.modbus_read_block(0x0000, 2)
+        self.assertEqual(port.written[written:], ["MODBUS_READ 0000", "MODBUS_READ 0001"])
+
+    async def test_modbus_block_refused_by_harness_reads_none(self):
+        port = FakeHarnessSerial(responder=lambda cmd: "ERROR: MODBUS_READ_BLOCK address not supported")
+        hw = await self._interface(port)
+        self.assertEqual(await hw.modbus_read_block(0x0100, 3), [None, None, None])
+        self.assertEqual(port.written, ["MODBUS_READ_BLOCK 0100 03"])
+
+    async def test_file_descriptor_reader(self):
+        port = SocketSerial(_harness)
+        hw = await self._interface(port)
+        self.assertIsNotNone(hw._fd)
+        self.assertIsNone(hw._reader_task)
+        results = await asyncio.gather(hw.ping(), hw.read_power(4), hw.read_status(4))
+        self.assertEqual(results, [True, 428.0, "OK RUN=1 OVL=0 LOCK=1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Integration Test — Compiled modular configuration bundle
+
+Purpose:
+- Verify the first load compiles config/*.yaml into a bundle and later loads reuse it.
+- Verify editing any source file (by content hash) triggers a recompile.
+- Verify a corrupt bundle is ignored and rebuilt.
+"""
+
+import contextlib
+import importlib.util
+import io
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SOURCES = ["sonic-multiplexer.yaml", "pinout-cfg.yaml", "connections-cfg.yaml",
+           "communication-cfg.yaml", "sonicator-cfg.yaml"]
+
+_spec = importlib.util.spec_from_file_location("config_loader", REPO_ROOT / "scripts" / "config-loader.py")
+config_loader = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(config_loader)
+
+
+class TestConfigBundle(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.config_dir = Path(tmp.name) / "config"
+        self.config_dir.mkdir()
+        for name in SOURCES:
+            shutil.copy(REPO_ROOT / "config" / name, self.config_dir / name)
+        self.bundle = str(Path(tmp.name) / "bundle.pickle")
+
+    def load(self):
+        loader = config_loader.ModularConfigLoader(str(self.config_dir))
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(loader.load_compiled(bundle_file=self.bundle))
+        return loader
+
+    def test_bundle_matches_direct_parse_and_is_reused(self):
+        first = self.load()
+        self.assertFalse(first.bundle_hit)
+        second = self.load()
+        self.assertTrue(second.bundle_hit)
+
+        direct = config_loader.ModularConfigLoader(str(self.config_dir))
+        with contextlib.redirect_stdout(io.StringIO()):
+            direct.load_master_config()
+            direct.load_all_modules()
+            direct.validate_configuration()
+        self.assertEqual(second.master_config, direct.master_config)
+        for name, module in direct.modules.items():
+            self.assertEqual(second.get_module_data(name), module.data)
+        self.assertEqual(second.validation_errors, direct.validation_errors)
+        self.assertEqual(second.get_pin_config("PB0"), direct.get_pin_config("PB0"))
+
+    def test_source_change_recompiles(self):
+        self.load()
+        sonicators = self.config_dir / "sonicator-cfg.yaml"
+        sonicators.write_text(sonicators.read_text() + "\nbundle_probe: 42\n")
+        loader = self.load()
+        self.assertFalse(loader.bundle_hit)
+        self.assertEqual(loader.get_module_data("sonicators")["bundle_probe"], 42)
+        self.assertTrue(self.load().bundle_hit)
+
+    def test_corrupt_bundle_is_rebuilt(self):
+        self.load()
+        Path(self.bundle).write_bytes(b"not a pickle")
+        self.assertFalse(self.load().bundle_hit)
+        self.assertTrue(self.load().bundle_hit)
+
+
+if __name__ == "__main__":
+    unittest.main()
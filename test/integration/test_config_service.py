@@ -0,0 +1,101 @@
+"""
+Integration Test — Process-wide HIL configuration service
+
+Purpose:
+- Verify hil_config.yaml is parsed once and shared as an immutable snapshot.
+- Verify typed views fall back to defaults and reject malformed values.
+- Verify config/*.yaml modules are attached through ModularConfigLoader.
+- Verify reload/watch publish a new snapshot to subscribers.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+from test.acceptance.hil_framework import config_service
+from test.acceptance.hil_framework.config_service import (
+    ConfigError,
+    ConfigService,
+    HarnessTimeouts,
+    HILConfig,
+    get_config_service,
+    hil_config,
+)
+
+
+class TestConfigService(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.path = self.tmp / "hil_config.yaml"
+        self.writes = 0
+        self.write({"timeouts": {"hardware_interface": {"ping": 0.5}}, "hardware": {"target_serial_port": "/dev/x"}})
+
+    def write(self, data):
+        self.path.write_text(yaml.safe_dump(data))
+        # mtime granularity on some filesystems is coarse; make every write visible
+        self.writes += 1
+        stamp = time.time() + self.writes
+        os.utime(self.path, (stamp, stamp))
+
+    def test_parsed_once_and_frozen(self):
+        service = ConfigService(self.path, config_dir=self.tmp)
+        with mock.patch.object(config_service.yaml, "safe_load", wraps=yaml.safe_load) as safe_load:
+            first, second = service.get(), service.get()
+        self.assertIs(first, second)
+        self.assertEqual(safe_load.call_count, 1)
+        self.assertEqual(first.harness_timeouts.ping, 0.5)
+        self.assertEqual(first.harness_timeouts.serial_connect, HarnessTimeouts().serial_connect)
+        with self.assertRaises(TypeError):
+            first.data["hardware"]["target_serial_port"] = "/dev/y"
+        copy = first.as_dict()
+        copy["hardware"]["target_serial_port"] = "/dev/y"
+        self.assertEqual(first.section("hardware")["target_serial_port"], "/dev/x")
+
+    def test_shared_service_per_file(self):
+        self.assertIs(get_config_service(), get_config_service("hil_config.yaml"))
+        self.assertIs(hil_config(), hil_config())
+
+    def test_invalid_values_are_rejected(self):
+        with self.assertRaises(ConfigError):
+            HILConfig.from_dict({"timeouts": {"programmer": {"chip_erase": "slow"}}})
+        with self.assertRaises(ConfigError):
+            HILConfig.from_dict({"testing": [1, 2]})
+
+    def test_modular_config_attached(self):
+        modules = hil_config().modules
+        self.assertIn("pinout", modules)
+        self.assertIs(hil_config().section("connections"), modules["connections"])
+
+    def test_reload_notifies_subscribers(self):
+        service = ConfigService(self.path, config_dir=self.tmp)
+        old = service.get()
+        seen = []
+        service.subscribe(seen.append)
+        self.assertFalse(service.changed())
+        self.write({"timeouts": {"hardware_interface": {"ping": 0.25}}})
+        self.assertTrue(service.changed())
+        service.watch(interval=0.02)
+        self.addCleanup(service.stop_watching)
+        deadline = time.monotonic() + 2.0
+        while not seen and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual([c.harness_timeouts.ping for c in seen], [0.25])
+        self.assertEqual(seen[0].generation, old.generation + 1)
+        self.assertEqual(old.harness_timeouts.ping, 0.5)
+
+    def test_hardware_interface_reads_shared_snapshot(self):
+        from test.acceptance.hil_framework.hardware_interface import HardwareInterface
+
+        hw = HardwareInterface("fake")
+        self.assertEqual(hw.ping_timeout, hil_config().harness_timeouts.ping)
+        hw._load_timeout_config(HILConfig.from_dict({"timeouts": {"hardware_interface": {"ping": 3}}}))
+        self.assertEqual(hw.ping_timeout, 3.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Integration Test — Intel HEX page diffing and delta ISP programming
+
+Purpose:
+- Verify Intel HEX images round-trip and diff at flash page granularity.
+- Verify only changed pages are sent to avrdude, and deltas that need an erase fall back to a full write.
+- Verify the cached base image is read back first and a mismatch forces a full, verified write.
+"""
+
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from test.acceptance.hil_framework.intel_hex import FlashImage, changed_pages, needs_erase
+from test.acceptance.hil_framework.programmer import ArduinoISPProgrammer
+
+
+def _image(values):
+    """Two pages of code; ``values`` overrides individual bytes"""
+    data = {addr: 0x00 for addr in range(256)}
+    data.update(values)
+    return FlashImage(data)
+
+
+class TestIntelHex(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+
+    def test_round_trip_and_checksum(self):
+        image = FlashImage({0x0000: 0x0C, 0x0001: 0x94, 0x10005: 0xAA})
+        path = self.root / "fw.hex"
+        image.write_hex(str(path))
+        self.assertEqual(FlashImage.from_hex(str(path)).pages(), image.pages())
+        path.write_text(":0100000000FE\n")
+        with self.assertRaises(ValueError):
+            FlashImage.from_hex(str(path))
+
+    def test_changed_pages_and_erase_detection(self):
+        previous = _image({0x10: 0xFF, 0x90: 0x00})
+        cleared = _image({0x10: 0x0F})
+        self.assertEqual(changed_pages(previous, cleared), [0x00])
+        self.assertFalse(needs_erase(previous, cleared, [0x00]))
+        raised = _image({0x10: 0xFF, 0x90: 0x01})
+        self.assertEqual(changed_pages(previous, raised), [0x80])
+        self.assertTrue(needs_erase(previous, raised, [0x80]))
+
+
+class TestDeltaProgramming(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.programmer = ArduinoISPProgrammer("/dev/null")
+        self.commands = []
+        self.base_on_target = True
+
+    def _run(self, cmd, **_kwargs):
+        self.commands.append(cmd)
+        written = next((op for op in cmd if op.startswith("flash:w:")), None)
+        if written:
+            self.written_pages = sorted(FlashImage.from_hex(written.split(":")[2]).pages())
+        verified = next((op for op in cmd if op.startswith("flash:v:")), None)
+        if verified and Path(verified.split(":")[2]).name == "base.hex" and not self.base_on_target:
+            return subprocess.CompletedProcess(cmd, 1, "", "verification error, content mismatch")
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    def _operations(self):
+        return [next((op.split(":")[1] for op in cmd if op.startswith("flash:")), "e" if "-e" in cmd else None)
+                for cmd in self.commands]
+
+    def _program(self, previous, current):
+        prev_path, cur_path = self.root / "prev.hex", self.root / "cur.hex"
+        previous.write_hex(str(prev_path))
+        current.write_hex(str(cur_path))
+        with mock.patch("subprocess.run", side_effect=self._run), \
+                mock.patch.object(ArduinoISPProgrammer, "_arduino_present", return_value=True):
+            return self.programmer.program_firmware_delta(str(cur_path), str(prev_path))
+
+    def test_writes_only_changed_pages(self):
+        self.assertTrue(self._program(_image({0x90: 0xFF}), _image({0x90: 0x12})))
+        self.assertEqual(self.written_pages, [0x80])
+        # Base read back first, then one write of the changed page without erase
+        self.assertEqual(self._operations(), ["v", "w"])
+        self.assertIn("-D", self.commands[1])
+
+    def test_identical_image_only_confirms_base(self):
+        self.assertTrue(self._program(_image({}), _image({})))
+        self.assertEqual(self._operations(), ["v"])
+
+    def test_bit_set_falls_back_to_erase_and_full_write(self):
+        self.assertTrue(self._program(_image({}), _image({0x90: 0x01})))
+        self.assertEqual(self._operations(), ["v", "e", "w", "v"])
+        self.assertEqual(self.written_pages, [0x00, 0x80])
+
+    def test_stale_cached_base_forces_full_verified_write(self):
+        self.base_on_target = False
+        self.assertTrue(self._program(_image({0x90: 0xFF}), _image({0x90: 0x12})))
+        self.assertEqual(self._operations(), ["v", "e", "w", "v"])
+        self.assertEqual(self.written_pages, [0x00, 0x80])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+Integration Test — Shared cached Gherkin feature index
+
+Purpose:
+- Verify feature/scenario tags, steps, backgrounds and outlines are parsed correctly.
+- Verify unchanged files are served from the on-disk cache and changed files are reparsed.
+- Verify requirement coverage reads the repository features through the index and
+  treats feature-level FR tags as inherited by every scenario.
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from test.acceptance import feature_index
+from test.acceptance.feature_index import FeatureIndex, parse_feature
+from test.acceptance.requirement_mapping import scan_feature_tags
+
+FEATURE = """\
+@requirement_FR2 @hil
+Feature: Start and stop
+  # comment lines are ignored
+
+  Background:
+    Given the system is initialized
+
+  @smoke @req-start
+  Scenario: Start unit 1
+    When I start unit 1
+    \"\"\"
+    Scenario: inside a docstring
+    \"\"\"
+    Then unit 1 should be running
+
+  @pending
+  Scenario Outline: Start unit <n>
+    When I start unit <n>
+    And the table is
+      | Then | not a step |
+
+    @examples_tag
+    Examples:
+      | n |
+      | 2 |
+
+  Scenario: Untagged
+    * a generic step
+"""
+
+
+class TestFeatureParser(unittest.TestCase):
+    def test_structure_and_tags(self):
+        feature = parse_feature(FEATURE, "start.feature")
+        self.assertEqual(feature.name, "Start and stop")
+        self.assertEqual(feature.tags, ["requirement_FR2", "hil"])
+        self.assertEqual([s.text for s in feature.background], ["Given the system is initialized"])
+
+        start, outline, untagged = feature.scenarios
+        self.assertEqual((start.name, start.keyword, start.line), ("Start unit 1", "Scenario", 9))
+        self.assertEqual(start.tags, ["smoke", "req-start"])
+        self.assertEqual([s.keyword for s in start.steps], ["When", "Then"])
+        self.assertEqual(outline.keyword, "Scenario Outline")
+        self.assertEqual(outline.tags, ["pending"])
+        self.assertEqual(len(outline.steps), 2)
+        # Examples tags do not leak into the following scenario
+        self.assertEqual(untagged.tags, [])
+        self.assertEqual(feature.effective_tags(start), ["requirement_FR2", "hil", "smoke", "req-start"])
+
+
+class TestFeatureIndexCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.cache = self.root / "cache" / "index.json"
+        self.path = self.root / "start.feature"
+        self.path.write_text(FEATURE)
+
+    def test_unchanged_files_are_not_reparsed(self):
+        self.assertEqual(len(FeatureIndex(self.cache).features(self.root)[0].scenarios), 3)
+        self.assertTrue(self.cache.exists())
+        with mock.patch.object(feature_index, "parse_feature") as parse:
+            # New process-equivalent index, touched but identical file: served from cache
+            os.utime(self.path, ns=(1, 1))
+            feature = FeatureIndex(self.cache).feature(self.path)
+            self.assertEqual(feature.scenarios[0].name, "Start unit 1")
+            FeatureIndex(self.cache).feature(self.path)
+        parse.assert_not_called()
+
+    def test_changed_files_are_reparsed(self):
+        index = FeatureIndex(self.cache)
+        index.feature(self.path)
+        self.path.write_text(FEATURE.replace("Start unit 1", "Start unit one"))
+        self.assertEqual(index.feature(self.path).scenarios[0].name, "Start unit one")
+        self.assertEqual(FeatureIndex(self.cache).feature(self.path).scenarios[0].name, "Start unit one")
+
+    def test_deleted_files_leave_the_cache(self):
+        FeatureIndex(self.cache).feature(self.path)
+        self.path.unlink()
+        self.assertEqual(FeatureIndex(self.cache).features(self.root), [])
+        self.assertNotIn(str(self.path.resolve()), self.cache.read_text())
+
+
+class TestFeatureIndexConsumers(unittest.TestCase):
+    def test_requirement_coverage_from_repository_features(self):
+        features_dir = Path(__file__).resolve().parents[1] / "acceptance" / "features"
+        with mock.patch.object(feature_index, "_default_index", FeatureIndex(Path(tempfile.mkdtemp()) / "i.json")):
+            cov = scan_feature_tags(str(features_dir))
+        self.assertIn("FR8", cov.found)
+        self.assertFalse(cov.fr_pending_seen.get("FR8", False))
+        self.assertIn("AC1", cov.ac_found)
+
+    def test_feature_requirement_is_live_through_any_live_scenario(self):
+        root = Path(tempfile.mkdtemp())
+        (root / "a.feature").write_text("@requirement_FR5\nFeature: A\n  @pending\n  Scenario: Pending\n"
+                                        "    Given a\n  Scenario: Untagged\n    Given b\n")
+        (root / "b.feature").write_text("@requirement_FR7\nFeature: B\n  @pending @requirement_FR8\n"
+                                        "  Scenario: Pending\n    Given c\n")
+        with mock.patch.object(feature_index, "_default_index", FeatureIndex(root / "i.json")):
+            cov = scan_feature_tags(str(root))
+        # The untagged scenario inherits @requirement_FR5 and is not pending
+        self.assertTrue(cov.fr_nonpending_seen["FR5"])
+        self.assertEqual((cov.fr_pending_seen.get("FR7"), cov.fr_nonpending_seen.get("FR7")), (True, None))
+        self.assertNotIn("FR8", cov.fr_nonpending_seen)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+"""
+Integration Test — Firmware emulator served over a MODBUS RTU PTY
+
+Purpose:
+- Verify the RTU slave mirrors modbus.cpp: CRC, silence on foreign slave id or
+  bad CRC, and ILLEGAL_FUNCTION/ADDRESS/VALUE exception responses.
+- Verify the sonicator state machine timing and status publication.
+- Verify a client can talk to the emulator through the symlinked PTY.
+"""
+
+import os
+import struct
+import tempfile
+import unittest
+
+from scripts.emulation import register_map as rm
+from scripts.emulation.firmware import FirmwareEmulator
+from scripts.emulation.pty_server import PtyEmulatorServer
+from scripts.emulation.rtu import RtuSlave, crc16, with_crc
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance_ms(self, ms):
+        self.now += ms / 1000.0
+
+
+def _read_frame(slave_id, start, count):
+    return with_crc(struct.pack(">BBHH", slave_id, rm.FC_READ_HOLDING, start, count))
+
+
+def _write_frame(slave_id, address, value):
+    return with_crc(struct.pack(">BBHH", slave_id, rm.FC_WRITE_SINGLE, address, value))
+
+
+class TestRtuSlave(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.firmware = FirmwareEmulator(clock=self.clock)
+        self.slave = RtuSlave(self.firmware)
+
+    def test_crc_matches_reference_vector(self):
+        # Read 1 holding register at 0 from slave 1: 01 03 00 00 00 01 84 0A
+        self.assertEqual(_read_frame(1, 0, 1)[-2:], bytes([0x84, 0x0A]))
+        self.assertEqual(crc16(b""), 0xFFFF)
+
+    def test_read_system_status_after_boot(self):
+        response = self.slave.handle_frame(_read_frame(2, rm.REG_SYSTEM_STATUS, 4))
+        self.assertEqual(response[:3], bytes([2, rm.FC_READ_HOLDING, 8]))
+        status, count, mask, watchdog = struct.unpack(">4H", response[3:11])
+        self.assertEqual((status, count, mask, watchdog), (rm.SYSTEM_STATUS_OK, 0, 0, 1))
+
+    def test_foreign_slave_and_bad_crc_are_ignored(self):
+        self.assertIsNone(self.slave.handle_frame(_read_frame(7, 0, 1)))
+        corrupt = bytearray(_read_frame(2, 0, 1))
+        corrupt[-1] ^= 0xFF
+        self.assertIsNone(self.slave.handle_frame(bytes(corrupt)))
+        self.assertEqual(self.slave.crc_errors, 1)
+
+    def test_exception_responses(self):
+        cases = [
+            (_read_frame(2, 0, 126), rm.FC_READ_HOLDING, rm.EXC_ILLEGAL_VALUE),
+            (_read_frame(2, 0x0050, 1), rm.FC_READ_HOLDING, rm.EXC_ILLEGAL_ADDRESS),
+            (_write_frame(2, rm.REG_ACTIVE_COUNT, 1), rm.FC_WRITE_SINGLE, rm.EXC_ILLEGAL_ADDRESS),
+            (_write_frame(2, 0x0200, 1), rm.FC_WRITE_SINGLE, rm.EXC_SLAVE_FAILURE),
+            (with_crc(bytes([2, 0x10, 0, 0x10, 0, 1, 2, 0, 1])), 0x10, rm.EXC_ILLEGAL_FUNCTION),
+        ]
+        for request, function_code, code in cases:
+            with self.subTest(request=request.hex()):
+                self.assertEqual(self.slave.handle_frame(request),
+                                 with_crc(bytes([2, function_code | 0x80, code])))
+
+    def test_write_single_echoes_request(self):
+        request = _write_frame(2, rm.REG_TEST_START_INHIBIT, 0x0005)
+        self.assertEqual(self.slave.handle_frame(request), request)
+        self.assertEqual(self.firmware.read_register(rm.REG_TEST_START_INHIBIT), 5)
+
+
+class TestSonicatorStateMachine(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.firmware = FirmwareEmulator(clock=self.clock)
+        self.flags_addr = rm.sonicator_address(4, rm.SON_STATUS_FLAGS)
+
+    def _flags(self):
+        return self.firmware.read_register(self.flags_addr)
+
+    def test_start_and_stop_follow_firmware_delays(self):
+        self.firmware.write_register(rm.sonicator_address(4, rm.SON_START_STOP), 1)
+        self.clock.advance_ms(30)
+        self.assertFalse(self._flags() & rm.SON_STATUS_RUNNING)
+        self.clock.advance_ms(40)
+        self.assertTrue(self._flags() & rm.SON_STATUS_RUNNING)
+        self.assertEqual(self.firmware.read_register(rm.REG_ACTIVE_MASK), 0b1000)
+        self.assertEqual(self.firmware.read_register(rm.sonicator_address(4, rm.SON_FREQUENCY_HZ)), 2000)
+
+        self.firmware.write_register(rm.sonicator_address(4, rm.SON_START_STOP), 0)
+        self.clock.advance_ms(20)
+        self.assertFalse(self._flags() & rm.SON_STATUS_RUNNING)
+        self.assertEqual(self.firmware.read_register(rm.REG_ACTIVE_COUNT), 0)
+
+    def test_overload_faults_until_reset(self):
+        self.firmware.write_register(rm.sonicator_address(4, rm.SON_START_STOP), 1)
+        self.clock.advance_ms(100)
+        self.firmware.set_overload(4, True)
+        self.clock.advance_ms(30)
+        self.assertTrue(self._flags() & rm.SON_STATUS_FAULT)
+        self.assertTrue(self._flags() & rm.SON_STATUS_OVERLOAD)
+
+        self.firmware.set_overload(4, False)
+        self.clock.advance_ms(30)
+        self.assertTrue(self._flags() & rm.SON_STATUS_FAULT)
+        self.firmware.write_register(rm.sonicator_address(4, rm.SON_OVERLOAD_RESET), 1)
+        self.clock.advance_ms(100)
+        self.assertEqual(self._flags() & rm.SON_STATUS_FAULT, 0)
+        self.assertTrue(self._flags() & rm.SON_STATUS_RUNNING)
+
+    def test_emergency_stop_snapshots_previous_state(self):
+        self.firmware.write_register(rm.sonicator_address(4, rm.SON_START_STOP), 1)
+        self.clock.advance_ms(100)
+        self.firmware.write_register(rm.REG_EMERGENCY_STOP, 1)
+        self.assertTrue(self.firmware.read_register(rm.REG_SYSTEM_STATUS) & rm.SYSTEM_STATUS_EMERGENCY_STOP)
+        self.assertEqual(self.firmware.read_register(rm.REG_PREV_ACTIVE_MASK), 0b1000)
+        self.assertEqual(self.firmware.read_register(rm.REG_LAST_SHUTDOWN_REASON), rm.SHUTDOWN_REASON_ESTOP)
+        self.assertEqual(self.firmware.read_register(rm.sonicator_address(4, rm.SON_PREV_STATE)), 2)
+
+
+class TestPtyEmulatorServer(unittest.TestCase):
+    def setUp(self):
+        try:
+            import serial  # noqa: F401
+        except ImportError:
+            self.skipTest("pyserial not installed")
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_parallel_instances_answer_on_their_own_links(self):
+        import serial
+        servers = [PtyEmulatorServer(os.path.join(self.tmpdir.name, f"tty-msio-{i}")).start() for i in range(2)]
+        for server in servers:
+            self.addCleanup(server.stop)
+
+        write = _write_frame(2, rm.REG_TEST_START_INHIBIT, 3)
+        with serial.Serial(servers[0].link_path, 115200, timeout=1.0) as port:
+            port.write(write)
+            self.assertEqual(port.read(len(write)), write)
+        with serial.Serial(servers[1].link_path, 115200, timeout=1.0) as port:
+            port.write(_read_frame(2, rm.REG_TEST_START_INHIBIT, 1))
+            response = port.read(7)
+        self.assertEqual(struct.unpack(">H", response[3:5])[0], 0)
+        self.assertEqual(servers[0].firmware.read_register(rm.REG_TEST_START_INHIBIT), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
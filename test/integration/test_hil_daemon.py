@@ -0,0 +1,93 @@
+"""
+Integration Test — HIL daemon session sharing over a Unix socket
+
+Purpose:
+- Verify clients attach to a warm harness session and commands reach the harness.
+- Verify batches, release/acquire for ISP programming and DUT reset on request only.
+- Verify the remote interface never opens the daemon's harness port itself.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from test.acceptance.hil_framework.hardware_interface import HardwareInterface
+from test.acceptance.hil_framework.hil_daemon import (
+    HILDaemon,
+    HILDaemonClient,
+    HILDaemonError,
+    RemoteHardwareInterface,
+)
+from test.mocks.fake_harness_serial import FakeHarnessSerial
+
+
+def _harness(cmd):
+    if cmd == "PING":
+        return "OK PONG"
+    if cmd.startswith("BATCH "):
+        items = cmd[6:].split(";")
+        return [f"OK BATCH {len(items)}"] + [f"OK {c}" for c in items]
+    return f"OK {cmd}"
+
+
+class TestHILDaemon(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.socket_path = os.path.join(tmp.name, "hil.sock")
+        self.port = FakeHarnessSerial(responder=_harness)
+        hw = HardwareInterface(serial_port="fake")
+        hw.serial_connection = self.port
+        hw.connected = True
+        self.daemon = HILDaemon(hw, self.socket_path).start(connect=False)
+        self.addCleanup(self.daemon.stop)
+
+    def _remote(self):
+        client = HILDaemonClient.attach(self.socket_path)
+        self.assertIsNotNone(client)
+        remote = RemoteHardwareInterface(client)
+        self.addCleanup(remote.cleanup)
+        return remote
+
+    def test_attach_returns_none_without_daemon(self):
+        self.assertIsNone(HILDaemonClient.attach(self.socket_path + ".missing"))
+
+    def test_commands_share_one_warm_session(self):
+        first, second = self._remote(), self._remote()
+        self.assertTrue(first.verify_connection())
+        self.assertEqual(second.send_command("READ STATUS 4"), "OK READ STATUS 4")
+        status = first.client.request("status")
+        self.assertEqual(status["clients"], 2)
+        self.assertEqual(status["commands_served"], 2)
+        self.assertNotIn("RESET_TARGET", self.port.written)
+
+    def test_batch_round_trips_through_daemon(self):
+        result = self._remote().send_batch(["READ STATUS 4", "READ POWER 4"])
+        self.assertTrue(result.batched)
+        self.assertEqual(result.responses, ["OK READ STATUS 4", "OK READ POWER 4"])
+
+    def test_release_blocks_commands_until_acquired(self):
+        remote = self._remote()
+        self.assertTrue(remote.release_port())
+        self.assertEqual(remote.send_command("PING"), "")
+        with self.assertRaises(HILDaemonError):
+            remote.client.request("command", command="PING")
+
+    def test_reset_dut_only_on_request(self):
+        self.assertTrue(self._remote().reset_dut())
+        self.assertEqual(self.port.written, ["RESET_TARGET"])
+
+    def test_remote_never_opens_the_harness_port(self):
+        remote = self._remote()
+        with mock.patch("serial.Serial") as open_port:
+            self.assertIsNone(remote.start_stream(["PWM"], rate_hz=100))
+            remote.stop_stream()
+            self.assertIsNone(remote.send_command_async("PING"))
+            self.assertEqual(remote.send_command("PING"), "OK PONG")
+        open_port.assert_not_called()
+        self.assertNotIn("STREAM OFF", self.port.written)
+
+
+if __name__ == "__main__":
+    unittest.main()
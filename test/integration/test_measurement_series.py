@@ -0,0 +1,76 @@
+"""
+Integration Test — NumPy measurement series for stability assertions
+
+Purpose:
+- Verify samples grow past the preallocated capacity without losing data.
+- Verify vectorized statistics match the statistics module and drift uses the timestamps.
+- Verify outlier and tolerance-band checks report sample indices.
+- Verify .npy evidence round-trips through save_evidence/load.
+"""
+
+import statistics
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from test.acceptance.hil_framework.measurement_series import MeasurementSeries, save_evidence
+
+
+class TestMeasurementSeries(unittest.TestCase):
+    def test_append_grows_preallocated_arrays(self):
+        series = MeasurementSeries("adc_A1", "counts", capacity=2)
+        for i in range(5):
+            series.append(500 + i, t=i * 0.01)
+        series.extend([510, 511], [0.05, 0.06])
+        self.assertEqual(len(series), 7)
+        self.assertEqual(series.values.tolist(), [500, 501, 502, 503, 504, 510, 511])
+        self.assertEqual(series.times[-1], 0.06)
+        with self.assertRaises(ValueError):
+            series.values[0] = 0
+        with self.assertRaises(ValueError):
+            series.extend([1, 2], [0.1])
+
+    def test_stats_match_statistics_module(self):
+        readings = [510, 512, 511, 509, 513, 512, 510, 511]
+        stats = MeasurementSeries.from_samples("adc", readings).stats()
+        self.assertEqual(stats.count, len(readings))
+        self.assertAlmostEqual(stats.mean, statistics.mean(readings))
+        self.assertAlmostEqual(stats.std, statistics.stdev(readings))
+        self.assertEqual((stats.minimum, stats.maximum, stats.span), (509, 513, 4))
+        self.assertAlmostEqual(stats.median, statistics.median(readings))
+        self.assertEqual(MeasurementSeries.from_samples("one", [7]).stats().std, 0.0)
+        with self.assertRaises(ValueError):
+            MeasurementSeries("empty").stats()
+
+    def test_drift_uses_timestamps(self):
+        t = np.linspace(0.0, 2.0, 2001)
+        series = MeasurementSeries.from_samples("pwm_frequency", 1000 + 3.0 * t, t, "Hz")
+        self.assertAlmostEqual(series.drift(), 3.0)
+        self.assertAlmostEqual(series.percentile(50), 1003.0)
+        self.assertEqual(MeasurementSeries.from_samples("flat", [1, 2], [0.0, 0.0]).drift(), 0.0)
+
+    def test_outliers_and_bands(self):
+        series = MeasurementSeries.from_samples("duty", [50.0, 50.2, 49.9, 53.0, 50.1], unit="%")
+        self.assertEqual(series.outliers(tolerance=1.0, center=50.0).tolist(), [3])
+        self.assertEqual(series.outliers(sigma=1.5).tolist(), [3])
+        self.assertEqual(series.band_violations(49.5, 50.5).tolist(), [3])
+        self.assertTrue(series.within_band(49.0, 53.0))
+        with self.assertRaises(ValueError):
+            series.outliers()
+
+    def test_evidence_round_trip(self):
+        series = MeasurementSeries.from_samples("adc_A1", [1, 2, 3], [0.0, 0.5, 1.0], "counts")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = save_evidence(series, scenario="ADC noise: 2.5V", directory=tmp)
+            self.assertEqual(path.parent, Path(tmp))
+            self.assertTrue(path.name.startswith("adc_noise_2_5v__adc_a1_"))
+            self.assertEqual(path.suffix, ".npy")
+            loaded = MeasurementSeries.load(path, name="adc_A1")
+        self.assertEqual(loaded.values.tolist(), [1, 2, 3])
+        self.assertEqual(loaded.times.tolist(), [0.0, 0.5, 1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
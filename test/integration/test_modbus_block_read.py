@@ -0,0 +1,87 @@
+"""
+Integration Test — Bulk MODBUS register reads through the harness
+
+Purpose:
+- Verify MODBUS_READ_BLOCK responses are unpacked into register values.
+- Verify a full register-map snapshot takes a single harness frame.
+- Verify harness builds without MODBUS_READ_BLOCK fall back to batched single reads.
+- Verify blocks the harness cannot serve read as None instead of zero padding.
+"""
+
+import unittest
+
+from test.acceptance.hil_framework.hardware_interface import HardwareInterface, MODBUS_SNAPSHOT_BLOCKS
+from test.mocks.fake_harness_serial import FakeHarnessSerial
+
+
+def _register(address):
+    return (address * 7) & 0xFFFF
+
+
+def _harness(cmd, block_support=True, register_limit=0x100):
+    """Responder mirroring arduino_harness/src/main.cpp (which serves registers below 0x100)"""
+    if cmd.startswith("BATCH "):
+        items = cmd[6:].split(";")
+        return [f"OK BATCH {len(items)}"] + [_harness(c, block_support, register_limit) for c in items]
+    name, _, args = cmd.partition(" ")
+    if name == "MODBUS_READ_BLOCK" and block_support:
+        addr, count = args.split()
+        start, n = int(addr, 16), int(count, 16)
+        if start + n > register_limit:
+            return "ERROR: MODBUS_READ_BLOCK address not supported (0000..00FF only)"
+        return f"MODBUS_BLOCK {addr} {count} " + "".join(f"{_register(start + i):04X}" for i in range(n))
+    if name == "MODBUS_READ":
+        return f"MODBUS {args} {_register(int(args, 16)):x}"
+    return f"ERROR: Unknown command '{name}'. Type HELP for available commands."
+
+
+class TestModbusBlockRead(unittest.TestCase):
+    def _interface(self, block_support=True, register_limit=0x100):
+        hw = HardwareInterface(serial_port="fake")
+        hw.serial_connection = FakeHarnessSerial(responder=lambda cmd: _harness(cmd, block_support, register_limit))
+        self.addCleanup(hw.cleanup)
+        return hw
+
+    def test_block_read_is_one_round_trip(self):
+        hw = self._interface()
+        self.assertEqual(hw.modbus_read_block(0x0000, 4), [_register(a) for a in range(4)])
+        self.assertEqual(hw.serial_connection.written, ["MODBUS_READ_BLOCK 0000 04"])
+
+    def test_default_snapshot_is_one_frame_the_harness_serves(self):
+        hw = self._interface()
+        snapshot = hw.modbus_read_snapshot()
+        self.assertEqual(len(hw.serial_connection.written), 1)
+        for (start, count), values in zip(MODBUS_SNAPSHOT_BLOCKS, snapshot):
+            self.assertEqual(values, [_register(start + i) for i in range(count)])
+
+    def test_several_blocks_share_one_frame(self):
+        hw = self._interface(register_limit=0x10000)
+        blocks = ((0x0000, 0x20), (0x0100, 0x75))
+        snapshot = hw.modbus_read_snapshot(blocks)
+        self.assertEqual(len(hw.serial_connection.written), 1)
+        for (start, count), values in zip(blocks, snapshot):
+            self.assertEqual(values, [_register(start + i) for i in range(count)])
+
+    def test_unsupported_block_reads_none_without_single_reads(self):
+        hw = self._interface()
+        low, high = hw.modbus_read_snapshot(((0x0000, 0x20), (0x0100, 0x75)))
+        self.assertEqual(low, [_register(i) for i in range(0x20)])
+        self.assertEqual(high, [None] * 0x75)
+        self.assertEqual(len(hw.serial_connection.written), 1)
+        self.assertTrue(hw._block_read_supported)
+
+    def test_legacy_harness_falls_back_to_single_reads(self):
+        hw = self._interface(block_support=False)
+        self.assertEqual(hw.modbus_read_block(0x0100, 20), [_register(0x0100 + i) for i in range(20)])
+        written = len(hw.serial_connection.written)
+        self.assertEqual(hw.modbus_read_block(0x0000, 2), [_register(0), _register(1)])
+        # Unsupported command learned once; later reads skip straight to batched reads
+        self.assertEqual(len(hw.serial_connection.written), written + 1)
+
+    def test_count_is_limited_to_fc03_maximum(self):
+        with self.assertRaises(ValueError):
+            self._interface().modbus_read_block(0x0000, 126)
+
+
+if __name__ == "__main__":
+    unittest.main()
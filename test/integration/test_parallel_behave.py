@@ -0,0 +1,88 @@
+"""
+Integration Test — Parallel Behave shard planning and JUnit merging
+
+Purpose:
+- Verify historical per-scenario durations are read from Behave JUnit output.
+- Verify shards are balanced longest-first and unknown features get a fallback weight.
+- Verify shard JUnit files replace the previous run's files in a single output directory.
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.parallel_behave import (
+    estimate_feature_seconds,
+    feature_key,
+    load_scenario_durations,
+    merge_junit,
+    plan_shards,
+)
+
+JUNIT_TEMPLATE = """<testsuite name="features.{stem}.Demo" tests="2" time="0">
+<testcase classname="features.{stem}.Demo" name="first" status="passed" time="{t1}"/>
+<testcase classname="features.{stem}.Demo" name="second" status="passed" time="{t2}"/>
+<testcase classname="features.{stem}.Demo" name="pending" status="skipped" time="9.0"><skipped/></testcase>
+</testsuite>
+"""
+
+
+class TestParallelBehave(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+
+    def _write_junit(self, directory, stem, t1, t2):
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"TESTS-features.{stem}.xml"
+        path.write_text(JUNIT_TEMPLATE.format(stem=stem, t1=t1, t2=t2))
+        return path
+
+    def test_feature_key_matches_junit_and_feature_names(self):
+        self.assertEqual(feature_key("TESTS-features.start_stop.xml"), "start_stop")
+        self.assertEqual(feature_key("test/acceptance/features/start_stop.feature"), "start_stop")
+
+    def test_history_ignores_skipped_scenarios(self):
+        self._write_junit(self.root, "safety", 1.5, 2.5)
+        history = load_scenario_durations(self.root)
+        self.assertEqual(history, {"safety": {"first": 1.5, "second": 2.5}})
+
+    def test_unknown_features_get_mean_weight(self):
+        self._write_junit(self.root, "a", 1.0, 1.0)
+        self._write_junit(self.root, "b", 3.0, 3.0)
+        features = [Path(f"{stem}.feature") for stem in ("a", "b", "new")]
+        weights = estimate_feature_seconds(features, load_scenario_durations(self.root))
+        self.assertEqual(weights[Path("new.feature")], 4.0)
+
+    def test_shards_are_balanced_longest_first(self):
+        weights = {Path(f"f{i}.feature"): w for i, w in enumerate([8, 7, 6, 5, 4, 3, 2, 1])}
+        shards = plan_shards(weights, 3)
+        self.assertEqual(len(shards), 3)
+        self.assertEqual(sorted(len(s.features) for s in shards), [2, 3, 3])
+        self.assertLessEqual(max(s.estimated_seconds for s in shards), 13)
+        self.assertEqual(sum(len(s.features) for s in shards), 8)
+
+    def test_more_workers_than_features_drops_empty_shards(self):
+        shards = plan_shards({Path("only.feature"): 1.0}, 4)
+        self.assertEqual(len(shards), 1)
+
+    def test_merge_copies_every_shard_file(self):
+        self._write_junit(self.root / "shard-0", "a", 1, 1)
+        self._write_junit(self.root / "shard-1", "b", 1, 1)
+        merged = merge_junit([self.root / "shard-0", self.root / "shard-1"], self.root / "out")
+        self.assertEqual(merged, 2)
+        self.assertEqual(sorted(p.name for p in (self.root / "out").iterdir()),
+                         ["TESTS-features.a.xml", "TESTS-features.b.xml"])
+
+    def test_merge_drops_results_of_earlier_runs(self):
+        out = self.root / "out"
+        self._write_junit(out, "removed_feature", 1, 1)
+        (out / "evidence").mkdir()
+        self._write_junit(self.root / "shard-0", "a", 1, 1)
+        self.assertEqual(merge_junit([self.root / "shard-0"], out), 1)
+        self.assertEqual(sorted(p.name for p in out.iterdir()), ["TESTS-features.a.xml", "evidence"])
+
+
+if __name__ == "__main__":
+    unittest.main()
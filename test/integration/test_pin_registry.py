@@ -0,0 +1,90 @@
+"""
+Integration Test — Pin registry built from config/pinout-cfg.yaml and connections-cfg.yaml
+
+Purpose:
+- Verify one entry per signal merges ATmega pin, harness pin, DB9 pins and sonicator unit.
+- Verify every index (signal, harness pin, ATmega pin, DB9 pin, sonicator) resolves in one lookup.
+- Verify step-text extraction matches whole signal names only, in order of mention.
+- Verify HardwareInterface takes its pin mapping from the registry.
+"""
+
+import unittest
+
+from test.acceptance.hil_framework.config_service import HILConfig
+from test.acceptance.hil_framework.pin_registry import PinRegistry, pin_registry
+
+PINOUT = {"dut": {"pins": {
+    "PB0": {"pin": 1, "signal": "FREQ_DIV10_4", "direction": "IN", "sonicator": 4,
+            "modbus_register": "REG_SON4_FREQ_DIV10_HZ", "modbus_address": "0x0171"},
+    "PC0": {"pin": 22, "signal": "START_4", "direction": "OUT", "sonicator": 4},
+    "PC2": {"pin": 24, "signal": "START_3", "direction": "OUT", "sonicator": 3},
+}}}
+CONNECTIONS = {
+    "db9_connectors": {
+        "DB9-4": {"sonicator_id": 4, "pins": {
+            4: {"signal": "FREQ_DIV10_4", "dut_pin": "PB0", "direction": "IN"},
+            7: {"signal": "START_4", "dut_pin": "PC0", "direction": "OUT"},
+            8: {"signal": "AMPLITUDE_ALL", "dut_pin": "PD7", "direction": "OUT"},
+        }},
+        "DB9-3": {"sonicator_id": 3, "pins": {
+            8: {"signal": "AMPLITUDE_ALL", "dut_pin": "PD7", "direction": "OUT"},
+        }},
+    },
+    "test_harness": {"connections": {
+        "D7": {"dut_pin": "PB0", "signal": "FREQ_DIV10_4", "direction": "harness_to_dut"},
+        "A3": {"dut_pin": "PC0", "signal": "START_4", "direction": "dut_to_harness"},
+        "D9": {"dut_pin": "PD7", "signal": "AMPLITUDE_ALL", "direction": "dut_to_harness"},
+    }},
+}
+
+
+class TestPinRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = PinRegistry.from_modules(PINOUT, CONNECTIONS)
+
+    def test_entries_merge_all_sources(self):
+        entry = self.registry.signal("FREQ_DIV10_4")
+        self.assertEqual((entry.dut_pin, entry.physical_pin, entry.harness_pin), ("PB0", 1, "D7"))
+        self.assertEqual((entry.direction, entry.harness_direction), ("IN", "harness_to_dut"))
+        self.assertEqual(entry.db9, (("DB9-4", 4),))
+        self.assertEqual(entry.modbus_address, 0x0171)
+        amplitude = self.registry.signal("AMPLITUDE_ALL")
+        self.assertEqual((amplitude.dut_pin, amplitude.direction), ("PD7", "OUT"))
+        self.assertEqual(amplitude.db9, (("DB9-4", 8), ("DB9-3", 8)))
+
+    def test_indexes(self):
+        self.assertEqual(self.registry.by_harness_pin["A3"].signal, "START_4")
+        self.assertEqual(self.registry.by_dut_pin["PC2"].signal, "START_3")
+        self.assertEqual(self.registry.by_db9[("DB9-3", 8)].signal, "AMPLITUDE_ALL")
+        self.assertEqual([e.signal for e in self.registry.sonicator(3)], ["START_3"])
+        self.assertEqual(self.registry.resolve("pc0").signal, "START_4")
+        self.assertEqual(self.registry.resolve("d9").signal, "AMPLITUDE_ALL")
+        self.assertIsNone(self.registry.resolve("D13"))
+        self.assertEqual(dict(self.registry.harness_pins),
+                         {"FREQ_DIV10_4": "D7", "START_4": "A3", "AMPLITUDE_ALL": "D9"})
+        with self.assertRaises(TypeError):
+            self.registry.by_signal["X"] = None
+
+    def test_extract_signals_in_text_order(self):
+        extract = self.registry.extract_signals
+        self.assertEqual(extract('Then "START_3" and START_4 follow START_3'), ["START_3", "START_4"])
+        self.assertEqual(extract("START_40 and XSTART_4 are not pins"), [])
+        self.assertEqual(extract(""), [])
+
+    def test_repo_config_and_hardware_interface(self):
+        from test.acceptance.hil_framework.hardware_interface import HardwareInterface
+
+        registry = pin_registry()
+        self.assertIs(registry, pin_registry())
+        self.assertIsNot(pin_registry(HILConfig.from_dict({})), registry)
+        self.assertEqual(registry.signal("START_4").dut_pin, "PC0")
+        self.assertEqual(registry.by_db9[("DB9-4", 7)].signal, "START_4")
+
+        hw = HardwareInterface("fake")
+        self.assertEqual(hw.pin_mapping["START_4"], registry.harness_pins["START_4"])
+        self.assertEqual(hw._resolve_pin("PB0"), registry.signal("FREQ_DIV10_4").harness_pin)
+        self.assertEqual(hw._resolve_pin("D13"), "D13")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Integration Test — Cached, fingerprint-based serial port discovery
+
+Purpose:
+- Verify a remembered VID:PID:serial fingerprint is validated first, even after renumbering.
+- Verify stale cache entries fall back to a parallel probe of the remaining candidates.
+- Verify scan=False never probes beyond the cached/configured port.
+- Verify open_harness polls PING through the Arduino boot instead of sleeping.
+"""
+
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from test.acceptance.hil_framework.port_discovery import (
+    ROLE_HARNESS,
+    PortDiscovery,
+    list_candidates,
+    open_harness,
+)
+from test.mocks.fake_harness_serial import FakeHarnessSerial
+
+
+def _port(device, vid=None, pid=None, serial_number=None, description="n/a"):
+    return SimpleNamespace(device=device, vid=vid, pid=pid, serial_number=serial_number,
+                           description=description, manufacturer=None)
+
+
+class _Handle:
+    def __init__(self, device):
+        self.device = device
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestPortDiscovery(unittest.TestCase):
+    def setUp(self):
+        self.cache_file = Path(tempfile.mkdtemp()) / "ports.json"
+        self.ports = [_port("/dev/ttyACM0", 0x2341, 0x0043, "HARNESS1", "Arduino Uno"),
+                      _port("/dev/ttyUSB0", 0x1A86, 0x7523, None, "USB Serial"),
+                      _port("/dev/ttyS0")]
+        self.harness = "/dev/ttyACM0"
+        self.probed = []
+        self.lock = threading.Lock()
+
+    def discovery(self):
+        return PortDiscovery(cache_file=self.cache_file, port_lister=lambda: list_candidates(self.ports))
+
+    def probe(self, device):
+        with self.lock:
+            self.probed.append(device)
+        return _Handle(device) if device == self.harness else None
+
+    def test_candidates_scored_by_usb_ids(self):
+        candidates = list_candidates(self.ports)
+        self.assertEqual([c.device for c in candidates], ["/dev/ttyACM0", "/dev/ttyUSB0", "/dev/ttyS0"])
+        self.assertEqual(candidates[0].fingerprint, "2341:0043:HARNESS1")
+        self.assertFalse(candidates[2].arduino_like)
+
+    def test_cached_port_is_validated_first_after_renumbering(self):
+        first = self.discovery().find(ROLE_HARNESS, self.probe)
+        self.assertFalse(first.cached)
+        self.assertNotIn("/dev/ttyS0", self.probed)
+
+        # Same board re-enumerated under a new path
+        self.ports[0].device = self.harness = "/dev/ttyACM3"
+        self.probed.clear()
+        found = self.discovery().find(ROLE_HARNESS, self.probe)
+        self.assertEqual((found.device, found.cached), ("/dev/ttyACM3", True))
+        self.assertEqual(self.probed, ["/dev/ttyACM3"])
+        self.assertEqual(self.discovery().best_guess(ROLE_HARNESS), "/dev/ttyACM3")
+
+    def test_stale_cache_falls_back_to_parallel_probe(self):
+        self.harness = "/dev/ttyUSB0"
+        self.discovery().find(ROLE_HARNESS, self.probe)
+        self.harness = "/dev/ttyACM0"
+        self.probed.clear()
+        found = self.discovery().find(ROLE_HARNESS, self.probe)
+        self.assertEqual(found.device, "/dev/ttyACM0")
+        self.assertEqual(self.probed, ["/dev/ttyUSB0", "/dev/ttyACM0"])
+
+    def test_parallel_probes_overlap_and_extra_handles_are_closed(self):
+        handles = []
+
+        def slow_probe(device):
+            time.sleep(0.2)
+            handle = _Handle(device)
+            handles.append(handle)
+            return handle
+
+        started = time.monotonic()
+        found = self.discovery().find(ROLE_HARNESS, slow_probe)
+        self.assertLess(time.monotonic() - started, 0.35)
+        self.assertEqual(len(handles), 2)
+        self.assertEqual([h.closed for h in handles if h is not found.handle], [True])
+
+    def test_scan_disabled_only_tries_configured_port(self):
+        self.assertIsNone(self.discovery().find(ROLE_HARNESS, self.probe, preferred="/dev/ttyUSB0", scan=False))
+        self.assertEqual(self.probed, ["/dev/ttyUSB0"])
+
+    def test_open_harness_polls_ping_during_boot(self):
+        pings = []
+
+        def booting(cmd):
+            pings.append(cmd)
+            return "OK PONG" if len(pings) >= 3 else None
+
+        fake = FakeHarnessSerial(responder=booting)
+        fake.timeout = 0.05
+        with mock.patch("serial.Serial", return_value=fake):
+            connection = open_harness("/dev/ttyACM0", boot_timeout=2.0)
+        self.assertIs(connection, fake)
+        self.assertEqual(pings, ["PING"] * 3)
+        self.assertEqual(fake.in_waiting, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
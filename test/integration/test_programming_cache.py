@@ -0,0 +1,75 @@
+"""
+Integration Test — Firmware programming cache
+
+Purpose:
+- Verify unchanged images are flashed once and then skipped across runs after read-back.
+- Verify changed images, failed read-back, forced flashes and the once/always modes reprogram.
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from test.acceptance.hil_framework.programming_cache import (
+    MODE_ALWAYS,
+    MODE_ONCE,
+    ProgrammingCache,
+)
+
+KEY = ProgrammingCache.device_key("/dev/ttyACM0", "ATmega32A")
+
+
+class TestProgrammingCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.cache_file = self.root / "programming.json"
+        self.hex = self.root / "firmware.hex"
+        self.hex.write_text(":00000001FF\n")
+        self.verified = []
+
+    def _verify(self, result):
+        def verify(path):
+            self.verified.append(path)
+            return result
+        return verify
+
+    def test_unchanged_image_is_skipped_after_one_readback(self):
+        ProgrammingCache(self.cache_file).record(KEY, str(self.hex))
+        cache = ProgrammingCache(self.cache_file)
+        self.assertFalse(cache.needs_programming(KEY, str(self.hex), verify=self._verify(True)))
+        self.assertFalse(cache.needs_programming(KEY, str(self.hex), verify=self._verify(True)))
+        self.assertEqual(len(self.verified), 1)
+
+    def test_changed_image_or_failed_readback_reprograms(self):
+        cache = ProgrammingCache(self.cache_file)
+        cache.record(KEY, str(self.hex))
+        self.hex.write_text(":0100000000FF\n:00000001FF\n")
+        self.assertTrue(cache.needs_programming(KEY, str(self.hex)))
+        cache.record(KEY, str(self.hex))
+        fresh = ProgrammingCache(self.cache_file)
+        self.assertTrue(fresh.needs_programming(KEY, str(self.hex), verify=self._verify(False)))
+
+    def test_force_and_invalidate(self):
+        cache = ProgrammingCache(self.cache_file)
+        cache.record(KEY, str(self.hex))
+        self.assertTrue(cache.needs_programming(KEY, str(self.hex), force=True))
+        cache.invalidate(KEY)
+        self.assertTrue(cache.needs_programming(KEY, str(self.hex)))
+
+    def test_once_and_always_modes(self):
+        once = ProgrammingCache(self.cache_file, mode=MODE_ONCE)
+        self.assertTrue(once.needs_programming(KEY, str(self.hex)))
+        once.record(KEY, str(self.hex))
+        self.assertFalse(once.needs_programming(KEY, str(self.hex)))
+        always = ProgrammingCache(self.cache_file, mode=MODE_ALWAYS)
+        self.assertTrue(always.needs_programming(KEY, str(self.hex)))
+
+    def test_unknown_mode_rejected(self):
+        with self.assertRaises(ValueError):
+            ProgrammingCache(self.cache_file, mode="sometimes")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+"""
+Integration Test — Multi-rig HIL pool and leasing scheduler
+
+Purpose:
+- Verify rigs are resolved to device paths by USB serial number.
+- Verify leases are exclusive across scheduler instances (flock) and released cleanly.
+- Verify failed health checks skip a rig and repeated failures quarantine it.
+- Verify HILController leases a rig and moves on when setup on one rig fails,
+  giving up at once when every rig has been tried.
+"""
+
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from test.acceptance.hil_framework.rig_pool import (
+    STATE_AVAILABLE,
+    STATE_LEASED,
+    STATE_OFFLINE,
+    STATE_QUARANTINED,
+    NoRigAvailableError,
+    RigRegistry,
+    RigScheduler,
+)
+
+RIGS = [{"serial": "AAA", "name": "bench-1"},
+        {"serial": "BBB", "name": "bench-2", "labels": ["s4"]},
+        {"serial": "CCC", "name": "bench-3"}]
+PORTS = {"AAA": "/dev/ttyACM0", "BBB": "/dev/ttyACM1", "ISP": "/dev/ttyUSB0"}
+
+
+class TestRigPool(unittest.TestCase):
+    def setUp(self):
+        self.state_dir = Path(tempfile.mkdtemp())
+        self.healthy = {"AAA": True, "BBB": True, "CCC": True}
+
+    def scheduler(self, **kwargs):
+        registry = RigRegistry.from_config(RIGS, port_lookup=lambda: PORTS)
+        options = dict(state_dir=self.state_dir, health_check=lambda rig: self.healthy[rig.serial],
+                       failure_threshold=2, quarantine_seconds=60, poll_interval=0.01)
+        options.update(kwargs)
+        return RigScheduler(registry, **options)
+
+    def test_ports_resolved_by_serial_number(self):
+        registry = RigRegistry.from_config([{"serial": "AAA", "programmer_serial": "ISP"}, {"serial": "CCC"}],
+                                           port_lookup=lambda: PORTS)
+        aaa, ccc = registry.refresh()
+        self.assertEqual((aaa.harness_port, aaa.programmer_port), ("/dev/ttyACM0", "/dev/ttyUSB0"))
+        self.assertFalse(ccc.present)
+
+    def test_leases_are_exclusive_across_schedulers(self):
+        first = self.scheduler().lease("shard 0")
+        second = self.scheduler().lease("shard 1")
+        self.assertEqual({first.rig.serial, second.rig.serial}, {"AAA", "BBB"})
+        with self.assertRaises(NoRigAvailableError):
+            self.scheduler().lease("shard 2", timeout=0.05)
+        states = {r["serial"]: r["state"] for r in self.scheduler().status()}
+        self.assertEqual(states, {"AAA": STATE_LEASED, "BBB": STATE_LEASED, "CCC": STATE_OFFLINE})
+        first.release()
+        self.assertEqual(self.scheduler().lease("shard 2").rig.serial, first.rig.serial)
+
+    def test_lease_held_by_another_process(self):
+        script = ("import sys, time; from test.acceptance.hil_framework.rig_pool import RigRegistry, RigScheduler;"
+                  f"s = RigScheduler(RigRegistry.from_config([{{'serial': 'AAA'}}], port_lookup=lambda: {PORTS!r}),"
+                  f" state_dir={str(self.state_dir)!r}, health_check=None); l = s.lease('child');"
+                  " print('leased', flush=True); sys.stdin.readline()")
+        child = subprocess.Popen([sys.executable, "-c", script], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                 text=True, cwd=Path(__file__).resolve().parents[2])
+        try:
+            self.assertEqual(child.stdout.readline().strip(), "leased")
+            self.assertEqual(self.scheduler().lease(serial=None).rig.serial, "BBB")
+            self.assertIn("child", self.scheduler().status()[0]["leased_by"])
+        finally:
+            child.communicate("\n", timeout=10)
+        # The kernel drops the lock when the holder exits
+        self.assertEqual(self.scheduler().lease(serial="AAA").rig.serial, "AAA")
+
+    def test_unhealthy_rig_is_skipped_then_quarantined(self):
+        self.healthy["AAA"] = False
+        lease = self.scheduler().lease("job")
+        self.assertEqual(lease.rig.serial, "BBB")
+        lease.release()
+        self.scheduler().lease("job").release()
+        states = {r["serial"]: r for r in self.scheduler().status()}
+        self.assertEqual(states["AAA"]["state"], STATE_QUARANTINED)
+        self.assertEqual(states["AAA"]["last_error"], "health check failed")
+        self.healthy["AAA"] = True
+        with self.assertRaises(NoRigAvailableError):
+            self.scheduler().lease(serial="AAA")
+        self.scheduler().clear_quarantine("AAA")
+        self.assertEqual(self.scheduler().lease(serial="AAA").rig.serial, "AAA")
+
+    def test_labels_and_release_results(self):
+        lease = self.scheduler(health_check=None).lease("job", labels=["s4"])
+        self.assertEqual(lease.rig.serial, "BBB")
+        lease.release(healthy=False, error="setup failed")
+        lease.release(healthy=False)  # second release is a no-op
+        entry = {r["serial"]: r for r in self.scheduler().status()}["BBB"]
+        self.assertEqual((entry["state"], entry["last_error"]), (STATE_AVAILABLE, "setup failed"))
+
+    def test_controller_moves_to_next_rig_when_setup_fails(self):
+        from test.acceptance.hil_framework.hil_controller import HILController
+
+        with mock.patch("test.acceptance.hil_framework.hil_controller.HILLogger"):
+            controller = HILController()
+        controller.rig_scheduler = self.scheduler(health_check=None)
+        ports = []
+
+        def connect():
+            ports.append(controller.config['hardware']['target_serial_port'])
+            return len(ports) > 1
+
+        with mock.patch.object(controller, "_connect_hardware", side_effect=connect):
+            self.assertTrue(controller.setup_hardware())
+        self.assertEqual(ports, ["/dev/ttyACM0", "/dev/ttyACM1"])
+        self.assertEqual(controller.rig_lease.rig.serial, "BBB")
+        controller.cleanup_hardware()
+        self.assertIsNone(controller.rig_lease)
+        states = {r["serial"]: r["state"] for r in self.scheduler().status()}
+        self.assertEqual((states["AAA"], states["BBB"]), (STATE_AVAILABLE, STATE_AVAILABLE))
+
+    def test_excluding_every_rig_fails_without_waiting(self):
+        scheduler = self.scheduler(health_check=None)
+        with mock.patch("time.sleep", side_effect=AssertionError("lease waited")):
+            with self.assertRaises(NoRigAvailableError):
+                scheduler.lease("job", timeout=600, exclude={"AAA", "BBB", "CCC"})
+            with self.assertRaises(NoRigAvailableError):
+                scheduler.lease("job", timeout=600, labels=["s4"], exclude={"BBB"})
+
+    def test_controller_gives_up_once_every_rig_failed_setup(self):
+        from test.acceptance.hil_framework.hil_controller import HILController
+
+        with mock.patch("test.acceptance.hil_framework.hil_controller.HILLogger"):
+            controller = HILController()
+        controller.rig_scheduler = self.scheduler(health_check=None)
+        # Two plugged-in rigs, both of which fail setup
+        controller.config['rig_pool'] = {'rigs': RIGS[:2], 'lease_timeout': 600}
+        controller.rig_scheduler.registry = RigRegistry.from_config(RIGS[:2], port_lookup=lambda: PORTS)
+        with mock.patch.object(controller, "_connect_hardware", return_value=False), \
+                mock.patch("time.sleep", side_effect=AssertionError("lease waited")):
+            self.assertFalse(controller.setup_hardware())
+        self.assertIsNone(controller.rig_lease)
+
+    def test_pool_disabled_without_flock(self):
+        with mock.patch("test.acceptance.hil_framework.rig_pool.fcntl", None), \
+                mock.patch.dict("os.environ", {"HIL_RIG_POOL": "1"}):
+            self.assertFalse(RigScheduler.enabled({}))
+
+
+if __name__ == "__main__":
+    unittest.main()
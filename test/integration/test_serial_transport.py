@@ -0,0 +1,136 @@
+"""
+Integration Test — Pipelined serial transport for the Arduino Test Harness
+
+Purpose:
+- Verify tag correlation of response lines with several commands in flight.
+- Verify untagged lines are not mistaken for replies and that a timed-out
+  command is dropped at once without shifting later responses onto it.
+- Verify BATCH frames and the one-at-a-time fallback for harnesses without BATCH.
+"""
+
+import unittest
+
+from test.acceptance.hil_framework.hardware_interface import HardwareInterface
+from test.acceptance.hil_framework.serial_transport import SerialTransport, TransportClosedError
+from test.mocks.fake_harness_serial import FakeHarnessSerial
+
+
+class TestSerialTransport(unittest.TestCase):
+    def setUp(self):
+        self.port = FakeHarnessSerial(responder=lambda cmd: f"OK {cmd}", delay=0.01)
+        self.transport = SerialTransport(self.port).start()
+
+    def tearDown(self):
+        self.transport.stop()
+
+    def test_request_returns_matching_line(self):
+        self.assertEqual(self.transport.request("PING", timeout=1.0), "OK PING")
+
+    def test_pipelined_commands_are_correlated_in_order(self):
+        self.port.delay = 0.2
+        pending = [self.transport.submit(f"READ ADC A{i}") for i in range(4)]
+        self.assertEqual(self.transport.outstanding, 4)
+        responses = [p.wait(1.0) for p in pending]
+        self.assertEqual(responses, [f"OK READ ADC A{i}" for i in range(4)])
+        self.assertTrue(all(p.latency is not None for p in pending))
+
+    def test_unsolicited_lines_are_buffered_separately(self):
+        self.port.inject("OK WRAPPER_READY S4-ONLY\n")
+        self.assertEqual(self.transport.wait_unsolicited(timeout=1.0), "OK WRAPPER_READY S4-ONLY")
+        self.assertEqual(self.transport.request("INFO", timeout=1.0), "OK INFO")
+
+    def test_commands_and_replies_carry_tags(self):
+        tags = []
+        self.port.responder = lambda cmd: tags.append(self.port.tag) or f"OK {cmd}"
+        self.transport.request("PING", timeout=1.0)
+        self.transport.request("INFO", timeout=1.0)
+        self.assertEqual(self.port.written, ["PING", "INFO"])
+        self.assertEqual(len(set(tags)), 2)
+        self.assertTrue(all(tag.startswith("#") for tag in tags))
+
+    def test_timed_out_command_is_dropped_and_late_reply_discarded(self):
+        self.port.delay = 0.2
+        self.assertEqual(self.transport.request("SLOW", timeout=0.05), "")
+        self.assertEqual(self.transport.outstanding, 0)
+        # The late reply to SLOW arrives first and must not be handed to FAST
+        self.assertEqual(self.transport.request("FAST", timeout=1.0), "OK FAST")
+        self.assertEqual(self.transport.late_replies, 1)
+
+    def test_untagged_line_is_never_a_reply(self):
+        self.port.responder = lambda cmd: None if cmd == "SILENT" else f"OK {cmd}"
+        pending = self.transport.submit("SILENT")
+        self.port.inject("DEBUG adc=512\n")
+        self.assertEqual(self.transport.wait_unsolicited(timeout=1.0), "DEBUG adc=512")
+        self.assertFalse(pending.done)
+        self.transport.abandon(pending)
+        self.assertEqual(self.transport.request("PING", timeout=1.0), "OK PING")
+
+    def test_submit_after_stop_raises(self):
+        self.transport.stop()
+        with self.assertRaises(TransportClosedError):
+            self.transport.submit("PING")
+
+
+def _batch_harness(cmd):
+    """Responder that understands BATCH frames like arduino_test_wrapper.ino."""
+    if cmd.startswith("BATCH "):
+        items = [c.strip() for c in cmd[6:].split(";") if c.strip()]
+        return [f"OK BATCH {len(items)}"] + [_batch_harness(c) for c in items]
+    if cmd.startswith("READ_PIN "):
+        return f"PIN {cmd.split()[1]} HIGH"
+    return f"OK {cmd}"
+
+
+def _legacy_harness(cmd):
+    """Responder for a harness build that predates BATCH."""
+    if cmd.startswith("BATCH"):
+        return "ERR UNKNOWN_COMMAND"
+    return f"OK {cmd}"
+
+
+class TestHardwareInterfaceBatch(unittest.TestCase):
+    def _interface(self, responder):
+        hw = HardwareInterface(serial_port="fake")
+        hw.serial_connection = FakeHarnessSerial(responder=responder)
+        self.addCleanup(hw.cleanup)
+        return hw
+
+    def test_batch_frame_returns_one_response_per_command(self):
+        hw = self._interface(_batch_harness)
+        result = hw.send_batch(["READ STATUS 4", "READ POWER 4"])
+        self.assertTrue(result.batched)
+        self.assertEqual(result.frames, 1)
+        self.assertEqual(result.responses, ["OK READ STATUS 4", "OK READ POWER 4"])
+        self.assertEqual(hw.serial_connection.written, ["BATCH READ STATUS 4;READ POWER 4"])
+
+    def test_large_batches_are_split_into_frames(self):
+        hw = self._interface(_batch_harness)
+        result = hw.send_batch([f"READ ADC A{i % 4}" for i in range(20)])
+        self.assertEqual(result.frames, 2)
+        self.assertEqual(len(result.responses), 20)
+        self.assertTrue(all(r.startswith("OK READ ADC") for r in result.responses))
+
+    def test_harness_without_batch_falls_back_to_one_command_at_a_time(self):
+        hw = self._interface(_legacy_harness)
+        port = hw.serial_connection
+        port.delay = 0.02
+        writes = []
+        write = port.write
+        # Commands registered with the transport when each write happens (the one being written included)
+        port.write = lambda data: writes.append((data, len(hw._transport._pending))) or write(data)
+        result = hw.send_batch(["PING", "INFO", "READ ADC A0"])
+        self.assertFalse(result.batched)
+        self.assertEqual(result.responses, ["OK PING", "OK INFO", "OK READ ADC A0"])
+        # Every write carries one line and goes out only once the previous reply is in
+        self.assertEqual([data.count(b"\n") for data, _ in writes], [1, 1, 1, 1])
+        self.assertEqual([outstanding for _, outstanding in writes], [1, 1, 1, 1])
+
+    def test_pin_snapshot_uses_single_frame(self):
+        hw = self._interface(_batch_harness)
+        snapshot = hw.read_pin_snapshot(["START_4", "RESET_4"])
+        self.assertEqual(snapshot, {"START_4": True, "RESET_4": True})
+        self.assertEqual(len(hw.serial_connection.written), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
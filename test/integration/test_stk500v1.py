@@ -0,0 +1,87 @@
+"""
+Integration Test — Native STK500v1 programming session
+
+Purpose:
+- Verify signature, fuse, erase, page write and read-back primitives against an ArduinoISP double.
+- Verify ArduinoISPProgrammer reuses one session and falls back to avrdude when it fails.
+"""
+
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import serial
+
+from test.acceptance.hil_framework.intel_hex import FlashImage
+from test.acceptance.hil_framework.programmer import ArduinoISPProgrammer
+from test.acceptance.hil_framework.stk500v1 import STK500Error, STK500v1Programmer
+from test.mocks.fake_arduino_isp import FakeArduinoISP
+
+
+class TestSTK500v1Programmer(unittest.TestCase):
+    def setUp(self):
+        self.isp = FakeArduinoISP()
+        self.session = STK500v1Programmer("fake", serial_factory=lambda *a, **k: self.isp).open()
+        self.addCleanup(self.session.close)
+
+    def test_signature_and_fuses(self):
+        self.assertEqual(self.session.sign_on, "AVR ISP")
+        self.assertEqual(self.session.read_signature(), bytes([0x1E, 0x95, 0x02]))
+        self.assertEqual(self.session.read_fuses(), {"lfuse": 0xFF, "hfuse": 0xD9, "lock": 0xFF})
+
+    def test_write_read_back_and_erase(self):
+        image = FlashImage({addr: addr & 0x7F for addr in range(300)})
+        self.assertEqual(self.session.write_image(image), 3)
+        self.assertEqual(self.session.verify_image(image), [])
+        self.assertEqual(self.session.read_flash().pages(), image.pages())
+        self.session.chip_erase()
+        self.assertEqual(self.session.verify_image(image), [0x00, 0x80, 0x100])
+
+    def test_fixed_clock_not_negotiated_with_arduino_isp(self):
+        self.assertFalse(self.session.set_sck_duration(1))
+        self.assertNotIn(0x40, self.isp.commands)
+
+    def test_close_leaves_programming_mode(self):
+        self.session.read_signature()
+        self.session.close()
+        self.assertFalse(self.isp.pmode)
+        self.assertFalse(self.isp.is_open)
+        with self.assertRaises(STK500Error):
+            self.session.read_signature()
+
+
+class TestNativeProgrammer(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.hex = Path(tmp.name) / "fw.hex"
+        FlashImage({addr: 0x5A for addr in range(200)}).write_hex(str(self.hex))
+        self.isp = FakeArduinoISP()
+        self.programmer = ArduinoISPProgrammer("fake", native_isp=True)
+        self.addCleanup(self.programmer.cleanup)
+
+    def test_operations_share_one_session(self):
+        factory = mock.Mock(return_value=self.isp)
+        with mock.patch("serial.Serial", factory), mock.patch("subprocess.run") as run:
+            self.assertTrue(self.programmer.verify_connection())
+            self.assertTrue(self.programmer.program_firmware(str(self.hex)))
+            self.assertTrue(self.programmer.verify_firmware(str(self.hex)))
+            self.assertEqual(self.programmer.read_fuses()["hfuse"], "d9")
+        factory.assert_called_once()
+        run.assert_not_called()
+        self.assertEqual(self.isp.pages_written, [0x00, 0x80])
+
+    def test_falls_back_to_avrdude(self):
+        done = subprocess.CompletedProcess([], 0, "", "")
+        with mock.patch("serial.Serial", side_effect=serial.SerialException("port busy")), \
+                mock.patch("subprocess.run", return_value=done) as run, \
+                mock.patch.object(ArduinoISPProgrammer, "_arduino_present", return_value=True):
+            self.assertTrue(self.programmer.erase_chip())
+        self.assertFalse(self.programmer.native_isp)
+        self.assertIn("-e", run.call_args[0][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
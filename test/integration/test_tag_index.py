@@ -0,0 +1,60 @@
+"""
+Integration Test — Tag-to-scenario inverted index
+
+Purpose:
+- Verify AND/OR/NOT, grouping, Behave-style operators and prefix queries evaluate over bitsets.
+- Verify per-tag counts are popcounts restricted to a query result.
+- Verify malformed expressions are rejected.
+"""
+
+import unittest
+
+from test.acceptance.tag_index import TagIndex, TagQueryError
+
+SCENARIOS = [
+    ["hil", "smoke", "req-start"],
+    ["hil", "pending", "req-stop"],
+    ["modbus", "req-crc"],
+    ["@HIL", "modbus"],
+]
+
+
+class TestTagIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TagIndex(SCENARIOS)
+
+    def ids(self, expression):
+        return TagIndex.ids(self.index.query(expression))
+
+    def test_boolean_operators(self):
+        self.assertEqual(self.ids("hil and modbus"), [3])
+        self.assertEqual(self.ids("hil modbus"), [3])
+        self.assertEqual(self.ids("smoke or req-crc"), [0, 2])
+        self.assertEqual(self.ids("hil and not pending"), [0, 3])
+        self.assertEqual(self.ids("(smoke or modbus) and not req-crc"), [0, 3])
+        self.assertEqual(self.ids("smoke, modbus && ~req-crc"), [0, 3])
+        self.assertEqual(self.ids("-hil"), [2])
+        self.assertEqual(self.ids(""), [0, 1, 2, 3])
+
+    def test_prefix_and_unknown_tags(self):
+        self.assertEqual(self.ids("req-*"), [0, 1, 2])
+        self.assertEqual(self.ids("@req-s*"), [0, 1])
+        self.assertEqual(self.ids("unknown"), [])
+
+    def test_counts_within_query(self):
+        self.assertEqual(self.index.counts()["hil"], 3)
+        counts = self.index.counts(self.index.query("not pending"))
+        self.assertEqual((counts["hil"], counts["req-stop"], counts["modbus"]), (2, 0, 2))
+
+    def test_web_ui_and_or_modes(self):
+        self.assertEqual(TagIndex.ids(self.index.match_all(["hil", "modbus"])), [3])
+        self.assertEqual(TagIndex.ids(self.index.match_any(["smoke", "req-crc"])), [0, 2])
+
+    def test_malformed_expressions(self):
+        for expression in ("hil and", "(hil or smoke", "or hil", "hil )"):
+            with self.subTest(expression=expression), self.assertRaises(TagQueryError):
+                self.index.query(expression)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Integration Test — Harness STREAM telemetry frames
+
+Purpose:
+- Verify binary frames are separated from response lines, even when split across reads.
+- Verify corrupt frames are discarded without desynchronising the line protocol.
+- Verify TelemetryStream decodes frames into ring buffers on the harness clock and counts gaps.
+- Verify HardwareInterface and AsyncHardwareInterface start/stop streaming and fall back cleanly.
+"""
+
+import asyncio
+import struct
+import unittest
+
+from test.acceptance.hil_framework.async_hardware_interface import AsyncHardwareInterface
+from test.acceptance.hil_framework.hardware_interface import HardwareInterface
+from test.acceptance.hil_framework.serial_transport import FRAME_SYNC, frame_checksum, split_records
+from test.acceptance.hil_framework.telemetry_stream import TelemetryStream
+from test.mocks.fake_harness_serial import FakeHarnessSerial
+
+
+def frame(seq, t_us, mask, *values):
+    payload = struct.pack(f"<HIB{len(values)}H", seq, t_us, mask, *values)
+    return FRAME_SYNC + bytes([len(payload)]) + payload + bytes([frame_checksum(payload)])
+
+
+def streaming_harness(port, frames):
+    def responder(cmd):
+        if cmd.startswith("STREAM ON"):
+            mask = TelemetryStream(cmd.split()[2].split(","), int(cmd.split()[3])).mask
+            port.reply(f"OK STREAM ON {mask} {cmd.split()[3]}")
+            port.inject_bytes(b"".join(frames))
+            return None
+        if cmd == "STREAM OFF":
+            return "OK STREAM OFF"
+        return "OK PONG" if cmd == "PING" else "ERR UNKNOWN_COMMAND"
+    return responder
+
+
+class TestTelemetryStream(unittest.TestCase):
+    def test_split_records_interleaves_lines_and_frames(self):
+        data = b"OK PONG\r\n" + frame(0, 100, 0x01, 512) + b"OK\r\n" + frame(1, 200, 0x01, 10)
+        buffer, line = bytearray(), bytearray()
+        records = []
+        for i in range(0, len(data), 5):  # arrive in small chunks
+            buffer.extend(data[i:i + 5])
+            records.extend(split_records(buffer, line))
+        self.assertEqual([r[0] for r in records], [False, True, False, True])
+        self.assertEqual(records[0][1].strip(), b"OK PONG")
+        self.assertEqual(struct.unpack("<HIBH", records[3][1]), (1, 200, 0x01, 10))
+        self.assertEqual(buffer, bytearray())
+
+    def test_corrupt_frame_is_skipped(self):
+        bad = bytearray(frame(0, 0, 0x01, 1))
+        bad[-1] ^= 0xFF
+        buffer = bytearray(bytes(bad) + b"OK\n")
+        self.assertEqual(list(split_records(buffer, bytearray())), [(True, None), (False, b"OK")])
+
+    def test_frame_inside_a_line_does_not_split_it(self):
+        data = b"OK ADC" + frame(0, 100, 0x01, 512) + b"=512\n"
+        buffer, line = bytearray(), bytearray()
+        records = []
+        for i in range(0, len(data), 3):
+            buffer.extend(data[i:i + 3])
+            records.extend(split_records(buffer, line))
+        self.assertEqual(records, [(True, struct.pack("<HIBH", 0, 100, 0x01, 512)), (False, b"OK ADC=512")])
+        self.assertEqual((buffer, line), (bytearray(), bytearray()))
+
+    def test_decode_timestamps_gaps_and_scaling(self):
+        stream = TelemetryStream(["PWM_HZ", "A1", "PINS", "PWM"], rate_hz=100, capacity=3)
+        self.assertEqual(stream.signals, ("POWER_SENSE_4", "PINS", "PWM", "PWM_HZ"))
+        self.assertEqual(stream.command, "STREAM ON POWER_SENSE_4,PINS,PWM,PWM_HZ 100")
+        mask = stream.mask
+        for seq, t_us in ((0xFFFF, 0xFFFFFF00), (0, 0x00000100), (3, 0x00001100)):
+            stream.feed(frame(seq, t_us, mask, 512, 0x05, 503, 1000)[3:-1])
+        stream.feed(frame(4, 0, 0x01, 1)[3:-1])
+
+        times, counts = stream.samples("POWER_SENSE_4")
+        self.assertEqual(counts, [512, 512, 512])
+        self.assertEqual(times, [0.0, 0x200 / 1e6, 0x1200 / 1e6])
+        self.assertAlmostEqual(stream.latest("PWM")[1], 50.3)
+        self.assertEqual(stream.latest("AMPLITUDE_ALL")[1], stream.latest("PWM")[1])
+        self.assertTrue(stream.pin_state("START_4"))
+        self.assertFalse(stream.pin_state("RESET_4"))
+        self.assertEqual((stream.frames, stream.dropped, stream.rejected), (3, 2, 1))
+        self.assertTrue(stream.accepts(f"OK STREAM ON {mask} 100"))
+        self.assertFalse(stream.accepts("ERR UNKNOWN_COMMAND"))
+        with self.assertRaises(KeyError):
+            stream.latest("A0")
+
+    def test_rate_budget_is_enforced(self):
+        self.assertEqual(TelemetryStream.max_rate(1), 769)
+        with self.assertRaises(ValueError):
+            TelemetryStream(["POWER_SENSE_4"], rate_hz=TelemetryStream.max_rate(1) + 1)
+        with self.assertRaises(ValueError):
+            TelemetryStream(["START_4"])
+
+    def test_hardware_interface_streams_and_falls_back(self):
+        frames = [frame(i, i * 2000, 0x01, 500 + i) for i in range(5)]
+        hw = HardwareInterface("fake")
+        port = FakeHarnessSerial()
+        port.responder = streaming_harness(port, frames)
+        hw.serial_connection = port
+        self.addCleanup(hw.cleanup)
+
+        stream = hw.start_stream(["POWER_SENSE_4"], rate_hz=500)
+        self.assertIsNotNone(stream)
+        self.assertTrue(stream.wait_for("POWER_SENSE_4", 5, timeout=2.0))
+        self.assertEqual(stream.values("POWER_SENSE_4"), [500, 501, 502, 503, 504])
+        self.assertTrue(hw.ping())  # replies still flow while frames arrive
+        hw.stop_stream()
+        self.assertIsNone(hw.telemetry)
+        self.assertEqual(port.written[-1], "STREAM OFF")
+
+        port.responder = lambda cmd: "ERR UNKNOWN_COMMAND"
+        self.assertIsNone(hw.start_stream(["POWER_SENSE_4"]))
+        self.assertIsNone(hw._transport.frame_handler)
+
+
+class TestAsyncTelemetryStream(unittest.IsolatedAsyncioTestCase):
+    async def test_async_interface_feeds_stream(self):
+        port = FakeHarnessSerial()
+        port.responder = streaming_harness(port, [frame(0, 0, 0x10, 0x01), frame(1, 20000, 0x10, 0x00)])
+        hw = await AsyncHardwareInterface(serial_connection=port).open()
+        try:
+            stream = await hw.start_stream(["PINS"], rate_hz=50)
+            self.assertIsNotNone(stream)
+            for _ in range(100):
+                if stream.count("PINS") == 2:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual(stream.samples("PINS"), ([0.0, 0.02], [1, 0]))
+            self.assertFalse(stream.pin_state("START_4"))
+            await hw.stop_stream()
+            self.assertIsNone(hw.frame_handler)
+        finally:
+            await hw.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
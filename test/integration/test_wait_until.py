@@ -0,0 +1,51 @@
+"""
+Integration Test — Event-driven waits for timing assertions
+
+Purpose:
+- Verify wait_until returns as soon as the condition holds and reports its latency.
+- Verify timeouts re-check at the deadline and wake sources replace polling sleeps.
+- Verify latencies are recorded on the Behave context against their spec.
+"""
+
+import time
+import unittest
+from types import SimpleNamespace
+
+from test.acceptance.hil_framework.timing import WaitResult, record_latency, wait_until
+
+
+class TestWaitUntil(unittest.TestCase):
+    def test_returns_once_condition_holds(self):
+        ready_at = time.monotonic() + 0.03
+        started = time.monotonic()
+        result = wait_until(lambda: time.monotonic() >= ready_at, deadline=1.0)
+        self.assertTrue(result.satisfied)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertGreaterEqual(result.latency_ms, 25)
+        self.assertGreater(result.attempts, 1)
+
+    def test_times_out_with_last_value(self):
+        result = wait_until(lambda: 0, deadline=0.02)
+        self.assertFalse(result)
+        self.assertEqual(result.value, 0)
+        self.assertGreaterEqual(result.latency_ms, 20)
+
+    def test_wake_source_replaces_sleep(self):
+        pushed = []
+        result = wait_until(lambda: len(pushed) >= 3, deadline=1.0,
+                            wake=lambda timeout: pushed.append(timeout))
+        self.assertTrue(result.satisfied)
+        self.assertEqual(result.attempts, 4)
+
+    def test_record_latency_keeps_measurements(self):
+        logged = []
+        context = SimpleNamespace(hil_logger=SimpleNamespace(measurement=lambda *a: logged.append(a)))
+        record_latency(context, "Overload flag set latency", WaitResult(True, 12.345, 3), 100)
+        self.assertEqual(context.timing_measurements, [{
+            "name": "Overload flag set latency", "latency_ms": 12.35, "spec_ms": 100, "satisfied": True,
+        }])
+        self.assertEqual(logged, [("Overload flag set latency", 12.35, "ms", "<= 100 ms")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Fake ArduinoISP programmer for host-side tests
+
+Purpose:
+- Stands in for a pyserial ``Serial`` object connected to an Arduino running the
+  ArduinoISP sketch, answering the STK500v1 commands the sketch implements.
+- Backs them with an ATmega32 flash array: page writes can only clear bits and a
+  chip erase sets everything back to 0xFF, like the real ISP interface.
+"""
+
+STK_OK, STK_INSYNC, STK_NOSYNC, CRC_EOP = 0x10, 0x14, 0x15, 0x20
+
+# Command byte -> number of argument bytes before CRC_EOP
+_ARGS = {0x30: 0, 0x31: 0, 0x41: 1, 0x42: 20, 0x45: 5, 0x50: 0, 0x51: 0,
+         0x55: 2, 0x56: 4, 0x74: 3, 0x75: 0}
+
+
+class FakeArduinoISP:
+    def __init__(self, signature=bytes([0x1E, 0x95, 0x02]), flash_size=32768):
+        self.signature = signature
+        self.flash = bytearray(b"\xff" * flash_size)
+        self.fuses = {"lfuse": 0xFF, "hfuse": 0xD9, "lock": 0xFF}
+        self.here = 0
+        self.pmode = False
+        self.pages_written = []
+        self.commands = []
+        self.is_open = True
+        self._rx = bytearray()
+        self._pending = bytearray()
+
+    def reset_input_buffer(self):
+        self._rx.clear()
+
+    def close(self):
+        self.is_open = False
+
+    def read(self, size=1):
+        out, self._rx = bytes(self._rx[:size]), self._rx[size:]
+        return out
+
+    def write(self, data):
+        self._pending.extend(data)
+        while self._pending:
+            cmd = self._pending[0]
+            if cmd == 0x64 and len(self._pending) < 3:
+                break
+            length = 3 + int.from_bytes(self._pending[1:3], "big") if cmd == 0x64 else _ARGS.get(cmd, 0)
+            if len(self._pending) < length + 2:
+                break
+            args, eop = bytes(self._pending[1:length + 1]), self._pending[length + 1]
+            del self._pending[:length + 2]
+            self.commands.append(cmd)
+            if eop != CRC_EOP:
+                self._rx.append(STK_NOSYNC)
+                continue
+            self._rx.append(STK_INSYNC)
+            self._rx.extend(self._handle(cmd, args))
+            self._rx.append(STK_OK)
+        return len(data)
+
+    def _handle(self, cmd, args):
+        if cmd == 0x31:
+            return b"AVR ISP"
+        if cmd == 0x41:
+            return bytes([{0x81: 1, 0x82: 18}.get(args[0], 0)])
+        if cmd == 0x50:
+            self.pmode = True
+        if cmd == 0x51:
+            self.pmode = False
+        if cmd == 0x55:
+            self.here = args[0] | (args[1] << 8)
+        if cmd == 0x75:
+            return self.signature
+        if cmd == 0x56:
+            return bytes([self._universal(args)])
+        if cmd == 0x64:
+            start = self.here * 2
+            for i, byte in enumerate(args[3:]):
+                self.flash[start + i] &= byte
+            self.pages_written.append(start)
+        if cmd == 0x74:
+            start = self.here * 2
+            return bytes(self.flash[start:start + int.from_bytes(args[:2], "big")])
+        return b""
+
+    def _universal(self, args):
+        if args[:2] == bytes([0xAC, 0x80]):
+            self.flash[:] = b"\xff" * len(self.flash)
+            return 0
+        return {bytes([0x50, 0x00]): self.fuses["lfuse"],
+                bytes([0x58, 0x08]): self.fuses["hfuse"],
+                bytes([0x58, 0x00]): self.fuses["lock"]}.get(bytes(args[:2]), 0)
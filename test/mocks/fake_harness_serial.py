@@ -0,0 +1,109 @@
+"""
+Fake Arduino Test Harness serial port for host-side tests
+
+Purpose:
+- Stands in for a pyserial ``Serial`` object so HIL framework transport code can be
+  exercised without hardware.
+- Each written command line is passed to a responder callable; the returned line(s)
+  are queued for reading, optionally after a delay, like a real harness round trip.
+- Like the harness firmware, a "#<n> " command tag is stripped before the responder
+  sees the command and echoed in front of every reply line.
+"""
+
+import queue
+import threading
+import time
+
+
+class FakeHarnessSerial:
+    def __init__(self, responder=None, delay: float = 0.0):
+        self.responder = responder or (lambda cmd: "OK PONG" if cmd == "PING" else "OK")
+        self.delay = delay
+        self.timeout = 1.0
+        self.is_open = True
+        self.written = []
+        self.tag = ""  # "#<n> " prefix of the command being answered, "" when untagged
+        self._rx = bytearray()
+        self._cond = threading.Condition()
+        self._outbox = queue.Queue()
+        self._courier = None
+
+    @property
+    def in_waiting(self) -> int:
+        with self._cond:
+            return len(self._rx)
+
+    def inject(self, text: str) -> None:
+        """Queue raw text as if the harness had printed it."""
+        self.inject_bytes(text.encode("ascii"))
+
+    def inject_bytes(self, data: bytes) -> None:
+        """Queue raw bytes (e.g. binary telemetry frames) as if the harness had written them."""
+        with self._cond:
+            self._rx.extend(data)
+            self._cond.notify_all()
+
+    def reply(self, text: str) -> None:
+        """Queue one reply line for the command being answered, tagged like the harness would."""
+        self.inject(self.tag + text + "\r\n")
+
+    def write(self, data: bytes) -> int:
+        for raw in data.decode("ascii").splitlines():
+            self.tag, command = "", raw
+            if raw.startswith("#") and " " in raw:
+                tag, command = raw.split(" ", 1)
+                self.tag = tag + " "
+            self.written.append(command)
+            reply = self.responder(command)
+            if reply is None:
+                continue
+            lines = reply if isinstance(reply, list) else [reply]
+            payload = "".join(self.tag + line + "\r\n" for line in lines)
+            if self.delay:
+                self._deliver_later(payload)
+            else:
+                self.inject(payload)
+        return len(data)
+
+    def _deliver_later(self, payload: str) -> None:
+        """Deliver delayed replies strictly in order, like a real UART."""
+        self._outbox.put((time.monotonic() + self.delay, payload))
+        if self._courier is None:
+            self._courier = threading.Thread(target=self._courier_loop, daemon=True)
+            self._courier.start()
+
+    def _courier_loop(self) -> None:
+        while self.is_open:
+            try:
+                due, payload = self._outbox.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            time.sleep(max(0.0, due - time.monotonic()))
+            self.inject(payload)
+
+    def flush(self) -> None:
+        pass
+
+    def read(self, size: int = 1) -> bytes:
+        deadline = time.monotonic() + (self.timeout or 0)
+        with self._cond:
+            while not self._rx and self.is_open:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return b""
+                self._cond.wait(remaining)
+            chunk = bytes(self._rx[:size])
+            del self._rx[:size]
+            return chunk
+
+    def reset_input_buffer(self) -> None:
+        with self._cond:
+            self._rx.clear()
+
+    def reset_output_buffer(self) -> None:
+        pass
+
+    def close(self) -> None:
+        with self._cond:
+            self.is_open = False
+            self._cond.notify_all()
@@ -239,8 +239,9 @@ class HILAutomationController:
                 self.safety_system.stop_safety_monitoring()
             
             # Disconnect hardware
+            # Also returns a leased rig to the pool for the next cycle or job
             if self.hil_controller and self.hil_controller.hardware_interface:
-                self.hil_controller.cleanup()
+                self.hil_controller.cleanup_hardware()
             
             # Reset execution state
             self.execution_state['current_test'] = None
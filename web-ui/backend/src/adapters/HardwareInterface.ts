@@ -49,6 +49,7 @@ export class HardwareInterface extends EventEmitter {
   private serialPort: string | null = null
 
   private pinStates: Map<string, PinState> = new Map()
+  private pinIndex: Map<string, string> = new Map() // Arduino pin or signal name -> pinStates key
   private commandQueue: Array<{ command: HardwareCommand; resolve: Function; reject: Function }> = []
   private processingCommand = false
   private configuration = {
@@ -97,6 +98,8 @@ export class HardwareInterface extends EventEmitter {
         state: direction === 'ANALOG' ? 0 : 'LOW',
         timestamp: Date.now()
       })
+      if (!this.pinIndex.has(pin)) this.pinIndex.set(pin, signal)
+      this.pinIndex.set(signal, signal)
     })
   }
 
@@ -532,59 +535,58 @@ except Exception as e:
     const shouldLog = timestamp - lastLogTime > this.logThrottleMs
 
     // Find pin by Arduino pin name or signal name
-    for (const [signal, pinState] of this.pinStates.entries()) {
-      if (pinState.pin === pin || signal === pin) {
-        let newState: 'HIGH' | 'LOW' | number | string = 'LOW'
-
-        // Special handling for frequency pins
-        if (signal === 'FREQ_DIV10_4') {
-          if (this.configuration.sonicator4.enabled) {
-            const modeIndicator = this.configuration.sonicator4.manualMode ? ' (M)' : ''
-            newState = `${this.configuration.sonicator4.outputFrequencyKHz}kHz${modeIndicator}`
-          } else {
-            newState = 'OFF'
-          }
-        } else {
-          // Handle direct state values for regular pins
-          if (data === 'HIGH' || data.includes('HIGH')) {
-            newState = 'HIGH'
-          } else if (data === 'LOW' || data.includes('LOW')) {
-            newState = 'LOW'
-          } else if (data.includes('ADC=')) {
-            const match = data.match(/ADC=(\d+)/)
-            if (match) {
-              newState = parseInt(match[1])
-            }
-          } else if (!isNaN(parseInt(data))) {
-            // Handle numeric values (ADC readings)
-            newState = parseInt(data)
-          }
-        }
-
-        // Only log significant state changes occasionally (reduced verbosity)
-        if (shouldLog && pinState.state !== newState) {
-          this.lastPinLogTimes.set(pin, timestamp)
+    const signal = this.pinIndex.get(pin)
+    const pinState = signal !== undefined ? this.pinStates.get(signal) : undefined
+    if (signal === undefined || !pinState) return
+
+    let newState: 'HIGH' | 'LOW' | number | string = 'LOW'
+
+    // Special handling for frequency pins
+    if (signal === 'FREQ_DIV10_4') {
+      if (this.configuration.sonicator4.enabled) {
+        const modeIndicator = this.configuration.sonicator4.manualMode ? ' (M)' : ''
+        newState = `${this.configuration.sonicator4.outputFrequencyKHz}kHz${modeIndicator}`
+      } else {
+        newState = 'OFF'
+      }
+    } else {
+      // Handle direct state values for regular pins
+      if (data === 'HIGH' || data.includes('HIGH')) {
+        newState = 'HIGH'
+      } else if (data === 'LOW' || data.includes('LOW')) {
+        newState = 'LOW'
+      } else if (data.includes('ADC=')) {
+        const match = data.match(/ADC=(\d+)/)
+        if (match) {
+          newState = parseInt(match[1])
         }
+      } else if (!isNaN(parseInt(data))) {
+        // Handle numeric values (ADC readings)
+        newState = parseInt(data)
+      }
+    }
 
-        const updatedPin = {
-          ...pinState,
-          state: newState,
-          timestamp,
-          // Add frequency information for frequency pins
-          ...(signal === 'FREQ_DIV10_4' && {
-            frequency: this.configuration.sonicator4.outputFrequencyKHz * 1000,
-            frequencyDisplay: `${this.configuration.sonicator4.outputFrequencyKHz}kHz`,
-            operatingFrequency: `${this.configuration.sonicator4.operatingFrequencyKHz}kHz`,
-            enabled: this.configuration.sonicator4.enabled,
-            isActive: this.configuration.sonicator4.enabled && (data === 'HIGH' || data === 'LOW')
-          })
-        }
+    // Only log significant state changes occasionally (reduced verbosity)
+    if (shouldLog && pinState.state !== newState) {
+      this.lastPinLogTimes.set(pin, timestamp)
+    }
 
-        this.pinStates.set(signal, updatedPin as PinState)
-        this.emit('pin_update', signal, updatedPin)
-        break
-      }
+    const updatedPin = {
+      ...pinState,
+      state: newState,
+      timestamp,
+      // Add frequency information for frequency pins
+      ...(signal === 'FREQ_DIV10_4' && {
+        frequency: this.configuration.sonicator4.outputFrequencyKHz * 1000,
+        frequencyDisplay: `${this.configuration.sonicator4.outputFrequencyKHz}kHz`,
+        operatingFrequency: `${this.configuration.sonicator4.operatingFrequencyKHz}kHz`,
+        enabled: this.configuration.sonicator4.enabled,
+        isActive: this.configuration.sonicator4.enabled && (data === 'HIGH' || data === 'LOW')
+      })
     }
+
+    this.pinStates.set(signal, updatedPin as PinState)
+    this.emit('pin_update', signal, updatedPin)
   }
 
   private startPinMonitoring() {
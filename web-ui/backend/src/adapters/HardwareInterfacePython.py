@@ -23,6 +23,7 @@ class HardwareInterface:
         self.connected = False
         self.serialPort = None
         self.pinStates = {}
+        self.pinIndex = {}  # Arduino pin name or signal name -> signal key in pinStates
         self.pythonProcess = None
         self.event_handlers = {}
         self.initializePinStates()
@@ -51,6 +52,8 @@ class HardwareInterface:
                 description=pin_info['description']
             )
             self.pinStates[pin_info['signal']] = pin_state
+            self.pinIndex.setdefault(pin_info['pin'], pin_info['signal'])
+            self.pinIndex[pin_info['signal']] = pin_info['signal']
     
     def getPinStates(self) -> Dict[str, Any]:
         """Get all pin states as dictionary"""
@@ -76,21 +79,22 @@ class HardwareInterface:
         timestamp = int(time.time() * 1000)
         
         # Find pin by Arduino pin name or signal name
-        for signal, pin_state in self.pinStates.items():
-            if pin_state.pin == pin or signal == pin:
-                if data == 'HIGH':
-                    pin_state.state = 'HIGH'
-                elif data == 'LOW':
-                    pin_state.state = 'LOW'
-                elif data.startswith('ADC='):
-                    try:
-                        adc_value = int(data.split('=')[1])
-                        pin_state.state = adc_value
-                    except (ValueError, IndexError):
-                        pass
-                
-                pin_state.timestamp = timestamp
-                break
+        signal = self.pinIndex.get(pin)
+        pin_state = self.pinStates.get(signal) if signal is not None else None
+        if pin_state is None:
+            return
+        if data == 'HIGH':
+            pin_state.state = 'HIGH'
+        elif data == 'LOW':
+            pin_state.state = 'LOW'
+        elif data.startswith('ADC='):
+            try:
+                adc_value = int(data.split('=')[1])
+                pin_state.state = adc_value
+            except (ValueError, IndexError):
+                pass
+
+        pin_state.timestamp = timestamp
     
     async def sendCommand(self, command: Dict[str, Any]) -> Dict[str, Any]:
         """Send command to hardware (mock for testing)"""
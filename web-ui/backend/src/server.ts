@@ -65,7 +65,8 @@ setupRoutes(app, hardwareInterface, testAutomationService)
 const wsHandler = new WebSocketHandler(hardwareInterface, testAutomationService)
 wss.on('connection', (ws, request) => {
   console.log('New WebSocket connection from:', request.socket.remoteAddress)
-  wsHandler.handleConnection(ws)
+  const encoding = new URL(request.url || '/ws', 'http://localhost').searchParams.get('encoding') || 'json'
+  wsHandler.handleConnection(ws, encoding)
 })
 
 // Error handling
@@ -11,16 +11,43 @@ License: Proprietary
 """
 
 import os
+import re
 import sys
 import json
 import subprocess
 import threading
 import time
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+# CLI commands whose stdout carries JSON for the Node backend (no diagnostic prints)
+API_COMMANDS = ['get_scenarios', 'execute_scenarios', 'filter_scenarios', 'get_tag_counts', 'serve']
+
+# Behave formatter streaming step events as JSON lines (test/acceptance/progress_formatter.py)
+BEHAVE_PROGRESS_FORMATTER = 'test.acceptance.progress_formatter:ProgressFormatter'
+
+# Behave step/scenario status names mapped onto web UI statuses
+BEHAVE_STATUS_MAP = {
+    'passed': 'passed',
+    'failed': 'failed',
+    'undefined': 'failed',
+    'skipped': 'skipped',
+    'untested': 'skipped',
+    'executing': 'running',
+    'hook_error': 'error',
+    'error': 'error',
+}
+
+# Signals recognised in step text when the pin registry (config/*.yaml) is unavailable
+DEFAULT_PIN_SIGNALS = [
+    'START_4', 'RESET_4', 'OVERLOAD_4', 'FREQ_LOCK_4', 'POWER_SENSE_4',
+    'AMPLITUDE_ALL', 'STATUS_LED', 'UART_RXD', 'UART_TXD'
+]
+DEFAULT_PIN_MATCHER = re.compile(
+    r"(?<![A-Za-z0-9_])(" + "|".join(sorted(DEFAULT_PIN_SIGNALS, key=len, reverse=True)) + r")(?![A-Za-z0-9_])")
+
 # Add the test acceptance framework to the path
 sys.path.append(str(Path(__file__).parent.parent.parent.parent.parent / 'test' / 'acceptance'))
 
@@ -29,11 +56,23 @@ try:
     from test.acceptance.hil_framework.hardware_interface import HardwareInterface as HILHardwareInterface
 except ImportError as e:
     # Only print warning if not being called from API (when stdout is used for JSON)
-    if len(sys.argv) < 2 or sys.argv[1] not in ['get_scenarios', 'execute_scenarios']:
+    if len(sys.argv) < 2 or sys.argv[1] not in API_COMMANDS:
         print(f"Warning: Could not import HIL framework: {e}")
     HILController = None
     HILHardwareInterface = None
 
+try:
+    from test.acceptance.hil_framework.pin_registry import pin_registry
+except ImportError:
+    pin_registry = None
+
+try:
+    from test.acceptance.feature_index import default_index as default_feature_index
+    from test.acceptance.tag_index import TagIndex
+except ImportError:
+    from feature_index import default_index as default_feature_index
+    from tag_index import TagIndex
+
 
 class TestStatus(Enum):
     """Test execution status enumeration"""
@@ -71,6 +110,7 @@ class TestScenario:
     status: TestStatus = TestStatus.PENDING
     duration_ms: Optional[int] = None
     error_message: Optional[str] = None
+    line: Optional[int] = None  # scenario line in the feature file, used as Behave location
 
 
 @dataclass
@@ -90,23 +130,42 @@ class TestExecution:
 class TestAutomationService:
     """Service for executing BDD test scenarios from web UI"""
 
-    def __init__(self, progress_callback: Optional[Callable] = None):
+    def __init__(self, progress_callback: Optional[Callable] = None, progress_interval: float = 0.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 timer: Callable[[float, Callable], Any] = threading.Timer):
         """Initialize test automation service
         
         Args:
             progress_callback: Optional callback for real-time progress updates
+            progress_interval: Minimum seconds between progress messages; changes
+                arriving sooner are coalesced into the next message (0 = no limit)
+            clock: Monotonic time source for the progress interval
+            timer: Factory for the timer that flushes coalesced progress
+                (``threading.Timer`` signature)
         """
         self.progress_callback = progress_callback
+        self.progress_interval = progress_interval
+        self._clock = clock
+        self._timer = timer
+        self._progress_lock = threading.RLock()
+        self._progress_seq = 0
+        self._progress_sent: Optional[Dict[str, Any]] = None
+        self._progress_last_time = 0.0
+        self._progress_timer: Optional[threading.Timer] = None
         self.current_execution: Optional[TestExecution] = None
         self.hil_controller: Optional[HILController] = None
         self.execution_thread: Optional[threading.Thread] = None
+        self.behave_process: Optional[subprocess.Popen] = None
+        self._execution_positions: Dict[int, int] = {}
+        self._scenario_cache: Optional[Tuple[tuple, List[Dict[str, Any]], TagIndex]] = None
         
         # Path to acceptance tests
         self.test_root = Path(__file__).parent.parent.parent.parent.parent / 'test' / 'acceptance'
         self.features_path = self.test_root / 'features'
+        self.project_root = self.test_root.parent.parent
         
         # Only print initialization messages if not being called from API
-        if len(sys.argv) < 2 or sys.argv[1] not in ['get_scenarios', 'execute_scenarios']:
+        if len(sys.argv) < 2 or sys.argv[1] not in API_COMMANDS:
             print(f"Test Automation Service initialized")
             print(f"Features path: {self.features_path}")
 
@@ -126,117 +185,87 @@ class TestAutomationService:
                 
         except Exception as e:
             # Only print error if not being called from API
-            if len(sys.argv) < 2 or sys.argv[1] not in ['get_scenarios', 'execute_scenarios']:
+            if len(sys.argv) < 2 or sys.argv[1] not in API_COMMANDS:
                 print(f"Error parsing feature files: {e}")
             
         return scenarios
 
+    def _indexed_scenarios(self) -> Tuple[List[Dict[str, Any]], TagIndex]:
+        """Available scenarios and their tag index, rebuilt only when a feature file changes"""
+        signature = ()
+        if self.features_path.exists():
+            signature = tuple(
+                (str(path), path.stat().st_mtime_ns, path.stat().st_size)
+                for path in sorted(self.features_path.glob('*.feature'))
+            )
+        if self._scenario_cache is None or self._scenario_cache[0] != signature:
+            scenarios = self.get_available_scenarios()
+            self._scenario_cache = (signature, scenarios, TagIndex(s['tags'] for s in scenarios))
+        return self._scenario_cache[1], self._scenario_cache[2]
+
+    def filter_scenarios(self, expression: str = '', tags: Optional[List[str]] = None,
+                         use_or_logic: bool = False) -> List[Dict[str, Any]]:
+        """Scenarios matching a tag expression and/or a tag list
+        
+        Args:
+            expression: Boolean tag query, e.g. "hil and not pending" or "req-*"
+            tags: Tags combined with AND (default) or OR logic, as in the web UI
+            use_or_logic: Match any instead of all of ``tags``
+        """
+        scenarios, index = self._indexed_scenarios()
+        bits = index.query(expression)
+        if tags:
+            bits &= index.match_any(tags) if use_or_logic else index.match_all(tags)
+        return [scenarios[i] for i in index.ids(bits)]
+
+    def get_tag_counts(self, expression: str = '') -> Dict[str, int]:
+        """Number of scenarios per tag, restricted to scenarios matching ``expression``"""
+        _, index = self._indexed_scenarios()
+        return index.counts(index.query(expression))
+
     def _parse_feature_file(self, feature_file: Path) -> List[Dict[str, Any]]:
-        """Parse a single feature file and extract scenarios"""
+        """Extract scenarios from a single feature file via the shared feature index"""
         scenarios = []
         
         try:
-            with open(feature_file, 'r') as f:
-                content = f.read()
-                
-            # Simple parsing - in production, use a proper Gherkin parser
-            lines = content.split('\n')
-            current_scenario = None
-            current_steps = []
-            feature_name = ""
-            
-            for line_index, line in enumerate(lines):
-                line = line.strip()
-
-                if line.startswith('Feature:'):
-                    feature_name = line.replace('Feature:', '').strip()
-
-                elif line.startswith('Scenario:'):
-                    # Save previous scenario if exists
-                    if current_scenario:
-                        current_scenario['steps'] = current_steps
-                        scenarios.append(current_scenario)
-
-                    # Start new scenario
-                    scenario_name = line.replace('Scenario:', '').strip()
-                    current_scenario = {
-                        'name': scenario_name,
-                        'description': scenario_name,
-                        'feature_file': str(feature_file.name),
-                        'feature_name': feature_name,
-                        'tags': self._extract_tags_from_previous_lines(lines, line_index),
-                        'steps': []
-                    }
-                    current_steps = []
-                    
-                elif line.startswith(('Given', 'When', 'Then', 'And', 'But')):
-                    if current_scenario:
-                        step_type = line.split()[0]
-                        step_description = line
-                        current_steps.append({
-                            'step_type': step_type,
-                            'description': step_description,
-                            'pin_interactions': self._extract_pin_interactions(step_description)
-                        })
-            
-            # Don't forget the last scenario
-            if current_scenario:
-                current_scenario['steps'] = current_steps
-                scenarios.append(current_scenario)
+            feature = default_feature_index().feature(feature_file)
+            for scenario in feature.scenarios:
+                if scenario.keyword != 'Scenario':
+                    continue
+                scenarios.append({
+                    'name': scenario.name,
+                    'description': scenario.name,
+                    'feature_file': str(feature_file.name),
+                    'feature_name': feature.name,
+                    'line': scenario.line,
+                    'tags': feature.effective_tags(scenario),
+                    'steps': [
+                        {
+                            'step_type': step.keyword,
+                            'description': step.text,
+                            'pin_interactions': self._extract_pin_interactions(step.text)
+                        }
+                        for step in scenario.steps
+                    ]
+                })
                 
         except Exception as e:
             # Only print error if not being called from API
-            if len(sys.argv) < 2 or sys.argv[1] not in ['get_scenarios', 'execute_scenarios']:
+            if len(sys.argv) < 2 or sys.argv[1] not in API_COMMANDS:
                 print(f"Error parsing feature file {feature_file}: {e}")
             
         return scenarios
 
-    def _extract_tags_from_previous_lines(self, lines: List[str], current_index: int) -> List[str]:
-        """Extract tags from lines before the scenario and from feature level"""
-        tags = []
-
-        # First, look for feature-level tags at the beginning of the file
-        for line in lines:
-            line = line.strip()
-            if line.startswith('@') and not line.startswith('Feature:'):
-                # Extract all tags from this line
-                line_tags = [tag.strip() for tag in line.split() if tag.startswith('@')]
-                tags.extend([tag[1:] for tag in line_tags])  # Remove @ prefix
-            elif line.startswith('Feature:'):
-                break
-
-        # Then look backwards for scenario-level tag lines
-        for i in range(current_index - 1, -1, -1):
-            line = lines[i].strip()
-            if line.startswith('@'):
-                # Extract all tags from this line
-                line_tags = [tag.strip() for tag in line.split() if tag.startswith('@')]
-                scenario_tags = [tag[1:] for tag in line_tags]  # Remove @ prefix
-                # Add scenario tags that aren't already in the list
-                for tag in scenario_tags:
-                    if tag not in tags:
-                        tags.append(tag)
-            elif line and not line.startswith('#'):
-                # Stop at first non-tag, non-comment line
-                break
-
-        return tags
-
     def _extract_pin_interactions(self, step_description: str) -> List[str]:
-        """Extract pin names from step description"""
-        pins = []
-        
-        # Common pin patterns in our test scenarios
-        pin_patterns = [
-            'START_4', 'RESET_4', 'OVERLOAD_4', 'FREQ_LOCK_4', 'POWER_SENSE_4',
-            'AMPLITUDE_ALL', 'STATUS_LED', 'UART_RXD', 'UART_TXD'
-        ]
-        
-        for pin in pin_patterns:
-            if pin in step_description:
-                pins.append(pin)
-                
-        return pins
+        """Extract pin names from step description, in order of first mention"""
+        matcher = DEFAULT_PIN_MATCHER
+        if pin_registry is not None:
+            try:
+                # One precompiled alternation over every signal in the pin matrix
+                matcher = pin_registry().signal_matcher
+            except Exception:
+                pass
+        return list(dict.fromkeys(m.group(1) for m in matcher.finditer(step_description or '')))
 
     def execute_scenarios(self, scenario_names: List[str], execution_id: str) -> bool:
         """Execute selected test scenarios
@@ -253,7 +282,7 @@ class TestAutomationService:
             return False
             
         # Get scenarios to execute
-        available_scenarios = self.get_available_scenarios()
+        available_scenarios, _ = self._indexed_scenarios()
         scenarios_to_execute = [
             s for s in available_scenarios 
             if s['name'] in scenario_names
@@ -280,7 +309,8 @@ class TestAutomationService:
                 description=scenario_data['description'],
                 feature_file=scenario_data['feature_file'],
                 tags=scenario_data['tags'],
-                steps=steps
+                steps=steps,
+                line=scenario_data.get('line')
             ))
         
         self.current_execution = TestExecution(
@@ -310,20 +340,13 @@ class TestAutomationService:
         self._send_progress_update()
         
         try:
-            # Initialize HIL controller if available
-            if HILController:
+            # Initialize HIL controller if available (kept warm for hardware queries;
+            # the Behave process opens its own hardware session)
+            if HILController and self.hil_controller is None:
                 self.hil_controller = HILController()
                 
-            for i, scenario in enumerate(execution.scenarios):
-                execution.current_scenario_index = i
-                self._execute_scenario(scenario)
-                
-                if scenario.status == TestStatus.PASSED:
-                    execution.passed_scenarios += 1
-                elif scenario.status == TestStatus.FAILED:
-                    execution.failed_scenarios += 1
-                    
-                self._send_progress_update()
+            # One Behave invocation for the whole selection; results stream back per step
+            self._run_behave(execution.scenarios)
                 
         except Exception as e:
             execution.status = TestStatus.ERROR
@@ -335,107 +358,248 @@ class TestAutomationService:
             if execution.status == TestStatus.RUNNING:
                 execution.status = TestStatus.PASSED if execution.failed_scenarios == 0 else TestStatus.FAILED
                 
-            self._send_progress_update()
-
-    def _execute_scenario(self, scenario: TestScenario):
-        """Execute a single test scenario"""
-        scenario.status = TestStatus.RUNNING
-        start_time = time.time()
-
+            self._send_progress_update(force=True)
+
+    def _behave_command(self, scenarios: List[TestScenario]) -> List[str]:
+        """Behave command line running the given scenarios by file:line location"""
+        locations = []
+        for scenario in scenarios:
+            path = self.features_path / scenario.feature_file
+            location = f"{path}:{scenario.line}" if scenario.line else str(path)
+            if location not in locations:
+                locations.append(location)
+        return [sys.executable, '-m', 'behave', *locations,
+                '--format', BEHAVE_PROGRESS_FORMATTER, '--no-summary', '--no-snippets']
+
+    def _run_behave(self, scenarios: List[TestScenario]):
+        """Run scenarios in one Behave process, applying streamed step events as they arrive"""
+        by_location = {(s.feature_file, s.line): s for s in scenarios}
+        execution_scenarios = self.current_execution.scenarios if self.current_execution else []
+        self._execution_positions = {id(s): i for i, s in enumerate(execution_scenarios)}
+        output_tail: List[str] = []
+
+        process = subprocess.Popen(
+            self._behave_command(scenarios),
+            cwd=str(self.project_root),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
+        )
+        self.behave_process = process
         try:
-            # For now, simulate test execution
-            # In a full implementation, this would use behave or direct HIL calls
-            scenario_failed = False
-
+            for line in process.stdout:
+                event = self._parse_behave_event(line)
+                if event is None:
+                    if line.strip():
+                        output_tail = (output_tail + [line.strip()])[-20:]
+                    continue
+                scenario = by_location.get((event.get('feature_file'), event.get('line')))
+                if scenario is not None:
+                    self._apply_behave_event(scenario, event)
+            return_code = process.wait()
+        finally:
+            self.behave_process = None
+
+        # Scenarios Behave never reported (startup failure, crash or stop request)
+        for scenario in scenarios:
+            if scenario.status in (TestStatus.PENDING, TestStatus.RUNNING):
+                scenario.status = TestStatus.ERROR
+                scenario.error_message = (output_tail[-1] if output_tail
+                                          else f"Behave exited with code {return_code}")
             for step in scenario.steps:
+                if step.status in (TestStatus.PENDING, TestStatus.RUNNING):
+                    step.status = TestStatus.SKIPPED
+
+    @staticmethod
+    def _parse_behave_event(line: str) -> Optional[Dict[str, Any]]:
+        """Decode one progress formatter line; other Behave output yields None"""
+        line = line.strip()
+        if not line.startswith('{'):
+            return None
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        return event if isinstance(event, dict) and 'event' in event else None
+
+    def _apply_behave_event(self, scenario: TestScenario, event: Dict[str, Any]):
+        """Update scenario/step state from a progress event and notify listeners"""
+        kind = event['event']
+        status = TestStatus(BEHAVE_STATUS_MAP.get(event.get('status'), 'error')) if 'status' in event else None
+
+        if kind == 'scenario_started':
+            scenario.status = TestStatus.RUNNING
+            if self.current_execution and id(scenario) in self._execution_positions:
+                self.current_execution.current_scenario_index = self._execution_positions[id(scenario)]
+
+        elif kind in ('step_started', 'step_finished'):
+            index = event.get('index', -1)
+            if event.get('background'):
+                # Background steps are not listed in the UI; a failure fails the scenario
+                if status in (TestStatus.FAILED, TestStatus.ERROR):
+                    scenario.error_message = event.get('error_message')
+                return
+            if not 0 <= index < len(scenario.steps):
+                return
+            step = scenario.steps[index]
+            if kind == 'step_started':
                 step.status = TestStatus.RUNNING
-                self._send_progress_update()
-
-                # Simulate step execution time
-                time.sleep(0.1)  # Reduced for faster testing
-
-                # For demo purposes, randomly pass/fail some steps
-                import random
-                if random.random() > 0.1:  # 90% pass rate
-                    step.status = TestStatus.PASSED
-                    step.duration_ms = int((time.time() - start_time) * 1000)
-                else:
-                    step.status = TestStatus.FAILED
-                    step.error_message = "Simulated test failure"
-                    step.duration_ms = int((time.time() - start_time) * 1000)
-                    scenario_failed = True
-                    # Continue executing remaining steps even if one fails
-
-            # Ensure all steps have a final status (no PENDING steps remain)
-            for step in scenario.steps:
-                if step.status == TestStatus.PENDING or step.status == TestStatus.RUNNING:
-                    step.status = TestStatus.PASSED
-                    step.duration_ms = int((time.time() - start_time) * 1000)
-
-            # Determine scenario status
-            failed_steps = [s for s in scenario.steps if s.status == TestStatus.FAILED]
-            if failed_steps:
-                scenario.status = TestStatus.FAILED
-                scenario.error_message = f"Failed steps: {len(failed_steps)}"
             else:
-                scenario.status = TestStatus.PASSED
+                step.status = status
+                step.duration_ms = event.get('duration_ms')
+                step.error_message = event.get('error_message')
 
-        except Exception as e:
-            scenario.status = TestStatus.ERROR
-            scenario.error_message = str(e)
-            # Ensure all steps have a status even in error case
+        elif kind == 'scenario_finished':
+            scenario.status = status
+            scenario.duration_ms = event.get('duration_ms')
+            failed_steps = [s for s in scenario.steps if s.status == TestStatus.FAILED]
+            scenario.error_message = (event.get('error_message') or scenario.error_message
+                                      or (f"Failed steps: {len(failed_steps)}" if failed_steps else None))
             for step in scenario.steps:
-                if step.status == TestStatus.PENDING or step.status == TestStatus.RUNNING:
-                    step.status = TestStatus.ERROR
-                    step.error_message = str(e)
-                    step.duration_ms = int((time.time() - start_time) * 1000)
+                if step.status in (TestStatus.PENDING, TestStatus.RUNNING):
+                    step.status = TestStatus.SKIPPED
+            if self.current_execution and id(scenario) in self._execution_positions:
+                if status == TestStatus.PASSED:
+                    self.current_execution.passed_scenarios += 1
+                elif status in (TestStatus.FAILED, TestStatus.ERROR):
+                    self.current_execution.failed_scenarios += 1
+
+        self._send_progress_update()
 
-        scenario.duration_ms = int((time.time() - start_time) * 1000)
+    def _send_progress_update(self, force: bool = False):
+        """Send progress to the callback: a full snapshot first, then deltas
+        
+        Each message carries ``type`` ("snapshot" or "delta") and an increasing
+        ``seq``. Deltas hold only the execution fields, scenarios and steps that
+        changed since the previous message, as absolute values, so applying one
+        twice is harmless. A consumer that sees a gap in ``seq`` resyncs with
+        get_progress_snapshot(). With ``progress_interval`` set, updates are
+        coalesced to at most one message per interval unless ``force`` is set.
+        """
+        if not (self.progress_callback and self.current_execution):
+            return
+        with self._progress_lock:
+            wait = self._progress_last_time + self.progress_interval - self._clock()
+            if wait > 0 and not force and self._progress_sent is not None:
+                if self._progress_timer is None:
+                    self._progress_timer = self._timer(wait, self._send_progress_update)
+                    self._progress_timer.daemon = True
+                    self._progress_timer.start()
+                return
+            if self._progress_timer is not None:
+                self._progress_timer.cancel()
+                self._progress_timer = None
 
-    def _send_progress_update(self):
-        """Send progress update via callback"""
-        if self.progress_callback and self.current_execution:
             try:
-                # Convert to JSON-serializable format
-                execution_data = {
-                    'execution_id': self.current_execution.execution_id,
-                    'status': self.current_execution.status.value,
-                    'start_time': self.current_execution.start_time,
-                    'end_time': self.current_execution.end_time,
-                    'total_scenarios': self.current_execution.total_scenarios,
-                    'passed_scenarios': self.current_execution.passed_scenarios,
-                    'failed_scenarios': self.current_execution.failed_scenarios,
-                    'current_scenario_index': self.current_execution.current_scenario_index,
-                    'scenarios': [
-                        {
-                            'name': s.name,
-                            'description': s.description,
-                            'feature_file': s.feature_file,
-                            'tags': s.tags,
-                            'status': s.status.value,
-                            'duration_ms': s.duration_ms,
-                            'error_message': s.error_message,
-                            'steps': [
-                                {
-                                    'step_type': step.step_type,
-                                    'description': step.description,
-                                    'status': step.status.value,
-                                    'duration_ms': step.duration_ms,
-                                    'error_message': step.error_message,
-                                    'pin_interactions': step.pin_interactions
-                                }
-                                for step in s.steps
-                            ]
-                        }
-                        for s in self.current_execution.scenarios
-                    ]
-                }
+                execution = self.current_execution
+                state = self._progress_state(execution)
+                sent = self._progress_sent
+                if sent is None or sent['execution_id'] != execution.execution_id:
+                    message = dict(self._execution_snapshot(execution), type='snapshot')
+                else:
+                    message = self._progress_delta(sent, state)
+                    if message is None:
+                        return
+                self._progress_seq += 1
+                message['seq'] = self._progress_seq
+                self._progress_sent = state
+                self._progress_last_time = self._clock()
                 
-                self.progress_callback(execution_data)
+                self.progress_callback(message)
                 
             except Exception as e:
                 print(f"Error sending progress update: {e}")
 
+    def get_progress_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Full execution state for a new subscriber or a resync after a missed ``seq``"""
+        with self._progress_lock:
+            if not self.current_execution:
+                return None
+            return dict(self._execution_snapshot(self.current_execution), type='snapshot', seq=self._progress_seq)
+
+    def _execution_snapshot(self, execution: TestExecution) -> Dict[str, Any]:
+        """Complete JSON-serializable execution state"""
+        return {
+            'execution_id': execution.execution_id,
+            'status': execution.status.value,
+            'start_time': execution.start_time,
+            'end_time': execution.end_time,
+            'total_scenarios': execution.total_scenarios,
+            'passed_scenarios': execution.passed_scenarios,
+            'failed_scenarios': execution.failed_scenarios,
+            'current_scenario_index': execution.current_scenario_index,
+            'scenarios': [
+                {
+                    'name': s.name,
+                    'description': s.description,
+                    'feature_file': s.feature_file,
+                    'tags': s.tags,
+                    'status': s.status.value,
+                    'duration_ms': s.duration_ms,
+                    'error_message': s.error_message,
+                    'steps': [
+                        {
+                            'step_type': step.step_type,
+                            'description': step.description,
+                            'status': step.status.value,
+                            'duration_ms': step.duration_ms,
+                            'error_message': step.error_message,
+                            'pin_interactions': step.pin_interactions
+                        }
+                        for step in s.steps
+                    ]
+                }
+                for s in execution.scenarios
+            ]
+        }
+
+    @staticmethod
+    def _progress_state(execution: TestExecution) -> Dict[str, Any]:
+        """Mutable parts of an execution, compared between messages to build deltas"""
+        return {
+            'execution_id': execution.execution_id,
+            'fields': {
+                'status': execution.status.value,
+                'start_time': execution.start_time,
+                'end_time': execution.end_time,
+                'passed_scenarios': execution.passed_scenarios,
+                'failed_scenarios': execution.failed_scenarios,
+                'current_scenario_index': execution.current_scenario_index,
+            },
+            'scenarios': [
+                (s.status.value, s.duration_ms, s.error_message,
+                 tuple((step.status.value, step.duration_ms, step.error_message) for step in s.steps))
+                for s in execution.scenarios
+            ]
+        }
+
+    @staticmethod
+    def _progress_delta(previous: Dict[str, Any], current: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Changed fields between two progress states, or None if nothing changed"""
+        keys = ('status', 'duration_ms', 'error_message')
+        delta: Dict[str, Any] = {'type': 'delta', 'execution_id': current['execution_id']}
+        delta.update({k: v for k, v in current['fields'].items() if previous['fields'].get(k) != v})
+
+        scenarios = []
+        for index, (old, new) in enumerate(zip(previous['scenarios'], current['scenarios'])):
+            if old == new:
+                continue
+            change: Dict[str, Any] = {'index': index}
+            change.update({k: n for k, o, n in zip(keys, old[:3], new[:3]) if o != n})
+            steps = []
+            for step_index, (old_step, new_step) in enumerate(zip(old[3], new[3])):
+                if old_step != new_step:
+                    step_change = {'index': step_index}
+                    step_change.update({k: n for k, o, n in zip(keys, old_step, new_step) if o != n})
+                    steps.append(step_change)
+            if steps:
+                change['steps'] = steps
+            scenarios.append(change)
+        if scenarios:
+            delta['scenarios'] = scenarios
+        return delta if len(delta) > 2 else None
+
     def get_execution_status(self) -> Optional[Dict[str, Any]]:
         """Get current execution status"""
         if not self.current_execution:
@@ -455,10 +619,75 @@ class TestAutomationService:
         if self.current_execution and self.current_execution.status == TestStatus.RUNNING:
             self.current_execution.status = TestStatus.ERROR
             self.current_execution.error_message = "Execution stopped by user"
+            if self.behave_process is not None:
+                self.behave_process.terminate()
             return True
         return False
 
 
+class TestAutomationWorker:
+    """Resident JSON-lines RPC front end for TestAutomationService
+    
+    Started once with ``TestAutomationService.py serve`` so interpreter startup,
+    HIL framework imports, parsed scenarios and the HILController stay warm
+    between calls. Each input line is a request
+    ``{"id": 1, "method": "get_scenarios", "params": {...}}`` answered by
+    ``{"id": 1, "result": ...}`` or ``{"id": 1, "error": "..."}``. Execution
+    progress is pushed as ``{"event": "progress", "data": {...}}`` lines while
+    other requests (status, stop, listing) keep being served.
+    """
+
+    def __init__(self, service: TestAutomationService, output=None):
+        self.service = service
+        self.output = output or sys.stdout
+        self._write_lock = threading.Lock()
+        self.methods: Dict[str, Callable[..., Any]] = {
+            'ping': lambda: 'pong',
+            'get_scenarios': lambda: service._indexed_scenarios()[0],
+            'filter_scenarios': service.filter_scenarios,
+            'get_tag_counts': service.get_tag_counts,
+            'execute_scenarios': service.execute_scenarios,
+            'get_execution_status': service.get_execution_status,
+            'get_progress_snapshot': service.get_progress_snapshot,
+            'stop_execution': service.stop_execution,
+            'shutdown': self._shutdown,
+        }
+        self._running = False
+        service.progress_callback = lambda data: self._emit({'event': 'progress', 'data': data})
+
+    def handle(self, line: str) -> Dict[str, Any]:
+        """Dispatch one request line and return its response"""
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            method = self.methods.get(request.get('method'))
+            if method is None:
+                return {'id': request_id, 'error': f"Unknown method: {request.get('method')}"}
+            return {'id': request_id, 'result': method(**(request.get('params') or {}))}
+        except Exception as e:
+            return {'id': request_id, 'error': str(e)}
+
+    def serve(self, input_stream=None):
+        """Answer requests until EOF or a shutdown request"""
+        self._running = True
+        for line in (input_stream or sys.stdin):
+            if line.strip():
+                self._emit(self.handle(line))
+            if not self._running:
+                break
+
+    def _shutdown(self) -> bool:
+        self.service.stop_execution()
+        self._running = False
+        return True
+
+    def _emit(self, message: Dict[str, Any]):
+        with self._write_lock:
+            self.output.write(json.dumps(message) + '\n')
+            self.output.flush()
+
+
 def main():
     """Command-line interface for the test automation service"""
     import sys
@@ -472,12 +701,30 @@ def main():
 
     try:
         service = TestAutomationService()
+        # At most one progress message per interval (seconds), e.g. 0.1 for 10 updates/s
+        service.progress_interval = float(os.environ.get('TEST_PROGRESS_INTERVAL', '0') or 0)
 
         if command == 'get_scenarios':
             # Get all available scenarios
             scenarios = service.get_available_scenarios()
             print(json.dumps(scenarios, indent=2))
 
+        elif command == 'filter_scenarios':
+            # Scenarios matching a tag expression, e.g. "hil and not pending"
+            expression = sys.argv[2] if len(sys.argv) > 2 else ''
+            print(json.dumps(service.filter_scenarios(expression), indent=2))
+
+        elif command == 'get_tag_counts':
+            # Scenario count per tag, optionally within a tag expression
+            expression = sys.argv[2] if len(sys.argv) > 2 else ''
+            print(json.dumps(service.get_tag_counts(expression), indent=2))
+
+        elif command == 'serve':
+            # Resident JSON-lines worker; diagnostics go to stderr so stdout stays protocol-only
+            worker = TestAutomationWorker(service, output=sys.stdout)
+            sys.stdout = sys.stderr
+            worker.serve(sys.stdin)
+
         elif command == 'execute_scenarios':
             if len(sys.argv) < 4:
                 print("Usage: python TestAutomationService.py execute_scenarios <scenarios_json> <execution_id>")
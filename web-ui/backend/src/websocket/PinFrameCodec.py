@@ -0,0 +1,112 @@
+"""
+Compact binary encoding for pin_update / pin state websocket traffic
+
+Clients that negotiate the 'binary' encoding receive the pin descriptors
+(signal, Arduino pin, direction, description) once, as a JSON
+'pin_descriptors' message, and from then on only fixed-size binary frames
+keyed by the descriptor's numeric ID. Everything else stays JSON.
+
+Frame layout (little-endian):
+    header   u8 version | u8 kind | u16 record count
+    record   u16 signal id | u8 state kind | f64 value | i64 timestamp (ms)
+             state kind TEXT is followed by u8 length + UTF-8 bytes
+
+A pin update is 23 bytes on the wire instead of roughly 200 bytes of JSON.
+Pin states carrying fields a record has no room for (the frequency readout on
+FREQ_DIV10_4) are left to JSON.
+"""
+
+import struct
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+FRAME_VERSION = 1
+FRAME_PIN_UPDATE = 1
+FRAME_PIN_STATES = 2
+
+STATE_LOW = 0
+STATE_HIGH = 1
+STATE_NUMBER = 2
+STATE_TEXT = 3
+
+_HEADER = struct.Struct('<BBH')
+_RECORD = struct.Struct('<HBdq')
+_FRAME_FIELDS = frozenset(('pin', 'signal', 'direction', 'description', 'state', 'timestamp'))
+
+
+class PinFrameCodec:
+    """Signal ID table plus encoder/decoder for binary pin frames"""
+
+    def __init__(self, pinStates: Dict[str, Dict[str, Any]]):
+        self.signals: List[str] = list(pinStates)
+        self.ids = {signal: index for index, signal in enumerate(self.signals)}
+        self.descriptors = [{
+            'id': index,
+            'signal': signal,
+            'pin': pinStates[signal].get('pin'),
+            'direction': pinStates[signal].get('direction'),
+            'description': pinStates[signal].get('description', '')
+        } for index, signal in enumerate(self.signals)]
+
+    def knows(self, signal: str) -> bool:
+        return signal in self.ids
+
+    def canEncode(self, signal: str, pinState: Optional[Dict[str, Any]]) -> bool:
+        """True if a frame record carries everything in this pin state"""
+        return signal in self.ids and set(pinState or {}) <= _FRAME_FIELDS
+
+    def encode(self, kind: int, pins: Iterable[Tuple[str, Dict[str, Any]]]) -> Optional[bytes]:
+        """Encode (signal, pinState) pairs; None if one of them cannot be framed"""
+        records = []
+        for signal, pinState in pins:
+            if not self.canEncode(signal, pinState):
+                return None
+            records.append(self._encodeRecord(self.ids[signal], pinState or {}))
+        return _HEADER.pack(FRAME_VERSION, kind, len(records)) + b''.join(records)
+
+    def encodeUpdate(self, signal: str, pinState: Dict[str, Any]) -> Optional[bytes]:
+        return self.encode(FRAME_PIN_UPDATE, [(signal, pinState)])
+
+    def encodeStates(self, pinStates: Dict[str, Dict[str, Any]]) -> bytes:
+        """Encode a full snapshot, skipping pin states that cannot be framed"""
+        framed = [(signal, state) for signal, state in pinStates.items() if self.canEncode(signal, state)]
+        return self.encode(FRAME_PIN_STATES, framed)
+
+    def unframed(self, pinStates: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """The part of a snapshot encodeStates leaves out, to be sent as JSON"""
+        return {signal: state for signal, state in pinStates.items() if not self.canEncode(signal, state)}
+
+    def decode(self, frame: bytes) -> Tuple[int, List[Dict[str, Any]]]:
+        """Decode a frame back to (kind, [{signal, state, timestamp}, ...])"""
+        version, kind, count = _HEADER.unpack_from(frame, 0)
+        if version != FRAME_VERSION:
+            raise ValueError(f'Unsupported pin frame version: {version}')
+        offset = _HEADER.size
+        pins = []
+        for _ in range(count):
+            signalId, stateKind, value, timestamp = _RECORD.unpack_from(frame, offset)
+            offset += _RECORD.size
+            if stateKind == STATE_TEXT:
+                length = frame[offset]
+                state = frame[offset + 1:offset + 1 + length].decode('utf-8')
+                offset += 1 + length
+            elif stateKind == STATE_NUMBER:
+                state = int(value) if value.is_integer() else value
+            else:
+                state = 'HIGH' if stateKind == STATE_HIGH else 'LOW'
+            pins.append({'signal': self.signals[signalId], 'state': state, 'timestamp': timestamp})
+        return kind, pins
+
+    @staticmethod
+    def _encodeRecord(signalId: int, pinState: Dict[str, Any]) -> bytes:
+        state = pinState.get('state')
+        timestamp = int(pinState.get('timestamp') or 0)
+        if state == 'HIGH':
+            return _RECORD.pack(signalId, STATE_HIGH, 0.0, timestamp)
+        if state == 'LOW':
+            return _RECORD.pack(signalId, STATE_LOW, 0.0, timestamp)
+        if isinstance(state, (int, float)) and not isinstance(state, bool):
+            return _RECORD.pack(signalId, STATE_NUMBER, float(state), timestamp)
+        # Cap at 255 bytes without splitting a multi-byte character
+        text = str(state if state is not None else '').encode('utf-8')[:255]
+        text = text.decode('utf-8', 'ignore').encode('utf-8')
+        return _RECORD.pack(signalId, STATE_TEXT, 0.0, timestamp) + bytes([len(text)]) + text
@@ -0,0 +1,136 @@
+import { PinState } from '../adapters/HardwareInterface.js'
+
+/**
+ * Compact binary encoding for pin_update / pin state websocket traffic.
+ *
+ * Clients that negotiate the 'binary' encoding receive the pin descriptors
+ * (signal, Arduino pin, direction, description) once, as a JSON
+ * 'pin_descriptors' message, and from then on only fixed-size binary frames
+ * keyed by the descriptor's numeric ID. Everything else stays JSON.
+ *
+ * Frame layout (little-endian), shared with PinFrameCodec.py:
+ *   header   u8 version | u8 kind | u16 record count
+ *   record   u16 signal id | u8 state kind | f64 value | i64 timestamp (ms)
+ *            state kind TEXT is followed by u8 length + UTF-8 bytes
+ *
+ * Pin states carrying fields a record has no room for (the frequency readout
+ * on FREQ_DIV10_4) are left to JSON.
+ */
+
+export const FRAME_VERSION = 1
+export const FRAME_PIN_UPDATE = 1
+export const FRAME_PIN_STATES = 2
+
+export const STATE_LOW = 0
+export const STATE_HIGH = 1
+export const STATE_NUMBER = 2
+export const STATE_TEXT = 3
+
+const HEADER_SIZE = 4
+const RECORD_SIZE = 19
+const MAX_TEXT_BYTES = 255
+const FRAME_FIELDS = new Set(['pin', 'signal', 'direction', 'description', 'state', 'timestamp'])
+
+export interface PinDescriptor {
+  id: number
+  signal: string
+  pin: string
+  direction: PinState['direction']
+  description: string
+}
+
+export class PinFrameCodec {
+  readonly descriptors: PinDescriptor[]
+  private ids: Map<string, number> = new Map()
+
+  constructor(pinStates: Map<string, PinState>) {
+    this.descriptors = Array.from(pinStates.entries()).map(([signal, pinState], id) => {
+      this.ids.set(signal, id)
+      return {
+        id,
+        signal,
+        pin: pinState.pin,
+        direction: pinState.direction,
+        description: (pinState as PinState & { description?: string }).description || ''
+      }
+    })
+  }
+
+  /** True if a frame record carries everything in this pin state */
+  canEncode(signal: string, pinState: Partial<PinState> | undefined): boolean {
+    if (!this.ids.has(signal)) {
+      return false
+    }
+    return Object.keys(pinState || {}).every(field => FRAME_FIELDS.has(field))
+  }
+
+  /** Encode (signal, pinState) pairs; null if one of them cannot be framed */
+  encode(kind: number, pins: Array<[string, Partial<PinState>]>): Buffer | null {
+    const records: Buffer[] = []
+    for (const [signal, pinState] of pins) {
+      if (!this.canEncode(signal, pinState)) {
+        return null
+      }
+      records.push(this.encodeRecord(this.ids.get(signal)!, pinState || {}))
+    }
+    const header = Buffer.alloc(HEADER_SIZE)
+    header.writeUInt8(FRAME_VERSION, 0)
+    header.writeUInt8(kind, 1)
+    header.writeUInt16LE(records.length, 2)
+    return Buffer.concat([header, ...records])
+  }
+
+  encodeUpdate(signal: string, pinState: Partial<PinState>): Buffer | null {
+    return this.encode(FRAME_PIN_UPDATE, [[signal, pinState]])
+  }
+
+  /** Encode a full snapshot, skipping pin states that cannot be framed */
+  encodeStates(pinStates: Map<string, PinState>): Buffer {
+    const framed = Array.from(pinStates.entries()).filter(([signal, pinState]) => this.canEncode(signal, pinState))
+    return this.encode(FRAME_PIN_STATES, framed)!
+  }
+
+  /** The part of a snapshot encodeStates leaves out, to be sent as JSON */
+  unframed(pinStates: Map<string, PinState>): Record<string, PinState> {
+    return Object.fromEntries(
+      Array.from(pinStates.entries()).filter(([signal, pinState]) => !this.canEncode(signal, pinState))
+    )
+  }
+
+  private encodeRecord(signalId: number, pinState: Partial<PinState>): Buffer {
+    const { state } = pinState
+    let stateKind = STATE_TEXT
+    let value = 0
+    let text: Buffer | null = null
+
+    if (state === 'HIGH') {
+      stateKind = STATE_HIGH
+    } else if (state === 'LOW') {
+      stateKind = STATE_LOW
+    } else if (typeof state === 'number') {
+      stateKind = STATE_NUMBER
+      value = state
+    } else {
+      // Cap at 255 bytes without splitting a multi-byte character
+      text = Buffer.from(String(state ?? ''), 'utf8')
+      if (text.length > MAX_TEXT_BYTES) {
+        let end = MAX_TEXT_BYTES
+        while (end > 0 && (text[end] & 0xc0) === 0x80) {
+          end--
+        }
+        text = text.subarray(0, end)
+      }
+    }
+
+    const record = Buffer.alloc(RECORD_SIZE + (text ? 1 + text.length : 0))
+    record.writeUInt16LE(signalId, 0)
+    record.writeUInt8(stateKind, 2)
+    record.writeDoubleLE(value, 3)
+    record.writeBigInt64LE(BigInt(Math.trunc(Number(pinState.timestamp) || 0)), 11)
+    if (text) {
+      record.writeUInt8(text.length, RECORD_SIZE)
+      text.copy(record, RECORD_SIZE + 1)
+    }
+    return record
+  }
+}
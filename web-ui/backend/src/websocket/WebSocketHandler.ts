@@ -2,6 +2,7 @@ import { WebSocket } from 'ws'
 import { HardwareInterface } from '../adapters/HardwareInterface.js'
 import { TestAutomationService } from '../services/TestAutomationService.js'
 import { modularConfigService } from '../config/ModularConfigService'
+import { PinFrameCodec } from './PinFrameCodec.js'
 
 export interface WebSocketMessage {
   type: string
@@ -9,11 +10,19 @@ export interface WebSocketMessage {
   timestamp: number
 }
 
+// Wire encodings a client can negotiate. 'binary' sends pin updates and pin
+// state snapshots as PinFrameCodec frames after a one-time descriptor handshake.
+export type WireEncoding = 'json' | 'binary'
+export const SUPPORTED_ENCODINGS: WireEncoding[] = ['json', 'binary']
+
 export class WebSocketHandler {
   private clients: Set<WebSocket> = new Set()
   private hardwareInterface: HardwareInterface
   private testAutomationService?: TestAutomationService
   private pendingCommands: Map<string, { command: string; timestamp: number }> = new Map()
+  private clientEncodings: Map<WebSocket, WireEncoding> = new Map()
+  private descriptorsSent: Set<WebSocket> = new Set()
+  private pinCodec?: PinFrameCodec
 
   constructor(hardwareInterface: HardwareInterface, testAutomationService?: TestAutomationService) {
     this.hardwareInterface = hardwareInterface
@@ -204,8 +213,16 @@ export class WebSocketHandler {
     })
   }
 
-  handleConnection(ws: WebSocket) {
+  /**
+   * Handle a new client. `encoding` is what the client asked for when
+   * connecting (the `?encoding=binary` query string); clients can also switch
+   * later with a `set_encoding` message.
+   */
+  handleConnection(ws: WebSocket, encoding: string = 'json') {
     this.clients.add(ws)
+    if (encoding === 'binary') {
+      this.clientEncodings.set(ws, encoding)
+    }
     console.log(`WebSocket client connected. Total clients: ${this.clients.size}`)
 
     // Send initial state to new client
@@ -222,17 +239,36 @@ export class WebSocketHandler {
     })
 
     ws.on('close', () => {
-      this.clients.delete(ws)
+      this.removeClient(ws)
       console.log(`WebSocket client disconnected. Total clients: ${this.clients.size}`)
     })
 
     ws.on('error', (error) => {
       console.error('WebSocket error:', error)
-      this.clients.delete(ws)
+      this.removeClient(ws)
     })
   }
 
   private sendInitialState(ws: WebSocket) {
+    // Binary clients get the pin descriptors first and the pin states as a
+    // binary snapshot right after the (pin-less) initial_state message
+    if (this.getClientEncoding(ws) === 'binary') {
+      this.sendPinDescriptors(ws)
+      this.sendToClient(ws, {
+        type: 'initial_state',
+        data: {
+          connected: this.hardwareInterface.isConnected(),
+          port: this.hardwareInterface.getSerialPort(),
+          encoding: 'binary',
+          test_execution: this.testAutomationService?.getCurrentExecution() || null,
+          test_in_progress: this.testAutomationService?.isExecutionInProgress() || false
+        },
+        timestamp: Date.now()
+      })
+      this.sendPinStates(ws)
+      return
+    }
+
     // Send current connection status
     const message: WebSocketMessage = {
       type: 'initial_state',
@@ -249,6 +285,65 @@ export class WebSocketHandler {
     this.sendToClient(ws, message)
   }
 
+  private getClientEncoding(ws: WebSocket): WireEncoding {
+    return this.clientEncodings.get(ws) || 'json'
+  }
+
+  /** Switch a client's wire encoding and acknowledge with 'encoding_changed' */
+  private setClientEncoding(ws: WebSocket, encoding: string) {
+    if (!SUPPORTED_ENCODINGS.includes(encoding as WireEncoding)) {
+      this.sendError(ws, `Unsupported encoding: ${encoding}`)
+      return
+    }
+    if (encoding === 'binary') {
+      this.clientEncodings.set(ws, encoding)
+    } else {
+      this.clientEncodings.delete(ws)
+    }
+    this.sendToClient(ws, {
+      type: 'encoding_changed',
+      data: { encoding },
+      timestamp: Date.now()
+    })
+    if (encoding === 'binary') {
+      this.sendPinDescriptors(ws)
+      this.sendPinStates(ws)
+    }
+  }
+
+  /** Send the signal ID table once per client */
+  private sendPinDescriptors(ws: WebSocket) {
+    if (this.descriptorsSent.has(ws)) {
+      return
+    }
+    this.sendToClient(ws, {
+      type: 'pin_descriptors',
+      data: { version: 1, pins: this.getPinCodec().descriptors },
+      timestamp: Date.now()
+    })
+    this.descriptorsSent.add(ws)
+  }
+
+  /** Send current pin states in the client's encoding */
+  private sendPinStates(ws: WebSocket) {
+    const pinStates = this.hardwareInterface.getPinStates()
+    let jsonPins: Record<string, any> = Object.fromEntries(pinStates)
+    if (this.getClientEncoding(ws) === 'binary') {
+      const codec = this.getPinCodec()
+      this.sendRaw(ws, codec.encodeStates(pinStates))
+      // Pin states a frame cannot carry follow as JSON
+      jsonPins = codec.unframed(pinStates)
+      if (Object.keys(jsonPins).length === 0) {
+        return
+      }
+    }
+    this.sendToClient(ws, {
+      type: 'pin_states',
+      data: jsonPins,
+      timestamp: Date.now()
+    })
+  }
+
   private async handleMessage(ws: WebSocket, message: any) {
     try {
       switch (message.type) {
@@ -265,11 +360,11 @@ export class WebSocketHandler {
           break
 
         case 'get_pin_states':
-          this.sendToClient(ws, {
-            type: 'pin_states',
-            data: Object.fromEntries(this.hardwareInterface.getPinStates()),
-            timestamp: Date.now()
-          })
+          this.sendPinStates(ws)
+          break
+
+        case 'set_encoding':
+          this.setClientEncoding(ws, message.data?.encoding)
           break
 
         default:
@@ -405,6 +500,16 @@ export class WebSocketHandler {
     }
   }
 
+  private sendRaw(ws: WebSocket, frame: Buffer) {
+    if (ws.readyState === WebSocket.OPEN) {
+      try {
+        ws.send(frame)
+      } catch (error) {
+        console.error('Failed to send frame to WebSocket client:', error)
+      }
+    }
+  }
+
   private sendError(ws: WebSocket, error: string) {
     this.sendToClient(ws, {
       type: 'error',
@@ -415,21 +520,43 @@ export class WebSocketHandler {
 
   private broadcast(message: WebSocketMessage) {
     const messageStr = JSON.stringify(message)
+    // Pin updates are also encoded once as a binary frame for clients that
+    // negotiated the binary encoding. Signals without a descriptor, or with
+    // extra fields, fall back to JSON.
+    let binaryFrame: Buffer | null = null
+    if (message.type === 'pin_update' && this.clientEncodings.size > 0) {
+      binaryFrame = this.getPinCodec().encodeUpdate(message.data.signal, message.data.pinState)
+    }
     
     this.clients.forEach(client => {
       if (client.readyState === WebSocket.OPEN) {
         try {
-          client.send(messageStr)
+          const useFrame = binaryFrame !== null && this.clientEncodings.get(client) === 'binary'
+          client.send(useFrame ? binaryFrame! : messageStr)
         } catch (error) {
           console.error('Failed to broadcast to WebSocket client:', error)
-          this.clients.delete(client)
+          this.removeClient(client)
         }
       } else {
-        this.clients.delete(client)
+        this.removeClient(client)
       }
     })
   }
 
+  private removeClient(ws: WebSocket) {
+    this.clients.delete(ws)
+    this.clientEncodings.delete(ws)
+    this.descriptorsSent.delete(ws)
+  }
+
+  /** Signal ID table, built from the pin set on first use */
+  private getPinCodec(): PinFrameCodec {
+    if (!this.pinCodec) {
+      this.pinCodec = new PinFrameCodec(this.hardwareInterface.getPinStates())
+    }
+    return this.pinCodec
+  }
+
   getClientCount(): number {
     return this.clients.size
   }
@@ -5,9 +5,62 @@ This mirrors the TypeScript WebSocketHandler functionality for pytest
 
 import json
 import time
+from collections import OrderedDict
+from itertools import count
 from typing import Set, Dict, Any, Optional
 from unittest.mock import Mock
 
+try:
+    from .PinFrameCodec import PinFrameCodec
+except ImportError:
+    from PinFrameCodec import PinFrameCodec
+
+# Back-pressure limits per client. A client whose socket already buffers more
+# than SEND_HIGH_WATER bytes gets messages queued instead of sent; pin_update
+# messages in the queue are coalesced per signal (latest value wins). A client
+# whose queue grows past MAX_QUEUED_MESSAGES or MAX_QUEUED_BYTES is disconnected.
+SEND_HIGH_WATER = 64 * 1024
+MAX_QUEUED_MESSAGES = 256
+MAX_QUEUED_BYTES = 1024 * 1024
+
+# Wire encodings a client can negotiate. 'binary' sends pin updates and pin
+# state snapshots as PinFrameCodec frames after a one-time descriptor handshake.
+ENCODING_JSON = 'json'
+ENCODING_BINARY = 'binary'
+SUPPORTED_ENCODINGS = (ENCODING_JSON, ENCODING_BINARY)
+
+
+class ClientSendQueue:
+    """Bounded outgoing queue for one client with per-signal pin_update coalescing"""
+
+    def __init__(self):
+        self.pending: "OrderedDict[Any, Any]" = OrderedDict()
+        self.queued_bytes = 0
+        self.coalesced = 0
+        self._ids = count()
+
+    def push(self, payload, coalesce_key: Optional[str] = None):
+        key = ('pin', coalesce_key) if coalesce_key is not None else next(self._ids)
+        previous = self.pending.get(key)
+        if previous is not None:
+            # Keep the queue position, replace the value
+            self.queued_bytes -= len(previous)
+            self.coalesced += 1
+        self.pending[key] = payload
+        self.queued_bytes += len(payload)
+
+    def pop(self):
+        _, payload = self.pending.popitem(last=False)
+        self.queued_bytes -= len(payload)
+        return payload
+
+    def over_limit(self) -> bool:
+        return len(self.pending) > MAX_QUEUED_MESSAGES or self.queued_bytes > MAX_QUEUED_BYTES
+
+    def __len__(self):
+        return len(self.pending)
+
+
 class WebSocketMessage:
     def __init__(self, msg_type: str, data: Any = None, timestamp: Optional[int] = None):
         self.type = msg_type
@@ -19,6 +72,11 @@ class WebSocketHandler:
     
     def __init__(self, hardwareInterface):
         self.clients = set()
+        self.sendQueues: Dict[Any, ClientSendQueue] = {}
+        self.droppedClients = 0
+        self.clientEncodings: Dict[Any, str] = {}
+        self.descriptorsSent: Set[Any] = set()
+        self.pinCodec: Optional[PinFrameCodec] = None
         self.hardwareInterface = hardwareInterface
         self.setupHardwareListeners()
     
@@ -50,9 +108,16 @@ class WebSocketHandler:
         message = WebSocketMessage('error', {'error': error})
         self.broadcast(message)
     
-    def handleConnection(self, ws):
-        """Handle new WebSocket connection"""
+    def handleConnection(self, ws, encoding: str = ENCODING_JSON):
+        """Handle new WebSocket connection
+
+        ``encoding`` is what the client asked for when connecting (e.g. via the
+        ``?encoding=binary`` query string); clients can also switch later with a
+        ``set_encoding`` message.
+        """
         self.clients.add(ws)
+        if encoding in SUPPORTED_ENCODINGS and encoding != ENCODING_JSON:
+            self.clientEncodings[ws] = encoding
 
         # Mock WebSocket event handlers if not already set
         if not hasattr(ws, 'on'):
@@ -67,13 +132,68 @@ class WebSocketHandler:
         return ws
     
     def sendInitialState(self, ws):
-        """Send initial state to new client"""
+        """Send initial state to new client
+
+        Binary clients get the pin descriptors first and the pin states as a
+        binary snapshot right after the (pin-less) initial_state message.
+        """
+        if self.getClientEncoding(ws) == ENCODING_BINARY:
+            self.sendPinDescriptors(ws)
+            message = WebSocketMessage('initial_state', {
+                'connected': self.hardwareInterface.isConnected(),
+                'port': self.hardwareInterface.getSerialPort(),
+                'encoding': ENCODING_BINARY
+            })
+            self.sendToClient(ws, message)
+            self.sendPinStates(ws)
+            return
         message = WebSocketMessage('initial_state', {
             'connected': self.hardwareInterface.isConnected(),
             'port': self.hardwareInterface.getSerialPort(),
             'pins': self.hardwareInterface.getPinStates()
         })
         self.sendToClient(ws, message)
+
+    def getClientEncoding(self, ws) -> str:
+        return self.clientEncodings.get(ws, ENCODING_JSON)
+
+    def setClientEncoding(self, ws, encoding: str):
+        """Switch a client's wire encoding and acknowledge with 'encoding_changed'"""
+        if encoding not in SUPPORTED_ENCODINGS:
+            self.sendError(ws, f'Unsupported encoding: {encoding}')
+            return
+        if encoding == ENCODING_JSON:
+            self.clientEncodings.pop(ws, None)
+        else:
+            self.clientEncodings[ws] = encoding
+        self.sendToClient(ws, WebSocketMessage('encoding_changed', {'encoding': encoding}))
+        if encoding == ENCODING_BINARY:
+            self.sendPinDescriptors(ws)
+            self.sendPinStates(ws)
+
+    def sendPinDescriptors(self, ws):
+        """Send the signal ID table once per client"""
+        if ws in self.descriptorsSent:
+            return
+        codec = self._getPinCodec()
+        message = WebSocketMessage('pin_descriptors', {
+            'version': 1,
+            'pins': codec.descriptors
+        })
+        self.sendToClient(ws, message)
+        self.descriptorsSent.add(ws)
+
+    def sendPinStates(self, ws):
+        """Send current pin states in the client's encoding"""
+        pinStates = self._pinStates()
+        if self.getClientEncoding(ws) == ENCODING_BINARY:
+            codec = self._getPinCodec()
+            self._sendRaw(ws, codec.encodeStates(pinStates))
+            # Pin states a frame cannot carry follow as JSON
+            pinStates = codec.unframed(pinStates)
+            if not pinStates:
+                return
+        self.sendToClient(ws, WebSocketMessage('pin_states', pinStates))
     
     async def handleMessage(self, ws, message: Dict[str, Any]):
         """Handle incoming WebSocket message"""
@@ -87,8 +207,10 @@ class WebSocketHandler:
             await self.handleHardwareCommand(ws, message.get('data', {}))
         
         elif msg_type == 'get_pin_states':
-            response = WebSocketMessage('pin_states', self.hardwareInterface.getPinStates())
-            self.sendToClient(ws, response)
+            self.sendPinStates(ws)
+
+        elif msg_type == 'set_encoding':
+            self.setClientEncoding(ws, (message.get('data') or {}).get('encoding'))
         
         else:
             self.sendError(ws, f'Unknown message type: {msg_type}')
@@ -145,6 +267,10 @@ class WebSocketHandler:
             else:
                 message_dict = message
             ws.send(json.dumps(message_dict))
+
+    def _sendRaw(self, ws, payload):
+        if hasattr(ws, 'send') and getattr(ws, 'readyState', 1) == 1:
+            ws.send(payload)
     
     def sendError(self, ws, error: str):
         """Send error message to client"""
@@ -152,7 +278,15 @@ class WebSocketHandler:
         self.sendToClient(ws, message)
     
     def broadcast(self, message):
-        """Broadcast message to all connected clients"""
+        """Broadcast message to all connected clients
+        
+        The message is JSON-encoded once and the same string is handed to every
+        client. Clients whose socket is backed up get it queued instead (see
+        ClientSendQueue); queued pin updates for the same signal collapse to the
+        latest one, and clients that fall too far behind are disconnected.
+        Pin updates are also encoded once as a binary frame for clients that
+        negotiated the binary encoding.
+        """
         if isinstance(message, WebSocketMessage):
             message_dict = {
                 'type': message.type,
@@ -163,18 +297,90 @@ class WebSocketHandler:
             # Handle dict messages
             message_dict = message
         message_str = json.dumps(message_dict)
+        coalesce_key = None
+        binary_frame = None
+        if message_dict.get('type') == 'pin_update':
+            data = message_dict.get('data') or {}
+            coalesce_key = data.get('signal')
+            if self.clientEncodings:
+                # Signals without a descriptor, or with extra fields, fall back to JSON
+                binary_frame = self._getPinCodec().encodeUpdate(coalesce_key, data.get('pinState'))
         
         # Remove closed connections while broadcasting
         closed_clients = set()
         for client in self.clients:
             if hasattr(client, 'readyState') and client.readyState == 1:
-                if hasattr(client, 'send'):
-                    client.send(message_str)
+                payload = message_str
+                if binary_frame is not None and self.clientEncodings.get(client) == ENCODING_BINARY:
+                    payload = binary_frame
+                try:
+                    if hasattr(client, 'send') and not self._deliver(client, payload, coalesce_key):
+                        closed_clients.add(client)
+                except Exception:
+                    # A failing socket is treated like a closed one
+                    closed_clients.add(client)
             else:
                 closed_clients.add(client)
         
         # Remove closed clients
-        self.clients -= closed_clients
+        for client in closed_clients:
+            self._removeClient(client)
+
+    def flushPending(self):
+        """Retry queued messages for clients whose socket buffer has drained"""
+        for client in list(self.sendQueues):
+            if client in self.clients and getattr(client, 'readyState', 1) == 1:
+                self._drain(client, self.sendQueues[client])
+
+    def getQueuedCount(self, ws) -> int:
+        """Number of messages waiting for a backed-up client"""
+        queue = self.sendQueues.get(ws)
+        return len(queue) if queue else 0
+
+    def _deliver(self, client, payload, coalesce_key: Optional[str]) -> bool:
+        """Send or queue one encoded message; False if the client had to be dropped"""
+        queue = self.sendQueues.get(client)
+        if queue is None and self._bufferedAmount(client) <= SEND_HIGH_WATER:
+            client.send(payload)
+            return True
+        if queue is None:
+            queue = self.sendQueues[client] = ClientSendQueue()
+        queue.push(payload, coalesce_key)
+        self._drain(client, queue)
+        if queue.over_limit():
+            self.droppedClients += 1
+            close = getattr(client, 'terminate', None) or getattr(client, 'close', None)
+            if close:
+                close()
+            return False
+        return True
+
+    def _drain(self, client, queue: ClientSendQueue):
+        while len(queue) and self._bufferedAmount(client) <= SEND_HIGH_WATER:
+            client.send(queue.pop())
+        if not len(queue):
+            self.sendQueues.pop(client, None)
+
+    def _removeClient(self, client):
+        self.clients.discard(client)
+        self.sendQueues.pop(client, None)
+        self.clientEncodings.pop(client, None)
+        self.descriptorsSent.discard(client)
+
+    def _pinStates(self) -> Dict[str, Any]:
+        pinStates = self.hardwareInterface.getPinStates()
+        return pinStates if isinstance(pinStates, dict) else {}
+
+    def _getPinCodec(self) -> PinFrameCodec:
+        """Signal ID table, built from the pin set on first use"""
+        if self.pinCodec is None:
+            self.pinCodec = PinFrameCodec(self._pinStates())
+        return self.pinCodec
+
+    @staticmethod
+    def _bufferedAmount(client) -> int:
+        amount = getattr(client, 'bufferedAmount', 0)
+        return amount if isinstance(amount, (int, float)) else 0
     
     def getClientCount(self) -> int:
         """Get number of connected clients"""
@@ -28,7 +28,7 @@ function App() {
   const [currentTestExecution, setCurrentTestExecution] = useState<any>(null)
   const [keyboardShortcutsEnabled, setKeyboardShortcutsEnabled] = useState(true)
 
-  const { connected, sendMessage, lastMessage } = useWebSocket(WEBSOCKET_URL)
+  const { connected, sendMessage, lastMessage } = useWebSocket(WEBSOCKET_URL, { encoding: 'binary' })
   const { hardwareState, updatePinState, updateMultiplePins, setConnectionStatus } = useHardwareState()
   const { addHistoryEntry } = usePinHistory()
   const { addCommandPair } = useArduinoCommandLog({ maxEntries: 100 })
@@ -108,6 +108,11 @@ function App() {
         })
         break
 
+      case 'pin_states':
+        // Full snapshot, e.g. decoded from a binary pin frame
+        updateMultiplePins(lastMessage.data)
+        break
+
       case 'pin_update':
         // Update individual pin state and add to history
         const { signal, pinState } = lastMessage.data
@@ -1,19 +1,32 @@
 import { useState, useEffect, useRef, useCallback } from 'react'
-import { WebSocketMessage } from '../types'
+import { PinDescriptor, WebSocketMessage } from '../types'
 import { WEBSOCKET_CONFIG } from '../../../shared/constants'
+import { pinFrameToMessage } from '../utils/pinFrameDecoder'
 
-export function useWebSocket(url: string) {
+interface UseWebSocketOptions {
+  // 'binary' asks the server for compact pin frames; they are decoded back
+  // into the usual 'pin_update' / 'pin_states' messages
+  encoding?: 'json' | 'binary'
+}
+
+export function useWebSocket(url: string, { encoding = 'json' }: UseWebSocketOptions = {}) {
   const [connected, setConnected] = useState(false)
   const [lastMessage, setLastMessage] = useState<WebSocketMessage | null>(null)
   const [error, setError] = useState<string | null>(null)
   const ws = useRef<WebSocket | null>(null)
   const reconnectTimeoutRef = useRef<NodeJS.Timeout | undefined>(undefined)
   const reconnectAttempts = useRef(0)
+  const pinDescriptors = useRef<PinDescriptor[]>([])
   const maxReconnectAttempts = WEBSOCKET_CONFIG.MAX_RECONNECT_ATTEMPTS
 
   const connect = useCallback(() => {
     try {
-      ws.current = new WebSocket(url)
+      if (encoding === 'binary') {
+        ws.current = new WebSocket(`${url}${url.includes('?') ? '&' : '?'}encoding=binary`)
+        ws.current.binaryType = 'arraybuffer'
+      } else {
+        ws.current = new WebSocket(url)
+      }
       
       ws.current.onopen = () => {
         console.log('WebSocket connected')
@@ -24,7 +37,17 @@ export function useWebSocket(url: string) {
       
       ws.current.onmessage = (event) => {
         try {
+          if (event.data instanceof ArrayBuffer) {
+            const frameMessage = pinFrameToMessage(event.data, pinDescriptors.current)
+            if (frameMessage) {
+              setLastMessage(frameMessage)
+            }
+            return
+          }
           const message: WebSocketMessage = JSON.parse(event.data)
+          if (message.type === 'pin_descriptors') {
+            pinDescriptors.current = message.data.pins
+          }
           setLastMessage(message)
         } catch (err) {
           console.error('Failed to parse WebSocket message:', err)
@@ -59,7 +82,7 @@ export function useWebSocket(url: string) {
       console.error('Failed to create WebSocket connection:', err)
       setError('Failed to create WebSocket connection')
     }
-  }, [url])
+  }, [url, encoding])
 
   const disconnect = useCallback(() => {
     if (reconnectTimeoutRef.current) {
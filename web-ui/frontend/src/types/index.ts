@@ -40,6 +40,25 @@ export interface PinState {
   isActive?: boolean;  // For frequency pins
 }
 
+/**
+ * Static description of a pin, sent once to clients using the binary encoding.
+ * Binary pin frames refer to pins by the descriptor's numeric ID.
+ * 
+ * @interface PinDescriptor
+ * @property {number} id - Numeric ID used in binary pin frames
+ * @property {string} signal - Signal name as defined in pin-matrix.md
+ * @property {string} pin - Physical pin identifier (e.g., 'D7', 'A2')
+ * @property {'IN' | 'OUT' | 'ANALOG'} direction - Pin direction/mode
+ * @property {string} description - Human-readable description (may be empty)
+ */
+export interface PinDescriptor {
+  id: number;
+  signal: string;
+  pin: string;
+  direction: 'IN' | 'OUT' | 'ANALOG';
+  description: string;
+}
+
 /**
  * Represents the connection status between the web UI and hardware interface.
  * 
@@ -154,7 +173,7 @@ export interface ATmega32ADUT {
  * @property {number} timestamp - Unix timestamp when message was created
  */
 export interface WebSocketMessage {
-  type: 'pin_update' | 'connection_status' | 'error' | 'command_response' | 'test_progress' | 'test_complete' | 'test_error' | 'test_stopped' | 'initial_state' | 'arduino_command_response' | 'arduino_command_sent';
+  type: 'pin_update' | 'connection_status' | 'error' | 'command_response' | 'test_progress' | 'test_complete' | 'test_error' | 'test_stopped' | 'initial_state' | 'arduino_command_response' | 'arduino_command_sent' | 'pin_states' | 'pin_descriptors' | 'encoding_changed';
   data: any;
   timestamp: number;
 }
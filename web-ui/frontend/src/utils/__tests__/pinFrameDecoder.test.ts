@@ -0,0 +1,82 @@
+import { describe, it, expect } from 'vitest'
+import { decodePinFrame, pinFrameToMessage, FRAME_PIN_STATES, FRAME_PIN_UPDATE } from '../pinFrameDecoder'
+import { PinDescriptor } from '../../types'
+
+const descriptors: PinDescriptor[] = [
+  { id: 0, signal: 'START_4', pin: 'A3', direction: 'OUT', description: '' },
+  { id: 1, signal: 'POWER_SENSE_4', pin: 'A1', direction: 'ANALOG', description: '' }
+]
+
+type FrameRecord = [id: number, kind: number, value: number, timestamp: number, text?: string]
+
+// Builds a frame with the same layout as the backend's PinFrameCodec
+function buildFrame(kind: number, records: FrameRecord[]): ArrayBuffer {
+  const encoder = new TextEncoder()
+  const texts = records.map(([, , , , text]) => (text === undefined ? null : encoder.encode(text)))
+  const size = 4 + records.reduce((total, _, i) => total + 19 + (texts[i] ? 1 + texts[i]!.length : 0), 0)
+  const buffer = new ArrayBuffer(size)
+  const view = new DataView(buffer)
+  view.setUint8(0, 1)
+  view.setUint8(1, kind)
+  view.setUint16(2, records.length, true)
+  let offset = 4
+  records.forEach(([id, stateKind, value, timestamp], i) => {
+    view.setUint16(offset, id, true)
+    view.setUint8(offset + 2, stateKind)
+    view.setFloat64(offset + 3, value, true)
+    view.setBigInt64(offset + 11, BigInt(timestamp), true)
+    offset += 19
+    const text = texts[i]
+    if (text) {
+      view.setUint8(offset, text.length)
+      new Uint8Array(buffer, offset + 1, text.length).set(text)
+      offset += 1 + text.length
+    }
+  })
+  return buffer
+}
+
+describe('pinFrameDecoder', () => {
+  it('decodes a 23-byte pin update frame', () => {
+    const frame = buildFrame(FRAME_PIN_UPDATE, [[0, 1, 0, 1700000000123]])
+    expect(frame.byteLength).toBe(23)
+    expect(decodePinFrame(frame)).toEqual({
+      kind: FRAME_PIN_UPDATE,
+      pins: [{ id: 0, state: 'HIGH', timestamp: 1700000000123 }]
+    })
+  })
+
+  it('decodes numeric and text states', () => {
+    const frame = buildFrame(FRAME_PIN_STATES, [[1, 2, 2.5, 10], [0, 3, 0, 11, 'PWM=50%']])
+    expect(decodePinFrame(frame).pins).toEqual([
+      { id: 1, state: 2.5, timestamp: 10 },
+      { id: 0, state: 'PWM=50%', timestamp: 11 }
+    ])
+  })
+
+  it('rejects frames from an unknown protocol version', () => {
+    const frame = buildFrame(FRAME_PIN_UPDATE, [[0, 0, 0, 0]])
+    new DataView(frame).setUint8(0, 2)
+    expect(() => decodePinFrame(frame)).toThrow('Unsupported pin frame version: 2')
+  })
+
+  it('turns an update frame into a pin_update message using the descriptors', () => {
+    const message = pinFrameToMessage(buildFrame(FRAME_PIN_UPDATE, [[1, 2, 3.3, 42]]), descriptors)
+    expect(message?.type).toBe('pin_update')
+    expect(message?.data).toEqual({
+      signal: 'POWER_SENSE_4',
+      pinState: { pin: 'A1', signal: 'POWER_SENSE_4', direction: 'ANALOG', state: 3.3, timestamp: 42 }
+    })
+  })
+
+  it('turns a snapshot frame into a pin_states message keyed by signal', () => {
+    const message = pinFrameToMessage(buildFrame(FRAME_PIN_STATES, [[0, 0, 0, 1], [1, 2, 0, 2]]), descriptors)
+    expect(message?.type).toBe('pin_states')
+    expect(Object.keys(message?.data)).toEqual(['START_4', 'POWER_SENSE_4'])
+    expect(message?.data.START_4.state).toBe('LOW')
+  })
+
+  it('ignores records without a descriptor', () => {
+    expect(pinFrameToMessage(buildFrame(FRAME_PIN_UPDATE, [[7, 1, 0, 1]]), descriptors)).toBeNull()
+  })
+})
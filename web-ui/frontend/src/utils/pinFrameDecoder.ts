@@ -0,0 +1,93 @@
+/**
+ * Decoder for the binary pin frames the backend sends to clients that
+ * negotiated the 'binary' encoding (see backend/src/websocket/PinFrameCodec.ts)
+ */
+
+import { PinDescriptor, PinState, WebSocketMessage } from '../types'
+
+export const FRAME_VERSION = 1
+export const FRAME_PIN_UPDATE = 1
+export const FRAME_PIN_STATES = 2
+
+const STATE_HIGH = 1
+const STATE_NUMBER = 2
+const STATE_TEXT = 3
+
+const HEADER_SIZE = 4
+const RECORD_SIZE = 19
+
+export interface DecodedPin {
+  id: number
+  state: PinState['state']
+  timestamp: number
+}
+
+/**
+ * Decodes a frame into its kind and records (little-endian, 4-byte header,
+ * 19-byte records, TEXT states followed by a length-prefixed UTF-8 string)
+ */
+export function decodePinFrame(buffer: ArrayBuffer): { kind: number; pins: DecodedPin[] } {
+  const view = new DataView(buffer)
+  const version = view.getUint8(0)
+  if (version !== FRAME_VERSION) {
+    throw new Error(`Unsupported pin frame version: ${version}`)
+  }
+  const kind = view.getUint8(1)
+  const count = view.getUint16(2, true)
+
+  const pins: DecodedPin[] = []
+  let offset = HEADER_SIZE
+  for (let i = 0; i < count; i++) {
+    const id = view.getUint16(offset, true)
+    const stateKind = view.getUint8(offset + 2)
+    const value = view.getFloat64(offset + 3, true)
+    const timestamp = Number(view.getBigInt64(offset + 11, true))
+    offset += RECORD_SIZE
+
+    let state: PinState['state']
+    if (stateKind === STATE_TEXT) {
+      const length = view.getUint8(offset)
+      state = new TextDecoder().decode(new Uint8Array(buffer, offset + 1, length))
+      offset += 1 + length
+    } else if (stateKind === STATE_NUMBER) {
+      state = value
+    } else {
+      state = stateKind === STATE_HIGH ? 'HIGH' : 'LOW'
+    }
+    pins.push({ id, state, timestamp })
+  }
+  return { kind, pins }
+}
+
+/**
+ * Turns a frame into the JSON message the server would otherwise have sent
+ * ('pin_update' or 'pin_states'), filling in pin and direction from the
+ * descriptor table received in 'pin_descriptors'
+ */
+export function pinFrameToMessage(buffer: ArrayBuffer, descriptors: PinDescriptor[]): WebSocketMessage | null {
+  const { kind, pins } = decodePinFrame(buffer)
+  const pinStates: Record<string, PinState> = {}
+  for (const { id, state, timestamp } of pins) {
+    const descriptor = descriptors[id]
+    if (!descriptor) {
+      continue
+    }
+    pinStates[descriptor.signal] = {
+      pin: descriptor.pin,
+      signal: descriptor.signal,
+      direction: descriptor.direction,
+      state,
+      timestamp
+    }
+  }
+
+  const received = Object.values(pinStates)
+  if (kind === FRAME_PIN_UPDATE && received.length === 1) {
+    const [pinState] = received
+    return { type: 'pin_update', data: { signal: pinState.signal, pinState }, timestamp: pinState.timestamp }
+  }
+  if (kind === FRAME_PIN_STATES) {
+    return { type: 'pin_states', data: pinStates, timestamp: Date.now() }
+  }
+  return null
+}
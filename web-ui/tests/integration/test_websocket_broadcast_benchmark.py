@@ -0,0 +1,85 @@
+"""
+Benchmark for WebSocketHandler broadcast with hundreds of simulated clients
+Measures fan-out cost of a fast-toggling signal and verifies slow clients stay bounded
+"""
+import pytest
+import json
+import random
+import time
+import sys
+import os
+
+# Add backend source to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../backend/src'))
+
+
+class SimulatedClient:
+    """WebSocket client whose socket buffer drains at a fixed rate per broadcast"""
+
+    def __init__(self, drain_bytes: int):
+        self.readyState = 1
+        self.bufferedAmount = 0
+        self.drain_bytes = drain_bytes
+        self.received = 0
+        self.last_payload = None
+
+    def send(self, payload: str):
+        self.bufferedAmount += len(payload)
+        self.received += 1
+        self.last_payload = payload
+
+    def tick(self):
+        self.bufferedAmount = max(0, self.bufferedAmount - self.drain_bytes)
+
+    def terminate(self):
+        self.readyState = 3
+
+
+@pytest.mark.integration
+@pytest.mark.websocket
+@pytest.mark.slow
+class TestWebSocketBroadcastBenchmark:
+    """Broadcast fan-out benchmark"""
+
+    CLIENTS = 500
+    UPDATES = 2000
+    SIGNALS = ['START_4', 'RESET_4', 'OVERLOAD_4', 'FREQ_LOCK_4', 'FREQ_DIV10_4']
+
+    def test_broadcast_fan_out(self, mock_hardware_interface):
+        """Hundreds of clients, 10% of them slow, one toggling signal set"""
+        from websocket.WebSocketHandlerPython import WebSocketHandler, MAX_QUEUED_MESSAGES
+
+        random.seed(1)
+        handler = WebSocketHandler(mock_hardware_interface)
+        fast = [SimulatedClient(drain_bytes=1 << 20) for _ in range(self.CLIENTS * 9 // 10)]
+        slow = [SimulatedClient(drain_bytes=8) for _ in range(self.CLIENTS // 10)]
+        clients = fast + slow
+        handler.clients.update(clients)
+
+        elapsed = 0.0
+        for i in range(self.UPDATES):
+            start = time.perf_counter()
+            handler.onPinUpdate(self.SIGNALS[i % len(self.SIGNALS)], {'state': 'HIGH' if i % 2 else 'LOW'})
+            handler.flushPending()
+            elapsed += time.perf_counter() - start
+            for client in clients:
+                client.tick()
+
+        per_update_us = elapsed / self.UPDATES * 1e6
+        per_send_us = elapsed / (self.UPDATES * self.CLIENTS) * 1e6
+        print(f"\n{self.CLIENTS} clients x {self.UPDATES} pin updates: {elapsed:.2f}s "
+              f"({per_update_us:.0f} us/update, {per_send_us:.2f} us/client-send)")
+
+        # Fast clients see every update; slow ones get coalesced latest values, never unbounded queues
+        assert all(c.received == self.UPDATES for c in fast)
+        assert all(c.received < self.UPDATES for c in slow)
+        assert all(handler.getQueuedCount(c) <= len(self.SIGNALS) for c in slow)
+        assert max(len(q) for q in handler.sendQueues.values()) <= MAX_QUEUED_MESSAGES
+        assert handler.getClientCount() == self.CLIENTS
+
+        # Once drained, a slow client ends with the latest state of every signal
+        for client in slow:
+            client.bufferedAmount = 0
+        handler.flushPending()
+        assert all(json.loads(c.last_payload)['type'] == 'pin_update' for c in slow)
+        assert not handler.sendQueues
@@ -23,6 +23,17 @@ sys.path.append(str(Path(__file__).parent.parent.parent / 'backend' / 'src' / 's
 from TestAutomationService import TestAutomationService, TestStatus, TestStep, TestScenario, TestExecution
 
 
+def fake_behave(events, output=(), return_code=0):
+    """Popen replacement whose stdout replays progress formatter events"""
+    lines = list(output) + [json.dumps(dict(event, feature_file=event.get('feature_file', 'test.feature'),
+                                            line=event.get('line', 3))) + '\n'
+                            for event in events]
+    process = Mock()
+    process.stdout = iter(lines)
+    process.wait.return_value = return_code
+    return Mock(return_value=process)
+
+
 class TestTestAutomationService:
     """Test cases for TestAutomationService"""
 
@@ -38,9 +49,14 @@ class TestTestAutomationService:
         # Override the features path
         self.service.features_path = self.features_path
 
+        # Never launch a real Behave process from unit tests
+        self.popen_patch = patch('TestAutomationService.subprocess.Popen', fake_behave([]))
+        self.popen_patch.start()
+
     def teardown_method(self):
         """Clean up test fixtures"""
         import shutil
+        self.popen_patch.stop()
         shutil.rmtree(self.temp_dir)
 
     def create_test_feature_file(self, filename: str, content: str):
@@ -124,19 +140,36 @@ Feature: GPIO Hardware Functionality
             pins = self.service._extract_pin_interactions(description)
             assert pins == expected_pins, f"Failed for: {description}"
 
-    def test_extract_tags_from_previous_lines(self):
-        """Test tag extraction from feature file lines"""
-        lines = [
-            "Feature: Test Feature",
-            "",
-            "@hil @smoke @hardware",
-            "@gpio",
-            "Scenario: Test Scenario"
-        ]
-        
-        tags = self.service._extract_tags_from_previous_lines(lines, 4)  # Index of scenario line
-        expected_tags = ['hil', 'smoke', 'hardware', 'gpio']
-        assert sorted(tags) == sorted(expected_tags)
+    def test_filter_scenarios_and_tag_counts(self):
+        """Test tag queries and per-tag counts through the tag index"""
+        content = """
+@hil
+Feature: Tagged
+  @smoke @req-start
+  Scenario: A
+    Given a
+
+  @pending @req-stop
+  Scenario: B
+    Given b
+
+  @modbus
+  Scenario: C
+    Given c
+"""
+        self.create_test_feature_file('tagged.feature', content)
+
+        names = lambda scenarios: [s['name'] for s in scenarios]
+        assert names(self.service.filter_scenarios('hil and not pending')) == ['A', 'C']
+        assert names(self.service.filter_scenarios('req-*')) == ['A', 'B']
+        assert names(self.service.filter_scenarios(tags=['smoke', 'modbus'], use_or_logic=True)) == ['A', 'C']
+        assert names(self.service.filter_scenarios(tags=['hil', 'smoke'])) == ['A']
+        assert self.service.get_tag_counts()['hil'] == 3
+        assert self.service.get_tag_counts('not pending')['req-stop'] == 0
+
+        # Index is rebuilt when a feature file changes
+        self.create_test_feature_file('more.feature', "Feature: More\n  @smoke\n  Scenario: D\n    Given d\n")
+        assert self.service.get_tag_counts()['smoke'] == 2
 
     def test_execute_scenarios_invalid_names(self):
         """Test executing scenarios with invalid names"""
@@ -248,33 +281,47 @@ Feature: Test Feature
         assert callback_data[0]['execution_id'] == 'test-exec-1'
         assert callback_data[0]['status'] == 'running'
 
-    def test_scenario_execution_simulation(self):
-        """Test the scenario execution simulation"""
-        # Create test scenario
+    def test_scenario_execution_streams_behave_events(self):
+        """Test a scenario is run through Behave and step events update its state"""
         steps = [
             TestStep('Given', 'test setup', pin_interactions=['START_4']),
             TestStep('When', 'test action', pin_interactions=['RESET_4']),
             TestStep('Then', 'test result', pin_interactions=[])
         ]
-        
         scenario = TestScenario(
             name='Test Scenario',
             description='Test Description',
             feature_file='test.feature',
             tags=['test'],
-            steps=steps
+            steps=steps,
+            line=3
         )
-        
-        # Execute scenario (this will use the simulation)
-        self.service._execute_scenario(scenario)
-        
-        # Check that scenario completed
-        assert scenario.status in [TestStatus.PASSED, TestStatus.FAILED]
-        assert scenario.duration_ms is not None
-        
-        # Check that all steps have status
-        for step in scenario.steps:
-            assert step.status in [TestStatus.PASSED, TestStatus.FAILED]
+        events = [
+            {'event': 'scenario_started'},
+            {'event': 'step_started', 'index': 0, 'background': True},
+            {'event': 'step_finished', 'index': 0, 'background': True, 'status': 'passed', 'duration_ms': 1},
+        ]
+        for index in range(3):
+            events += [{'event': 'step_started', 'index': index},
+                       {'event': 'step_finished', 'index': index, 'status': 'passed', 'duration_ms': 10 + index}]
+        events.append({'event': 'scenario_finished', 'status': 'passed', 'duration_ms': 40})
+        updates = []
+        self.service.progress_callback = updates.append
+        self.service.current_execution = TestExecution('e', [scenario], total_scenarios=1)
+
+        with patch('TestAutomationService.subprocess.Popen', fake_behave(events, output=['[HIL] Starting\n'])) as popen:
+            self.service._run_behave([scenario])
+
+        command = popen.call_args[0][0]
+        assert command[1:3] == ['-m', 'behave']
+        assert f"{self.features_path / 'test.feature'}:3" in command
+        assert scenario.status == TestStatus.PASSED
+        assert scenario.duration_ms == 40
+        assert [step.duration_ms for step in steps] == [10, 11, 12]
+        assert all(step.status == TestStatus.PASSED for step in steps)
+        assert self.service.current_execution.passed_scenarios == 1
+        # Background step events do not produce UI updates
+        assert len(updates) == len(events) - 2
 
     def test_command_line_interface_get_scenarios(self):
         """Test command line interface for getting scenarios"""
@@ -408,30 +455,6 @@ Feature: CLI Test Feature
 
         # Should not crash and return cleanly
 
-    def test_execute_scenario_with_exception(self):
-        """Test scenario execution with exception handling"""
-        steps = [TestStep('Given', 'test setup')]
-        scenario = TestScenario(
-            name='Test Scenario',
-            description='Test Description',
-            feature_file='test.feature',
-            tags=['test'],
-            steps=steps
-        )
-
-        # Mock time.sleep to raise an exception (this happens inside the try block)
-        with patch('TestAutomationService.time.sleep', side_effect=Exception("Sleep error")):
-            self.service._execute_scenario(scenario)
-
-            # Scenario should be marked as ERROR
-            assert scenario.status == TestStatus.ERROR
-            assert scenario.error_message == "Sleep error"
-
-            # All steps should also be marked as ERROR
-            for step in scenario.steps:
-                assert step.status == TestStatus.ERROR
-                assert step.error_message == "Sleep error"
-
     def test_send_progress_update_with_callback(self):
         """Test progress update sending with callback"""
         import time
@@ -465,6 +488,69 @@ Feature: CLI Test Feature
         assert len(callback_data) == 1
         assert callback_data[0]['execution_id'] == 'test-exec'
 
+    def test_progress_updates_are_snapshot_then_deltas(self):
+        """Test the first progress message is a snapshot and later ones carry only changes"""
+        messages = []
+        self.service.progress_callback = messages.append
+        scenarios = [
+            TestScenario(f'S{i}', f'S{i}', 'test.feature', ['test'], [TestStep('Given', 'a'), TestStep('Then', 'b')])
+            for i in range(3)
+        ]
+        self.service.current_execution = TestExecution('exec-d', scenarios, total_scenarios=3)
+
+        self.service._send_progress_update()
+        scenarios[1].steps[0].status = TestStatus.PASSED
+        scenarios[1].steps[0].duration_ms = 12
+        self.service.current_execution.current_scenario_index = 1
+        self.service._send_progress_update()
+        self.service._send_progress_update()  # nothing changed: no message
+
+        snapshot, delta = messages
+        assert snapshot['type'] == 'snapshot' and snapshot['seq'] == 1
+        assert len(snapshot['scenarios']) == 3
+        assert delta == {
+            'type': 'delta', 'execution_id': 'exec-d', 'seq': 2, 'current_scenario_index': 1,
+            'scenarios': [{'index': 1, 'steps': [{'index': 0, 'status': 'passed', 'duration_ms': 12}]}]
+        }
+        assert len(json.dumps(delta)) < len(json.dumps(snapshot)) / 3
+
+        # Resync returns the full state at the current sequence number
+        resync = self.service.get_progress_snapshot()
+        assert resync['seq'] == 2 and resync['scenarios'][1]['steps'][0]['status'] == 'passed'
+
+    def test_progress_updates_are_coalesced(self):
+        """Test changes within the progress interval are merged into one delayed message"""
+        now = [100.0]
+        timers = []
+
+        def timer(delay, function):
+            timers.append((delay, function))
+            return Mock()
+
+        messages = []
+        self.service = TestAutomationService(messages.append, progress_interval=0.05,
+                                             clock=lambda: now[0], timer=timer)
+        scenario = TestScenario('S', 'S', 'test.feature', [], [TestStep('Given', 'a'), TestStep('Then', 'b')])
+        self.service.current_execution = TestExecution('exec-c', [scenario], total_scenarios=1)
+
+        self.service._send_progress_update()
+        for step in scenario.steps:
+            step.status = TestStatus.PASSED
+            self.service._send_progress_update()
+        assert len(messages) == 1
+        # One flush timer for the whole burst, due when the interval ends
+        assert len(timers) == 1 and timers[0][0] == pytest.approx(0.05)
+
+        now[0] += 0.05
+        timers[0][1]()
+        assert len(messages) == 2
+        assert [s['status'] for s in messages[1]['scenarios'][0]['steps']] == ['passed', 'passed']
+
+        # Forced updates (execution finished) bypass the interval
+        scenario.status = TestStatus.PASSED
+        self.service._send_progress_update(force=True)
+        assert messages[2]['scenarios'] == [{'index': 0, 'status': 'passed'}]
+
     def test_send_progress_update_callback_exception(self):
         """Test progress update with callback exception"""
         def failing_callback(data):
@@ -533,27 +619,35 @@ Feature: CLI Test Feature
 
     def test_scenario_execution_with_failed_steps(self):
         """Test scenario execution with some failed steps"""
-        steps = [TestStep('Given', 'test setup')]
+        steps = [TestStep('Given', 'test setup'), TestStep('Then', 'check')]
         scenario = TestScenario(
             name='Test Scenario',
             description='Test Description',
             feature_file='test.feature',
             tags=['test'],
-            steps=steps
+            steps=steps,
+            line=3
         )
+        events = [
+            {'event': 'scenario_started'},
+            {'event': 'step_started', 'index': 0},
+            {'event': 'step_finished', 'index': 0, 'status': 'failed', 'duration_ms': 5,
+             'error_message': 'Assertion Failed: no PONG'},
+            {'event': 'scenario_finished', 'status': 'failed', 'duration_ms': 6},
+        ]
 
-        # Mock random to always fail (return 0.05, which is < 0.1 threshold)
-        with patch('random.random', return_value=0.05):
-            with patch('time.sleep'):
-                self.service._execute_scenario(scenario)
+        with patch('TestAutomationService.subprocess.Popen', fake_behave(events, return_code=1)):
+            self.service._run_behave([scenario])
 
-        # Should be FAILED after execution
+        # Failed step keeps Behave's message; steps after it are skipped
         assert scenario.status == TestStatus.FAILED
-        assert all(step.status == TestStatus.FAILED for step in scenario.steps)
+        assert steps[0].status == TestStatus.FAILED
+        assert steps[0].error_message == 'Assertion Failed: no PONG'
+        assert steps[1].status == TestStatus.SKIPPED
         assert scenario.error_message == "Failed steps: 1"
 
     def test_step_status_cleanup(self):
-        """Test that all steps get final status even if some remain PENDING"""
+        """Test that all steps get final status even if Behave never reports the scenario"""
         steps = [
             TestStep('Given', 'test setup'),
             TestStep('When', 'action step'),
@@ -564,21 +658,21 @@ Feature: CLI Test Feature
             description='Test Description',
             feature_file='test.feature',
             tags=['test'],
-            steps=steps
+            steps=steps,
+            line=3
         )
 
         # Set some steps to PENDING to test cleanup
         steps[1].status = TestStatus.PENDING
         steps[2].status = TestStatus.RUNNING
 
-        # Mock to pass all steps
-        with patch('random.random', return_value=0.5):
-            with patch('time.sleep'):
-                self.service._execute_scenario(scenario)
+        output = ['ConfigError: No steps directory\n']
+        with patch('TestAutomationService.subprocess.Popen', fake_behave([], output=output, return_code=1)):
+            self.service._run_behave([scenario])
 
-        # All steps should have final status
+        assert scenario.status == TestStatus.ERROR
+        assert scenario.error_message == 'ConfigError: No steps directory'
         for step in scenario.steps:
-            assert step.status in [TestStatus.PASSED, TestStatus.FAILED, TestStatus.ERROR]
             assert step.status != TestStatus.PENDING
             assert step.status != TestStatus.RUNNING
 
@@ -638,6 +732,41 @@ Feature: CLI Test Feature
 
         assert result == False
 
+    def test_worker_serves_json_lines_requests(self):
+        """Test the resident worker answers list/filter/status requests and stops on shutdown"""
+        import io
+        from TestAutomationService import TestAutomationWorker
+
+        self.create_test_feature_file('w.feature', "@hil\nFeature: W\n  Scenario: One\n    Given a\n")
+        requests = [
+            {'id': 1, 'method': 'get_scenarios'},
+            {'id': 2, 'method': 'filter_scenarios', 'params': {'expression': 'not hil'}},
+            {'id': 3, 'method': 'get_execution_status'},
+            {'id': 4, 'method': 'missing'},
+            {'id': 5, 'method': 'shutdown'},
+            {'id': 6, 'method': 'ping'},
+        ]
+        output = io.StringIO()
+        worker = TestAutomationWorker(self.service, output=output)
+        worker.serve(io.StringIO(''.join(json.dumps(r) + '\n' for r in requests)))
+
+        responses = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert [r['id'] for r in responses] == [1, 2, 3, 4, 5]
+        assert responses[0]['result'][0]['name'] == 'One'
+        assert responses[1]['result'] == []
+        assert responses[2]['result'] is None
+        assert responses[3]['error'] == 'Unknown method: missing'
+
+    def test_worker_streams_progress_events(self):
+        """Test progress callbacks become event lines on the worker output"""
+        import io
+        from TestAutomationService import TestAutomationWorker
+
+        output = io.StringIO()
+        TestAutomationWorker(self.service, output=output)
+        self.service.progress_callback({'execution_id': 'e1'})
+        assert json.loads(output.getvalue()) == {'event': 'progress', 'data': {'execution_id': 'e1'}}
+
     def test_main_function_no_args(self):
         """Test main function with no arguments"""
         import sys
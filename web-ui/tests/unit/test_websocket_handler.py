@@ -4,7 +4,7 @@ Tests WebSocket communication and message handling
 """
 import pytest
 import json
-from unittest.mock import Mock, MagicMock
+from unittest.mock import Mock, MagicMock, patch
 import sys
 import os
 
@@ -583,3 +583,120 @@ class TestWebSocketHandler:
 
         # Verify message was sent as JSON
         mock_ws.send.assert_called_with(json.dumps(dict_message))
+
+    def test_broadcast_encodes_once_for_all_clients(self, mock_hardware_interface):
+        """Test a broadcast serializes the message once and shares the string"""
+        from websocket.WebSocketHandlerPython import WebSocketHandler
+
+        handler = WebSocketHandler(mock_hardware_interface)
+        clients = [Mock(readyState=1, bufferedAmount=0) for _ in range(5)]
+        handler.clients.update(clients)
+
+        with patch('websocket.WebSocketHandlerPython.json.dumps', wraps=json.dumps) as dumps:
+            handler.broadcast({'type': 'pin_update', 'data': {'signal': 'START_4', 'state': 'HIGH'}})
+
+        dumps.assert_called_once()
+        payloads = {id(c.send.call_args[0][0]) for c in clients}
+        assert len(payloads) == 1
+
+    def test_backed_up_client_gets_coalesced_pin_updates(self, mock_hardware_interface):
+        """Test pin updates queue for a slow client and collapse to the latest value per signal"""
+        from websocket.WebSocketHandlerPython import WebSocketHandler, SEND_HIGH_WATER
+
+        handler = WebSocketHandler(mock_hardware_interface)
+        fast = Mock(readyState=1, bufferedAmount=0)
+        slow = Mock(readyState=1, bufferedAmount=SEND_HIGH_WATER + 1)
+        handler.clients.update([fast, slow])
+
+        for state in range(50):
+            handler.onPinUpdate('START_4', {'state': state})
+        handler.onPinUpdate('RESET_4', {'state': 1})
+        handler.onHardwareError('late error')
+
+        assert fast.send.call_count == 52
+        slow.send.assert_not_called()
+        assert handler.getQueuedCount(slow) == 3
+
+        slow.bufferedAmount = 0
+        handler.flushPending()
+        sent = [json.loads(call[0][0]) for call in slow.send.call_args_list]
+        assert [m['type'] for m in sent] == ['pin_update', 'pin_update', 'error']
+        assert sent[0]['data'] == {'signal': 'START_4', 'pinState': {'state': 49}}
+        assert handler.getQueuedCount(slow) == 0
+
+    def test_client_exceeding_queue_limit_is_dropped(self, mock_hardware_interface):
+        """Test a client that never drains is disconnected once its queue overflows"""
+        from websocket.WebSocketHandlerPython import WebSocketHandler, SEND_HIGH_WATER, MAX_QUEUED_MESSAGES
+
+        handler = WebSocketHandler(mock_hardware_interface)
+        stuck = Mock(readyState=1, bufferedAmount=SEND_HIGH_WATER + 1)
+        handler.clients.add(stuck)
+
+        for i in range(MAX_QUEUED_MESSAGES + 1):
+            handler.onHardwareError(f'error {i}')
+
+        stuck.terminate.assert_called_once()
+        assert stuck not in handler.clients
+        assert handler.getQueuedCount(stuck) == 0
+        assert handler.droppedClients == 1
+
+    def test_binary_client_gets_descriptors_once_and_compact_frames(self, mock_hardware_interface, mock_pin_states):
+        """Test the binary encoding handshake and pin update frames"""
+        from websocket.WebSocketHandlerPython import WebSocketHandler, ENCODING_BINARY
+        from websocket.PinFrameCodec import FRAME_PIN_STATES, FRAME_PIN_UPDATE
+
+        mock_hardware_interface.getPinStates.return_value = mock_pin_states
+        handler = WebSocketHandler(mock_hardware_interface)
+        json_client = handler.handleConnection(Mock(readyState=1, bufferedAmount=0))
+        binary_client = handler.handleConnection(Mock(readyState=1, bufferedAmount=0), encoding=ENCODING_BINARY)
+
+        sent = [call[0][0] for call in binary_client.send.call_args_list]
+        descriptors = json.loads(sent[0])
+        assert descriptors['type'] == 'pin_descriptors'
+        assert [p['signal'] for p in descriptors['data']['pins']] == list(mock_pin_states)
+        initial = json.loads(sent[1])
+        assert initial['type'] == 'initial_state' and 'pins' not in initial['data']
+        kind, pins = handler.pinCodec.decode(sent[2])
+        assert kind == FRAME_PIN_STATES and len(pins) == len(mock_pin_states)
+
+        handler.onPinUpdate('POWER_SENSE_4', {'state': 2.5, 'timestamp': 1234})
+        handler.onPinUpdate('START_4', {'state': 'HIGH', 'timestamp': 1235})
+        frame = binary_client.send.call_args[0][0]
+        assert isinstance(frame, bytes) and len(frame) == 23
+        assert handler.pinCodec.decode(frame) == (FRAME_PIN_UPDATE, [{'signal': 'START_4', 'state': 'HIGH', 'timestamp': 1235}])
+        assert handler.pinCodec.decode(binary_client.send.call_args_list[-2][0][0])[1][0]['state'] == 2.5
+        assert json.loads(json_client.send.call_args[0][0])['type'] == 'pin_update'
+        assert len(frame) < len(json_client.send.call_args[0][0])
+
+        # Re-negotiating does not resend the descriptor table
+        binary_client.send.reset_mock()
+        handler.setClientEncoding(binary_client, ENCODING_BINARY)
+        types = [json.loads(c[0][0])['type'] for c in binary_client.send.call_args_list if isinstance(c[0][0], str)]
+        assert types == ['encoding_changed']
+
+    @pytest.mark.asyncio
+    async def test_set_encoding_message(self, mock_hardware_interface, mock_pin_states):
+        """Test switching encodings at runtime and rejecting unknown encodings"""
+        from websocket.WebSocketHandlerPython import WebSocketHandler
+
+        mock_hardware_interface.getPinStates.return_value = mock_pin_states
+        handler = WebSocketHandler(mock_hardware_interface)
+        ws = handler.handleConnection(Mock(readyState=1, bufferedAmount=0))
+
+        await handler.handleMessage(ws, {'type': 'set_encoding', 'data': {'encoding': 'binary'}})
+        await handler.handleMessage(ws, {'type': 'get_pin_states'})
+        assert isinstance(ws.send.call_args[0][0], bytes)
+
+        # Signals without a descriptor still go out as JSON
+        handler.onPinUpdate('NEW_SIGNAL', {'state': 'LOW'})
+        assert json.loads(ws.send.call_args[0][0])['data']['signal'] == 'NEW_SIGNAL'
+
+        # So do pin states carrying fields a frame has no room for
+        handler.onPinUpdate('FREQ_DIV10_4', {'state': 'HIGH', 'frequencyDisplay': '2.0kHz'})
+        assert json.loads(ws.send.call_args[0][0])['data']['pinState']['frequencyDisplay'] == '2.0kHz'
+
+        await handler.handleMessage(ws, {'type': 'set_encoding', 'data': {'encoding': 'cbor'}})
+        assert json.loads(ws.send.call_args[0][0])['type'] == 'error'
+        await handler.handleMessage(ws, {'type': 'set_encoding', 'data': {'encoding': 'json'}})
+        handler.onPinUpdate('START_4', {'state': 'LOW'})
+        assert json.loads(ws.send.call_args[0][0])['type'] == 'pin_update'